@@ -3,8 +3,21 @@ from __future__ import annotations
 import socket
 import struct
 import threading
+import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
+
+from delta_send import DeltaTracker
+
+
+ARTNET_ID = b"Art-Net\x00"
+OP_DMX = 0x5000
+OP_SYNC = 0x5200
+PROT_VER = 14
+
+_HEADER_LEN = 18
+_SEQ_OFFSET = 12
+_ZEROS = memoryview(bytes(512))
 
 
 @dataclass(frozen=True)
@@ -13,6 +26,14 @@ class ArtNetConfig:
     port: int = 6454
     universe_start: int = 0  # Art-Net Port-Address (0-based is common)
     channels_per_universe: int = 510  # 170 RGB pixels
+    # Send an ArtSync after each frame so nodes latch all universes together.
+    sync: bool = False
+    # ArtSync destination; blank = `host`. Broadcast addresses are allowed.
+    sync_host: str = ""
+    # Delta mode: skip universes whose data is unchanged, resending each one at
+    # least every `keepalive_s` (Art-Net nodes expect a refresh about every 4 s).
+    delta: bool = False
+    keepalive_s: float = 1.0
 
 
 class ArtNetSender:
@@ -21,6 +42,10 @@ class ArtNetSender:
 
     Packet format:
       ID[8] + OpCode[2 LE] + ProtVer[2 BE] + Seq[1] + Phys[1] + Universe[2 LE] + Length[2 BE] + Data[n]
+
+    One ArtDMX packet per universe is built once and patched in place (sequence
+    byte and data) each frame. With `sync`, an ArtSync (OpCode 0x5200) follows
+    every frame.
     """
 
     def __init__(self, cfg: ArtNetConfig) -> None:
@@ -29,12 +54,42 @@ class ArtNetSender:
         self.cfg = cfg
         self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
         self._seq = 0
+        self._addr = (cfg.host, int(cfg.port))
 
         ch = int(cfg.channels_per_universe)
         if ch <= 0 or ch > 512:
             raise ValueError("channels_per_universe must be 1..512")
         self._channels_per_universe = ch
+        self._packets: List[bytearray] = []
+
+        self._delta = DeltaTracker(cfg.keepalive_s) if cfg.delta else None
+
+        self._sync_packet: Optional[bytes] = None
+        self._sync_addr = self._addr
+        if cfg.sync:
+            self._sync_packet = (
+                ARTNET_ID
+                + struct.pack("<H", OP_SYNC)
+                + struct.pack(">H", PROT_VER)
+                + b"\x00\x00"  # Aux1, Aux2
+            )
+            sync_host = str(cfg.sync_host or "").strip()
+            if sync_host:
+                self._sync_addr = (sync_host, int(cfg.port))
+                try:
+                    self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                except OSError:
+                    pass
+
+    @property
+    def packets_skipped(self) -> int:
+        return self._delta.packets_skipped if self._delta is not None else 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self._delta.bytes_saved if self._delta is not None else 0
 
     def close(self) -> None:
         try:
@@ -47,6 +102,24 @@ class ArtNetSender:
             self._seq = (self._seq % 255) + 1
             return self._seq
 
+    def _build_packet(self, universe: int) -> bytearray:
+        ch_per = self._channels_per_universe
+        header = (
+            ARTNET_ID
+            + struct.pack("<H", OP_DMX)  # OpCode ArtDMX (little-endian)
+            + struct.pack(">H", PROT_VER)  # ProtVer (big-endian)
+            + struct.pack("BB", 0, 0)  # Seq, Physical
+            + struct.pack("<H", universe & 0xFFFF)  # Universe (Port-Address), LE
+            + struct.pack(">H", ch_per & 0xFFFF)  # Length, big-endian
+        )
+        return bytearray(header + bytes(ch_per))
+
+    def _packets_for(self, universes: int) -> List[bytearray]:
+        pkts = self._packets
+        while len(pkts) < universes:
+            pkts.append(self._build_packet(int(self.cfg.universe_start) + len(pkts)))
+        return pkts
+
     def send_frame(self, rgb: bytes) -> None:
         if not isinstance(rgb, (bytes, bytearray, memoryview)):
             raise TypeError("rgb must be bytes-like")
@@ -61,22 +134,39 @@ class ArtNetSender:
         if universes <= 0:
             universes = 1
 
-        for u in range(universes):
-            start = u * ch_per
-            end = min(total, start + ch_per)
-            chunk = bytes(data[start:end])
-            if len(chunk) < ch_per:
-                chunk += b"\x00" * (ch_per - len(chunk))
-
-            universe = int(self.cfg.universe_start) + u
-            header = (
-                b"Art-Net\x00"
-                + struct.pack("<H", 0x5000)  # OpCode ArtDMX (little-endian)
-                + struct.pack(">H", 14)  # ProtVer (big-endian)
-                + struct.pack("BB", seq & 0xFF, 0)  # Seq, Physical
-                + struct.pack(
-                    "<H", universe & 0xFFFF
-                )  # Universe (Port-Address), little-endian
-                + struct.pack(">H", len(chunk) & 0xFFFF)  # Length, big-endian
-            )
-            self._sock.sendto(header + chunk, (self.cfg.host, int(self.cfg.port)))
+        addr = self._addr
+        delta = self._delta
+        now = time.monotonic() if delta is not None else 0.0
+        sent = 0
+        with self._send_lock:
+            pkts = self._packets_for(universes)
+            for u in range(universes):
+                start = u * ch_per
+                end = min(total, start + ch_per)
+                n = end - start
+                pkt = pkts[u]
+                chunk = data[start:end]
+                if delta is not None and not delta.should_send(
+                    u,
+                    same=pkt[_HEADER_LEN : _HEADER_LEN + n] == chunk,
+                    length=n,
+                    now=now,
+                ):
+                    delta.skipped(len(pkt))
+                    continue
+                pkt[_SEQ_OFFSET] = seq
+                pkt[_HEADER_LEN : _HEADER_LEN + n] = chunk
+                if n < ch_per:
+                    pkt[_HEADER_LEN + n :] = _ZEROS[: ch_per - n]
+                self._sock.sendto(pkt, addr)
+                if delta is not None:
+                    delta.sent(u, length=n, now=now)
+                sent += 1
+            if self._sync_packet is not None and sent:
+                self.send_sync()
+
+    def send_sync(self) -> None:
+        """Broadcast/unicast an ArtSync (no-op unless `sync` is enabled)."""
+        if self._sync_packet is None:
+            return
+        self._sock.sendto(self._sync_packet, self._sync_addr)
@@ -1,17 +1,26 @@
 from __future__ import annotations
 
 import math
-import os
 import subprocess
 import tempfile
 import wave
 from array import array
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from jobs import JobCanceled
 
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+# Mono frames per PCM chunk (~1.5 s at 44.1 kHz). Decoding, downmix, energy
+# and waveform accumulation all work a chunk at a time, so memory is bounded
+# by this rather than by the track length.
+_PCM_CHUNK_FRAMES = 1 << 16
+
 
 class AudioAnalyzeError(RuntimeError):
     pass
@@ -41,66 +50,26 @@ def _has_cmd(name: str) -> bool:
     return which(name) is not None
 
 
-def _decode_to_wav_pcm(
-    *,
-    in_path: str,
-    sample_rate_hz: int = 44100,
-) -> str:
-    """
-    Decode arbitrary audio to a temporary mono 16-bit PCM WAV via ffmpeg.
-    """
-    if not _has_cmd("ffmpeg"):
-        raise AudioAnalyzeError(
-            "ffmpeg not found; only .wav files are supported without ffmpeg"
-        )
-    tmp = tempfile.NamedTemporaryFile(prefix="wsa_audio_", suffix=".wav", delete=False)
-    tmp.close()
-    out = tmp.name
-    cmd = [
-        "ffmpeg",
-        "-y",
-        "-i",
-        str(in_path),
-        "-ac",
-        "1",
-        "-ar",
-        str(int(sample_rate_hz)),
-        "-f",
-        "wav",
-        "-acodec",
-        "pcm_s16le",
-        out,
-    ]
-    try:
-        p = subprocess.run(
-            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False, text=True
-        )
-    except Exception as e:
-        raise AudioAnalyzeError(f"ffmpeg failed: {e}")
-    if p.returncode != 0:
-        raise AudioAnalyzeError(f"ffmpeg decode failed: {p.stderr[-500:]}")
-    return out
+def _use_numpy(backend: str) -> bool:
+    return np is not None and str(backend or "").strip().lower() == "numpy"
 
 
-def _read_wav_mono_s16(path: str) -> Tuple[int, array]:
-    p = Path(path)
-    if not p.is_file():
-        raise AudioAnalyzeError("Audio file not found")
-    with wave.open(str(p), "rb") as wf:
-        nch = int(wf.getnchannels())
-        sampwidth = int(wf.getsampwidth())
-        sr = int(wf.getframerate())
-        nframes = int(wf.getnframes())
-        if sampwidth != 2:
-            raise AudioAnalyzeError(
-                f"Unsupported WAV sample width: {sampwidth * 8} bits (expected 16-bit PCM)"
-            )
-        raw = wf.readframes(nframes)
+def _downmix_s16(raw: bytes, nch: int, *, use_numpy: bool) -> Any:
+    """
+    Interleaved 16-bit PCM to mono (channels averaged, truncated toward zero):
+    an `array("h")`, or an int16 ndarray with `use_numpy`.
+    """
+    if use_numpy:
+        data = np.frombuffer(raw, dtype="<i2")
+        if nch <= 1:
+            return data
+        acc = data.reshape(-1, nch).sum(axis=1, dtype=np.int32)
+        return np.trunc(acc / nch).astype(np.int16)
 
     samples = array("h")
     samples.frombytes(raw)
     if nch <= 1:
-        return sr, samples
+        return samples
 
     # Downmix to mono (average channels)
     mono = array("h")
@@ -111,7 +80,362 @@ def _read_wav_mono_s16(path: str) -> Tuple[int, array]:
         for c in range(nch):
             acc += int(samples[base + c])
         mono.append(int(acc / nch))
-    return sr, mono
+    return mono
+
+
+class PcmStream:
+    """
+    Mono 16-bit PCM of an audio file in chunks of at most `chunk_frames`.
+
+    WAV files are read directly; anything else is decoded by an
+    `ffmpeg ... -f s16le pipe:1` subprocess, so nothing is written to disk and
+    only one chunk is held at a time. `total_frames` is known up front for
+    WAV only. Use as a context manager (stops ffmpeg if iteration ends early).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        sample_rate_hz: int = 44100,
+        prefer_ffmpeg: bool = True,
+        use_numpy: bool = False,
+        chunk_frames: int | None = None,
+    ) -> None:
+        self.path = str(path)
+        self.use_numpy = bool(use_numpy)
+        self.chunk_frames = max(1, int(chunk_frames or _PCM_CHUNK_FRAMES))
+        self.total_frames: Optional[int] = None
+        self.decoded = False
+        self._wav: Any = None
+        self._proc: subprocess.Popen | None = None
+        self._stderr: Any = None
+        if self.path.lower().endswith(".wav"):
+            self._open_wav()
+        elif prefer_ffmpeg:
+            self._open_ffmpeg(int(sample_rate_hz))
+        else:
+            raise AudioAnalyzeError(
+                "Only .wav is supported (set prefer_ffmpeg=true to enable ffmpeg decoding)."
+            )
+
+    def _open_wav(self) -> None:
+        if not Path(self.path).is_file():
+            raise AudioAnalyzeError("Audio file not found")
+        wf = wave.open(self.path, "rb")
+        if int(wf.getsampwidth()) != 2:
+            width = int(wf.getsampwidth())
+            wf.close()
+            raise AudioAnalyzeError(
+                f"Unsupported WAV sample width: {width * 8} bits (expected 16-bit PCM)"
+            )
+        self._wav = wf
+        self.channels = int(wf.getnchannels())
+        self.sample_rate_hz = int(wf.getframerate())
+        self.total_frames = int(wf.getnframes())
+
+    def _open_ffmpeg(self, sample_rate_hz: int) -> None:
+        if not _has_cmd("ffmpeg"):
+            raise AudioAnalyzeError(
+                "ffmpeg not found; only .wav files are supported without ffmpeg"
+            )
+        cmd = [
+            "ffmpeg",
+            "-nostdin",
+            "-v",
+            "error",
+            "-i",
+            self.path,
+            "-ac",
+            "1",
+            "-ar",
+            str(int(sample_rate_hz)),
+            "-f",
+            "s16le",
+            "-acodec",
+            "pcm_s16le",
+            "pipe:1",
+        ]
+        # stderr goes to a temp file: an undrained pipe could stall ffmpeg.
+        self._stderr = tempfile.TemporaryFile()
+        try:
+            self._proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=self._stderr,
+            )
+        except Exception as e:
+            self._stderr.close()
+            raise AudioAnalyzeError(f"ffmpeg failed: {e}")
+        self.decoded = True
+        self.channels = 1
+        self.sample_rate_hz = int(sample_rate_hz)
+
+    def chunks(self) -> Iterator[Any]:
+        if self._wav is not None:
+            while True:
+                raw = self._wav.readframes(self.chunk_frames)
+                if not raw:
+                    return
+                yield _downmix_s16(raw, self.channels, use_numpy=self.use_numpy)
+
+        assert self._proc is not None and self._proc.stdout is not None
+        want = self.chunk_frames * 2
+        carry = b""
+        while True:
+            raw = self._proc.stdout.read(want)
+            if not raw:
+                break
+            raw = carry + raw
+            cut = len(raw) - (len(raw) % 2)
+            carry = raw[cut:]
+            if cut:
+                yield _downmix_s16(raw[:cut], 1, use_numpy=self.use_numpy)
+        if self._proc.wait() != 0:
+            self._stderr.seek(0)
+            err = self._stderr.read().decode("utf-8", "replace")
+            raise AudioAnalyzeError(f"ffmpeg decode failed: {err[-500:]}")
+
+    def close(self) -> None:
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+        if self._proc is not None:
+            if self._proc.poll() is None:
+                self._proc.kill()
+            if self._proc.stdout is not None:
+                self._proc.stdout.close()
+            self._proc.wait()
+            self._proc = None
+        if self._stderr is not None:
+            self._stderr.close()
+            self._stderr = None
+
+    def __enter__(self) -> "PcmStream":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class _EnergyAccumulator:
+    """
+    Short-time energy of `win`-sample windows every `hop` samples, fed one
+    PCM chunk at a time; only the samples of the next unfinished window are
+    kept between chunks.
+
+    Squares are summed as integers, which is exact. The scalar path's float
+    sum is exact too (every term is a multiple of 2**-30 and the total stays
+    far below 2**53 of them), so both backends give bit-identical energies.
+    """
+
+    def __init__(self, *, win: int, hop: int, use_numpy: bool) -> None:
+        self.win = int(win)
+        self.hop = int(hop)
+        self.use_numpy = bool(use_numpy)
+        self.energies = array("d")
+        self.samples = 0
+        self._buf: Any = np.empty(0, dtype=np.int16) if use_numpy else array("h")
+        self._buf_start = 0
+        self._next = 0
+
+    def feed(self, chunk: Any) -> None:
+        self.samples += len(chunk)
+        if self.use_numpy:
+            self._buf = np.concatenate((self._buf, chunk))
+        else:
+            self._buf.extend(chunk)
+        rel = self._next - self._buf_start
+        avail = len(self._buf) - rel
+        if avail >= self.win:
+            count = (avail - self.win) // self.hop + 1
+            if self.use_numpy:
+                self._energies_np(rel, count)
+            else:
+                self._energies(rel, count)
+            self._next += count * self.hop
+        keep = min(len(self._buf), self._next - self._buf_start)
+        self._buf = self._buf[keep:]
+        self._buf_start += keep
+
+    def _energies(self, rel: int, count: int) -> None:
+        buf, win = self._buf, self.win
+        for k in range(count):
+            start = rel + k * self.hop
+            acc = 0.0
+            for s in buf[start : start + win]:
+                x = float(s) / 32768.0
+                acc += x * x
+            self.energies.append(acc / float(win))
+
+    def _energies_np(self, rel: int, count: int) -> None:
+        sq = self._buf[rel : rel + (count - 1) * self.hop + self.win].astype(np.int64)
+        sq *= sq
+        csum = np.zeros(len(sq) + 1, dtype=np.int64)
+        np.cumsum(sq, out=csum[1:])
+        starts = np.arange(count, dtype=np.int64) * self.hop
+        acc = (csum[starts + self.win] - csum[starts]).astype(np.float64) / 1073741824.0
+        self.energies.extend((acc / float(self.win)).tolist())
+
+    def finish(self) -> array:
+        # Windows must end before the last sample (the batch loop's range).
+        if self.energies and self._next - self.hop + self.win == self.samples:
+            self.energies.pop()
+        return self.energies
+
+
+class _WaveformAccumulator:
+    """
+    Min/max of `points` equal buckets (the last takes the remainder), fed one
+    PCM chunk at a time.
+
+    With `total_frames` known (WAV) the buckets are exact. A piped decode has
+    no length up front, so samples are first reduced into blocks that double
+    in size whenever there are too many, and buckets are read from the blocks
+    at the end; edges can then be off by less than one block (a small
+    fraction of a bucket).
+    """
+
+    def __init__(
+        self, *, points: int, total_frames: Optional[int], use_numpy: bool
+    ) -> None:
+        self.points = int(points)
+        self.total = total_frames if total_frames else None
+        self.use_numpy = bool(use_numpy)
+        self.samples = 0
+        if self.total is not None:
+            self.block = max(1, self.total // self.points)
+            n = self.points
+        else:
+            self.block = 1
+            n = 0
+        self._max_blocks = max(4096, 8 * self.points)
+        self.mins: List[int] = [32768] * n
+        self.maxs: List[int] = [-32769] * n
+        # Partially filled block (streaming mode).
+        self._part = 0
+        self._part_min = 32768
+        self._part_max = -32769
+
+    def _reduce(self, chunk: Any, edges: List[int]) -> Tuple[List[int], List[int]]:
+        """Min/max of `chunk[edges[i]:edges[i + 1]]` (last runs to the end)."""
+        if self.use_numpy:
+            idx = np.asarray(edges, dtype=np.intp)
+            return (
+                np.minimum.reduceat(chunk, idx).tolist(),
+                np.maximum.reduceat(chunk, idx).tolist(),
+            )
+        mins, maxs = [], []
+        bounds = list(edges) + [len(chunk)]
+        for a, b in zip(bounds, bounds[1:]):
+            part = chunk[a:b]
+            mins.append(min(part))
+            maxs.append(max(part))
+        return mins, maxs
+
+    def feed(self, chunk: Any) -> None:
+        n = len(chunk)
+        if n == 0:
+            return
+        pos = self.samples
+        self.samples += n
+        if self.total is not None:
+            self._feed_exact(chunk, pos)
+        else:
+            self._feed_blocks(chunk)
+
+    def _feed_exact(self, chunk: Any, pos: int) -> None:
+        step, last = self.block, self.points - 1
+        first = min(pos // step, last)
+        stop = min((pos + len(chunk) - 1) // step, last)
+        edges = [0] + [b * step - pos for b in range(first + 1, stop + 1)]
+        mins, maxs = self._reduce(chunk, edges)
+        for i, (lo, hi) in enumerate(zip(mins, maxs), start=first):
+            if lo < self.mins[i]:
+                self.mins[i] = lo
+            if hi > self.maxs[i]:
+                self.maxs[i] = hi
+
+    def _feed_blocks(self, chunk: Any) -> None:
+        at = 0
+        n = len(chunk)
+        if self._part:
+            take = min(n, self.block - self._part)
+            lo, hi = self._reduce(chunk[:take], [0])
+            self._part_min = min(self._part_min, lo[0])
+            self._part_max = max(self._part_max, hi[0])
+            self._part += take
+            at = take
+            if self._part == self.block:
+                self._push(self._part_min, self._part_max)
+        full = (n - at) // self.block
+        if full:
+            lo, hi = self._reduce(
+                chunk[at : at + full * self.block],
+                list(range(0, full * self.block, self.block)),
+            )
+            self.mins.extend(lo)
+            self.maxs.extend(hi)
+            at += full * self.block
+        if at < n:
+            lo, hi = self._reduce(chunk[at:], [0])
+            self._part, self._part_min, self._part_max = n - at, lo[0], hi[0]
+        if len(self.mins) >= 2 * self._max_blocks:
+            self._merge()
+
+    def _push(self, lo: int, hi: int) -> None:
+        self.mins.append(lo)
+        self.maxs.append(hi)
+        self._part, self._part_min, self._part_max = 0, 32768, -32769
+
+    def _merge(self) -> None:
+        """Double the block size; an odd last block becomes the partial one."""
+        n = len(self.mins) // 2 * 2
+        if n < len(self.mins):
+            lo, hi = self.mins.pop(), self.maxs.pop()
+            # The old partial block follows it; it is still smaller than a block.
+            self._part_min = min(self._part_min, lo)
+            self._part_max = max(self._part_max, hi)
+            self._part += self.block
+        self.mins = [min(a, b) for a, b in zip(self.mins[0::2], self.mins[1::2])]
+        self.maxs = [max(a, b) for a, b in zip(self.maxs[0::2], self.maxs[1::2])]
+        self.block *= 2
+
+    def finish(self) -> List[Dict[str, float]]:
+        if self.total is None:
+            mins, maxs = self._bucket_blocks()
+        else:
+            mins, maxs = self.mins, self.maxs
+        return [
+            (
+                {"min": 0.0, "max": 0.0}
+                if lo > hi
+                else {"min": float(lo) / 32768.0, "max": float(hi) / 32768.0}
+            )
+            for lo, hi in zip(mins, maxs)
+        ]
+
+    def _bucket_blocks(self) -> Tuple[List[int], List[int]]:
+        if self._part:
+            self.mins.append(self._part_min)
+            self.maxs.append(self._part_max)
+            self._part = 0
+        total, block = self.samples, self.block
+        step = max(1, total // self.points)
+        mins: List[int] = []
+        maxs: List[int] = []
+        for i in range(self.points):
+            start = i * step
+            end = total if i == self.points - 1 else min(total, start + step)
+            if end <= start:
+                mins.append(32768)
+                maxs.append(-32769)
+                continue
+            a, b = start // block, (end - 1) // block + 1
+            mins.append(min(self.mins[a:b]))
+            maxs.append(max(self.maxs[a:b]))
+        return mins, maxs
 
 
 def extract_waveform(
@@ -120,60 +444,59 @@ def extract_waveform(
     points: int = 512,
     sample_rate_hz: int = 44100,
     prefer_ffmpeg: bool = True,
+    backend: str = "numpy",
 ) -> Dict[str, object]:
     """
     Downsample a waveform into min/max buckets for visualization.
+
+    PCM is streamed in chunks (see `PcmStream`), so memory does not grow with
+    the track length. The NumPy backend (when installed) returns the same
+    buckets as the scalar loop.
     """
     path = str(audio_path)
-    tmp: str | None = None
-    try:
-        if not path.lower().endswith(".wav"):
-            if not prefer_ffmpeg:
-                raise AudioAnalyzeError(
-                    "Non-WAV files require ffmpeg (set prefer_ffmpeg=true)."
-                )
-            tmp = _decode_to_wav_pcm(in_path=path, sample_rate_hz=int(sample_rate_hz))
-            path = tmp
-
-        sr, samples = _read_wav_mono_s16(path)
-        total = len(samples)
-        if total <= 0:
-            raise AudioAnalyzeError("Audio file has no samples")
-
-        points_i = max(32, min(5000, int(points)))
-        step = max(1, total // points_i)
-        scale = 32768.0
-        buckets: List[Dict[str, float]] = []
-
-        for i in range(points_i):
-            start = i * step
-            end = total if i == points_i - 1 else min(total, start + step)
-            if end <= start:
-                buckets.append({"min": 0.0, "max": 0.0})
-                continue
-            min_v = 1.0
-            max_v = -1.0
-            for j in range(start, end):
-                v = float(samples[j]) / scale
-                if v < min_v:
-                    min_v = v
-                if v > max_v:
-                    max_v = v
-            buckets.append({"min": float(min_v), "max": float(max_v)})
-
-        duration_s = float(total) / float(sr) if sr > 0 else 0.0
-        return {
-            "duration_s": duration_s,
-            "sample_rate_hz": int(sr),
-            "points": buckets,
-            "points_total": len(buckets),
-        }
-    finally:
-        if tmp:
-            try:
-                os.unlink(tmp)
-            except Exception:
-                pass
+    if not path.lower().endswith(".wav") and not prefer_ffmpeg:
+        raise AudioAnalyzeError(
+            "Non-WAV files require ffmpeg (set prefer_ffmpeg=true)."
+        )
+    use_np = _use_numpy(backend)
+    points_i = max(32, min(5000, int(points)))
+    with PcmStream(
+        path,
+        sample_rate_hz=int(sample_rate_hz),
+        prefer_ffmpeg=prefer_ffmpeg,
+        use_numpy=use_np,
+    ) as pcm:
+        acc = _WaveformAccumulator(
+            points=points_i, total_frames=pcm.total_frames, use_numpy=use_np
+        )
+        for chunk in pcm.chunks():
+            acc.feed(chunk)
+        sr = pcm.sample_rate_hz
+    total = acc.samples
+    if total <= 0:
+        raise AudioAnalyzeError("Audio file has no samples")
+    buckets = acc.finish()
+    duration_s = float(total) / float(sr) if sr > 0 else 0.0
+    return {
+        "duration_s": duration_s,
+        "sample_rate_hz": int(sr),
+        "points": buckets,
+        "points_total": len(buckets),
+    }
+
+
+def _onset_peaks(onset: List[float], thr: float, *, use_numpy: bool) -> List[int]:
+    """Indices of local maxima of `onset` at or above `thr` (interior only)."""
+    if not use_numpy:
+        return [
+            i
+            for i in range(1, len(onset) - 1)
+            if onset[i] >= thr and onset[i] >= onset[i - 1] and onset[i] >= onset[i + 1]
+        ]
+    o = np.asarray(onset, dtype=np.float64)
+    mid = o[1:-1]
+    mask = (mid >= thr) & (mid >= o[:-2]) & (mid >= o[2:])
+    return (np.flatnonzero(mask) + 1).tolist()
 
 
 def analyze_beats(
@@ -188,119 +511,125 @@ def analyze_beats(
     prefer_ffmpeg: bool = True,
     progress_cb: Callable[[float, float, str], None] | None = None,
     cancel_cb: Callable[[], bool] | None = None,
+    backend: str = "numpy",
 ) -> BeatAnalysis:
     """
-    Lightweight, dependency-free beat detection.
+    Lightweight beat detection (NumPy optional).
 
-    - If ffmpeg is available (and prefer_ffmpeg=True), we decode non-WAV formats to WAV PCM.
+    - PCM is streamed in chunks (WAV directly, other formats through an ffmpeg
+      pipe when prefer_ffmpeg=True), and energy is accumulated as it arrives.
     - Beat detection uses short-time energy deltas + peak picking.
+    - backend="numpy" (when installed) vectorizes the downmix, energy and peak
+      candidates; the result is identical to the scalar path.
     """
     src = str(audio_path)
-    temp_wav: Optional[str] = None
-    try:
-        if cancel_cb and cancel_cb():
-            raise JobCanceled("Job canceled")
-
-        ext = os.path.splitext(src)[1].lower()
-        wav_path = src
-        method = "wav_energy_peaks"
-        if ext != ".wav":
-            if prefer_ffmpeg:
-                temp_wav = _decode_to_wav_pcm(in_path=src)
-                wav_path = temp_wav
-                method = "ffmpeg->wav_energy_peaks"
-            else:
-                raise AudioAnalyzeError(
-                    "Only .wav is supported (set prefer_ffmpeg=true to enable ffmpeg decoding)."
-                )
-
-        sr, samples = _read_wav_mono_s16(wav_path)
-        if sr <= 0 or len(samples) < 1000:
+    if cancel_cb and cancel_cb():
+        raise JobCanceled("Job canceled")
+
+    use_np = _use_numpy(backend)
+    with PcmStream(src, prefer_ffmpeg=prefer_ffmpeg, use_numpy=use_np) as pcm:
+        method = "ffmpeg->pcm_energy_peaks" if pcm.decoded else "wav_energy_peaks"
+        sr = pcm.sample_rate_hz
+        if sr <= 0:
             raise AudioAnalyzeError("Audio too short to analyze")
 
         hop = max(1, int(sr * (max(5, int(hop_ms)) / 1000.0)))
         win = max(hop, int(sr * (max(10, int(window_ms)) / 1000.0)))
 
         # Short-time energy
+        acc = _EnergyAccumulator(win=win, hop=hop, use_numpy=use_np)
         total_windows = (
-            max(1, int((len(samples) - win) / float(hop))) if len(samples) > win else 1
+            max(1, int((pcm.total_frames - win) / float(hop)))
+            if pcm.total_frames and pcm.total_frames > win
+            else 0
         )
-        energies: List[float] = []
-        processed = 0
-        report_every = max(100, int(total_windows // 200) or 1)
-        for start in range(0, len(samples) - win, hop):
+        for chunk in pcm.chunks():
             if cancel_cb and cancel_cb():
                 raise JobCanceled("Job canceled")
-            acc = 0.0
-            for s in samples[start : start + win]:
-                x = float(s) / 32768.0
-                acc += x * x
-            energies.append(acc / float(win))
-            processed += 1
-            if progress_cb and (processed % report_every == 0):
-                progress_cb(float(processed), float(total_windows), "Analyzing audio…")
-
-        if len(energies) < 8:
-            raise AudioAnalyzeError("Audio too short to analyze")
-
-        # Onset strength: positive energy delta
-        onset: List[float] = [0.0]
+            acc.feed(chunk)
+            if progress_cb:
+                progress_cb(
+                    float(len(acc.energies)),
+                    float(total_windows),
+                    "Analyzing audio…",
+                )
+    if acc.samples < 1000:
+        raise AudioAnalyzeError("Audio too short to analyze")
+    energies = acc.finish()
+
+    if len(energies) < 8:
+        raise AudioAnalyzeError("Audio too short to analyze")
+
+    # Onset strength: positive energy delta
+    if use_np:
+        d = np.diff(np.frombuffer(energies, dtype=np.float64))
+        onset: List[float] = [0.0] + np.where(d > 0, d, 0.0).tolist()
+    else:
+        onset = [0.0]
         for i in range(1, len(energies)):
             d = energies[i] - energies[i - 1]
             onset.append(d if d > 0 else 0.0)
 
-        mean = sum(onset) / float(len(onset))
-        var = sum((x - mean) ** 2 for x in onset) / float(max(1, len(onset) - 1))
-        std = math.sqrt(var)
-        thr = mean + (std * float(peak_threshold))
-
-        # Peak picking
-        beats_idx: List[int] = []
-        last_t = -1e9
-        for i in range(1, len(onset) - 1):
-            if onset[i] < thr:
-                continue
-            if onset[i] < onset[i - 1] or onset[i] < onset[i + 1]:
+    mean = sum(onset) / float(len(onset))
+    var = sum((x - mean) ** 2 for x in onset) / float(max(1, len(onset) - 1))
+    std = math.sqrt(var)
+    thr = mean + (std * float(peak_threshold))
+
+    # Peak picking
+    beats_idx: List[int] = []
+    last_t = -1e9
+    for i in _onset_peaks(onset, thr, use_numpy=use_np):
+        t = (i * hop) / float(sr)
+        if t - last_t < float(min_interval_s):
+            continue
+        beats_idx.append(i)
+        last_t = t
+
+    beats_s = [(i * hop) / float(sr) for i in beats_idx]
+    duration_s = acc.samples / float(sr)
+
+    # Estimate BPM from beat intervals (median)
+    intervals = [beats_s[i] - beats_s[i - 1] for i in range(1, len(beats_s))]
+    bpm = 0.0
+    if intervals:
+        vals = []
+        for dt in intervals:
+            if dt <= 0:
                 continue
-            t = (i * hop) / float(sr)
-            if t - last_t < float(min_interval_s):
-                continue
-            beats_idx.append(i)
-            last_t = t
-
-        beats_s = [(i * hop) / float(sr) for i in beats_idx]
-        duration_s = len(samples) / float(sr)
-
-        # Estimate BPM from beat intervals (median)
-        intervals = [beats_s[i] - beats_s[i - 1] for i in range(1, len(beats_s))]
-        bpm = 0.0
-        if intervals:
-            vals = []
-            for dt in intervals:
-                if dt <= 0:
-                    continue
-                b = 60.0 / dt
-                if float(min_bpm) <= b <= float(max_bpm):
-                    vals.append(b)
-            if vals:
-                vals.sort()
-                mid = len(vals) // 2
-                bpm = (
-                    vals[mid]
-                    if len(vals) % 2 == 1
-                    else (vals[mid - 1] + vals[mid]) / 2.0
-                )
-
-        return BeatAnalysis(
-            bpm=float(bpm),
-            beats_s=beats_s,
-            duration_s=float(duration_s),
-            sample_rate_hz=int(sr),
-            method=method,
-        )
-    finally:
-        if temp_wav:
-            try:
-                Path(temp_wav).unlink(missing_ok=True)  # type: ignore[arg-type]
-            except Exception:
-                pass
+            b = 60.0 / dt
+            if float(min_bpm) <= b <= float(max_bpm):
+                vals.append(b)
+        if vals:
+            vals.sort()
+            mid = len(vals) // 2
+            bpm = vals[mid] if len(vals) % 2 == 1 else (vals[mid - 1] + vals[mid]) / 2.0
+
+    return BeatAnalysis(
+        bpm=float(bpm),
+        beats_s=beats_s,
+        duration_s=float(duration_s),
+        sample_rate_hz=int(sr),
+        method=method,
+    )
+
+
+def analyze_beats_timeline(**kwargs: Any) -> Dict[str, object]:
+    """
+    `analyze_beats` as the beats JSON the analyze endpoints write: the
+    analysis plus a single-segment `bpm_timeline` (empty when no BPM).
+    Returns plain data, so it can run in a `ProcessService` worker.
+    """
+    analysis = analyze_beats(**kwargs)
+    out = analysis.as_dict()
+    out["bpm_timeline"] = (
+        [
+            {
+                "start_s": 0.0,
+                "end_s": float(analysis.duration_s),
+                "bpm": float(analysis.bpm),
+            }
+        ]
+        if analysis.bpm > 0
+        else []
+    )
+    return out
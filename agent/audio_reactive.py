@@ -0,0 +1,536 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from audio_analyzer import AudioAnalyzeError, PcmStream, _use_numpy
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+
+# Live audio-reactive input for DDP streams.
+#
+# A `PcmSource` delivers mono s16le PCM as it arrives (a file played in real
+# time, a named pipe, or UDP datagrams). `BandAnalyzer` cuts it into fixed
+# hops and computes, per hop, normalized band energies from a windowed FFT,
+# an RMS level and spectral-flux onsets. `AudioReactive` pumps a source
+# through the analyzer in the background and, once per rendered frame,
+# writes the latest features into the pattern's params (see `apply`).
+
+DEFAULT_BANDS_HZ: Tuple[float, ...] = (20.0, 120.0, 400.0, 1200.0, 4000.0, 12000.0)
+DEFAULT_MAPPING: Dict[str, Dict[str, Any]] = {
+    "brightness": {"feature": "level", "min": 0.3, "max": 1.0}
+}
+_PEAK_FLOOR = 1e-3  # normalization floor (about -60 dBFS), keeps silence dark
+_ONSET_HISTORY_S = 1.0
+_PULSE_DECAY_S = 0.15
+
+
+@dataclass(frozen=True)
+class AudioFeatures:
+    t: float  # stream time of the newest sample in the hop (s)
+    captured_at: float  # time.monotonic() when that sample arrived
+    level: float  # RMS, normalized 0..1
+    bands: Tuple[float, ...]  # band energies, normalized 0..1
+    flux: float
+    onset: bool
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "t": float(self.t),
+            "level": float(self.level),
+            "bands": [float(b) for b in self.bands],
+            "flux": float(self.flux),
+            "onset": bool(self.onset),
+        }
+
+
+class BandAnalyzer:
+    """
+    Band energies, level and onsets for consecutive `hop`-sample hops of mono
+    s16 PCM, each over the last `fft_size` samples (Hann window).
+
+    Values are normalized by a per-band peak follower that halves every
+    `decay_s`, so quiet and loud material both use the full 0..1 range. An
+    onset is a hop whose spectral flux exceeds the mean + `onset_k` standard
+    deviations of the last second. The NumPy and scalar paths agree to
+    floating-point rounding.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate_hz: int = 44100,
+        hop: int = 512,
+        fft_size: int = 1024,
+        bands_hz: Tuple[float, ...] = DEFAULT_BANDS_HZ,
+        decay_s: float = 2.0,
+        onset_k: float = 1.5,
+        onset_min_interval_s: float = 0.1,
+        backend: str = "numpy",
+    ) -> None:
+        sr = int(sample_rate_hz)
+        n = int(fft_size)
+        if sr <= 0:
+            raise ValueError("sample_rate_hz must be > 0")
+        if n < 16 or n & (n - 1):
+            raise ValueError("fft_size must be a power of two >= 16")
+        if not 1 <= int(hop) <= n:
+            raise ValueError("hop must be between 1 and fft_size")
+        edges = [float(x) for x in bands_hz]
+        if len(edges) < 2 or any(b <= a for a, b in zip(edges, edges[1:])):
+            raise ValueError("bands_hz must be at least two increasing edges")
+
+        self.sample_rate_hz = sr
+        self.hop = int(hop)
+        self.fft_size = n
+        self.hop_s = float(self.hop) / float(sr)
+        self.use_numpy = _use_numpy(backend)
+
+        bin_hz = float(sr) / float(n)
+        top = n // 2 + 1
+        self._bins: List[Tuple[int, int]] = []
+        for lo_hz, hi_hz in zip(edges, edges[1:]):
+            lo = min(top - 1, max(1, int(math.ceil(lo_hz / bin_hz))))
+            hi = min(top, max(lo + 1, int(math.ceil(hi_hz / bin_hz))))
+            self._bins.append((lo, hi))
+
+        window = [0.5 - 0.5 * math.cos(2.0 * math.pi * i / n) for i in range(n)]
+        if self.use_numpy:
+            self._window: Any = np.asarray(window, dtype=np.float64)
+            self._buf: Any = np.zeros(n, dtype=np.float64)
+        else:
+            self._window = window
+            self._buf = [0.0] * n
+            bits = n.bit_length() - 1
+            self._bitrev = [int(format(i, f"0{bits}b")[::-1], 2) for i in range(n)]
+            self._twiddle = [
+                (math.cos(-2.0 * math.pi * k / n), math.sin(-2.0 * math.pi * k / n))
+                for k in range(n // 2)
+            ]
+
+        self._decay = 0.5 ** (self.hop_s / max(1e-3, float(decay_s)))
+        # Peaks are tracked in amplitude units (sqrt of band power / n).
+        self._band_peak = [_PEAK_FLOOR] * len(self._bins)
+        self._level_peak = _PEAK_FLOOR
+        self._prev_log = [0.0] * len(self._bins)
+        self._flux_hist: deque = deque(
+            maxlen=max(8, int(round(_ONSET_HISTORY_S / self.hop_s)))
+        )
+        self._onset_k = float(onset_k)
+        self._onset_min_interval_s = max(0.0, float(onset_min_interval_s))
+        self._last_onset_t = -1e9
+        self._pend = b""
+
+        self.samples = 0
+        self.hops = 0
+        self.compute_s_sum = 0.0
+        self.overruns = 0  # hops that took longer to analyze than to arrive
+        self.last_compute_s = 0.0
+        self.max_compute_s = 0.0
+
+    @property
+    def bands(self) -> int:
+        return len(self._bins)
+
+    def feed(self, pcm: bytes, *, arrived_at: float) -> List[AudioFeatures]:
+        """Features for every hop completed by `pcm` (a partial hop is kept)."""
+        data = self._pend + bytes(pcm)
+        step = 2 * self.hop
+        count = len(data) // step
+        out: List[AudioFeatures] = []
+        for i in range(count):
+            start = time.perf_counter()
+            out.append(self._hop(data[i * step : (i + 1) * step], arrived_at))
+            dt = time.perf_counter() - start
+            self.hops += 1
+            self.compute_s_sum += dt
+            self.last_compute_s = dt
+            if dt > self.hop_s:
+                self.overruns += 1
+            if dt > self.max_compute_s:
+                self.max_compute_s = dt
+        self._pend = data[count * step :]
+        return out
+
+    def _hop(self, raw: bytes, arrived_at: float) -> AudioFeatures:
+        n, hop = self.fft_size, self.hop
+        if self.use_numpy:
+            x = np.frombuffer(raw, dtype="<i2").astype(np.float64) / 32768.0
+            self._buf = np.concatenate((self._buf[hop:], x))
+            spec = np.fft.rfft(self._buf * self._window)
+            power = spec.real * spec.real + spec.imag * spec.imag
+            energies = [float(power[lo:hi].sum()) for lo, hi in self._bins]
+            sumsq = float(np.dot(x, x))
+        else:
+            pcm = array("h")
+            pcm.frombytes(raw)
+            x = [s / 32768.0 for s in pcm]
+            self._buf = self._buf[hop:] + x
+            power = self._fft_power([b * w for b, w in zip(self._buf, self._window)])
+            energies = [sum(power[lo:hi]) for lo, hi in self._bins]
+            sumsq = sum(s * s for s in x)
+        self.samples += hop
+        t = float(self.samples) / float(self.sample_rate_hz)
+
+        bands: List[float] = []
+        flux = 0.0
+        for i, e in enumerate(energies):
+            amp = math.sqrt(e) / n
+            self._band_peak[i] = max(amp, self._band_peak[i] * self._decay, _PEAK_FLOOR)
+            bands.append(amp / self._band_peak[i])
+            log_e = math.log10(1e-12 + e)
+            flux += max(0.0, log_e - self._prev_log[i])
+            self._prev_log[i] = log_e
+
+        rms = math.sqrt(sumsq / hop)
+        self._level_peak = max(rms, self._level_peak * self._decay, _PEAK_FLOOR)
+
+        onset = False
+        hist = self._flux_hist
+        if len(hist) >= 8:
+            mean = sum(hist) / len(hist)
+            std = math.sqrt(sum((f - mean) ** 2 for f in hist) / len(hist))
+            onset = (
+                flux > mean + self._onset_k * std
+                and flux > 0.1
+                and t - self._last_onset_t >= self._onset_min_interval_s
+            )
+        hist.append(flux)
+        if onset:
+            self._last_onset_t = t
+
+        return AudioFeatures(
+            t=t,
+            captured_at=float(arrived_at),
+            level=rms / self._level_peak,
+            bands=tuple(bands),
+            flux=flux,
+            onset=onset,
+        )
+
+    def _fft_power(self, values: List[float]) -> List[float]:
+        """|X[k]|^2 for k <= n/2 (iterative radix-2 FFT, real input)."""
+        n = self.fft_size
+        re = [values[j] for j in self._bitrev]
+        im = [0.0] * n
+        tw = self._twiddle
+        size = 2
+        while size <= n:
+            half = size // 2
+            stride = n // size
+            for start in range(0, n, size):
+                for k in range(half):
+                    wr, wi = tw[k * stride]
+                    a = start + k
+                    b = a + half
+                    tr = wr * re[b] - wi * im[b]
+                    ti = wr * im[b] + wi * re[b]
+                    re[b] = re[a] - tr
+                    im[b] = im[a] - ti
+                    re[a] += tr
+                    im[a] += ti
+            size *= 2
+        return [re[k] * re[k] + im[k] * im[k] for k in range(n // 2 + 1)]
+
+
+class PcmSource:
+    """Mono s16le PCM arriving in real time; `read()` returns None at the end."""
+
+    sample_rate_hz: int = 44100
+    samples_dropped: int = 0
+
+    async def read(self) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+
+class _FileSource(PcmSource):
+    """An audio file played at real-time speed (WAV directly, else ffmpeg)."""
+
+    def __init__(self, path: str, *, sample_rate_hz: int, prefer_ffmpeg: bool) -> None:
+        self._stream = PcmStream(
+            path,
+            sample_rate_hz=int(sample_rate_hz),
+            prefer_ffmpeg=prefer_ffmpeg,
+            chunk_frames=max(64, int(sample_rate_hz) // 100),
+        )
+        self.sample_rate_hz = int(self._stream.sample_rate_hz)
+        self._chunks = self._stream.chunks()
+        self._start: Optional[float] = None
+        self._frames = 0
+
+    async def read(self) -> Optional[bytes]:
+        if self._start is None:
+            self._start = time.monotonic()
+        due = self._start + float(self._frames) / float(self.sample_rate_hz)
+        delay = due - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        chunk = await asyncio.to_thread(next, self._chunks, None)
+        if chunk is None:
+            return None
+        self._frames += len(chunk)
+        return chunk.tobytes()
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._stream.close)
+
+
+class _FifoSource(PcmSource):
+    """Raw s16le mono from a named pipe (e.g. `ffmpeg ... -f s16le /tmp/pcm`)."""
+
+    def __init__(self, path: str, *, sample_rate_hz: int) -> None:
+        self.path = str(path)
+        self.sample_rate_hz = int(sample_rate_hz)
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._transport: Any = None
+
+    async def _open(self) -> asyncio.StreamReader:
+        # O_NONBLOCK: opening a FIFO for reading must not wait for a writer.
+        fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        self._transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(fd, "rb", 0)
+        )
+        return reader
+
+    async def read(self) -> Optional[bytes]:
+        if self._reader is None:
+            self._reader = await self._open()
+        data = await self._reader.read(4096)
+        return data or None
+
+    async def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+
+class _UdpProtocol(asyncio.DatagramProtocol):
+    def __init__(self, source: "_UdpSource") -> None:
+        self.source = source
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        q = self.source.queue
+        if q.full():
+            # Bounded latency: drop the oldest datagram rather than queue up.
+            old = q.get_nowait()
+            self.source.samples_dropped += len(old or b"") // 2
+        q.put_nowait(bytes(data))
+
+
+class _UdpSource(PcmSource):
+    """Raw s16le mono datagrams (e.g. `ffmpeg -re ... -f s16le udp://host:port`)."""
+
+    def __init__(
+        self, *, host: str, port: int, sample_rate_hz: int, max_backlog_s: float
+    ) -> None:
+        self.host = str(host)
+        self.port = int(port)
+        self.sample_rate_hz = int(sample_rate_hz)
+        # Assuming ~1 KiB datagrams; the queue holds at most max_backlog_s.
+        slots = int(max_backlog_s * self.sample_rate_hz * 2 / 1024)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max(4, slots))
+        self._transport: Any = None
+
+    async def read(self) -> Optional[bytes]:
+        if self._transport is None:
+            loop = asyncio.get_running_loop()
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _UdpProtocol(self), local_addr=(self.host, self.port)
+            )
+        return await self.queue.get()
+
+    async def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+
+def open_pcm_source(
+    kind: str,
+    *,
+    path: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: int = 7777,
+    sample_rate_hz: int = 44100,
+    prefer_ffmpeg: bool = True,
+    max_backlog_s: float = 0.1,
+) -> PcmSource:
+    """`kind` is "file", "fifo" or "udp" (fifo/udp carry raw s16le mono)."""
+    k = str(kind or "").strip().lower()
+    if k in ("file", "fifo") and not path:
+        raise ValueError(f"{k} source requires a path")
+    if k == "file":
+        try:
+            return _FileSource(
+                str(path), sample_rate_hz=sample_rate_hz, prefer_ffmpeg=prefer_ffmpeg
+            )
+        except AudioAnalyzeError as e:
+            raise ValueError(str(e))
+    if k == "fifo":
+        return _FifoSource(str(path), sample_rate_hz=sample_rate_hz)
+    if k == "udp":
+        return _UdpSource(
+            host=host,
+            port=port,
+            sample_rate_hz=sample_rate_hz,
+            max_backlog_s=float(max_backlog_s),
+        )
+    raise ValueError(f"Unknown audio source: {kind!r} (expected file, fifo or udp)")
+
+
+class AudioReactive:
+    """
+    Background analysis of a `PcmSource`, applied to a pattern once per frame.
+
+    `mapping` maps a param name (or "brightness" for the frame brightness) to
+    {"feature", "min", "max"}; the feature ("level", "bandN", "onset" or
+    "pulse", all 0..1) is scaled into [min, max]. Every frame also gets the
+    raw features as `params["audio"]`.
+    """
+
+    def __init__(
+        self,
+        source: PcmSource,
+        *,
+        hop: int = 512,
+        fft_size: int = 1024,
+        bands_hz: Tuple[float, ...] = DEFAULT_BANDS_HZ,
+        mapping: Optional[Dict[str, Dict[str, Any]]] = None,
+        backend: str = "numpy",
+    ) -> None:
+        self.source = source
+        self.analyzer = BandAnalyzer(
+            sample_rate_hz=source.sample_rate_hz,
+            hop=hop,
+            fft_size=fft_size,
+            bands_hz=tuple(bands_hz),
+            backend=backend,
+        )
+        self.mapping = self._check_mapping(
+            DEFAULT_MAPPING if mapping is None else mapping
+        )
+        self.latest: Optional[AudioFeatures] = None
+        self.ended = False
+        self._onset_pending = False
+        self._last_onset_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _check_mapping(
+        self, mapping: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Tuple[str, float, float]]:
+        names = {"level", "onset", "pulse"}
+        names.update(f"band{i}" for i in range(self.analyzer.bands))
+        out: Dict[str, Tuple[str, float, float]] = {}
+        for target, spec in dict(mapping or {}).items():
+            spec = dict(spec or {})
+            feature = str(spec.get("feature") or "level")
+            if feature not in names:
+                raise ValueError(
+                    f"Unknown audio feature {feature!r} for {target!r} "
+                    f"(expected one of: {', '.join(sorted(names))})"
+                )
+            out[str(target)] = (
+                feature,
+                float(spec.get("min", 0.0)),
+                float(spec.get("max", 1.0)),
+            )
+        return out
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._pump(), name="audio_reactive")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                pass
+        await self.source.close()
+
+    async def _pump(self) -> None:
+        try:
+            while True:
+                data = await self.source.read()
+                if data is None:
+                    break
+                arrived_at = time.monotonic()
+                if self.analyzer.use_numpy:
+                    feats = self.analyzer.feed(data, arrived_at=arrived_at)
+                else:
+                    # The scalar FFT takes milliseconds; keep it off the loop.
+                    feats = await asyncio.to_thread(
+                        self.analyzer.feed, data, arrived_at=arrived_at
+                    )
+                if not feats:
+                    continue
+                if any(f.onset for f in feats):
+                    self._onset_pending = True
+                    self._last_onset_at = arrived_at
+                self.latest = feats[-1]
+        finally:
+            self.latest = None
+            self.ended = True
+
+    def _feature(
+        self, feats: AudioFeatures, name: str, onset: bool, now: float
+    ) -> float:
+        if name == "level":
+            return float(feats.level)
+        if name == "onset":
+            return 1.0 if onset else 0.0
+        if name == "pulse":
+            if self._last_onset_at is None:
+                return 0.0
+            return math.exp(-max(0.0, now - self._last_onset_at) / _PULSE_DECAY_S)
+        return float(feats.bands[int(name[4:])])
+
+    def apply(self, pat: Any, brightness: int) -> Tuple[int, Optional[AudioFeatures]]:
+        """
+        Write the latest features into `pat.params` and return the frame
+        brightness plus the features used (None before the first hop).
+        """
+        feats = self.latest
+        if feats is None:
+            return int(brightness), None
+        onset, self._onset_pending = self._onset_pending or feats.onset, False
+        now = time.monotonic()
+        params = pat.params
+        audio = feats.as_dict()
+        audio["onset"] = onset
+        params["audio"] = audio
+        out_bri = int(brightness)
+        for target, (feature, lo, hi) in self.mapping.items():
+            value = lo + (hi - lo) * self._feature(feats, feature, onset, now)
+            if target == "brightness":
+                out_bri = max(0, min(255, int(round(brightness * value))))
+            else:
+                params[target] = value
+        return out_bri, feats
+
+    def status(self) -> Dict[str, Any]:
+        a = self.analyzer
+        return {
+            "sample_rate_hz": int(a.sample_rate_hz),
+            "hop": int(a.hop),
+            "hop_s": float(a.hop_s),
+            "fft_size": int(a.fft_size),
+            "ended": bool(self.ended),
+            "latest": self.latest.as_dict() if self.latest is not None else None,
+        }
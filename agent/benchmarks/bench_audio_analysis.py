@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import wave
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Allow `python benchmarks/bench_audio_analysis.py` from the agent directory.
+AGENT_DIR = Path(__file__).resolve().parents[1]
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+from audio_analyzer import analyze_beats, extract_waveform  # noqa: E402
+
+
+def _write_synthetic_wav(
+    path: Path, *, duration_s: float, sample_rate_hz: int, channels: int, bpm: float
+) -> None:
+    """Noise bed with a loud click on every beat (different per channel)."""
+    rng = random.Random(1234)
+    n = int(duration_s * sample_rate_hz)
+    noise = array("h", (rng.randint(-2500, 2500) for _ in range(4096)))
+    samples = array("h", noise * (n * channels // len(noise) + 1))
+    del samples[n * channels :]
+    click = int(0.02 * sample_rate_hz)
+    beat = 60.0 / float(bpm)
+    t = 0.0
+    while t < duration_s:
+        start = int(t * sample_rate_hz)
+        for i in range(start, min(n, start + click)):
+            for c in range(channels):
+                samples[i * channels + c] = 26000 if c % 2 == 0 else -24000
+        t += beat
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(int(channels))
+        wf.setsampwidth(2)
+        wf.setframerate(int(sample_rate_hz))
+        wf.writeframes(samples.tobytes())
+
+
+def _time_s(fn: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / max(1, repeat)
+
+
+def _peak_mb(fn: Callable[[], object]) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def run(
+    durations: List[float], *, channels: int, points: int, repeat: int
+) -> List[Dict[str, float]]:
+    rows: List[Dict[str, float]] = []
+    with tempfile.TemporaryDirectory(prefix="wsa_bench_audio_") as tmp:
+        for duration_s in durations:
+            wav = Path(tmp) / f"synthetic_{int(duration_s)}s.wav"
+            _write_synthetic_wav(
+                wav,
+                duration_s=duration_s,
+                sample_rate_hz=44100,
+                channels=channels,
+                bpm=124.0,
+            )
+            beats = {
+                b: analyze_beats(audio_path=str(wav), backend=b)
+                for b in ("python", "numpy")
+            }
+            waves = {
+                b: extract_waveform(audio_path=str(wav), points=points, backend=b)
+                for b in ("python", "numpy")
+            }
+            if beats["python"] != beats["numpy"] or waves["python"] != waves["numpy"]:
+                raise SystemExit(f"backends disagree for {duration_s:.0f}s input")
+            rows.append(
+                {
+                    "duration_s": float(duration_s),
+                    "beats_python_s": _time_s(
+                        lambda: analyze_beats(audio_path=str(wav), backend="python"),
+                        repeat,
+                    ),
+                    "beats_numpy_s": _time_s(
+                        lambda: analyze_beats(audio_path=str(wav), backend="numpy"),
+                        repeat,
+                    ),
+                    "waveform_python_s": _time_s(
+                        lambda: extract_waveform(
+                            audio_path=str(wav), points=points, backend="python"
+                        ),
+                        repeat,
+                    ),
+                    "waveform_numpy_s": _time_s(
+                        lambda: extract_waveform(
+                            audio_path=str(wav), points=points, backend="numpy"
+                        ),
+                        repeat,
+                    ),
+                    # PCM is streamed in chunks: flat in the track length.
+                    "numpy_peak_mb": _peak_mb(
+                        lambda: analyze_beats(audio_path=str(wav), backend="numpy")
+                    ),
+                }
+            )
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description="analyze_beats / extract_waveform: scalar loops vs NumPy on synthetic WAVs"
+    )
+    ap.add_argument("--durations", default="30,120,240")
+    ap.add_argument("--channels", type=int, default=2)
+    ap.add_argument("--points", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=1)
+    args = ap.parse_args()
+
+    durations = [float(x) for x in str(args.durations).split(",") if x.strip()]
+    rows = run(
+        durations,
+        channels=max(1, int(args.channels)),
+        points=int(args.points),
+        repeat=int(args.repeat),
+    )
+    cols = [
+        "duration_s",
+        "beats_python_s",
+        "beats_numpy_s",
+        "waveform_python_s",
+        "waveform_numpy_s",
+        "numpy_peak_mb",
+    ]
+    print("  ".join(f"{c:>18}" for c in cols))
+    for row in rows:
+        print("  ".join(f"{row[c]:>18.3f}" for c in cols))
+
+
+if __name__ == "__main__":
+    main()
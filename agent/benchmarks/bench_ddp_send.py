@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import socket
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Allow `python benchmarks/bench_ddp_send.py` from the agent directory.
+AGENT_DIR = Path(__file__).resolve().parents[1]
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+from ddp_sender import DDPAsyncSender, DDPConfig, DDPSender  # noqa: E402
+
+
+def _legacy_send_frame(
+    sock: socket.socket, cfg: DDPConfig, rgb: bytes, seq: int
+) -> None:
+    """The pre-template sender: struct.pack + header + bytes(chunk) per packet."""
+    data = memoryview(rgb)
+    total = len(data)
+    max_len = max(1, int(cfg.max_pixels_per_packet)) * 3
+    packets, rem = divmod(total, max_len)
+    if rem == 0:
+        packets -= 1
+    for i in range(packets + 1):
+        start = i * max_len
+        end = min(total, start + max_len)
+        chunk = data[start:end]
+        flags = cfg.ver1_flag | (cfg.push_flag if i == packets else 0)
+        header = struct.pack(
+            "!BBBBLH",
+            flags & 0xFF,
+            seq & 0xFF,
+            cfg.datatype_rgb & 0xFF,
+            cfg.destination_id & 0xFF,
+            start,
+            len(chunk) & 0xFFFF,
+        )
+        sock.sendto(header + bytes(chunk), (cfg.host, int(cfg.port)))
+
+
+def _rate(fn: Callable[[], None], frames: int) -> float:
+    start = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    return frames / max(1e-9, time.perf_counter() - start)
+
+
+async def _async_rate(sender: DDPAsyncSender, frame: bytes, frames: int) -> float:
+    start = time.perf_counter()
+    for _ in range(frames):
+        await sender.send_frame(frame)
+    return frames / max(1e-9, time.perf_counter() - start)
+
+
+def run(pixels: int, frames: int, max_pixels_per_packet: int) -> List[Dict[str, float]]:
+    # A bound receiver that never reads: the kernel drops overflow, and the
+    # senders never see ICMP errors.
+    rx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    rx.bind(("127.0.0.1", 0))
+    cfg = DDPConfig(
+        host="127.0.0.1",
+        port=rx.getsockname()[1],
+        max_pixels_per_packet=max_pixels_per_packet,
+    )
+    frame = bytes(i & 0xFF for i in range(pixels * 3))
+    max_len = max_pixels_per_packet * 3
+    packets = (len(frame) + max_len - 1) // max_len
+
+    rows: List[Dict[str, float]] = []
+
+    legacy_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    fps = _rate(lambda: _legacy_send_frame(legacy_sock, cfg, frame, 1), frames)
+    legacy_sock.close()
+    rows.append({"variant": 0, "frames_per_s": fps, "packets_per_s": fps * packets})
+
+    sync = DDPSender(cfg)
+    fps = _rate(lambda: sync.send_frame(frame), frames)
+    sync.close()
+    rows.append({"variant": 1, "frames_per_s": fps, "packets_per_s": fps * packets})
+
+    async def _run_async() -> float:
+        sender = DDPAsyncSender(cfg)
+        try:
+            return await _async_rate(sender, frame, frames)
+        finally:
+            sender.close()
+
+    fps = asyncio.run(_run_async())
+    rows.append({"variant": 2, "frames_per_s": fps, "packets_per_s": fps * packets})
+    rx.close()
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="DDP loopback send throughput")
+    ap.add_argument("--pixels", type=int, default=5000)
+    ap.add_argument("--frames", type=int, default=2000)
+    ap.add_argument("--max-pixels-per-packet", type=int, default=480)
+    args = ap.parse_args()
+
+    names = ["legacy (pack + concat + sendto)", "DDPSender", "DDPAsyncSender"]
+    rows = run(int(args.pixels), int(args.frames), int(args.max_pixels_per_packet))
+    print(f"{'sender':<34}{'frames/s':>12}{'packets/s':>14}")
+    for row in rows:
+        print(
+            f"{names[int(row['variant'])]:<34}"
+            f"{row['frames_per_s']:>12.0f}{row['packets_per_s']:>14.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Allow `python benchmarks/bench_fseq_parallel.py` from the agent directory.
+AGENT_DIR = Path(__file__).resolve().parents[1]
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+from geometry import TreeGeometry  # noqa: E402
+from services.blocking_service import ProcessService  # noqa: E402
+from utils.fseq_render import render_fseq, render_fseq_parallel  # noqa: E402
+
+
+async def run(
+    *, pixels: int, seconds: float, step_ms: int, workers: int, compression: str
+) -> None:
+    runs = 20
+    geom = TreeGeometry(
+        runs=runs,
+        pixels_per_run=max(1, pixels // runs),
+        segment_len=max(1, pixels // runs),
+        segments_per_run=1,
+    )
+    patterns = ["rainbow_cycle", "plasma", "candy_spiral", "sparkle"]
+    steps = [
+        {"type": "ddp", "pattern": p, "duration_s": seconds / len(patterns)}
+        for p in patterns
+    ]
+    kwargs = dict(
+        steps=steps,
+        led_count=pixels,
+        channel_start=1,
+        channels_total=pixels * 3,
+        step_ms=step_ms,
+        default_bri=128,
+        geometry=geom,
+        segment_layout=None,
+        max_bri=255,
+        fseq_version=1 if compression == "v1" else 2,
+        compression="none" if compression == "v1" else compression,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        render_fseq(out_path=str(Path(tmp) / "serial.fseq"), **kwargs)
+        serial_s = time.perf_counter() - start
+        print(f"{'serial':<12}{serial_s:>8.2f} s")
+
+        pool = ProcessService(max_workers=workers, max_queue=workers)
+        try:
+            start = time.perf_counter()
+            await render_fseq_parallel(
+                pool, out_path=str(Path(tmp) / "parallel.fseq"), **kwargs
+            )
+            parallel_s = time.perf_counter() - start
+        finally:
+            await pool.shutdown()
+        print(
+            f"{f'{workers} workers':<12}{parallel_s:>8.2f} s"
+            f"{serial_s / max(1e-9, parallel_s):>8.2f}x"
+        )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Serial vs process-pool fseq export")
+    ap.add_argument("--pixels", type=int, default=2000)
+    ap.add_argument("--seconds", type=float, default=60.0)
+    ap.add_argument("--step-ms", type=int, default=25)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--compression", default="zstd", help="v1, none, zlib or zstd")
+    args = ap.parse_args()
+    asyncio.run(
+        run(
+            pixels=int(args.pixels),
+            seconds=float(args.seconds),
+            step_ms=int(args.step_ms),
+            workers=int(args.workers),
+            compression=str(args.compression),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
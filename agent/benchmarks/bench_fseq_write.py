@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Allow `python benchmarks/bench_fseq_write.py` from the agent directory.
+AGENT_DIR = Path(__file__).resolve().parents[1]
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+from fseq import (  # noqa: E402
+    fseq_v2_compression_available,
+    write_fseq_v1_file,
+    write_fseq_v2_file,
+)
+from geometry import TreeGeometry  # noqa: E402
+from patterns import PatternFactory  # noqa: E402
+
+
+def _render_frames(pixels: int, frames: int, pattern: str, step_ms: int) -> List[bytes]:
+    runs = 20
+    geom = TreeGeometry(
+        runs=runs,
+        pixels_per_run=max(1, pixels // runs),
+        segment_len=max(1, pixels // runs),
+        segments_per_run=1,
+    )
+    pat = PatternFactory(led_count=pixels, geometry=geom).create(pattern)
+    return [
+        pat.frame(t=i * step_ms / 1000.0, frame_idx=i, brightness=128)
+        for i in range(frames)
+    ]
+
+
+def run(
+    *, pixels: int, frames: int, pattern: str, step_ms: int, frames_per_block: int
+) -> List[Dict[str, object]]:
+    data = _render_frames(pixels, frames, pattern, step_ms)
+    channels = pixels * 3
+    raw_mb = channels * frames / 1e6
+    variants = [("v1", "none"), ("v2", "none"), ("v2", "zlib"), ("v2", "zstd")]
+    rows: List[Dict[str, object]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for version, compression in variants:
+            if not fseq_v2_compression_available(compression):
+                continue
+            out = str(Path(tmp) / f"{version}_{compression}.fseq")
+            start = time.perf_counter()
+            if version == "v1":
+                res = write_fseq_v1_file(
+                    out_path=out,
+                    channel_count=channels,
+                    num_frames=frames,
+                    step_ms=step_ms,
+                    frame_generator=iter(data),
+                )
+            else:
+                res = write_fseq_v2_file(
+                    out_path=out,
+                    channel_count=channels,
+                    num_frames=frames,
+                    step_ms=step_ms,
+                    frame_generator=iter(data),
+                    compression=compression,
+                    frames_per_block=frames_per_block,
+                )
+            elapsed = time.perf_counter() - start
+            size = Path(out).stat().st_size
+            rows.append(
+                {
+                    "variant": f"{version} {res.compression}",
+                    "size_mb": size / 1e6,
+                    "ratio": (channels * frames) / max(1, size),
+                    "write_mb_s": raw_mb / max(1e-9, elapsed),
+                }
+            )
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="FSEQ v1 vs v2 file size and write speed")
+    ap.add_argument("--pixels", type=int, default=3000)
+    ap.add_argument("--frames", type=int, default=1200)
+    ap.add_argument("--pattern", default="rainbow_cycle")
+    ap.add_argument("--step-ms", type=int, default=25)
+    ap.add_argument("--frames-per-block", type=int, default=0)
+    args = ap.parse_args()
+
+    rows = run(
+        pixels=int(args.pixels),
+        frames=int(args.frames),
+        pattern=str(args.pattern),
+        step_ms=int(args.step_ms),
+        frames_per_block=int(args.frames_per_block),
+    )
+    print(f"{'variant':<12}{'size MB':>10}{'ratio':>8}{'write MB/s':>12}")
+    for row in rows:
+        print(
+            f"{row['variant']:<12}{row['size_mb']:>10.2f}"
+            f"{row['ratio']:>8.1f}{row['write_mb_s']:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Allow `python benchmarks/bench_pixel_tables.py` from the agent directory.
+AGENT_DIR = Path(__file__).resolve().parents[1]
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+from geometry import TreeGeometry  # noqa: E402
+from patterns import (  # noqa: E402
+    PatternFactory,
+    RenderContext,
+    numpy_backend_available,
+)
+from segment_layout import SegmentLayout, SegmentRange  # noqa: E402
+
+
+def _quarters(led_count: int) -> SegmentLayout:
+    q = led_count // 4
+    segs = [
+        SegmentRange(id=i, start=i * q, stop=(led_count if i == 3 else (i + 1) * q))
+        for i in range(4)
+    ]
+    return SegmentLayout(led_count=led_count, segments=segs, kind="quarters")
+
+
+def _legacy_lookups(ctx: RenderContext) -> float:
+    """Per-pixel lookups as patterns did them before RenderContext.tables."""
+    segs = ctx.segment_layout.segments if ctx.segment_layout else []
+    acc = 0.0
+    for i in range(ctx.led_count):
+        ang, y, _ = ctx.geometry.coords(i)
+        sid = None
+        for s in segs:  # SegmentLayout.segment_for_index linear scan
+            if s.start <= i < s.stop:
+                sid = s.id
+                break
+        order = {s.id: k for k, s in enumerate(segs)}.get(sid)  # id_to_order()
+        acc += ang + y + (order or 0)
+    return acc
+
+
+def _table_lookups(ctx: RenderContext) -> float:
+    tb = ctx.tables
+    acc = 0.0
+    for i in range(ctx.led_count):
+        acc += tb.angle[i] + tb.y[i] + tb.seg_order[i]
+    return acc
+
+
+def _time_ms(fn: Callable[[], object], repeat: int) -> float:
+    fn()  # warm caches (tables, NumPy index arrays)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000.0 / max(1, repeat)
+
+
+def run(
+    sizes: List[int], *, pattern: str, repeat: int
+) -> List[Dict[str, Optional[float]]]:
+    rows: List[Dict[str, Optional[float]]] = []
+    for n in sizes:
+        runs = 20
+        geom = TreeGeometry(
+            runs=runs,
+            pixels_per_run=n // runs,
+            segment_len=n // runs,
+            segments_per_run=1,
+        )
+        layout = _quarters(n)
+        factory = PatternFactory(led_count=n, geometry=geom, segment_layout=layout)
+        ctx = RenderContext(
+            led_count=n,
+            geometry=geom,
+            geometry_enabled=geom.enabled_for(n),
+            segment_layout=layout,
+        )
+
+        build_start = time.perf_counter()
+        _ = ctx.tables
+        build_ms = (time.perf_counter() - build_start) * 1000.0
+
+        pat = factory.create(pattern)
+        row: Dict[str, Optional[float]] = {
+            "pixels": float(n),
+            "tables_build_ms": build_ms,
+            "lookups_legacy_ms": _time_ms(lambda: _legacy_lookups(ctx), repeat),
+            "lookups_tables_ms": _time_ms(lambda: _table_lookups(ctx), repeat),
+            "frame_python_ms": _time_ms(
+                lambda: pat.frame(t=1.0, frame_idx=40, brightness=128), repeat
+            ),
+            "frame_numpy_ms": None,
+        }
+        if numpy_backend_available():
+            vec = factory.create(pattern, backend="numpy")
+            row["frame_numpy_ms"] = _time_ms(
+                lambda: vec.frame(t=1.0, frame_idx=40, brightness=128), repeat
+            )
+        rows.append(row)
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description="Per-frame pixel lookup cost: legacy per-pixel calls vs RenderContext.tables"
+    )
+    ap.add_argument("--sizes", default="1000,5000,20000")
+    ap.add_argument("--pattern", default="quad_spiral")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    sizes = [int(x) for x in str(args.sizes).split(",") if x.strip()]
+    rows = run(sizes, pattern=str(args.pattern), repeat=int(args.repeat))
+    cols = [
+        "pixels",
+        "tables_build_ms",
+        "lookups_legacy_ms",
+        "lookups_tables_ms",
+        "frame_python_ms",
+        "frame_numpy_ms",
+    ]
+    print("  ".join(f"{c:>18}" for c in cols))
+    for row in rows:
+        cells = []
+        for c in cols:
+            v = row.get(c)
+            cells.append(f"{'-':>18}" if v is None else f"{v:>18.2f}")
+        print("  ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Allow `python benchmarks/bench_sequence_preview.py` from the agent directory.
+AGENT_DIR = Path(__file__).resolve().parents[1]
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+from geometry import TreeGeometry  # noqa: E402
+from patterns import PatternFactory  # noqa: E402
+from utils.sequence_preview import PreviewRaster  # noqa: E402
+
+
+def _legacy_downsample(rgb: bytes, *, led_count: int, width: int, height: int) -> bytes:
+    """Per-pixel averaging loop the preview used before PreviewRaster (1D row)."""
+    expected = led_count * 3
+    row = bytearray(width * 3)
+    for x in range(width):
+        start = int(x * led_count / width)
+        end = int((x + 1) * led_count / width)
+        if end <= start:
+            end = min(led_count, start + 1)
+        start_b = start * 3
+        end_b = min(expected, end * 3)
+        if start_b >= end_b:
+            continue
+        count = max(1, (end_b - start_b) // 3)
+        r_sum = g_sum = b_sum = 0
+        for idx in range(start_b, end_b, 3):
+            r_sum += rgb[idx]
+            g_sum += rgb[idx + 1]
+            b_sum += rgb[idx + 2]
+        row[x * 3] = int(r_sum / count)
+        row[x * 3 + 1] = int(g_sum / count)
+        row[x * 3 + 2] = int(b_sum / count)
+    return bytes(row) * height
+
+
+def _time_ms(fn: Callable[[], object], repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000.0 / max(1, repeat)
+
+
+def run(
+    sizes: List[int], *, width: int, height: int, pattern: str, repeat: int
+) -> List[Dict[str, float]]:
+    rows: List[Dict[str, float]] = []
+    for n in sizes:
+        runs = 16
+        geom = TreeGeometry(
+            runs=runs,
+            pixels_per_run=n // runs,
+            segment_len=n // runs,
+            segments_per_run=1,
+        )
+        led_count = geom.total_pixels
+        factory = PatternFactory(led_count=led_count, geometry=geom)
+        pat = factory.create(pattern)
+        vec = factory.create(pattern, backend="numpy")
+        rgb = pat.frame(t=1.0, frame_idx=12, brightness=128)
+        raster = PreviewRaster(
+            led_count=led_count, geometry=geom, width=width, height=height
+        )
+        rows.append(
+            {
+                "pixels": float(led_count),
+                "frame_python_ms": _time_ms(
+                    lambda: pat.frame(t=1.0, frame_idx=12, brightness=128), repeat
+                ),
+                "frame_into_numpy_ms": _time_ms(
+                    lambda: vec.frame_into(
+                        raster.source, 0, t=1.0, frame_idx=12, brightness=128
+                    ),
+                    repeat,
+                ),
+                "legacy_downsample_ms": _time_ms(
+                    lambda: _legacy_downsample(
+                        rgb, led_count=led_count, width=width, height=height
+                    ),
+                    repeat,
+                ),
+                "raster_resample_ms": _time_ms(raster.resample, repeat),
+            }
+        )
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description="Per-frame preview cost: pattern render and legacy 1D averaging vs PreviewRaster"
+    )
+    ap.add_argument("--sizes", default="1000,5000,20000")
+    ap.add_argument("--width", type=int, default=120)
+    ap.add_argument("--height", type=int, default=24)
+    ap.add_argument("--pattern", default="rainbow_cycle")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    sizes = [int(x) for x in str(args.sizes).split(",") if x.strip()]
+    rows = run(
+        sizes,
+        width=int(args.width),
+        height=int(args.height),
+        pattern=str(args.pattern),
+        repeat=int(args.repeat),
+    )
+    cols = [
+        "pixels",
+        "frame_python_ms",
+        "frame_into_numpy_ms",
+        "legacy_downsample_ms",
+        "raster_resample_ms",
+    ]
+    print("  ".join(f"{c:>20}" for c in cols))
+    for row in rows:
+        print("  ".join(f"{row[c]:>20.2f}" for c in cols))
+
+
+if __name__ == "__main__":
+    main()
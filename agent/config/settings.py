@@ -194,6 +194,11 @@ class Settings:
     ddp_drop_late_frames: bool
     ddp_backpressure_max_lag_s: float
     ddp_use_cpu_pool: bool
+    ddp_render_ahead_frames: int
+    ddp_delta_send: bool
+    ddp_delta_keepalive_s: float
+    ddp_pacer_spin_ms: float
+    pattern_render_backend: str
 
     # Media previews
     sequence_preview_width: int
@@ -204,6 +209,9 @@ class Settings:
     sequence_preview_cache_max_days: float
     waveform_cache_max_mb: int
     waveform_cache_max_days: float
+    fseq_chunk_cache_enabled: bool
+    fseq_chunk_cache_max_mb: int
+    fseq_chunk_cache_max_days: float
     waveform_points_default: int
 
     # Pixel streaming (for non-WLED controllers like ESPixelStick)
@@ -215,6 +223,11 @@ class Settings:
     pixel_count: int
     pixel_priority: int
     pixel_source_name: str
+    pixel_sync_universe: int
+    pixel_artnet_sync: bool
+    pixel_artnet_sync_host: str
+    pixel_delta_send: bool
+    pixel_delta_keepalive_s: float
 
     # Data dir
     data_dir: str
@@ -617,6 +630,21 @@ def load_settings() -> Settings:
         0.0, _as_float(os.environ.get("DDP_BACKPRESSURE_MAX_LAG_S"), 0.25)
     )
     ddp_use_cpu_pool = _as_bool(os.environ.get("DDP_USE_CPU_POOL"), False)
+    ddp_render_ahead_frames = max(
+        0, min(240, _as_int(os.environ.get("DDP_RENDER_AHEAD_FRAMES"), 0))
+    )
+    ddp_delta_send = _as_bool(os.environ.get("DDP_DELTA_SEND"), False)
+    ddp_delta_keepalive_s = max(
+        0.0, _as_float(os.environ.get("DDP_DELTA_KEEPALIVE_S"), 1.0)
+    )
+    ddp_pacer_spin_ms = max(
+        0.0, min(20.0, _as_float(os.environ.get("DDP_PACER_SPIN_MS"), 2.0))
+    )
+    pattern_render_backend = (
+        _as_str(os.environ.get("PATTERN_RENDER_BACKEND"), default="python").lower()
+    )
+    if pattern_render_backend not in ("python", "numpy"):
+        pattern_render_backend = "python"
 
     sequence_preview_width = max(
         16, _as_int(os.environ.get("SEQUENCE_PREVIEW_WIDTH"), 120)
@@ -642,6 +670,15 @@ def load_settings() -> Settings:
     waveform_cache_max_days = max(
         0.0, _as_float(os.environ.get("WAVEFORM_CACHE_MAX_DAYS"), 7.0)
     )
+    fseq_chunk_cache_enabled = _as_bool(
+        os.environ.get("FSEQ_CHUNK_CACHE_ENABLED"), True
+    )
+    fseq_chunk_cache_max_mb = max(
+        0, _as_int(os.environ.get("FSEQ_CHUNK_CACHE_MAX_MB"), 1024)
+    )
+    fseq_chunk_cache_max_days = max(
+        0.0, _as_float(os.environ.get("FSEQ_CHUNK_CACHE_MAX_DAYS"), 14.0)
+    )
     waveform_points_default = max(
         32, _as_int(os.environ.get("WAVEFORM_POINTS_DEFAULT"), 512)
     )
@@ -749,6 +786,17 @@ def load_settings() -> Settings:
     pixel_source_name = _as_str(
         os.environ.get("PIXEL_SOURCE_NAME"), default=agent_name
     )[:64]
+    pixel_sync_universe = max(
+        0, min(63999, _as_int(os.environ.get("PIXEL_SYNC_UNIVERSE"), 0))
+    )
+    pixel_artnet_sync = _as_bool(os.environ.get("PIXEL_ARTNET_SYNC"), False)
+    pixel_artnet_sync_host = _as_str(
+        os.environ.get("PIXEL_ARTNET_SYNC_HOST"), default=""
+    ).strip()
+    pixel_delta_send = _as_bool(os.environ.get("PIXEL_DELTA_SEND"), False)
+    pixel_delta_keepalive_s = max(
+        0.0, _as_float(os.environ.get("PIXEL_DELTA_KEEPALIVE_S"), 1.0)
+    )
 
     fpp_base_url = _as_str(os.environ.get("FPP_BASE_URL"), default="").rstrip("/")
     fpp_http_timeout_s = max(0.5, _as_float(os.environ.get("FPP_HTTP_TIMEOUT_S"), 2.5))
@@ -916,6 +964,11 @@ def load_settings() -> Settings:
         ddp_drop_late_frames=ddp_drop_late_frames,
         ddp_backpressure_max_lag_s=ddp_backpressure_max_lag_s,
         ddp_use_cpu_pool=ddp_use_cpu_pool,
+        ddp_render_ahead_frames=ddp_render_ahead_frames,
+        ddp_delta_send=ddp_delta_send,
+        ddp_delta_keepalive_s=ddp_delta_keepalive_s,
+        ddp_pacer_spin_ms=ddp_pacer_spin_ms,
+        pattern_render_backend=pattern_render_backend,
         sequence_preview_width=sequence_preview_width,
         sequence_preview_height=sequence_preview_height,
         sequence_preview_fps=sequence_preview_fps,
@@ -924,6 +977,9 @@ def load_settings() -> Settings:
         sequence_preview_cache_max_days=sequence_preview_cache_max_days,
         waveform_cache_max_mb=waveform_cache_max_mb,
         waveform_cache_max_days=waveform_cache_max_days,
+        fseq_chunk_cache_enabled=fseq_chunk_cache_enabled,
+        fseq_chunk_cache_max_mb=fseq_chunk_cache_max_mb,
+        fseq_chunk_cache_max_days=fseq_chunk_cache_max_days,
         waveform_points_default=waveform_points_default,
         pixel_host=pixel_host,
         pixel_port=pixel_port,
@@ -933,6 +989,11 @@ def load_settings() -> Settings:
         pixel_count=pixel_count,
         pixel_priority=pixel_priority,
         pixel_source_name=pixel_source_name,
+        pixel_sync_universe=pixel_sync_universe,
+        pixel_artnet_sync=pixel_artnet_sync,
+        pixel_artnet_sync_host=pixel_artnet_sync_host,
+        pixel_delta_send=pixel_delta_send,
+        pixel_delta_keepalive_s=pixel_delta_keepalive_s,
         data_dir=data_dir,
         database_url=database_url,
         db_migrate_on_startup=db_migrate_on_startup,
@@ -4,8 +4,11 @@ import asyncio
 import socket
 import struct
 import threading
+import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+from delta_send import DeltaTracker
 
 
 @dataclass(frozen=True)
@@ -18,6 +21,95 @@ class DDPConfig:
     ver1_flag: int = 0x40
     push_flag: int = 0x01
     datatype_rgb: int = 0x0B  # RGB, 8-bit
+    # Delta mode: skip packets whose pixels are unchanged since they were last
+    # sent, resending each at least every `keepalive_s`.
+    delta: bool = False
+    keepalive_s: float = 1.0
+
+
+_HEADER = struct.Struct("!BBBBLH")
+_HEADER_LEN = _HEADER.size
+_SEQ_BYTE = 1
+_HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+
+# (header, start, end) for each packet of a frame; only the sequence byte of
+# a header changes between frames.
+_PacketPlan = Tuple[Tuple[bytearray, int, int], ...]
+
+
+def _build_plan(cfg: DDPConfig, total: int, max_len: int) -> _PacketPlan:
+    plan = []
+    for start in range(0, total, max_len):
+        end = min(total, start + max_len)
+        last = end >= total
+        flags = cfg.ver1_flag | (cfg.push_flag if last else 0)
+        header = bytearray(
+            _HEADER.pack(
+                flags & 0xFF,
+                0,
+                cfg.datatype_rgb & 0xFF,
+                cfg.destination_id & 0xFF,
+                start,  # byte offset
+                (end - start) & 0xFFFF,
+            )
+        )
+        plan.append((header, start, end))
+    return tuple(plan)
+
+
+class _PlanCache:
+    """Packet header templates per frame size (a streamer uses one or two)."""
+
+    def __init__(self, cfg: DDPConfig, max_len: int, *, max_sizes: int = 4) -> None:
+        self._cfg = cfg
+        self._max_len = int(max_len)
+        self._max_sizes = max(1, int(max_sizes))
+        self._plans: Dict[int, _PacketPlan] = {}
+
+    def get(self, total: int) -> _PacketPlan:
+        plan = self._plans.get(total)
+        if plan is None:
+            if len(self._plans) >= self._max_sizes:
+                self._plans.clear()
+            plan = _build_plan(self._cfg, total, self._max_len)
+            self._plans[total] = plan
+        return plan
+
+
+class _DeltaFrame:
+    """
+    Last-sent copy of the frame, used to pick which packets of a plan to send.
+
+    If any packet changes, the final (PUSH) packet is always sent as well so
+    the receiver latches the update.
+    """
+
+    def __init__(self, keepalive_s: float) -> None:
+        self.tracker = DeltaTracker(keepalive_s)
+        self._last = bytearray()
+
+    def select(self, plan: _PacketPlan, data: memoryview, now: float) -> List[bool]:
+        total = len(data)
+        if len(self._last) != total:
+            self._last = bytearray(total)
+            self.tracker.reset()
+        last = self._last
+        tracker = self.tracker
+        send = [
+            tracker.should_send(
+                i, same=last[start:end] == data[start:end], length=end - start, now=now
+            )
+            for i, (_, start, end) in enumerate(plan)
+        ]
+        if send and any(send):
+            send[-1] = True
+        for i, (_, start, end) in enumerate(plan):
+            if send[i]:
+                last[start:end] = data[start:end]
+                tracker.sent(i, length=end - start, now=now)
+            else:
+                tracker.skipped(_HEADER_LEN + end - start)
+        return send
 
 
 class DDPSender:
@@ -32,6 +124,10 @@ class DDPSender:
       byte3: destination id
       uint32: offset in bytes
       uint16: data length in bytes
+
+    Headers are prebuilt per frame size with only the sequence byte patched,
+    and each packet goes out as `sendmsg([header, payload view])`, so the
+    payload is never copied in user space.
     """
 
     def __init__(self, cfg: DDPConfig) -> None:
@@ -40,9 +136,21 @@ class DDPSender:
         self.cfg = cfg
         self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
         self._seq = 0
+        self._addr = (self.cfg.host, int(self.cfg.port))
 
         self._max_data_len = max(1, int(cfg.max_pixels_per_packet)) * 3
+        self._plans = _PlanCache(cfg, self._max_data_len)
+        self._delta = _DeltaFrame(cfg.keepalive_s) if cfg.delta else None
+
+    @property
+    def packets_skipped(self) -> int:
+        return self._delta.tracker.packets_skipped if self._delta is not None else 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self._delta.tracker.bytes_saved if self._delta is not None else 0
 
     def close(self) -> None:
         try:
@@ -65,35 +173,31 @@ class DDPSender:
             return
         seq = self._next_seq()
 
-        # Number of packets
-        max_len = self._max_data_len
-        packets, rem = divmod(total, max_len)
-        if rem == 0:
-            packets -= 1  # exactly fits; divmod gave an extra 0 remainder
-
-        for i in range(packets + 1):
-            start = i * max_len
-            end = min(total, start + max_len)
-            chunk = data[start:end]
-            last = i == packets
-            flags = self.cfg.ver1_flag | (self.cfg.push_flag if last else 0)
-            header = struct.pack(
-                "!BBBBLH",
-                flags & 0xFF,
-                seq & 0xFF,
-                self.cfg.datatype_rgb & 0xFF,
-                self.cfg.destination_id & 0xFF,
-                start,  # byte offset
-                len(chunk) & 0xFFFF,
-            )
-            self._sock.sendto(
-                header + bytes(chunk), (self.cfg.host, int(self.cfg.port))
+        addr = self._addr
+        sock = self._sock
+        with self._send_lock:
+            plan = self._plans.get(total)
+            send = (
+                self._delta.select(plan, data, time.monotonic())
+                if self._delta is not None
+                else None
             )
+            for i, (header, start, end) in enumerate(plan):
+                if send is not None and not send[i]:
+                    continue
+                header[_SEQ_BYTE] = seq & 0xFF
+                if _HAS_SENDMSG:
+                    sock.sendmsg((header, data[start:end]), (), 0, addr)
+                else:
+                    sock.sendto(bytes(header) + data[start:end], addr)
 
 
 class DDPAsyncSender:
     """
     Async DDP sender using the event loop's UDP transport helpers.
+
+    Packets are written with non-blocking `sendmsg` straight from the frame
+    buffer; the loop is only awaited when the socket buffer is full.
     """
 
     def __init__(
@@ -108,6 +212,16 @@ class DDPAsyncSender:
         self._seq = 0
         self._addr = (self.cfg.host, int(self.cfg.port))
         self._max_data_len = max(1, int(cfg.max_pixels_per_packet)) * 3
+        self._plans = _PlanCache(cfg, self._max_data_len)
+        self._delta = _DeltaFrame(cfg.keepalive_s) if cfg.delta else None
+
+    @property
+    def packets_skipped(self) -> int:
+        return self._delta.tracker.packets_skipped if self._delta is not None else 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self._delta.tracker.bytes_saved if self._delta is not None else 0
 
     def close(self) -> None:
         try:
@@ -128,24 +242,23 @@ class DDPAsyncSender:
             return
         seq = self._next_seq()
 
-        max_len = self._max_data_len
-        packets, rem = divmod(total, max_len)
-        if rem == 0:
-            packets -= 1
-
-        for i in range(packets + 1):
-            start = i * max_len
-            end = min(total, start + max_len)
+        addr = self._addr
+        sock = self._sock
+        plan = self._plans.get(total)
+        send = (
+            self._delta.select(plan, data, time.monotonic())
+            if self._delta is not None
+            else None
+        )
+        for i, (header, start, end) in enumerate(plan):
+            if send is not None and not send[i]:
+                continue
+            header[_SEQ_BYTE] = seq & 0xFF
             chunk = data[start:end]
-            last = i == packets
-            flags = self.cfg.ver1_flag | (self.cfg.push_flag if last else 0)
-            header = struct.pack(
-                "!BBBBLH",
-                flags & 0xFF,
-                seq & 0xFF,
-                self.cfg.datatype_rgb & 0xFF,
-                self.cfg.destination_id & 0xFF,
-                start,
-                len(chunk) & 0xFFFF,
-            )
-            await self._loop.sock_sendto(self._sock, header + bytes(chunk), self._addr)
+            if _HAS_SENDMSG:
+                try:
+                    sock.sendmsg((header, chunk), (), 0, addr)
+                    continue
+                except (BlockingIOError, InterruptedError):
+                    pass
+            await self._loop.sock_sendto(sock, bytes(header) + chunk, addr)
@@ -4,11 +4,18 @@ import asyncio
 import pickle
 import time
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, Dict, Optional
 
+from audio_reactive import AudioReactive
 from ddp_sender import DDPAsyncSender, DDPConfig
+from frame_pacer import FramePacer, JitterHistogram
+from frame_pool import FramePool
+from fseq import FSEQReader
 from geometry import TreeGeometry
 from patterns import PatternFactory
+from preview_stream import FrameTap
+from render_ahead import FrameRing, render_ahead_worker
 from segment_layout import fetch_segment_layout_async
 from services.blocking_service import BlockingQueueFull
 from utils.blocking import run_cpu_blocking
@@ -22,6 +29,8 @@ class StreamStatus:
     fps: float | None
     started_at: float | None
     frames_sent: int
+    # Audio-reactive input of the running stream (`AudioReactive.status()`).
+    audio: Dict[str, Any] | None = None
 
 
 @dataclass
@@ -36,6 +45,30 @@ class StreamMetrics:
     last_frame_compute_s: float | None = None
     last_frame_lag_s: float | None = None
     max_frame_lag_s: float = 0.0
+    # Render-ahead mode (DDP_RENDER_AHEAD_FRAMES > 0 with the CPU pool).
+    lookahead_frames: int = 0
+    ring_underruns_total: int = 0
+    # Delta sending (DDP_DELTA_SEND).
+    packets_skipped_total: int = 0
+    bytes_saved_total: int = 0
+    # Inter-frame send interval for the current/last stream (FramePacer).
+    frame_interval_p50_s: float | None = None
+    frame_interval_p99_s: float | None = None
+    frame_interval_count: int = 0
+    frame_interval_seconds_sum: float = 0.0
+    # Live preview clients tapping the output (GET /v1/ddp/preview).
+    preview_clients: int = 0
+    # Audio-reactive streams (`start(audio=...)`): analysis hops and the time
+    # from a hop's newest sample arriving to the frame using it being sent.
+    audio_hops_total: int = 0
+    audio_hop_overruns_total: int = 0
+    audio_hop_compute_seconds_sum: float = 0.0
+    audio_hop_compute_max_s: float = 0.0
+    audio_samples_dropped_total: int = 0
+    audio_latency_seconds_sum: float = 0.0
+    audio_latency_seconds_count: int = 0
+    audio_latency_max_s: float = 0.0
+    last_audio_latency_s: float | None = None
 
 
 class DDPStreamer:
@@ -52,6 +85,9 @@ class DDPStreamer:
         segment_ids: Optional[list[int]] = None,
         blocking: Any | None = None,
         cpu_pool: Any | None = None,
+        render_backend: str = "python",
+        render_ahead_frames: int = 0,
+        pacer_spin_s: float = 0.002,
     ) -> None:
         self.wled = wled
         self.geometry = geometry
@@ -64,6 +100,9 @@ class DDPStreamer:
         self.segment_ids = list(segment_ids) if segment_ids else None
         self._blocking = blocking
         self._cpu_pool = cpu_pool
+        self.render_backend = str(render_backend or "python")
+        self.render_ahead_frames = max(0, int(render_ahead_frames or 0))
+        self.pacer_spin_s = max(0.0, float(pacer_spin_s))
 
         self._lock = asyncio.Lock()
         self._task: asyncio.Task[None] | None = None
@@ -72,14 +111,53 @@ class DDPStreamer:
             running=False, pattern=None, fps=None, started_at=None, frames_sent=0
         )
         self._metrics = StreamMetrics()
+        self._delta_seen = (0, 0)
+        self._audio: AudioReactive | None = None
+        self._audio_seen = (0, 0, 0.0, 0)
+        self._jitter = JitterHistogram()
+        # Every sent frame is offered to live preview clients (never blocks).
+        self.preview = FrameTap()
 
     async def status(self) -> StreamStatus:
         async with self._lock:
-            return StreamStatus(**self._status.__dict__)
+            out = StreamStatus(**self._status.__dict__)
+            if self._audio is not None:
+                out.audio = self._audio.status()
+            return out
+
+    def _pacer(self, frame_period: float) -> FramePacer:
+        return FramePacer(frame_period, spin_s=self.pacer_spin_s, jitter=self._jitter)
+
+    def _account_delta(self, sender: DDPAsyncSender) -> None:
+        # Sender counters are per stream; fold their growth into the totals.
+        skipped, saved = sender.packets_skipped, sender.bytes_saved
+        seen_skipped, seen_saved = self._delta_seen
+        self._metrics.packets_skipped_total += skipped - seen_skipped
+        self._metrics.bytes_saved_total += saved - seen_saved
+        self._delta_seen = (skipped, saved)
+
+    def _account_audio(self, audio: AudioReactive) -> None:
+        # Same folding as `_account_delta`, for the analyzer's per-stream counters.
+        a = audio.analyzer
+        now = (a.hops, a.overruns, a.compute_s_sum, audio.source.samples_dropped)
+        seen = self._audio_seen
+        m = self._metrics
+        m.audio_hops_total += now[0] - seen[0]
+        m.audio_hop_overruns_total += now[1] - seen[1]
+        m.audio_hop_compute_seconds_sum += now[2] - seen[2]
+        m.audio_samples_dropped_total += now[3] - seen[3]
+        m.audio_hop_compute_max_s = max(m.audio_hop_compute_max_s, a.max_compute_s)
+        self._audio_seen = now
 
     async def metrics(self) -> StreamMetrics:
         async with self._lock:
-            return StreamMetrics(**self._metrics.__dict__)
+            out = StreamMetrics(**self._metrics.__dict__)
+            out.frame_interval_p50_s = self._jitter.quantile(0.5)
+            out.frame_interval_p99_s = self._jitter.quantile(0.99)
+            out.frame_interval_count = int(self._jitter.count)
+            out.frame_interval_seconds_sum = float(self._jitter.sum_s)
+            out.preview_clients = int(self.preview.clients)
+            return out
 
     async def _cleanup_after_run(self) -> None:
         async with self._lock:
@@ -125,7 +203,13 @@ class DDPStreamer:
         duration_s: float = 30.0,
         brightness: int = 128,
         fps: Optional[float] = None,
+        audio: AudioReactive | None = None,
     ) -> StreamStatus:
+        """
+        Stream `pattern` for `duration_s`. With `audio`, the analyzer is
+        started here and its features are applied to the pattern every frame
+        (render-ahead is skipped, frames must see the newest audio).
+        """
         fps_val = float(fps if fps is not None else self.fps_default)
         fps_val = max(1.0, min(self.fps_max, fps_val))
         duration_s = max(0.1, float(duration_s))
@@ -148,9 +232,14 @@ class DDPStreamer:
             raise RuntimeError("WLED returned led_count=0; cannot stream DDP")
 
         factory = PatternFactory(
-            led_count=led_count, geometry=self.geometry, segment_layout=layout
+            led_count=led_count,
+            geometry=self.geometry,
+            segment_layout=layout,
+            backend=self.render_backend,
         )
         pat = factory.create(pattern, params=params or {})
+        if audio is not None:
+            await audio.start()
 
         # Best-effort enter live mode.
         try:
@@ -168,20 +257,151 @@ class DDPStreamer:
             self._status.fps = fps_val
             self._status.started_at = time.time()
             self._status.frames_sent = 0
+            self._audio = audio
             self._metrics.last_frame_compute_s = None
             self._metrics.last_frame_lag_s = None
             self._metrics.max_frame_lag_s = 0.0
+            self._metrics.lookahead_frames = 0
+            self._jitter.reset()
             self._task = asyncio.create_task(
                 self._run_stream(
                     pat=pat,
                     duration_s=duration_s,
                     brightness=brightness,
                     fps_val=fps_val,
+                    audio=audio,
                 ),
                 name="ddp_streamer",
             )
             return StreamStatus(**self._status.__dict__)
 
+    async def play_fseq(
+        self,
+        *,
+        path: str,
+        channel_start: int = 1,
+        led_count: Optional[int] = None,
+        loop: bool = False,
+        brightness: Optional[int] = None,
+    ) -> StreamStatus:
+        """
+        Play a pre-rendered .fseq at its step time (no pattern rendering).
+
+        Sends `led_count * 3` channels starting at 1-based `channel_start`;
+        `led_count` defaults to WLED's reported count.
+        """
+        await self.stop()
+
+        if led_count is None:
+            layout = None
+            try:
+                layout = await fetch_segment_layout_async(
+                    self.wled, segment_ids=self.segment_ids, refresh=True
+                )
+            except Exception:
+                layout = None
+            led_count = int(getattr(layout, "led_count", 0) or 0) if layout else 0
+        if int(led_count) <= 0:
+            raise RuntimeError("led_count is unknown; cannot play fseq over DDP")
+
+        reader = FSEQReader(path)
+        try:
+            length = int(led_count) * 3
+            offset = reader.locate(int(channel_start) - 1, length)
+            if reader.step_ms <= 0 or reader.num_frames <= 0:
+                raise ValueError("FSEQ has no frames")
+        except Exception:
+            reader.close()
+            raise
+
+        try:
+            await self.wled.enter_live_mode()
+            if brightness is not None:
+                await self.wled.set_brightness(max(0, min(255, int(brightness))))
+        except Exception:
+            pass
+
+        self._stop.clear()
+        async with self._lock:
+            self._status.running = True
+            self._status.pattern = f"fseq:{Path(reader.path).name}"
+            self._status.fps = 1000.0 / reader.step_ms
+            self._status.started_at = time.time()
+            self._status.frames_sent = 0
+            self._metrics.last_frame_compute_s = None
+            self._metrics.last_frame_lag_s = None
+            self._metrics.max_frame_lag_s = 0.0
+            self._metrics.lookahead_frames = 0
+            self._jitter.reset()
+            self._task = asyncio.create_task(
+                self._run_fseq(reader=reader, offset=offset, length=length, loop=loop),
+                name="ddp_streamer",
+            )
+            return StreamStatus(**self._status.__dict__)
+
+    async def _run_fseq(
+        self, *, reader: FSEQReader, offset: int, length: int, loop: bool
+    ) -> None:
+        sender: DDPAsyncSender | None = None
+        frame_period = reader.step_ms / 1000.0
+        sent = 0
+        try:
+            sender = DDPAsyncSender(self.ddp_cfg)
+            self._delta_seen = (0, 0)
+            pacer = self._pacer(frame_period)
+            pacer.start()
+            while not self._stop.is_set():
+                now = await pacer.wait_async(self._stop)
+                if self._stop.is_set():
+                    break
+                if self.drop_late_frames:
+                    drops = pacer.skip_late(now, self.max_lag_s)
+                    if drops:
+                        async with self._lock:
+                            self._metrics.frames_dropped_total += int(drops)
+                if pacer.frame >= reader.num_frames:
+                    if not loop:
+                        break
+                    pacer.start()
+                    continue
+                lag_s = pacer.lag(now)
+
+                send_start = time.perf_counter()
+                view = reader.frame(pacer.frame)[offset : offset + length]
+                try:
+                    await sender.send_frame(view)
+                    self.preview.publish(view)
+                finally:
+                    view.release()
+                sent_at = time.monotonic()
+                send_s = max(0.0, time.perf_counter() - send_start)
+                sent += 1
+
+                async with self._lock:
+                    self._status.frames_sent = int(sent)
+                    self._metrics.frames_sent_total += 1
+                    if send_s > frame_period:
+                        self._metrics.frame_overruns_total += 1
+                    self._metrics.frame_compute_seconds_sum += float(send_s)
+                    self._metrics.frame_compute_seconds_count += 1
+                    self._metrics.frame_lag_seconds_sum += float(lag_s)
+                    self._metrics.frame_lag_seconds_count += 1
+                    self._metrics.last_frame_compute_s = float(send_s)
+                    self._metrics.last_frame_lag_s = float(lag_s)
+                    if lag_s > self._metrics.max_frame_lag_s:
+                        self._metrics.max_frame_lag_s = float(lag_s)
+                    self._account_delta(sender)
+                    pacer.tick(sent_at)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            pass
+        finally:
+            if sender is not None:
+                sender.close()
+            reader.close()
+            await self._cleanup_after_run()
+
     async def _run_stream(
         self,
         *,
@@ -189,6 +409,7 @@ class DDPStreamer:
         duration_s: float,
         brightness: int,
         fps_val: float,
+        audio: AudioReactive | None = None,
     ) -> None:
         sender: DDPAsyncSender | None = None
         frame_idx = 0
@@ -199,48 +420,83 @@ class DDPStreamer:
                 pickle.dumps(pat.frame)
             except Exception:
                 compute_pool = self._blocking
+        # In-process renders write straight into a reused buffer; process pool
+        # results come back as fresh bytes anyway.
+        frames: FramePool | None = None
+        if self._cpu_pool is None or compute_pool is not self._cpu_pool:
+            frames = FramePool(int(pat.ctx.led_count) * 3)
         try:
             sender = DDPAsyncSender(self.ddp_cfg)
-            start_ts = time.monotonic()
-            next_frame = start_ts
+            self._delta_seen = (0, 0)
+            self._audio_seen = (0, 0, 0.0, 0)
+            if (
+                self.render_ahead_frames > 0
+                and compute_pool is self._cpu_pool
+                and audio is None
+            ):
+                if await self._run_render_ahead(
+                    sender=sender,
+                    pat=pat,
+                    duration_s=duration_s,
+                    brightness=brightness,
+                    fps_val=fps_val,
+                ):
+                    return
+                # The worker never produced a frame; render in-process instead.
+                compute_pool = self._blocking
+                frames = FramePool(int(pat.ctx.led_count) * 3)
             frame_period = max(0.001, 1.0 / fps_val)
+            pacer = self._pacer(frame_period)
+            start_ts = pacer.start()
             while not self._stop.is_set():
-                now = time.monotonic()
-                if now >= (start_ts + duration_s):
+                now = await pacer.wait_async(self._stop)
+                if self._stop.is_set() or now >= (start_ts + duration_s):
                     break
-                if now < next_frame:
-                    await asyncio.sleep(min(0.01, next_frame - now))
-                    continue
-                lag_s = max(0.0, now - next_frame)
                 dropped = 0
-                if self.drop_late_frames and lag_s > self.max_lag_s:
-                    drops = max(1, int(lag_s / frame_period))
-                    if drops > 0:
-                        dropped = drops
-                        next_frame += float(drops) * frame_period
-                        lag_s = max(0.0, now - next_frame)
+                if self.drop_late_frames:
+                    dropped = pacer.skip_late(now, self.max_lag_s)
+                lag_s = pacer.lag(now)
                 t = now - start_ts
                 frame_start = time.perf_counter()
+                frame_bri, feats = (
+                    audio.apply(pat, brightness)
+                    if audio is not None
+                    else (brightness, None)
+                )
                 try:
-                    rgb = await run_cpu_blocking(
-                        compute_pool,
-                        pat.frame,
-                        t=t,
-                        frame_idx=frame_idx,
-                        brightness=brightness,
-                    )
+                    if frames is not None:
+                        rgb = frames.acquire()
+                        await run_cpu_blocking(
+                            compute_pool,
+                            pat.frame_into,
+                            rgb,
+                            0,
+                            t=t,
+                            frame_idx=frame_idx,
+                            brightness=frame_bri,
+                        )
+                    else:
+                        rgb = await run_cpu_blocking(
+                            compute_pool,
+                            pat.frame,
+                            t=t,
+                            frame_idx=frame_idx,
+                            brightness=frame_bri,
+                        )
                 except BlockingQueueFull:
                     async with self._lock:
                         self._metrics.frames_dropped_total += 1
-                    next_frame += frame_period
+                    pacer.skip()
                     continue
                 except Exception:
                     async with self._lock:
                         self._metrics.frames_dropped_total += 1
-                    next_frame += frame_period
+                    pacer.skip()
                     continue
 
                 await sender.send_frame(rgb)
+                sent_at = time.monotonic()
+                self.preview.publish(rgb, now=sent_at)
                 frame_compute_s = max(0.0, time.perf_counter() - frame_start)
                 overrun = frame_compute_s > frame_period
                 frame_idx += 1
@@ -260,7 +516,17 @@ class DDPStreamer:
                     self._metrics.last_frame_lag_s = float(lag_s)
                     if lag_s > self._metrics.max_frame_lag_s:
                         self._metrics.max_frame_lag_s = float(lag_s)
-                next_frame += frame_period
+                    self._account_delta(sender)
+                    if audio is not None:
+                        self._account_audio(audio)
+                    if feats is not None:
+                        latency_s = max(0.0, sent_at - feats.captured_at)
+                        self._metrics.audio_latency_seconds_sum += latency_s
+                        self._metrics.audio_latency_seconds_count += 1
+                        self._metrics.last_audio_latency_s = latency_s
+                        if latency_s > self._metrics.audio_latency_max_s:
+                            self._metrics.audio_latency_max_s = latency_s
+                    pacer.tick(sent_at)
         except asyncio.CancelledError:
             pass
         except Exception:
@@ -268,4 +534,127 @@ class DDPStreamer:
         finally:
             if sender is not None:
                 sender.close()
+            if audio is not None:
+                await audio.stop()
+                async with self._lock:
+                    self._account_audio(audio)
+                    self._audio = None
             await self._cleanup_after_run()
+
+    async def _run_render_ahead(
+        self,
+        *,
+        sender: DDPAsyncSender,
+        pat: Any,
+        duration_s: float,
+        brightness: int,
+        fps_val: float,
+    ) -> bool:
+        """
+        Stream frames rendered ahead by a CPU pool worker into a shared ring.
+
+        The worker owns the pattern for the whole stream and renders frame `k`
+        for `t = k / fps`; this loop only paces and transmits. Returns False if
+        the worker failed before producing any frame.
+        """
+        frame_period = max(0.001, 1.0 / fps_val)
+        total_frames = int(duration_s / frame_period) + 1
+        ring = FrameRing.create(
+            slots=self.render_ahead_frames, frame_len=int(pat.ctx.led_count) * 3
+        )
+        worker = asyncio.ensure_future(
+            run_cpu_blocking(
+                self._cpu_pool,
+                render_ahead_worker,
+                ring.name,
+                pattern=pat,
+                slots=ring.slots,
+                frame_len=ring.frame_len,
+                frame_period_s=frame_period,
+                brightness=brightness,
+                total_frames=total_frames,
+            )
+        )
+        sent = 0
+        try:
+            # Prefill before starting the clock so the first frames are not late.
+            prefill_deadline = time.monotonic() + 2.0
+            while (
+                ring.rendered < min(ring.slots, total_frames)
+                and not worker.done()
+                and not self._stop.is_set()
+                and time.monotonic() < prefill_deadline
+            ):
+                await asyncio.sleep(0.002)
+            if ring.rendered == 0 and worker.done():
+                return False
+
+            pacer = self._pacer(frame_period)
+            start_ts = pacer.start()
+            underrun_k = -1
+            while not self._stop.is_set() and pacer.frame < total_frames:
+                now = await pacer.wait_async(self._stop)
+                if self._stop.is_set() or now >= (start_ts + duration_s):
+                    break
+                if self.drop_late_frames:
+                    drops = pacer.skip_late(now, self.max_lag_s)
+                    if drops:
+                        ring.set_consumed(pacer.frame)
+                        async with self._lock:
+                            self._metrics.frames_dropped_total += int(drops)
+                        continue
+                lag_s = pacer.lag(now)
+                k = pacer.frame
+
+                view = ring.frame(k)
+                if view is None:
+                    if worker.done():
+                        break
+                    if underrun_k != k:
+                        underrun_k = k
+                        async with self._lock:
+                            self._metrics.ring_underruns_total += 1
+                    await asyncio.sleep(min(0.002, frame_period / 4.0))
+                    continue
+
+                send_start = time.perf_counter()
+                try:
+                    await sender.send_frame(view)
+                    self.preview.publish(view)
+                finally:
+                    try:
+                        view.release()
+                    except Exception:
+                        pass
+                sent_at = time.monotonic()
+                send_s = max(0.0, time.perf_counter() - send_start)
+                ring.set_consumed(k + 1)
+                sent += 1
+                depth = max(0, ring.rendered - (k + 1))
+
+                async with self._lock:
+                    self._status.frames_sent = int(sent)
+                    self._metrics.frames_sent_total += 1
+                    if send_s > frame_period:
+                        self._metrics.frame_overruns_total += 1
+                    self._metrics.frame_compute_seconds_sum += float(send_s)
+                    self._metrics.frame_compute_seconds_count += 1
+                    self._metrics.frame_lag_seconds_sum += float(lag_s)
+                    self._metrics.frame_lag_seconds_count += 1
+                    self._metrics.last_frame_compute_s = float(send_s)
+                    self._metrics.last_frame_lag_s = float(lag_s)
+                    if lag_s > self._metrics.max_frame_lag_s:
+                        self._metrics.max_frame_lag_s = float(lag_s)
+                    self._account_delta(sender)
+                    self._metrics.lookahead_frames = int(depth)
+                    pacer.tick(sent_at)
+            return True
+        finally:
+            ring.request_stop()
+            try:
+                await asyncio.wait_for(asyncio.shield(worker), timeout=2.0)
+            except (asyncio.CancelledError, Exception):
+                pass
+            async with self._lock:
+                self._metrics.lookahead_frames = 0
+            ring.close()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import List
+
+
+class DeltaTracker:
+    """
+    Bookkeeping for opt-in delta sending (skip packets whose payload is unchanged).
+
+    Senders compare each universe/packet payload against what they last sent
+    (keep the stored copy as a `bytearray` on the left of `==`: that is a
+    memcmp, while memoryview equality is element-wise). A packet is still
+    resent once `keepalive_s` has passed since it last went out, or when its
+    length changes. `keepalive_s <= 0` disables the keepalive.
+    """
+
+    def __init__(self, keepalive_s: float = 1.0) -> None:
+        self.keepalive_s = max(0.0, float(keepalive_s))
+        self._sent_at: List[float] = []
+        self._sent_len: List[int] = []
+        self.packets_skipped = 0
+        self.bytes_saved = 0
+
+    def reset(self) -> None:
+        self._sent_at.clear()
+        self._sent_len.clear()
+
+    def should_send(self, slot: int, *, same: bool, length: int, now: float) -> bool:
+        if slot >= len(self._sent_at):
+            return True
+        if not same or self._sent_len[slot] != int(length):
+            return True
+        if self.keepalive_s > 0 and (now - self._sent_at[slot]) >= self.keepalive_s:
+            return True
+        return False
+
+    def sent(self, slot: int, *, length: int, now: float) -> None:
+        while slot >= len(self._sent_at):
+            self._sent_at.append(0.0)
+            self._sent_len.append(-1)
+        self._sent_at[slot] = float(now)
+        self._sent_len[slot] = int(length)
+
+    def skipped(self, nbytes: int) -> None:
+        self.packets_skipped += 1
+        self.bytes_saved += int(nbytes)
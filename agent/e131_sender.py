@@ -3,12 +3,29 @@ from __future__ import annotations
 import socket
 import struct
 import threading
+import time
 import uuid
 from dataclasses import dataclass
+from typing import List
+
+from delta_send import DeltaTracker
 
 
 ACN_PID = b"ASC-E1.17\x00\x00\x00"  # 12 bytes
 
+VECTOR_ROOT_E131_DATA = 0x00000004
+VECTOR_ROOT_E131_EXTENDED = 0x00000008
+VECTOR_E131_DATA_PACKET = 0x00000002
+VECTOR_E131_EXTENDED_SYNCHRONIZATION = 0x00000001
+
+# Byte offsets inside a data packet (root 38 + framing 77 + DMP 10 + slots).
+_SEQ_OFFSET = 111
+_UNIVERSE_OFFSET = 113
+_SLOTS_OFFSET = 126
+_SYNC_PACKET_LEN = 49
+_SYNC_SEQ_OFFSET = 44
+_ZEROS = memoryview(bytes(512))
+
 
 @dataclass(frozen=True)
 class E131Config:
@@ -18,6 +35,13 @@ class E131Config:
     channels_per_universe: int = 510  # 170 RGB pixels
     priority: int = 100
     source_name: str = "wled-show-agent"
+    # Universe synchronization (E1.31-2016): when set, data packets carry this
+    # sync address and receivers hold output until the sync packet arrives.
+    sync_universe: int = 0
+    # Delta mode: skip universes whose DMX data is unchanged, but resend each
+    # one at least every `keepalive_s` (receivers time out after ~2.5 s).
+    delta: bool = False
+    keepalive_s: float = 1.0
 
 
 class E131Sender:
@@ -27,6 +51,10 @@ class E131Sender:
     Uses the E1.31 "Data Packet" (Root Vector 0x00000004) with:
       - Framing Vector 0x00000002
       - DMP Vector 0x02, Address/Data Type 0xA1
+
+    One packet per universe is built once and reused; each frame only patches
+    the sequence byte and the DMX slots. With `sync_universe` set, a
+    synchronization packet (Root Vector 0x00000008) follows every frame.
     """
 
     def __init__(self, cfg: E131Config) -> None:
@@ -43,16 +71,24 @@ class E131Sender:
         if pri < 0 or pri > 200:
             raise ValueError("priority must be 0..200")
 
+        sync = int(cfg.sync_universe)
+        if sync < 0 or sync > 63999:
+            raise ValueError("sync_universe must be 0..63999")
+
         self.cfg = cfg
         self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
         self._seq = 0
+        self._sync_seq = 0
+        self._addr = (cfg.host, int(cfg.port))
 
         self._slots_len = ch
-        # Precompute flags/length values for fixed slot length.
-        self._dmp_flags_len = 0x7000 | (9 + self._slots_len)
-        self._framing_flags_len = 0x7000 | (86 + self._slots_len)
-        self._root_flags_len = 0x7000 | (108 + self._slots_len)
+        # Precompute flags/length values for fixed slot length (PDU lengths
+        # include the DMX start code: 523/600/622 for a full 512-slot universe).
+        self._dmp_flags_len = 0x7000 | (11 + self._slots_len)
+        self._framing_flags_len = 0x7000 | (88 + self._slots_len)
+        self._root_flags_len = 0x7000 | (110 + self._slots_len)
 
         name = (cfg.source_name or "wled-show-agent").encode("utf-8", errors="ignore")[
             :64
@@ -60,6 +96,18 @@ class E131Sender:
         self._source_name = name + (b"\x00" * (64 - len(name)))
         self._cid = uuid.uuid4().bytes  # 16 bytes
 
+        self._packets: List[bytearray] = []
+        self._sync_packet = self._build_sync_packet() if sync else None
+        self._delta = DeltaTracker(cfg.keepalive_s) if cfg.delta else None
+
+    @property
+    def packets_skipped(self) -> int:
+        return self._delta.packets_skipped if self._delta is not None else 0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self._delta.bytes_saved if self._delta is not None else 0
+
     def close(self) -> None:
         try:
             self._sock.close()
@@ -71,6 +119,13 @@ class E131Sender:
             self._seq = (self._seq + 1) % 256
             return self._seq
 
+    def _packets_for(self, universes: int) -> List[bytearray]:
+        pkts = self._packets
+        while len(pkts) < universes:
+            universe = int(self.cfg.universe_start) + len(pkts)
+            pkts.append(self._build_packet(universe=universe, sequence=0))
+        return pkts
+
     def send_frame(self, rgb: bytes) -> None:
         if not isinstance(rgb, (bytes, bytearray, memoryview)):
             raise TypeError("rgb must be bytes-like")
@@ -85,35 +140,68 @@ class E131Sender:
         if universes <= 0:
             universes = 1
 
-        for u in range(universes):
-            start = u * ch_per
-            end = min(total, start + ch_per)
-            chunk = bytes(data[start:end])
-            if len(chunk) < ch_per:
-                chunk += b"\x00" * (ch_per - len(chunk))
-
-            universe = int(self.cfg.universe_start) + u
-            pkt = self._build_packet(universe=universe, sequence=seq, dmx=chunk)
-            self._sock.sendto(pkt, (self.cfg.host, int(self.cfg.port)))
+        addr = self._addr
+        delta = self._delta
+        now = time.monotonic() if delta is not None else 0.0
+        sent = 0
+        with self._send_lock:
+            pkts = self._packets_for(universes)
+            for u in range(universes):
+                start = u * ch_per
+                end = min(total, start + ch_per)
+                n = end - start
+                pkt = pkts[u]
+                chunk = data[start:end]
+                if delta is not None and not delta.should_send(
+                    u,
+                    same=pkt[_SLOTS_OFFSET : _SLOTS_OFFSET + n] == chunk,
+                    length=n,
+                    now=now,
+                ):
+                    delta.skipped(len(pkt))
+                    continue
+                pkt[_SEQ_OFFSET] = seq
+                pkt[_SLOTS_OFFSET : _SLOTS_OFFSET + n] = chunk
+                if n < ch_per:
+                    pkt[_SLOTS_OFFSET + n : _SLOTS_OFFSET + ch_per] = _ZEROS[
+                        : ch_per - n
+                    ]
+                self._sock.sendto(pkt, addr)
+                if delta is not None:
+                    delta.sent(u, length=n, now=now)
+                sent += 1
+            if self._sync_packet is not None and sent:
+                self.send_sync()
+
+    def send_sync(self) -> None:
+        """Send a universe synchronization packet (no-op without `sync_universe`)."""
+        pkt = self._sync_packet
+        if pkt is None:
+            return
+        self._sync_seq = (self._sync_seq + 1) % 256
+        pkt[_SYNC_SEQ_OFFSET] = self._sync_seq
+        self._sock.sendto(pkt, self._addr)
 
-    def _build_packet(self, *, universe: int, sequence: int, dmx: bytes) -> bytes:
+    def _build_packet(
+        self, *, universe: int, sequence: int, dmx: bytes = b""
+    ) -> bytearray:
         # Root layer
         preamble = struct.pack(">HH", 0x0010, 0x0000)
         root = (
             preamble
             + ACN_PID
             + struct.pack(">H", self._root_flags_len)
-            + struct.pack(">I", 0x00000004)
+            + struct.pack(">I", VECTOR_ROOT_E131_DATA)
             + self._cid
         )
 
         # Framing layer
         framing = (
             struct.pack(">H", self._framing_flags_len)
-            + struct.pack(">I", 0x00000002)
+            + struct.pack(">I", VECTOR_E131_DATA_PACKET)
             + self._source_name
             + struct.pack("B", int(self.cfg.priority) & 0xFF)
-            + struct.pack(">H", 0x0000)  # reserved
+            + struct.pack(">H", int(self.cfg.sync_universe) & 0xFFFF)  # sync address
             + struct.pack("B", int(sequence) & 0xFF)
             + struct.pack("B", 0x00)  # options
             + struct.pack(">H", int(universe) & 0xFFFF)
@@ -128,7 +216,24 @@ class E131Sender:
             + struct.pack(">H", 0x0001)  # address increment
             + struct.pack(">H", (1 + self._slots_len) & 0xFFFF)  # property value count
             + struct.pack("B", 0x00)  # start code
-            + dmx
+            + bytes(dmx[: self._slots_len]).ljust(self._slots_len, b"\x00")
         )
 
-        return root + framing + dmp
+        return bytearray(root + framing + dmp)
+
+    def _build_sync_packet(self) -> bytearray:
+        root = (
+            struct.pack(">HH", 0x0010, 0x0000)
+            + ACN_PID
+            + struct.pack(">H", 0x7000 | (_SYNC_PACKET_LEN - 16))
+            + struct.pack(">I", VECTOR_ROOT_E131_EXTENDED)
+            + self._cid
+        )
+        framing = (
+            struct.pack(">H", 0x7000 | (_SYNC_PACKET_LEN - 38))
+            + struct.pack(">I", VECTOR_E131_EXTENDED_SYNCHRONIZATION)
+            + struct.pack("B", 0x00)  # sequence
+            + struct.pack(">H", int(self.cfg.sync_universe) & 0xFFFF)
+            + struct.pack(">H", 0x0000)  # reserved
+        )
+        return bytearray(root + framing)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from typing import List, Optional
+
+
+class JitterHistogram:
+    """
+    Fixed-bucket histogram of inter-frame intervals.
+
+    Buckets are `bucket_s` wide (0.1 ms by default) up to `bucket_s * buckets`;
+    longer intervals land in the last bucket. Recording is O(1) and never
+    allocates, so it is safe to call from the send loop.
+    """
+
+    def __init__(self, *, bucket_s: float = 0.0001, buckets: int = 5000) -> None:
+        self.bucket_s = max(1e-6, float(bucket_s))
+        self._counts: List[int] = [0] * max(1, int(buckets))
+        self.count = 0
+        self.sum_s = 0.0
+
+    def reset(self) -> None:
+        for i in range(len(self._counts)):
+            self._counts[i] = 0
+        self.count = 0
+        self.sum_s = 0.0
+
+    def record(self, interval_s: float) -> None:
+        interval_s = max(0.0, float(interval_s))
+        idx = min(len(self._counts) - 1, int(interval_s / self.bucket_s))
+        self._counts[idx] += 1
+        self.count += 1
+        self.sum_s += interval_s
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the `q` quantile (bucket midpoint), or None when empty."""
+        if self.count <= 0:
+            return None
+        target = max(1, int(math.ceil(max(0.0, min(1.0, float(q))) * self.count)))
+        acc = 0
+        for idx, n in enumerate(self._counts):
+            acc += n
+            if acc >= target:
+                return (idx + 0.5) * self.bucket_s
+        return (len(self._counts) - 0.5) * self.bucket_s
+
+
+class FramePacer:
+    """
+    Absolute-deadline frame clock on `time.monotonic()`.
+
+    Frame `k` is due at `start + k * period`, so a late frame never pushes the
+    following deadlines back and the stream cannot drift. Waits sleep until
+    `spin_s` before the deadline and spin for the remainder (the async variant
+    yields to the event loop while spinning), which keeps frames within a
+    fraction of a millisecond of their deadline instead of the ~1-10 ms a plain
+    sleep overshoots by. `spin_s=0` disables spinning.
+    """
+
+    def __init__(
+        self,
+        period_s: float,
+        *,
+        spin_s: float = 0.002,
+        max_sleep_s: float = 0.05,
+        jitter: Optional[JitterHistogram] = None,
+    ) -> None:
+        self.period_s = max(1e-4, float(period_s))
+        self.spin_s = max(0.0, float(spin_s))
+        self.max_sleep_s = max(0.001, float(max_sleep_s))
+        self.jitter = jitter
+        self.start_ts = 0.0
+        self.frame = 0
+        self._last_tick: Optional[float] = None
+
+    def start(self, now: Optional[float] = None) -> float:
+        self.start_ts = time.monotonic() if now is None else float(now)
+        self.frame = 0
+        self._last_tick = None
+        return self.start_ts
+
+    @property
+    def deadline(self) -> float:
+        return self.start_ts + self.frame * self.period_s
+
+    def lag(self, now: float) -> float:
+        return max(0.0, float(now) - self.deadline)
+
+    def skip(self, frames: int = 1) -> None:
+        """Give up on the current frame(s) without recording an interval."""
+        self.frame += max(0, int(frames))
+
+    def skip_late(self, now: float, max_lag_s: float) -> int:
+        """Skip whole frames when more than `max_lag_s` behind; returns the count."""
+        lag = float(now) - self.deadline
+        if lag <= float(max_lag_s):
+            return 0
+        drops = max(1, int(lag / self.period_s))
+        self.frame += drops
+        return drops
+
+    def tick(self, now: Optional[float] = None) -> None:
+        """Mark the current frame as sent and move on to the next deadline."""
+        now = time.monotonic() if now is None else float(now)
+        if self._last_tick is not None and self.jitter is not None:
+            self.jitter.record(now - self._last_tick)
+        self._last_tick = now
+        self.frame += 1
+
+    def wait(self, stop: Optional[threading.Event] = None) -> float:
+        """Block until the current frame is due (or `stop` is set); returns now."""
+        deadline = self.deadline
+        while True:
+            now = time.monotonic()
+            remaining = deadline - now
+            if remaining <= 0 or (stop is not None and stop.is_set()):
+                return now
+            if remaining > self.spin_s:
+                sleep_s = min(self.max_sleep_s, remaining - self.spin_s)
+                if stop is not None:
+                    stop.wait(sleep_s)
+                else:
+                    time.sleep(sleep_s)
+
+    async def wait_async(self, stop: Optional[asyncio.Event] = None) -> float:
+        """Async `wait`: sleeps on the loop, then yields with `sleep(0)` to spin."""
+        deadline = self.deadline
+        while True:
+            now = time.monotonic()
+            remaining = deadline - now
+            if remaining <= 0 or (stop is not None and stop.is_set()):
+                return now
+            if remaining > self.spin_s:
+                await asyncio.sleep(min(self.max_sleep_s, remaining - self.spin_s))
+            else:
+                await asyncio.sleep(0)
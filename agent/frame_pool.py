@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import List
+
+
+class FramePool:
+    """
+    Fixed set of reusable frame buffers handed out round-robin.
+
+    With the default two buffers, frame N+1 can be rendered while frame N is
+    still being packetized or written. A buffer must no longer be in use by
+    the time it comes round again. Bytes outside what a renderer writes keep
+    their previous value (zero unless the caller changed them).
+    """
+
+    def __init__(self, size: int, *, count: int = 2) -> None:
+        if int(size) <= 0:
+            raise ValueError("size must be > 0")
+        if int(count) <= 0:
+            raise ValueError("count must be > 0")
+        self._bufs: List[bytearray] = [bytearray(int(size)) for _ in range(int(count))]
+        self._next = 0
+
+    @property
+    def size(self) -> int:
+        return len(self._bufs[0])
+
+    def __len__(self) -> int:
+        return len(self._bufs)
+
+    def acquire(self) -> bytearray:
+        buf = self._bufs[self._next]
+        self._next = (self._next + 1) % len(self._bufs)
+        return buf
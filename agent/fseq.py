@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import bisect
+import math
+import mmap
+import time
+import zlib
 from dataclasses import dataclass
 from pathlib import Path
-from typing import BinaryIO, Optional
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 
 class FSEQError(RuntimeError):
@@ -17,6 +22,10 @@ def _u32le(v: int) -> bytes:
     return int(v).to_bytes(4, "little", signed=False)
 
 
+def _u24le(v: int) -> bytes:
+    return int(v).to_bytes(3, "little", signed=False)
+
+
 def _round4(n: int) -> int:
     x = int(n)
     r = x % 4
@@ -99,7 +108,7 @@ class FSEQV1Writer:
 
         self.fp.write(bytes(buf))
 
-    def add_frame(self, frame_bytes: bytes) -> None:
+    def add_frame(self, frame_bytes: bytes | bytearray | memoryview) -> None:
         if self._frames_written >= int(self.header.num_frames):
             raise FSEQError("All frames already written")
 
@@ -122,6 +131,455 @@ class FSEQV1Writer:
             pass
 
 
+FSEQ_V2_HEADER_LEN = 32
+FSEQ_V2_MAX_BLOCKS = 255
+_COMPRESSION_CODES = {"none": 0, "zstd": 1, "zlib": 2}
+# Uncompressed bytes per block when frames_per_block is left on auto.
+_V2_TARGET_BLOCK_BYTES = 512 * 1024
+
+
+def _zstd_compressor(level: int) -> Optional[Callable[[bytes], bytes]]:
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except Exception:
+        return None
+    return zstandard.ZstdCompressor(level=int(level)).compress
+
+
+def fseq_v2_block_compressor(
+    compression: str, level: int = 0
+) -> Tuple[str, Optional[Callable[[bytes], bytes]]]:
+    """
+    Resolve a v2 block codec to `(effective compression, compress function)`.
+
+    zstandard is optional: "zstd" falls back to zlib (equally valid for FPP)
+    when it is not installed. "none" returns no compress function.
+    """
+    compression = str(compression or "none").strip().lower()
+    if compression not in _COMPRESSION_CODES:
+        raise ValueError("compression must be none, zstd or zlib")
+    level = int(level)
+    if compression == "zstd":
+        fn = _zstd_compressor(level or 10)
+        if fn is not None:
+            return compression, fn
+        compression = "zlib"
+    if compression == "zlib":
+        zlevel = level or 6
+        return compression, lambda data: zlib.compress(data, zlevel)
+    return compression, None
+
+
+def fseq_v2_compression_available(kind: str) -> bool:
+    kind = str(kind or "").strip().lower()
+    if kind == "zstd":
+        return _zstd_compressor(1) is not None
+    return kind in _COMPRESSION_CODES
+
+
+@dataclass(frozen=True)
+class FSEQV2Header:
+    channel_count: int
+    num_frames: int
+    step_ms: int
+    compression: str = "zstd"  # none, zstd or zlib
+    compression_level: int = 0  # 0 = codec default
+    frames_per_block: int = 0  # 0 = auto
+    # (0-based start channel, channel count); frames then carry only these
+    # channels, concatenated in order.
+    sparse_ranges: Tuple[Tuple[int, int], ...] = ()
+    # (two-letter code, data), e.g. ("sp", b"wled-show-agent\x00").
+    variable_headers: Tuple[Tuple[str, bytes], ...] = ()
+    unique_id: int = 0
+    version_major: int = 2
+    version_minor: int = 0
+
+    @property
+    def frame_len(self) -> int:
+        if self.sparse_ranges:
+            return sum(int(n) for _, n in self.sparse_ranges)
+        return int(self.channel_count)
+
+    @property
+    def block_count(self) -> int:
+        if self.compression == "none":
+            return 0
+        return int(math.ceil(int(self.num_frames) / self.resolved_frames_per_block))
+
+    @property
+    def resolved_frames_per_block(self) -> int:
+        fpb = int(self.frames_per_block)
+        if fpb <= 0:
+            fpb = max(1, _V2_TARGET_BLOCK_BYTES // max(1, self.frame_len))
+        # The block index holds at most 255 entries.
+        return max(fpb, int(math.ceil(int(self.num_frames) / FSEQ_V2_MAX_BLOCKS)))
+
+    @property
+    def variable_headers_len(self) -> int:
+        return sum(4 + len(data) for _, data in self.variable_headers)
+
+    @property
+    def header_len(self) -> int:
+        return FSEQ_V2_HEADER_LEN + self.block_count * 8 + len(self.sparse_ranges) * 6
+
+    @property
+    def channel_data_offset(self) -> int:
+        return _round4(self.header_len + self.variable_headers_len)
+
+
+class FSEQV2Writer:
+    """
+    xLights/FPP compatible FSEQ v2 writer with zstd/zlib frame blocks.
+
+    Frames are buffered into blocks of `frames_per_block` and each block is
+    compressed as it fills; the block index in the header is reserved up front
+    and filled in by `finalize()`, so `fp` must be seekable.
+
+    Reference: xLights `V2FSEQFile::writeHeader()` / `addFrame()` / `finalize()`.
+    """
+
+    def __init__(self, fp: BinaryIO, header: FSEQV2Header) -> None:
+        if header.channel_count <= 0:
+            raise ValueError("channel_count must be > 0")
+        if header.num_frames <= 0:
+            raise ValueError("num_frames must be > 0")
+        if header.step_ms <= 0 or header.step_ms > 255:
+            raise ValueError("step_ms must be 1..255")
+        if len(header.sparse_ranges) > 255:
+            raise ValueError("At most 255 sparse ranges are supported")
+        for start, count in header.sparse_ranges:
+            if start < 0 or count <= 0 or start + count > header.channel_count:
+                raise ValueError(f"Sparse range ({start}, {count}) is out of bounds")
+        for code, _ in header.variable_headers:
+            if len(code.encode("ascii")) != 2:
+                raise ValueError("Variable header codes must be two ASCII characters")
+
+        compression, self._compress = fseq_v2_block_compressor(
+            header.compression, header.compression_level
+        )
+        if compression != header.compression:
+            header = FSEQV2Header(**{**header.__dict__, "compression": compression})
+
+        self.fp = fp
+        self.header = header
+        self._frames_written = 0
+        self._frame_len = header.frame_len
+        self._fpb = header.resolved_frames_per_block
+        self._block = bytearray(self._fpb * self._frame_len if self._compress else 0)
+        self._block_frames = 0
+        self._block_first = 0
+        self._blocks: List[Tuple[int, int]] = []
+        self.bytes_written = 0
+
+    @property
+    def frames_written(self) -> int:
+        return self._frames_written
+
+    def _header_bytes(self) -> bytes:
+        h = self.header
+        offset = h.channel_data_offset
+        buf = bytearray(offset)
+        buf[0:4] = b"PSEQ"
+        buf[4:6] = _u16le(offset)
+        buf[6] = int(h.version_minor) & 0xFF
+        buf[7] = int(h.version_major) & 0xFF
+        # Offset of the variable headers (fixed header + index + ranges).
+        buf[8:10] = _u16le(h.header_len)
+        buf[10:14] = _u32le(h.channel_count)
+        buf[14:18] = _u32le(h.num_frames)
+        buf[18] = int(h.step_ms) & 0xFF
+        buf[19] = 0  # flags
+        buf[20] = _COMPRESSION_CODES[h.compression] & 0x0F
+        buf[21] = h.block_count & 0xFF
+        buf[22] = len(h.sparse_ranges) & 0xFF
+        buf[23] = 0  # flags
+        buf[24:32] = int(h.unique_id).to_bytes(8, "little", signed=False)
+
+        pos = FSEQ_V2_HEADER_LEN
+        for i, (first, length) in enumerate(self._blocks):
+            at = pos + i * 8
+            buf[at : at + 4] = _u32le(first)
+            buf[at + 4 : at + 8] = _u32le(length)
+        pos += h.block_count * 8
+        for start, count in h.sparse_ranges:
+            buf[pos : pos + 3] = _u24le(start)
+            buf[pos + 3 : pos + 6] = _u24le(count)
+            pos += 6
+        for code, data in h.variable_headers:
+            buf[pos : pos + 2] = _u16le(4 + len(data))
+            buf[pos + 2 : pos + 4] = code.encode("ascii")
+            buf[pos + 4 : pos + 4 + len(data)] = data
+            pos += 4 + len(data)
+        return bytes(buf)
+
+    def write_header(self) -> None:
+        hdr = self._header_bytes()
+        self.fp.write(hdr)
+        self.bytes_written += len(hdr)
+
+    def _flush_block(self) -> None:
+        if not self._block_frames or self._compress is None:
+            return
+        data = self._compress(
+            memoryview(self._block)[: self._block_frames * self._frame_len]
+        )
+        self.fp.write(data)
+        self.bytes_written += len(data)
+        self._blocks.append((self._block_first, len(data)))
+        self._block_first += self._block_frames
+        self._block_frames = 0
+
+    def add_frame(self, frame_bytes: bytes | bytearray | memoryview) -> None:
+        if self._frames_written >= int(self.header.num_frames):
+            raise FSEQError("All frames already written")
+        if len(frame_bytes) != self._frame_len:
+            raise FSEQError(
+                f"Frame size {len(frame_bytes)} != frame length {self._frame_len}"
+            )
+        if self._compress is None:
+            self.fp.write(frame_bytes)
+            self.bytes_written += self._frame_len
+        else:
+            at = self._block_frames * self._frame_len
+            self._block[at : at + self._frame_len] = frame_bytes
+            self._block_frames += 1
+            if self._block_frames >= self._fpb:
+                self._flush_block()
+        self._frames_written += 1
+
+    def add_compressed_block(self, data: bytes, frames: int) -> None:
+        """
+        Append a block compressed elsewhere (e.g. in a worker process).
+
+        `data` must be `frames` consecutive frames compressed with this
+        writer's codec; every block but the last must hold exactly
+        `resolved_frames_per_block` frames so readers can find frames.
+        """
+        frames = int(frames)
+        if self._compress is None:
+            raise FSEQError("Uncompressed files have no blocks")
+        if self._block_frames:
+            raise FSEQError("Cannot mix add_frame and add_compressed_block")
+        if frames <= 0 or self._frames_written + frames > int(self.header.num_frames):
+            raise FSEQError("Block frame count is out of range")
+        if len(self._blocks) >= self.header.block_count:
+            raise FSEQError("Block index is full")
+        self.fp.write(data)
+        self.bytes_written += len(data)
+        self._blocks.append((self._block_first, len(data)))
+        self._block_first += frames
+        self._frames_written += frames
+
+    def finalize(self) -> None:
+        if self._frames_written != int(self.header.num_frames):
+            raise FSEQError(
+                f"frames_written={self._frames_written} != num_frames={self.header.num_frames}"
+            )
+        self._flush_block()
+        if self._blocks:
+            end = self.fp.tell()
+            self.fp.seek(0)
+            self.fp.write(self._header_bytes())
+            self.fp.seek(end)
+        try:
+            self.fp.flush()
+        except Exception:
+            pass
+
+
+def _zstd_decompress(data: memoryview) -> bytes:
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except Exception as e:
+        raise FSEQError("zstd-compressed FSEQ needs the zstandard package") from e
+    # decompressobj copes with frames that do not record their content size.
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+class FSEQReader:
+    """
+    Memory-mapped FSEQ v1/v2 reader.
+
+    Uncompressed frames are returned as memoryviews straight into the mapping
+    (no copy). Compressed v2 frames are views into the most recently
+    decompressed block, so sequential playback decompresses each block once.
+    Release returned views before `close()`.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = str(path)
+        self._fh = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            self._fh.close()
+            raise FSEQError("FSEQ file is empty") from e
+        self._mv = memoryview(self._mm)
+        self._block_idx = -1
+        self._block_data: Optional[memoryview] = None
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self) -> None:
+        mv = self._mv
+        if len(mv) < 28 or bytes(mv[0:4]) not in (b"PSEQ", b"FSEQ"):
+            raise FSEQError("Not an FSEQ file")
+        u16 = lambda at: int.from_bytes(mv[at : at + 2], "little")  # noqa: E731
+        u24 = lambda at: int.from_bytes(mv[at : at + 3], "little")  # noqa: E731
+        u32 = lambda at: int.from_bytes(mv[at : at + 4], "little")  # noqa: E731
+
+        self.data_offset = u16(4)
+        self.version_minor = int(mv[6])
+        self.version_major = int(mv[7])
+        var_start = u16(8)
+        self.channel_count = u32(10)
+        self.num_frames = u32(14)
+        self.step_ms = int(mv[18])
+        self.compression = "none"
+        self.sparse_ranges: Tuple[Tuple[int, int], ...] = ()
+        # (first frame, file offset, length) per compressed block.
+        self._blocks: List[Tuple[int, int, int]] = []
+
+        if self.version_major >= 2:
+            if len(mv) < FSEQ_V2_HEADER_LEN:
+                raise FSEQError("Truncated FSEQ v2 header")
+            codes = {v: k for k, v in _COMPRESSION_CODES.items()}
+            comp = int(mv[20]) & 0x0F
+            if comp not in codes:
+                raise FSEQError(f"Unknown FSEQ compression type {comp}")
+            self.compression = codes[comp]
+            block_count = int(mv[21]) | ((int(mv[20]) & 0xF0) << 4)
+            pos = FSEQ_V2_HEADER_LEN
+            at = self.data_offset
+            for _ in range(block_count):
+                first, length = u32(pos), u32(pos + 4)
+                pos += 8
+                if length > 0:
+                    self._blocks.append((first, at, length))
+                    at += length
+            ranges = []
+            for _ in range(int(mv[22])):
+                ranges.append((u24(pos), u24(pos + 3)))
+                pos += 6
+            self.sparse_ranges = tuple(ranges)
+        elif self.version_major != 1:
+            raise FSEQError(f"Unsupported FSEQ version {self.version_major}")
+
+        self.variable_headers: Dict[str, bytes] = {}
+        pos = var_start
+        while pos + 4 <= self.data_offset:
+            length = u16(pos)
+            if length < 4 or pos + length > self.data_offset:
+                break
+            code = bytes(mv[pos + 2 : pos + 4]).decode("ascii", "replace")
+            self.variable_headers[code] = bytes(mv[pos + 4 : pos + length])
+            pos += length
+
+        if self.sparse_ranges:
+            self.frame_len = sum(n for _, n in self.sparse_ranges)
+        else:
+            self.frame_len = int(self.channel_count)
+        if self.compression == "none":
+            need = self.data_offset + self.num_frames * self.frame_len
+            if len(mv) < need:
+                raise FSEQError("FSEQ file is truncated")
+        self._block_firsts = [b[0] for b in self._blocks]
+
+    def __enter__(self) -> "FSEQReader":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return int(self.num_frames)
+
+    @property
+    def duration_s(self) -> float:
+        return self.num_frames * self.step_ms / 1000.0
+
+    def locate(self, channel: int, count: int) -> int:
+        """
+        Offset within a stored frame of absolute channels `[channel, channel + count)`.
+
+        `channel` is 0-based. For sparse files the span must sit inside one range.
+        """
+        channel, count = int(channel), int(count)
+        if not self.sparse_ranges:
+            if channel < 0 or channel + count > self.frame_len:
+                raise FSEQError("Channel span is outside the sequence")
+            return channel
+        base = 0
+        for start, n in self.sparse_ranges:
+            if start <= channel and channel + count <= start + n:
+                return base + (channel - start)
+            base += n
+        raise FSEQError("Channel span is not covered by one sparse range")
+
+    def _decompress_block(self, idx: int) -> memoryview:
+        if idx != self._block_idx:
+            _, at, length = self._blocks[idx]
+            raw = self._mv[at : at + length]
+            try:
+                if self.compression == "zstd":
+                    data = _zstd_decompress(raw)
+                else:
+                    data = zlib.decompress(raw)
+            finally:
+                raw.release()
+            if self._block_data is not None:
+                self._block_data.release()
+            self._block_data = memoryview(data)
+            self._block_idx = idx
+        assert self._block_data is not None
+        return self._block_data
+
+    def frame(self, k: int) -> memoryview:
+        k = int(k)
+        if k < 0 or k >= self.num_frames:
+            raise IndexError(f"frame {k} out of range")
+        n = self.frame_len
+        if self.compression == "none":
+            start = self.data_offset + k * n
+            return self._mv[start : start + n]
+        idx = bisect.bisect_right(self._block_firsts, k) - 1
+        if idx < 0:
+            raise FSEQError(f"No compressed block holds frame {k}")
+        block = self._decompress_block(idx)
+        start = (k - self._blocks[idx][0]) * n
+        if start + n > len(block):
+            raise FSEQError(f"Compressed block is too short for frame {k}")
+        return block[start : start + n]
+
+    def frames(self) -> Iterator[memoryview]:
+        for k in range(self.num_frames):
+            yield self.frame(k)
+
+    def close(self) -> None:
+        if self._block_data is not None:
+            try:
+                self._block_data.release()
+            except Exception:
+                pass
+            self._block_data = None
+        try:
+            self._mv.release()
+        except Exception:
+            pass
+        try:
+            self._mm.close()
+        except (BufferError, ValueError):
+            # A caller still holds a frame view; the mapping goes away with it.
+            pass
+        try:
+            self._fh.close()
+        except Exception:
+            pass
+
+
 @dataclass(frozen=True)
 class ExportedFSEQ:
     filename: str
@@ -130,6 +588,8 @@ class ExportedFSEQ:
     frames: int
     channels: int
     step_ms: int
+    version: int = 1
+    compression: str = "none"
 
 
 def write_fseq_v1_file(
@@ -143,7 +603,9 @@ def write_fseq_v1_file(
     """
     Write an uncompressed FSEQ v1 file to disk.
 
-    `frame_generator` yields exactly `num_frames` bytes objects, each of length `channel_count`.
+    `frame_generator` yields exactly `num_frames` bytes-like objects, each of length
+    `channel_count`. Each frame is written before the next is requested, so a
+    generator may yield the same reused buffer every time.
     """
     p = Path(out_path)
     p.parent.mkdir(parents=True, exist_ok=True)
@@ -161,7 +623,7 @@ def write_fseq_v1_file(
         bytes_written += header.channel_data_offset
 
         for fb in frame_generator:
-            w.add_frame(bytes(fb))
+            w.add_frame(fb)
             bytes_written += int(channel_count)
 
         w.finalize()
@@ -174,3 +636,57 @@ def write_fseq_v1_file(
         channels=int(channel_count),
         step_ms=int(step_ms),
     )
+
+
+def write_fseq_v2_file(
+    *,
+    out_path: str,
+    channel_count: int,
+    num_frames: int,
+    step_ms: int,
+    frame_generator,
+    compression: str = "zstd",
+    compression_level: int = 0,
+    frames_per_block: int = 0,
+    sparse_ranges: Sequence[Tuple[int, int]] = (),
+    variable_headers: Sequence[Tuple[str, bytes]] = (),
+) -> ExportedFSEQ:
+    """
+    Write an FSEQ v2 file to disk (compressed blocks, optional sparse ranges).
+
+    `frame_generator` yields exactly `num_frames` bytes-like objects. Without
+    `sparse_ranges` each is `channel_count` long; with them, each holds just the
+    ranged channels back to back. Frames are copied into the current block as
+    they arrive, so a generator may reuse one buffer.
+    """
+    p = Path(out_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+
+    header = FSEQV2Header(
+        channel_count=int(channel_count),
+        num_frames=int(num_frames),
+        step_ms=int(step_ms),
+        compression=str(compression or "none").strip().lower(),
+        compression_level=int(compression_level),
+        frames_per_block=int(frames_per_block),
+        sparse_ranges=tuple((int(a), int(b)) for a, b in sparse_ranges),
+        variable_headers=tuple((str(c), bytes(d)) for c, d in variable_headers),
+        unique_id=time.time_ns() // 1000,
+    )
+    with p.open("wb") as f:
+        w = FSEQV2Writer(f, header)
+        w.write_header()
+        for fb in frame_generator:
+            w.add_frame(fb)
+        w.finalize()
+
+    return ExportedFSEQ(
+        filename=p.name,
+        rel_path=str(p),
+        bytes_written=int(w.bytes_written),
+        frames=int(num_frames),
+        channels=int(channel_count),
+        step_ms=int(step_ms),
+        version=2,
+        compression=w.header.compression,
+    )
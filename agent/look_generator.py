@@ -5,7 +5,17 @@ import itertools
 import random
 import math
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from wled_mapper import WLEDMapper
 from jobs import JobCanceled
@@ -40,6 +50,34 @@ class Look:
     spec: Dict[str, Any]  # effect/palette by name + segment params etc
 
 
+# parameter banks (lots of variety)
+_SPEEDS = [40, 60, 80, 100, 120, 150, 180, 210, 235]
+_INTENSITIES = [30, 50, 70, 90, 110, 127, 150, 180, 210, 235]
+_TRANSITIONS = [0, 1, 2, 3, 5, 8, 12]
+_SEG_VAR = [
+    {"rev": False, "grp": 1, "spc": 0},
+    {"rev": True, "grp": 1, "spc": 0},
+    {"rev": False, "grp": 2, "spc": 0},
+    {"rev": False, "grp": 3, "spc": 0},
+    {"rev": False, "grp": 4, "spc": 0},
+    {"rev": False, "grp": 1, "spc": 1},
+    {"rev": True, "grp": 2, "spc": 1},
+]
+
+
+def theme_targets(total: int, themes: Sequence[str]) -> List[Tuple[str, int]]:
+    """Per-theme look targets (roughly even), in theme order."""
+    themes = list(themes) or ["classic"]
+    per_theme = max(1, int(total) // len(themes))
+    extra = int(total) - per_theme * len(themes)
+    return [(t, per_theme + (1 if i < extra else 0)) for i, t in enumerate(themes)]
+
+
+def theme_seed(seed: int, theme: str) -> int:
+    """Stable per-theme RNG seed for sharded generation (independent of PYTHONHASHSEED)."""
+    return int(_stable_id(str(int(seed)), "theme", str(theme))[:8], 16)
+
+
 class LookLibraryGenerator:
     """
     Generates a LOT of looks as WLED-state "specs" that reference effect/palette by *name*.
@@ -236,7 +274,319 @@ class LookLibraryGenerator:
         self.rng.shuffle(candidates)
         return candidates
 
-    def generate(
+    def _theme_banks(self, theme: str) -> Tuple[List[List[RGB]], List[str], List[str]]:
+        colorsets = self.colors.get(
+            theme, self.colors.get("classic", [])
+        ) or self.colors.get("classic", [])
+        return colorsets, self._pick_effects(theme), self._pick_palettes(theme)
+
+    def _single_look(
+        self,
+        theme: str,
+        eff: str,
+        pal: str,
+        colors: Sequence[RGB],
+        brightness: int,
+    ) -> Tuple[str, Look]:
+        """Draw the remaining single-segment params; returns (dedupe key, look)."""
+        sx = self.rng.choice(_SPEEDS)
+        ix = self.rng.choice(_INTENSITIES)
+        sv = self.rng.choice(_SEG_VAR)
+        tr = self.rng.choice(_TRANSITIONS)
+
+        spec = {
+            "type": "wled_look",
+            "theme": theme,
+            "effect": eff,
+            "palette": pal,
+            "bri": brightness,
+            "transition": tr,
+            "seg": {
+                "id": 0,
+                "fx": eff,  # NAME form (mapped later)
+                "pal": pal,  # NAME form (mapped later)
+                "sx": sx,
+                "ix": ix,
+                "col": [[c[0], c[1], c[2]] for c in colors[:3]],
+                **sv,
+            },
+            "tags": [],
+        }
+
+        key = f"{theme}|{eff}|{pal}|{sx}|{ix}|{tr}|{sv.get('rev')}|{sv.get('grp')}|{sv.get('spc')}|{spec['seg']['col']}"
+        name = f"{theme}:{eff} [{pal}] sx{sx} ix{ix}"
+        look_id = _stable_id(
+            theme,
+            eff,
+            pal,
+            str(sx),
+            str(ix),
+            str(tr),
+            str(sv.get("rev")),
+            str(sv.get("grp")),
+            str(sv.get("spc")),
+        )
+        return key, Look(id=look_id, name=name, theme=theme, tags=[], spec=spec)
+
+    def _top_up_look(self, theme: str, brightness: int) -> Tuple[str, Look]:
+        colorsets, effs, pals = self._theme_banks(theme)
+        eff = self.rng.choice(effs)
+        pal = self.rng.choice(pals) if pals else "Default"
+        colors = self.rng.choice(colorsets)
+        return self._single_look(theme, eff, pal, colors, brightness)
+
+    def _iter_theme_looks(
+        self,
+        theme: str,
+        banks: Tuple[List[List[RGB]], List[str], List[str]],
+        *,
+        target: int,
+        have: int,
+        brightness: int,
+        seen: set[str],
+        check_cancel: Callable[[], None],
+    ) -> Iterator[Look]:
+        colorsets, effs, pals = banks
+
+        # Slightly bias towards holiday-specific effects if present in list
+        # (no guarantee those exist on all builds)
+        def pick_effect() -> str:
+            if theme.lower() == "halloween":
+                for e in effs:
+                    if "halloween" in e.lower():
+                        return e
+            if theme.lower() in ("classic", "candy_cane"):
+                for e in effs:
+                    if "merry" in e.lower():
+                        return e
+            return self.rng.choice(effs)
+
+        attempts = 0
+        while have < target and attempts < target * 50:
+            check_cancel()
+            attempts += 1
+            eff = pick_effect()
+            pal = self.rng.choice(pals) if pals else "Default"
+            colors = self.rng.choice(colorsets) if colorsets else [(255, 255, 255)]
+            key, look = self._single_look(theme, eff, pal, colors, brightness)
+            if key in seen:
+                continue
+            seen.add(key)
+            have += 1
+            yield look
+
+    def _iter_multi_segment_looks(
+        self,
+        theme: str,
+        banks: Tuple[List[List[RGB]], List[str], List[str]],
+        *,
+        target: int,
+        brightness: int,
+        seg_ids: Sequence[int],
+        seen: set[str],
+        check_cancel: Callable[[], None],
+    ) -> Iterator[Look]:
+        # A small handful of multi-segment looks, for extra spice.
+        # If the WLED instance has multiple segments (e.g., 4), generate patterns that address ALL segments.
+        colorsets, effs, pals = banks
+        ms_target = max(0, min(80, target // 6))
+        attempts = 0
+        while ms_target > 0 and attempts < 500:
+            check_cancel()
+            attempts += 1
+            # Build a few "segment styles" for variety.
+            styles = [
+                "alt_colors",
+                "quad_colors",
+                "alt_rev",
+                "split_fx",
+                "split_pal",
+            ]
+            # Extra styles when you have 4+ segments (e.g. 4 quadrants).
+            if len(seg_ids) >= 4:
+                styles += [
+                    "quad_offset",
+                    "quad_bri_gradient",
+                    "opposite_pairs",
+                    "spotlight",
+                    # Street-oriented spotlights (assumes ordered segments start at street-right and
+                    # go around the tree; good for quarter-tree output layouts).
+                    "street_spotlight_front",
+                    "street_spotlight_right",
+                ]
+            style = self.rng.choice(styles)  # segment-aware
+
+            pal = self.rng.choice(pals) if pals else "Default"
+            eff = self.rng.choice(effs)
+
+            seg_list: List[Dict[str, Any]] = []
+            # pick multiple color sets
+            csets: List[List[RGB]] = []
+            for _ in range(max(2, min(4, len(seg_ids)))):
+                csets.append(self.rng.choice(colorsets))
+
+            effs2 = self._pick_effects(theme)
+            pals2 = self._pick_palettes(theme)
+
+            # Best-effort: infer physical segment order + lengths from WLED.
+            ordered_seg_ids = list(seg_ids)
+            seg_len_by_id: Dict[int, int] = {}
+            try:
+                seg_state = (
+                    self._segments_state
+                    if self._segments_state is not None
+                    else self.mapper.wled.get_segments(refresh=False)
+                )
+                seg_map = {}
+                for s in seg_state:
+                    if not isinstance(s, dict):
+                        continue
+                    sid = int(s.get("id", -1))
+                    if sid < 0 or sid not in set(int(x) for x in seg_ids):
+                        continue
+                    start = int(s.get("start", 0))
+                    stop = int(s.get("stop", 0))
+                    ln = int(s.get("len", 0))
+                    if ln <= 0 and stop > start:
+                        ln = stop - start
+                    seg_len_by_id[sid] = max(0, ln)
+                    seg_map[sid] = (start, sid)
+                # Sort by start then id if starts exist
+                if seg_map:
+                    ordered_seg_ids = [
+                        sid
+                        for sid, _ in sorted(
+                            seg_map.items(), key=lambda kv: (kv[1][0], kv[1][1])
+                        )
+                    ]
+            except Exception:
+                ordered_seg_ids = list(seg_ids)
+
+            for si, seg_id in enumerate(ordered_seg_ids):
+                # per-segment effect/palette variations
+                fx_name = eff
+                pal_name = pal
+                if style == "split_fx":
+                    fx_name = self.rng.choice(effs2)
+                if style == "split_pal":
+                    pal_name = self.rng.choice(pals2) if pals2 else pal
+
+                colors = csets[si % len(csets)]
+                sx = int(self.rng.choice(_SPEEDS))
+                ix = int(self.rng.choice(_INTENSITIES))
+                rev = (
+                    bool((si % 2) == 1)
+                    if style in ("alt_rev",)
+                    else bool(self.rng.choice([False, False, True]))
+                )
+
+                seg_obj: Dict[str, Any] = {
+                    "id": int(seg_id),
+                    "fx": fx_name,
+                    "pal": pal_name,
+                    "sx": sx,
+                    "ix": ix,
+                    "col": [[x[0], x[1], x[2]] for x in colors[:3]],
+                    "rev": rev,
+                }
+
+                # Segment-aware extras (WLED supports per-segment on/off, brightness, and offset).
+                # These are optional and won't change segment bounds.
+                if style == "quad_offset":
+                    seg_len = int(seg_len_by_id.get(int(seg_id), 0)) or max(
+                        1, int(self.rng.choice([196, 392, 784]))
+                    )
+                    seg_obj["of"] = int((si / max(1, len(ordered_seg_ids))) * seg_len)
+                elif style == "quad_bri_gradient":
+                    # Brightness "around" the tree
+                    base = int(brightness)
+                    # A simple 4-phase wave
+                    phase = (si % max(1, len(ordered_seg_ids))) / max(
+                        1.0, float(len(ordered_seg_ids))
+                    )
+                    seg_obj["bri"] = max(
+                        0,
+                        min(
+                            255,
+                            int(
+                                base
+                                * (
+                                    0.35
+                                    + 0.65
+                                    * (0.5 + 0.5 * math.sin(2.0 * math.pi * phase))
+                                )
+                            ),
+                        ),
+                    )
+                elif style == "opposite_pairs":
+                    # (0,2) share colors; (1,3) share colors
+                    pair = si % 2
+                    seg_obj["col"] = [[x[0], x[1], x[2]] for x in csets[pair][:3]]
+                    seg_obj["rev"] = bool(pair == 1)
+                elif style == "spotlight":
+                    # Pick a "spot" segment; dim others
+                    spot = int(self.rng.randrange(0, max(1, len(ordered_seg_ids))))
+                    seg_obj["bri"] = (
+                        int(brightness)
+                        if si == spot
+                        else max(0, int(brightness * 0.15))
+                    )
+                    seg_obj["on"] = True
+                elif style == "street_spotlight_front":
+                    # Bias spotlight to the street-facing quadrant.
+                    # If ordered_seg_ids starts at street-right and goes counterclockwise,
+                    # then the street-facing quadrant is the last one.
+                    spot = max(0, len(ordered_seg_ids) - 1)
+                    seg_obj["bri"] = (
+                        int(brightness)
+                        if si == spot
+                        else max(0, int(brightness * 0.15))
+                    )
+                    seg_obj["on"] = True
+                elif style == "street_spotlight_right":
+                    # Bias spotlight to the street-right quadrant (first in ordered_seg_ids).
+                    spot = 0
+                    seg_obj["bri"] = (
+                        int(brightness)
+                        if si == spot
+                        else max(0, int(brightness * 0.15))
+                    )
+                    seg_obj["on"] = True
+
+                seg_list.append(seg_obj)
+
+            spec = {
+                "type": "wled_look",
+                "theme": theme,
+                "effect": eff,
+                "palette": pal,
+                "bri": brightness,
+                "transition": 0,
+                "seg": seg_list,
+                "tags": ["multi_segment", style],
+            }
+
+            key = f"ms|{style}|{theme}|{pal}|" + "|".join(
+                [
+                    f"{s['id']}:{s['fx']}:{s['pal']}:{s['sx']}:{s['ix']}:{s.get('rev')}:{s['col']}"
+                    for s in seg_list
+                ]
+            )
+            if key in seen:
+                continue
+            seen.add(key)
+            name = f"{theme}:MS {eff} [{pal}]"
+            look_id = _stable_id("ms", theme, style, eff, pal, str(len(seg_list)))
+            yield Look(
+                id=look_id,
+                name=name,
+                theme=theme,
+                tags=["multi_segment", style],
+                spec=spec,
+            )
+            ms_target -= 1
+
+    def iter_generate(
         self,
         *,
         total: int,
@@ -246,16 +596,18 @@ class LookLibraryGenerator:
         segment_ids: Optional[Sequence[int]] = None,
         progress_cb: Callable[[int, int, str], None] | None = None,
         cancel_cb: Callable[[], bool] | None = None,
-    ) -> List[Look]:
+    ) -> Iterator[Look]:
         """
-        Generate up to `total` looks, distributed across `themes`.
+        Yield up to `total` looks, distributed across `themes`, as they are produced.
 
-        This implementation is intentionally streaming (no huge Cartesian products in memory).
+        Per-theme counters keep every attempt O(1), so a pack is generated in linear time
+        and can be written out without holding the whole list.
         """
         brightness = _clamp8(brightness)
         seg_ids = list(segment_ids) if segment_ids else [0]
-        looks: List[Look] = []
         seen: set[str] = set()
+        counts: Dict[str, int] = {}
+        produced = 0
 
         if not themes:
             themes = ["classic"]
@@ -268,382 +620,148 @@ class LookLibraryGenerator:
 
         def _report(message: str) -> None:
             if progress_cb:
-                progress_cb(len(looks), int(total), message)
-
-        # parameter banks (lots of variety)
-        speeds = [40, 60, 80, 100, 120, 150, 180, 210, 235]
-        intensities = [30, 50, 70, 90, 110, 127, 150, 180, 210, 235]
-        transitions = [0, 1, 2, 3, 5, 8, 12]
-
-        seg_var = [
-            {"rev": False, "grp": 1, "spc": 0},
-            {"rev": True, "grp": 1, "spc": 0},
-            {"rev": False, "grp": 2, "spc": 0},
-            {"rev": False, "grp": 3, "spc": 0},
-            {"rev": False, "grp": 4, "spc": 0},
-            {"rev": False, "grp": 1, "spc": 1},
-            {"rev": True, "grp": 2, "spc": 1},
-        ]
+                progress_cb(produced, int(total), message)
 
-        # Determine per-theme targets (roughly even)
-        per_theme = max(1, total // max(1, len(themes)))
-        extra = total - per_theme * len(themes)
+        def _emit(looks: Iterable[Look]) -> Iterator[Look]:
+            nonlocal produced
+            for look in looks:
+                counts[look.theme] = counts.get(look.theme, 0) + 1
+                produced += 1
+                if progress_cb and (produced % progress_every == 0):
+                    _report(f"Generating looks… ({produced}/{total})")
+                yield look
 
         _report("Starting…")
 
-        for ti, theme in enumerate(themes):
+        for theme, target in theme_targets(total, themes):
             _check_cancel()
-            target = per_theme + (1 if ti < extra else 0)
             _report(f"Theme: {theme}")
-            colorsets = self.colors.get(
-                theme, self.colors.get("classic", [])
-            ) or self.colors.get("classic", [])
-            effs = self._pick_effects(theme)
-            pals = self._pick_palettes(theme)
-
-            # Slightly bias towards holiday-specific effects if present in list
-            # (no guarantee those exist on all builds)
-            def pick_effect() -> str:
-                if theme.lower() == "halloween":
-                    for e in effs:
-                        if "halloween" in e.lower():
-                            return e
-                if theme.lower() in ("classic", "candy_cane"):
-                    for e in effs:
-                        if "merry" in e.lower():
-                            return e
-                return self.rng.choice(effs)
-
-            attempts = 0
-            while (
-                len([l for l in looks if l.theme == theme]) < target
-                and attempts < target * 50
-            ):
-                _check_cancel()
-                attempts += 1
-                eff = pick_effect()
-                pal = self.rng.choice(pals) if pals else "Default"
-                colors = self.rng.choice(colorsets) if colorsets else [(255, 255, 255)]
-                sx = self.rng.choice(speeds)
-                ix = self.rng.choice(intensities)
-                sv = self.rng.choice(seg_var)
-                tr = self.rng.choice(transitions)
-
-                spec = {
-                    "type": "wled_look",
-                    "theme": theme,
-                    "effect": eff,
-                    "palette": pal,
-                    "bri": brightness,
-                    "transition": tr,
-                    "seg": {
-                        "id": 0,
-                        "fx": eff,  # NAME form (mapped later)
-                        "pal": pal,  # NAME form (mapped later)
-                        "sx": sx,
-                        "ix": ix,
-                        "col": [[c[0], c[1], c[2]] for c in colors[:3]],
-                        **sv,
-                    },
-                    "tags": [],
-                }
-
-                key = f"{theme}|{eff}|{pal}|{sx}|{ix}|{tr}|{sv.get('rev')}|{sv.get('grp')}|{sv.get('spc')}|{spec['seg']['col']}"
-                if key in seen:
-                    continue
-                seen.add(key)
-
-                name = f"{theme}:{eff} [{pal}] sx{sx} ix{ix}"
-                look_id = _stable_id(
+            banks = self._theme_banks(theme)
+            yield from _emit(
+                self._iter_theme_looks(
                     theme,
-                    eff,
-                    pal,
-                    str(sx),
-                    str(ix),
-                    str(tr),
-                    str(sv.get("rev")),
-                    str(sv.get("grp")),
-                    str(sv.get("spc")),
+                    banks,
+                    target=target,
+                    have=counts.get(theme, 0),
+                    brightness=brightness,
+                    seen=seen,
+                    check_cancel=_check_cancel,
                 )
-                looks.append(
-                    Look(id=look_id, name=name, theme=theme, tags=[], spec=spec)
-                )
-                if progress_cb and (len(looks) % progress_every == 0):
-                    _report(f"Generating looks… ({len(looks)}/{total})")
-
-            # Optional: a small handful of multi-segment looks, for extra spice
-            # If the WLED instance has multiple segments (e.g., 4), generate patterns that address ALL segments.
-            if include_multi_segment and len(seg_ids) >= 2 and len(looks) < total:
-                ms_target = max(0, min(80, target // 6))
-                attempts = 0
-                while ms_target > 0 and attempts < 500:
-                    _check_cancel()
-                    attempts += 1
-                    # Build a few "segment styles" for variety.
-                    styles = [
-                        "alt_colors",
-                        "quad_colors",
-                        "alt_rev",
-                        "split_fx",
-                        "split_pal",
-                    ]
-                    # Extra styles when you have 4+ segments (e.g. 4 quadrants).
-                    if len(seg_ids) >= 4:
-                        styles += [
-                            "quad_offset",
-                            "quad_bri_gradient",
-                            "opposite_pairs",
-                            "spotlight",
-                            # Street-oriented spotlights (assumes ordered segments start at street-right and
-                            # go around the tree; good for quarter-tree output layouts).
-                            "street_spotlight_front",
-                            "street_spotlight_right",
-                        ]
-                    style = self.rng.choice(styles)  # segment-aware
-
-                    pal = self.rng.choice(pals) if pals else "Default"
-                    eff = self.rng.choice(effs)
-
-                    seg_list: List[Dict[str, Any]] = []
-                    # pick multiple color sets
-                    csets: List[List[RGB]] = []
-                    for _ in range(max(2, min(4, len(seg_ids)))):
-                        csets.append(self.rng.choice(colorsets))
-
-                    effs2 = self._pick_effects(theme)
-                    pals2 = self._pick_palettes(theme)
-
-                    # Best-effort: infer physical segment order + lengths from WLED.
-                    ordered_seg_ids = list(seg_ids)
-                    seg_len_by_id: Dict[int, int] = {}
-                    try:
-                        seg_state = (
-                            self._segments_state
-                            if self._segments_state is not None
-                            else self.mapper.wled.get_segments(refresh=False)
-                        )
-                        seg_map = {}
-                        for s in seg_state:
-                            if not isinstance(s, dict):
-                                continue
-                            sid = int(s.get("id", -1))
-                            if sid < 0 or sid not in set(int(x) for x in seg_ids):
-                                continue
-                            start = int(s.get("start", 0))
-                            stop = int(s.get("stop", 0))
-                            ln = int(s.get("len", 0))
-                            if ln <= 0 and stop > start:
-                                ln = stop - start
-                            seg_len_by_id[sid] = max(0, ln)
-                            seg_map[sid] = (start, sid)
-                        # Sort by start then id if starts exist
-                        if seg_map:
-                            ordered_seg_ids = [
-                                sid
-                                for sid, _ in sorted(
-                                    seg_map.items(), key=lambda kv: (kv[1][0], kv[1][1])
-                                )
-                            ]
-                    except Exception:
-                        ordered_seg_ids = list(seg_ids)
-
-                    for si, seg_id in enumerate(ordered_seg_ids):
-                        # per-segment effect/palette variations
-                        fx_name = eff
-                        pal_name = pal
-                        if style == "split_fx":
-                            fx_name = self.rng.choice(effs2)
-                        if style == "split_pal":
-                            pal_name = self.rng.choice(pals2) if pals2 else pal
-
-                        colors = csets[si % len(csets)]
-                        sx = int(self.rng.choice(speeds))
-                        ix = int(self.rng.choice(intensities))
-                        rev = (
-                            bool((si % 2) == 1)
-                            if style in ("alt_rev",)
-                            else bool(self.rng.choice([False, False, True]))
-                        )
-
-                        seg_obj: Dict[str, Any] = {
-                            "id": int(seg_id),
-                            "fx": fx_name,
-                            "pal": pal_name,
-                            "sx": sx,
-                            "ix": ix,
-                            "col": [[x[0], x[1], x[2]] for x in colors[:3]],
-                            "rev": rev,
-                        }
-
-                        # Segment-aware extras (WLED supports per-segment on/off, brightness, and offset).
-                        # These are optional and won't change segment bounds.
-                        if style == "quad_offset":
-                            seg_len = int(seg_len_by_id.get(int(seg_id), 0)) or max(
-                                1, int(self.rng.choice([196, 392, 784]))
-                            )
-                            seg_obj["of"] = int(
-                                (si / max(1, len(ordered_seg_ids))) * seg_len
-                            )
-                        elif style == "quad_bri_gradient":
-                            # Brightness "around" the tree
-                            base = int(brightness)
-                            # A simple 4-phase wave
-                            phase = (si % max(1, len(ordered_seg_ids))) / max(
-                                1.0, float(len(ordered_seg_ids))
-                            )
-                            seg_obj["bri"] = max(
-                                0,
-                                min(
-                                    255,
-                                    int(
-                                        base
-                                        * (
-                                            0.35
-                                            + 0.65
-                                            * (
-                                                0.5
-                                                + 0.5 * math.sin(2.0 * math.pi * phase)
-                                            )
-                                        )
-                                    ),
-                                ),
-                            )
-                        elif style == "opposite_pairs":
-                            # (0,2) share colors; (1,3) share colors
-                            pair = si % 2
-                            seg_obj["col"] = [
-                                [x[0], x[1], x[2]] for x in csets[pair][:3]
-                            ]
-                            seg_obj["rev"] = bool(pair == 1)
-                        elif style == "spotlight":
-                            # Pick a "spot" segment; dim others
-                            spot = int(
-                                self.rng.randrange(0, max(1, len(ordered_seg_ids)))
-                            )
-                            seg_obj["bri"] = (
-                                int(brightness)
-                                if si == spot
-                                else max(0, int(brightness * 0.15))
-                            )
-                            seg_obj["on"] = True
-                        elif style == "street_spotlight_front":
-                            # Bias spotlight to the street-facing quadrant.
-                            # If ordered_seg_ids starts at street-right and goes counterclockwise,
-                            # then the street-facing quadrant is the last one.
-                            spot = max(0, len(ordered_seg_ids) - 1)
-                            seg_obj["bri"] = (
-                                int(brightness)
-                                if si == spot
-                                else max(0, int(brightness * 0.15))
-                            )
-                            seg_obj["on"] = True
-                        elif style == "street_spotlight_right":
-                            # Bias spotlight to the street-right quadrant (first in ordered_seg_ids).
-                            spot = 0
-                            seg_obj["bri"] = (
-                                int(brightness)
-                                if si == spot
-                                else max(0, int(brightness * 0.15))
-                            )
-                            seg_obj["on"] = True
-
-                        seg_list.append(seg_obj)
-
-                    spec = {
-                        "type": "wled_look",
-                        "theme": theme,
-                        "effect": eff,
-                        "palette": pal,
-                        "bri": brightness,
-                        "transition": 0,
-                        "seg": seg_list,
-                        "tags": ["multi_segment", style],
-                    }
-
-                    key = f"ms|{style}|{theme}|{pal}|" + "|".join(
-                        [
-                            f"{s['id']}:{s['fx']}:{s['pal']}:{s['sx']}:{s['ix']}:{s.get('rev')}:{s['col']}"
-                            for s in seg_list
-                        ]
-                    )
-                    if key in seen:
-                        continue
-                    seen.add(key)
-                    name = f"{theme}:MS {eff} [{pal}]"
-                    look_id = _stable_id(
-                        "ms", theme, style, eff, pal, str(len(seg_list))
-                    )
-                    looks.append(
-                        Look(
-                            id=look_id,
-                            name=name,
-                            theme=theme,
-                            tags=["multi_segment", style],
-                            spec=spec,
-                        )
+            )
+            if include_multi_segment and len(seg_ids) >= 2 and produced < total:
+                yield from _emit(
+                    self._iter_multi_segment_looks(
+                        theme,
+                        banks,
+                        target=target,
+                        brightness=brightness,
+                        seg_ids=seg_ids,
+                        seen=seen,
+                        check_cancel=_check_cancel,
                     )
-                    ms_target -= 1
-                    if progress_cb and (len(looks) % progress_every == 0):
-                        _report(f"Generating looks… ({len(looks)}/{total})")
+                )
 
         # If still short (e.g., too few effects), top up from any theme
         attempts = 0
-        while len(looks) < total and attempts < total * 50:
+        while produced < total and attempts < total * 50:
             _check_cancel()
             attempts += 1
-            theme = self.rng.choice(list(themes))
-            colorsets = self.colors.get(
-                theme, self.colors.get("classic", [])
-            ) or self.colors.get("classic", [])
-            effs = self._pick_effects(theme)
-            pals = self._pick_palettes(theme)
-            eff = self.rng.choice(effs)
-            pal = self.rng.choice(pals) if pals else "Default"
-            colors = self.rng.choice(colorsets)
-            sx = self.rng.choice(speeds)
-            ix = self.rng.choice(intensities)
-            sv = self.rng.choice(seg_var)
-            tr = self.rng.choice(transitions)
-            spec = {
-                "type": "wled_look",
-                "theme": theme,
-                "effect": eff,
-                "palette": pal,
-                "bri": brightness,
-                "transition": tr,
-                "seg": {
-                    "id": 0,
-                    "fx": eff,
-                    "pal": pal,
-                    "sx": sx,
-                    "ix": ix,
-                    "col": [[c[0], c[1], c[2]] for c in colors[:3]],
-                    **sv,
-                },
-                "tags": [],
-            }
-            key = f"{theme}|{eff}|{pal}|{sx}|{ix}|{tr}|{sv.get('rev')}|{sv.get('grp')}|{sv.get('spc')}|{spec['seg']['col']}"
+            key, look = self._top_up_look(self.rng.choice(list(themes)), brightness)
             if key in seen:
                 continue
             seen.add(key)
-            name = f"{theme}:{eff} [{pal}] sx{sx} ix{ix}"
-            look_id = _stable_id(
-                theme,
-                eff,
-                pal,
-                str(sx),
-                str(ix),
-                str(tr),
-                str(sv.get("rev")),
-                str(sv.get("grp")),
-                str(sv.get("spc")),
-            )
-            looks.append(Look(id=look_id, name=name, theme=theme, tags=[], spec=spec))
-            if progress_cb and (len(looks) % progress_every == 0):
-                _report(f"Generating looks… ({len(looks)}/{total})")
+            yield from _emit((look,))
 
         _report("Finalizing…")
-        return looks
+
+    def iter_theme(
+        self,
+        theme: str,
+        *,
+        target: int,
+        brightness: int = 180,
+        include_multi_segment: bool = False,
+        segment_ids: Optional[Sequence[int]] = None,
+        cancel_cb: Callable[[], bool] | None = None,
+    ) -> Iterator[Look]:
+        """
+        Yield one theme's share of a pack (`target` looks plus multi-segment extras)
+        without reference to any other theme, so themes can be generated in parallel.
+        Seed the generator with `theme_seed()` to keep shards reproducible.
+        """
+        brightness = _clamp8(brightness)
+        seg_ids = list(segment_ids) if segment_ids else [0]
+        seen: set[str] = set()
+
+        def _check_cancel() -> None:
+            if cancel_cb and cancel_cb():
+                raise JobCanceled("Job canceled")
+
+        banks = self._theme_banks(theme)
+        made = 0
+        for look in self._iter_theme_looks(
+            theme,
+            banks,
+            target=target,
+            have=0,
+            brightness=brightness,
+            seen=seen,
+            check_cancel=_check_cancel,
+        ):
+            made += 1
+            yield look
+        if include_multi_segment and len(seg_ids) >= 2:
+            for look in self._iter_multi_segment_looks(
+                theme,
+                banks,
+                target=target,
+                brightness=brightness,
+                seg_ids=seg_ids,
+                seen=seen,
+                check_cancel=_check_cancel,
+            ):
+                made += 1
+                yield look
+
+        attempts = 0
+        while made < target and attempts < target * 50:
+            _check_cancel()
+            attempts += 1
+            key, look = self._top_up_look(theme, brightness)
+            if key in seen:
+                continue
+            seen.add(key)
+            made += 1
+            yield look
+
+    def generate(
+        self,
+        *,
+        total: int,
+        themes: Sequence[str],
+        brightness: int = 180,
+        include_multi_segment: bool = False,
+        segment_ids: Optional[Sequence[int]] = None,
+        progress_cb: Callable[[int, int, str], None] | None = None,
+        cancel_cb: Callable[[], bool] | None = None,
+    ) -> List[Look]:
+        """
+        Generate up to `total` looks, distributed across `themes`.
+
+        This implementation is intentionally streaming (no huge Cartesian products in memory);
+        use `iter_generate()` to consume looks as they are produced.
+        """
+        return list(
+            self.iter_generate(
+                total=total,
+                themes=themes,
+                brightness=brightness,
+                include_multi_segment=include_multi_segment,
+                segment_ids=segment_ids,
+                progress_cb=progress_cb,
+                cancel_cb=cancel_cb,
+            )
+        )
 
 
 def look_to_wled_state(
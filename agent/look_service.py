@@ -3,14 +3,23 @@ from __future__ import annotations
 import asyncio
 import multiprocessing as mp
 import random
+import shutil
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Sequence
 
-from look_generator import LookLibraryGenerator, look_to_wled_state
-from pack_io import nowstamp, read_jsonl_async, write_jsonl
+from jobs import JobCanceled
+from look_generator import LookLibraryGenerator, look_to_wled_state, theme_targets
+from pack_io import nowstamp, read_jsonl_async
 from utils.blocking import run_blocking, run_cpu_blocking
-from utils.look_generate import generate_looks_pack, list_look_packs
+from utils.look_generate import (
+    generate_looks_pack,
+    generate_looks_shard,
+    join_look_shards,
+    list_look_packs,
+    look_rows,
+    write_pack_atomic,
+)
 from wled_client import AsyncWLEDClient
 from wled_mapper import WLEDMapper
 
@@ -72,9 +81,14 @@ class LookService:
         seed: int,
         write_files: bool = True,
         include_multi_segment: bool = True,
+        sharded: bool = False,
         progress_cb: Callable[[int, int, str], None] | None = None,
         cancel_cb: Callable[[], bool] | None = None,
     ) -> PackSummary:
+        """
+        Generate a looks pack. `sharded` generates each theme independently on the CPU pool
+        (seeded per theme), so the pack is reproducible but differs from the serial one.
+        """
         try:
             effects = await self.wled.get_effects(refresh=True)
             palettes = await self.wled.get_palettes(refresh=True)
@@ -85,7 +99,23 @@ class LookService:
 
         use_cpu_pool = self._cpu_pool is not None
         handled = False
-        if use_cpu_pool and (progress_cb is not None or cancel_cb is not None):
+        rows: Optional[List[Dict[str, Any]]] = None
+        if sharded:
+            fname, rows, theme_counts = await self._generate_sharded(
+                total_looks=total_looks,
+                themes=themes,
+                brightness=min(self.max_bri, brightness),
+                seed=seed,
+                effects=list(effects),
+                palettes=list(palettes),
+                segments=segments_list,
+                include_multi_segment=include_multi_segment,
+                write_files=write_files,
+                progress_cb=progress_cb,
+                cancel_cb=cancel_cb,
+            )
+            handled = True
+        if not handled and use_cpu_pool and (progress_cb is not None or cancel_cb is not None):
             manager = None
             try:
                 ctx = mp.get_context()
@@ -191,7 +221,7 @@ class LookService:
             )
             handled = True
         if not handled:
-            def _run() -> tuple[str, List[Dict[str, Any]], Dict[str, int]]:
+            def _run() -> tuple[str, Optional[List[Dict[str, Any]]], Dict[str, int]]:
                 gen = LookLibraryGenerator(
                     mapper=self.mapper,
                     seed=seed,
@@ -199,7 +229,7 @@ class LookService:
                     palettes=list(palettes),
                     segments=segments_list,
                 )
-                looks = gen.generate(
+                looks = gen.iter_generate(
                     total=total_looks,
                     themes=themes,
                     brightness=min(self.max_bri, brightness),
@@ -209,29 +239,126 @@ class LookService:
                     cancel_cb=cancel_cb,
                 )
 
-                rows: List[Dict[str, Any]] = []
                 theme_counts: Dict[str, int] = {}
-                for look in looks:
-                    row = dict(look.spec)
-                    row["id"] = look.id
-                    row["name"] = look.name
-                    row["theme"] = look.theme
-                    row["tags"] = look.tags
-                    rows.append(row)
-                    theme_counts[look.theme] = theme_counts.get(look.theme, 0) + 1
-
                 fname = f"looks_pack_{nowstamp()}.jsonl"
                 if write_files:
-                    write_jsonl(self._pack_path(fname), rows)
-                return fname, rows, theme_counts
+                    write_pack_atomic(
+                        self._pack_path(fname), look_rows(looks, theme_counts)
+                    )
+                    return fname, None, theme_counts
+                return fname, list(look_rows(looks, theme_counts)), theme_counts
 
             fname, rows, theme_counts = await run_blocking(self._blocking, _run)
 
-        # Cache (event-loop thread only).
-        self._cache[fname] = rows
-        self._cache_theme_index[fname] = self._build_theme_index(rows)
+        # Cache (event-loop thread only). Packs streamed to disk load lazily.
+        if rows is not None:
+            self._cache[fname] = rows
+            self._cache_theme_index[fname] = self._build_theme_index(rows)
+        else:
+            self._cache.pop(fname, None)
+            self._cache_theme_index.pop(fname, None)
+
+        return PackSummary(
+            file=fname, total=sum(theme_counts.values()), themes=theme_counts
+        )
 
-        return PackSummary(file=fname, total=len(rows), themes=theme_counts)
+    async def _generate_sharded(
+        self,
+        *,
+        total_looks: int,
+        themes: Sequence[str],
+        brightness: int,
+        seed: int,
+        effects: List[str],
+        palettes: List[str],
+        segments: List[Dict[str, Any]],
+        include_multi_segment: bool,
+        write_files: bool,
+        progress_cb: Callable[[int, int, str], None] | None,
+        cancel_cb: Callable[[], bool] | None,
+    ) -> tuple[str, Optional[List[Dict[str, Any]]], Dict[str, int]]:
+        # One shard per distinct theme; repeated themes merge their targets.
+        plan: Dict[str, int] = {}
+        for theme, target in theme_targets(total_looks, themes):
+            plan[theme] = plan.get(theme, 0) + target
+
+        fname = f"looks_pack_{nowstamp()}.jsonl"
+        parts_dir = self._looks_dir() / f".{fname}.parts" if write_files else None
+        part_paths = (
+            [str(parts_dir / f"{i:04d}.jsonl") for i in range(len(plan))]
+            if parts_dir is not None
+            else []
+        )
+
+        workers = 1
+        stats = getattr(self._cpu_pool, "stats", None)
+        if stats is not None:
+            workers = int((await stats()).max_workers)
+        slots = asyncio.Semaphore(max(1, workers))
+        aborted = False
+
+        async def _shard(i: int, theme: str, target: int) -> Any:
+            async with slots:
+                if aborted:
+                    raise JobCanceled("Job canceled")
+                return await run_cpu_blocking(
+                    self._cpu_pool,
+                    generate_looks_shard,
+                    theme=theme,
+                    target=target,
+                    seed=seed,
+                    brightness=brightness,
+                    effects=effects,
+                    palettes=palettes,
+                    segments=segments,
+                    include_multi_segment=include_multi_segment,
+                    segment_ids=self.segment_ids or [0],
+                    out_path=part_paths[i] if part_paths else None,
+                )
+
+        tasks = {
+            asyncio.create_task(_shard(i, theme, target)): theme
+            for i, (theme, target) in enumerate(plan.items())
+        }
+        results: Dict[str, Any] = {}
+        produced = 0
+        try:
+            if progress_cb is not None:
+                progress_cb(0, int(total_looks), "Starting…")
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=0.2, return_when=asyncio.FIRST_COMPLETED
+                )
+                if cancel_cb is not None and cancel_cb():
+                    raise JobCanceled("Job canceled")
+                for task in done:
+                    theme = tasks[task]
+                    results[theme] = task.result()
+                    produced += int(results[theme][1])
+                    if progress_cb is not None:
+                        progress_cb(
+                            produced,
+                            int(total_looks),
+                            f"Theme: {theme} ({len(results)}/{len(plan)})",
+                        )
+
+            theme_counts = {theme: int(results[theme][1]) for theme in plan}
+            if parts_dir is None:
+                rows = [row for theme in plan for row in results[theme][0]]
+                return fname, rows, theme_counts
+            await run_blocking(
+                self._blocking, join_look_shards, part_paths, self._pack_path(fname)
+            )
+            return fname, None, theme_counts
+        finally:
+            # Let in-flight shards finish so nothing writes into parts_dir after cleanup.
+            aborted = True
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if parts_dir is not None:
+                await run_blocking(
+                    self._blocking, shutil.rmtree, str(parts_dir), ignore_errors=True
+                )
 
     def _build_theme_index(self, rows: List[Dict[str, Any]]) -> Dict[str, List[int]]:
         idx: Dict[str, List[int]] = {}
@@ -12,7 +12,7 @@ class ApplyStateRequest(BaseModel):
 
 
 class GenerateLooksRequest(BaseModel):
-    total_looks: int = Field(800, ge=50, le=5000)
+    total_looks: int = Field(800, ge=50, le=50000)
     themes: List[str] = Field(
         default_factory=lambda: [
             "classic",
@@ -26,6 +26,10 @@ class GenerateLooksRequest(BaseModel):
     seed: int = Field(1337)
     write_files: bool = True
     include_multi_segment: bool = True
+    sharded: bool = Field(
+        False,
+        description="Generate each theme in parallel on the CPU pool with a per-theme seed (reproducible, but a different pack than the serial generator).",
+    )
 
 
 class ApplyRandomLookRequest(BaseModel):
@@ -44,6 +48,35 @@ class ImportPresetsRequest(BaseModel):
     save_bounds: bool = True
 
 
+class DDPAudioReactiveRequest(BaseModel):
+    source: str = Field(
+        "file",
+        description="file (played in real time; WAV directly, else ffmpeg), fifo or udp (raw s16le mono).",
+    )
+    path: Optional[str] = Field(
+        default=None, description="file/fifo path relative to DATA_DIR."
+    )
+    host: str = Field("127.0.0.1", description="udp: local address to bind.")
+    port: int = Field(7777, ge=1, le=65535, description="udp: local port to bind.")
+    sample_rate_hz: int = Field(
+        44100, ge=8000, le=192000, description="fifo/udp rate (and ffmpeg output rate)."
+    )
+    hop: int = Field(512, ge=64, le=8192, description="Samples per analysis hop.")
+    fft_size: int = Field(1024, ge=128, le=16384, description="Power of two >= hop.")
+    bands_hz: List[float] = Field(
+        default_factory=lambda: [20.0, 120.0, 400.0, 1200.0, 4000.0, 12000.0],
+        description="Band edges in Hz (N edges give N-1 bands: band0, band1, ...).",
+    )
+    mapping: Optional[Dict[str, Dict[str, Any]]] = Field(
+        default=None,
+        description='Param (or "brightness") -> {"feature": level|bandN|onset|pulse, "min", "max"}. '
+        "Default: brightness follows level (0.3..1.0).",
+    )
+    max_backlog_s: float = Field(
+        0.1, ge=0.01, le=2.0, description="udp: audio queued before old datagrams drop."
+    )
+
+
 class DDPStartRequest(BaseModel):
     pattern: str
     params: Dict[str, Any] = Field(default_factory=dict)
@@ -56,6 +89,9 @@ class DDPStartRequest(BaseModel):
     start_pos: Optional[str] = Field(
         default=None, description="Start position from street: front/right/back/left"
     )
+    audio: Optional[DDPAudioReactiveRequest] = Field(
+        default=None, description="Optional live audio input driving pattern params."
+    )
 
 
 class GoCrazyRequest(BaseModel):
@@ -263,6 +299,78 @@ class FSEQExportRequest(BaseModel):
         description="Optional LED count to render; defaults to WLED reported led_count.",
     )
     default_brightness: int = Field(128, ge=1, le=255)
+    fseq_version: int = Field(
+        1, ge=1, le=2, description="1 = uncompressed v1, 2 = v2 with compressed blocks."
+    )
+    compression: str = Field(
+        "zstd",
+        description="FSEQ v2 block compression: zstd, zlib or none (zstd falls back to zlib).",
+    )
+    frames_per_block: int = Field(
+        0, ge=0, le=10000, description="FSEQ v2 frames per compressed block (0 = auto)."
+    )
+    sparse: bool = Field(
+        False,
+        description="FSEQ v2: store only this prop's channels as a sparse range.",
+    )
+    use_cache: bool = Field(
+        True,
+        description="Reuse cached frames of unchanged steps (FSEQ_CHUNK_CACHE_ENABLED).",
+    )
+
+
+class FSEQShowExportRequest(BaseModel):
+    config_file: str = Field(
+        ..., description="Show config path relative to DATA_DIR (e.g. show/show_config.json)"
+    )
+    sequence_file: Optional[str] = Field(
+        default=None,
+        description="Sequence JSON under DATA_DIR/sequences for props without their own entry.",
+    )
+    prop_sequences: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Per-prop sequence JSON files under DATA_DIR/sequences (prop id -> file).",
+    )
+    prop_ids: Optional[List[str]] = Field(
+        default=None, description="Optional subset of prop ids to render (default: all)."
+    )
+    out_file: str = Field(
+        "fseq/show.fseq", description="Output path relative to DATA_DIR."
+    )
+    step_ms: int = Field(50, ge=10, le=255)
+    channels_total: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Optional total channel count; defaults to the highest prop channel.",
+    )
+    default_brightness: int = Field(128, ge=1, le=255)
+    fseq_version: int = Field(2, ge=1, le=2)
+    compression: str = Field(
+        "zstd", description="FSEQ v2 block compression: zstd, zlib or none."
+    )
+    frames_per_block: int = Field(0, ge=0, le=10000)
+    sparse: bool = Field(
+        True, description="FSEQ v2: store only the props' channel ranges."
+    )
+    use_cache: bool = True
+
+
+class FSEQPlayRequest(BaseModel):
+    file: str = Field(
+        ..., description="FSEQ path relative to DATA_DIR (e.g. fseq/out.fseq)."
+    )
+    channel_start: int = Field(
+        1, ge=1, description="1-based channel of the first LED within the FSEQ."
+    )
+    led_count: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Optional LED count to play; defaults to WLED reported led_count.",
+    )
+    loop: bool = False
+    brightness: Optional[int] = Field(
+        default=None, ge=1, le=255, description="Optional WLED brightness while playing."
+    )
 
 
 class FPPUploadFileRequest(BaseModel):
@@ -301,12 +409,51 @@ class AudioAnalyzeRequest(BaseModel):
     prefer_ffmpeg: bool = True
 
 
+class AudioLibraryAnalyzeRequest(BaseModel):
+    music_dir: str = Field(
+        "music", description="Directory under DATA_DIR scanned recursively for audio."
+    )
+    out_dir: str = Field(
+        "audio/library",
+        description="Beats JSON per file (<out_dir>/<path under music_dir>.json) and index.json.",
+    )
+    force: bool = Field(
+        False, description="Re-analyze files even if their content hash has a result."
+    )
+    workers: Optional[int] = Field(
+        default=None, ge=1, le=64, description="Parallel analyses (default: CPU pool size)."
+    )
+    min_bpm: int = Field(60, ge=20, le=400)
+    max_bpm: int = Field(200, ge=20, le=400)
+    hop_ms: int = Field(10, ge=5, le=100)
+    window_ms: int = Field(50, ge=10, le=500)
+    peak_threshold: float = Field(
+        1.35, ge=0.1, le=10.0, description="Higher means fewer beats detected."
+    )
+    min_interval_s: float = Field(0.20, ge=0.05, le=2.0)
+    prefer_ffmpeg: bool = True
+
+
 class ShowConfigLoadRequest(BaseModel):
     file: str = Field(
         ..., description="Path relative to DATA_DIR (e.g. show/show_config.json)"
     )
 
 
+class ShowStreamStartRequest(BaseModel):
+    config_file: str = Field(
+        ..., description="Show config path relative to DATA_DIR (e.g. show/show_config.json)"
+    )
+    prop_ids: Optional[List[str]] = Field(
+        default=None, description="Optional subset of prop ids to stream (default: all)."
+    )
+    pattern: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    duration_s: float = Field(30.0, ge=0.1, le=600.0)
+    brightness: int = Field(128, ge=1, le=255)
+    fps: Optional[float] = Field(default=None, ge=1.0, le=60.0)
+
+
 class XlightsImportNetworksRequest(BaseModel):
     networks_file: str = Field(
         ..., description="Path relative to DATA_DIR (e.g. xlights/xlights_networks.xml)"
@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from artnet_sender import ArtNetConfig, ArtNetSender
+from ddp_sender import DDPAsyncSender, DDPConfig
+from e131_sender import E131Config, E131Sender
+from frame_pacer import FramePacer, JitterHistogram
+from frame_pool import FramePool
+from geometry import TreeGeometry
+from patterns import PatternFactory
+from show_config import ShowConfig
+from utils.blocking import run_blocking
+
+_DEFAULT_PORTS = {"ddp": 4048, "e131": 5568, "artnet": 6454}
+
+
+@dataclass(frozen=True)
+class OutputSpec:
+    id: str
+    protocol: str  # "ddp", "e131" or "artnet"
+    host: str
+    port: int
+    channel_offset: int  # 0-based byte offset into the show frame
+    channel_count: int
+    universe_start: int = 1
+    channels_per_universe: int = 510
+
+
+def _host_from_url(url: str) -> str:
+    raw = str(url or "").strip()
+    if not raw:
+        return ""
+    if "://" not in raw:
+        raw = f"http://{raw}"
+    return str(urlparse(raw).hostname or "")
+
+
+def outputs_from_show_config(
+    cfg: ShowConfig, *, prop_ids: Optional[List[str]] = None
+) -> List[OutputSpec]:
+    """
+    Map `ShowConfig.props` to stream outputs over one shared channel space.
+
+    WLED props go out as DDP to the host in `wled_url`; props with a `pixel`
+    block go out as E1.31/Art-Net. A prop's slice of the frame starts at its
+    `channel_start` (1-based) and spans `channel_count` (or `pixel_count * 3`);
+    props without `channel_start` are packed after the highest channel used so
+    far. Props with no output or unknown size are skipped.
+    """
+    wanted = {str(x) for x in prop_ids} if prop_ids else None
+    out: List[OutputSpec] = []
+    cursor = 0
+    for prop in cfg.props:
+        if wanted is not None and prop.id not in wanted:
+            continue
+        pixel = prop.pixel
+        if prop.kind == "wled":
+            protocol = "ddp"
+            host = _host_from_url(prop.wled_url or "")
+        elif pixel is not None:
+            protocol = str(pixel.protocol or "e131").strip().lower()
+            host = str(pixel.host or "").strip()
+        else:
+            continue
+        if protocol not in _DEFAULT_PORTS or not host:
+            continue
+
+        count = int(prop.channel_count or 0)
+        if count <= 0:
+            pixels = int(prop.pixel_count or (pixel.pixel_count if pixel else 0) or 0)
+            count = pixels * 3
+        if count <= 0:
+            continue
+        offset = (
+            int(prop.channel_start) - 1 if prop.channel_start is not None else cursor
+        )
+        cursor = max(cursor, offset + count)
+        out.append(
+            OutputSpec(
+                id=str(prop.id),
+                protocol=protocol,
+                host=host,
+                port=_DEFAULT_PORTS[protocol],
+                channel_offset=offset,
+                channel_count=count,
+                universe_start=int(pixel.universe_start) if pixel else 1,
+                channels_per_universe=(
+                    int(pixel.channels_per_universe)
+                    if pixel
+                    else int(cfg.channels_per_universe)
+                ),
+            )
+        )
+    return out
+
+
+@dataclass
+class OutputMetrics:
+    id: str
+    protocol: str
+    host: str
+    frames_sent_total: int = 0
+    # Frames skipped because the previous send was still in flight.
+    frames_dropped_total: int = 0
+    errors_total: int = 0
+    last_error: str | None = None
+    send_seconds_sum: float = 0.0
+
+
+@dataclass
+class MultiStreamStatus:
+    running: bool
+    pattern: str | None
+    fps: float | None
+    started_at: float | None
+    frames_rendered: int
+    outputs: int
+    led_count: int
+
+
+@dataclass
+class MultiStreamMetrics:
+    frames_rendered_total: int = 0
+    frames_dropped_total: int = 0
+    render_seconds_sum: float = 0.0
+    render_seconds_count: int = 0
+    frame_interval_p50_s: float | None = None
+    frame_interval_p99_s: float | None = None
+    outputs: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class _OutputLane:
+    """
+    One controller: a private copy of its slice of the frame plus a send task.
+
+    `offer()` copies the slice and wakes the task; if the previous send is
+    still in flight the frame is dropped for this output only, so a slow
+    controller never holds up the render loop or the other outputs.
+    """
+
+    def __init__(self, spec: OutputSpec, sender: Any, *, is_async: bool) -> None:
+        self.spec = spec
+        self.sender = sender
+        self.is_async = bool(is_async)
+        self.buf = bytearray(spec.channel_count)
+        self.metrics = OutputMetrics(id=spec.id, protocol=spec.protocol, host=spec.host)
+        self._ready = asyncio.Event()
+        self._busy = False
+        self.task: asyncio.Task[None] | None = None
+
+    def offer(self, frame: memoryview) -> bool:
+        if self._busy:
+            self.metrics.frames_dropped_total += 1
+            return False
+        off = self.spec.channel_offset
+        self.buf[:] = frame[off : off + self.spec.channel_count]
+        self._busy = True
+        self._ready.set()
+        return True
+
+    async def run(self) -> None:
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            start = time.perf_counter()
+            try:
+                if self.is_async:
+                    await self.sender.send_frame(self.buf)
+                else:
+                    await asyncio.to_thread(self.sender.send_frame, self.buf)
+                self.metrics.frames_sent_total += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.metrics.errors_total += 1
+                self.metrics.last_error = str(e)
+            finally:
+                self.metrics.send_seconds_sum += time.perf_counter() - start
+                self._busy = False
+
+    def close(self) -> None:
+        try:
+            self.sender.close()
+        except Exception:
+            pass
+
+
+class MultiOutputStreamer:
+    """
+    Render a pattern once per frame across the whole show and fan it out.
+
+    Outputs (see `outputs_from_show_config`) each take their channel slice of
+    the shared frame and send it concurrently: DDP on the event loop, E1.31 and
+    Art-Net in worker threads.
+    """
+
+    def __init__(
+        self,
+        *,
+        geometry: TreeGeometry,
+        fps_default: float = 20.0,
+        fps_max: float = 45.0,
+        drop_late_frames: bool = True,
+        max_lag_s: float = 0.25,
+        blocking: Any | None = None,
+        render_backend: str = "python",
+        pacer_spin_s: float = 0.002,
+        ddp_max_pixels_per_packet: int = 480,
+        priority: int = 100,
+        source_name: str = "wled-show-agent",
+        delta: bool = False,
+        delta_keepalive_s: float = 1.0,
+    ) -> None:
+        self.geometry = geometry
+        self.fps_default = fps_default
+        self.fps_max = fps_max
+        self.drop_late_frames = bool(drop_late_frames)
+        self.max_lag_s = max(0.0, float(max_lag_s))
+        self._blocking = blocking
+        self.render_backend = str(render_backend or "python")
+        self.pacer_spin_s = max(0.0, float(pacer_spin_s))
+        self.ddp_max_pixels_per_packet = max(1, int(ddp_max_pixels_per_packet))
+        self.priority = int(priority)
+        self.source_name = str(source_name or "wled-show-agent")
+        self.delta = bool(delta)
+        self.delta_keepalive_s = float(delta_keepalive_s)
+
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._stop = asyncio.Event()
+        self._lanes: List[_OutputLane] = []
+        self._jitter = JitterHistogram()
+        self._status = MultiStreamStatus(
+            running=False,
+            pattern=None,
+            fps=None,
+            started_at=None,
+            frames_rendered=0,
+            outputs=0,
+            led_count=0,
+        )
+        self._metrics = MultiStreamMetrics()
+
+    async def status(self) -> MultiStreamStatus:
+        async with self._lock:
+            return MultiStreamStatus(**self._status.__dict__)
+
+    async def metrics(self) -> MultiStreamMetrics:
+        async with self._lock:
+            out = MultiStreamMetrics(**self._metrics.__dict__)
+            out.frame_interval_p50_s = self._jitter.quantile(0.5)
+            out.frame_interval_p99_s = self._jitter.quantile(0.99)
+            out.outputs = [dict(lane.metrics.__dict__) for lane in self._lanes]
+            return out
+
+    def _make_lane(self, spec: OutputSpec) -> _OutputLane:
+        if spec.protocol == "ddp":
+            sender: Any = DDPAsyncSender(
+                DDPConfig(
+                    host=spec.host,
+                    port=spec.port,
+                    max_pixels_per_packet=self.ddp_max_pixels_per_packet,
+                    delta=self.delta,
+                    keepalive_s=self.delta_keepalive_s,
+                )
+            )
+            return _OutputLane(spec, sender, is_async=True)
+        if spec.protocol == "artnet":
+            sender = ArtNetSender(
+                ArtNetConfig(
+                    host=spec.host,
+                    port=spec.port,
+                    universe_start=spec.universe_start,
+                    channels_per_universe=spec.channels_per_universe,
+                    delta=self.delta,
+                    keepalive_s=self.delta_keepalive_s,
+                )
+            )
+            return _OutputLane(spec, sender, is_async=False)
+        sender = E131Sender(
+            E131Config(
+                host=spec.host,
+                port=spec.port,
+                universe_start=spec.universe_start,
+                channels_per_universe=spec.channels_per_universe,
+                priority=self.priority,
+                source_name=self.source_name,
+                delta=self.delta,
+                keepalive_s=self.delta_keepalive_s,
+            )
+        )
+        return _OutputLane(spec, sender, is_async=False)
+
+    async def stop(self) -> MultiStreamStatus:
+        async with self._lock:
+            if not self._status.running:
+                return MultiStreamStatus(**self._status.__dict__)
+            self._stop.set()
+            task = self._task
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        async with self._lock:
+            self._status.running = False
+            self._status.pattern = None
+            self._status.fps = None
+            self._task = None
+        return await self.status()
+
+    async def start(
+        self,
+        *,
+        outputs: List[OutputSpec],
+        pattern: str,
+        params: Dict[str, Any],
+        duration_s: float,
+        brightness: int,
+        fps: Optional[float] = None,
+    ) -> MultiStreamStatus:
+        if not outputs:
+            raise ValueError(
+                "No streamable outputs (need wled_url or pixel host and a channel count)"
+            )
+        fps_val = float(fps if fps is not None else self.fps_default)
+        fps_val = max(1.0, min(self.fps_max, fps_val))
+        duration_s = max(0.1, float(duration_s))
+        brightness = max(0, min(255, int(brightness)))
+
+        await self.stop()
+
+        frame_len = max(o.channel_offset + o.channel_count for o in outputs)
+        led_count = (frame_len + 2) // 3
+        factory = PatternFactory(
+            led_count=led_count,
+            geometry=self.geometry,
+            segment_layout=None,
+            backend=self.render_backend,
+        )
+        pat = factory.create(pattern, params=params or {})
+        lanes = [self._make_lane(spec) for spec in outputs]
+
+        self._stop.clear()
+        async with self._lock:
+            self._lanes = lanes
+            self._jitter.reset()
+            self._status = MultiStreamStatus(
+                running=True,
+                pattern=pattern,
+                fps=fps_val,
+                started_at=time.time(),
+                frames_rendered=0,
+                outputs=len(lanes),
+                led_count=led_count,
+            )
+            self._task = asyncio.create_task(
+                self._run_stream(
+                    pat=pat,
+                    lanes=lanes,
+                    duration_s=duration_s,
+                    brightness=brightness,
+                    fps_val=fps_val,
+                )
+            )
+            return MultiStreamStatus(**self._status.__dict__)
+
+    async def _run_stream(
+        self,
+        *,
+        pat: Any,
+        lanes: List[_OutputLane],
+        duration_s: float,
+        brightness: int,
+        fps_val: float,
+    ) -> None:
+        frames = FramePool(int(pat.ctx.led_count) * 3)
+        for lane in lanes:
+            lane.task = asyncio.create_task(lane.run())
+        frame_idx = 0
+        try:
+            frame_period = 1.0 / fps_val
+            pacer = FramePacer(
+                frame_period, spin_s=self.pacer_spin_s, jitter=self._jitter
+            )
+            start_ts = pacer.start()
+            while not self._stop.is_set():
+                now = await pacer.wait_async(self._stop)
+                if self._stop.is_set() or now >= (start_ts + duration_s):
+                    break
+                dropped = (
+                    pacer.skip_late(now, self.max_lag_s) if self.drop_late_frames else 0
+                )
+                render_start = time.perf_counter()
+                rgb = frames.acquire()
+                try:
+                    await run_blocking(
+                        self._blocking,
+                        pat.frame_into,
+                        rgb,
+                        0,
+                        t=now - start_ts,
+                        frame_idx=frame_idx,
+                        brightness=brightness,
+                    )
+                except Exception:
+                    async with self._lock:
+                        self._metrics.frames_dropped_total += 1 + int(dropped)
+                    pacer.skip()
+                    continue
+                render_s = time.perf_counter() - render_start
+                view = memoryview(rgb)
+                for lane in lanes:
+                    lane.offer(view)
+                frame_idx += 1
+                async with self._lock:
+                    self._status.frames_rendered = frame_idx
+                    self._metrics.frames_rendered_total += 1
+                    self._metrics.frames_dropped_total += int(dropped)
+                    self._metrics.render_seconds_sum += float(render_s)
+                    self._metrics.render_seconds_count += 1
+                pacer.tick()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            for lane in lanes:
+                if lane.task is not None:
+                    lane.task.cancel()
+            await asyncio.gather(
+                *(lane.task for lane in lanes if lane.task is not None),
+                return_exceptions=True,
+            )
+            for lane in lanes:
+                lane.close()
+            async with self._lock:
+                self._status.running = False
+                self._status.pattern = None
+                self._status.fps = None
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import math
 import random
+from array import array
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from geometry import TreeGeometry
@@ -66,6 +68,87 @@ def scale_rgb(rgb: Tuple[int, int, int], bri: int) -> Tuple[int, int, int]:
     return (clamp8(rgb[0] * s), clamp8(rgb[1] * s), clamp8(rgb[2] * s))
 
 
+@dataclass(frozen=True)
+class PixelTables:
+    """
+    Read-only per-pixel lookup tables for one strip shape.
+
+    - angle/y: cylindrical coords (`TreeGeometry.coords`), empty when geometry is disabled
+    - seg_order/seg_local/seg_len: `_seg_info()` results per pixel
+    """
+
+    led_count: int
+    seg_count: int
+    angle: memoryview
+    y: memoryview
+    seg_order: memoryview
+    seg_local: memoryview
+    seg_len: memoryview
+
+
+def _frozen_array(typecode: str, values: Any) -> memoryview:
+    return memoryview(array(typecode, values).tobytes()).cast(typecode)
+
+
+def _layout_key(layout: SegmentLayout | None) -> Tuple[Tuple[int, int, int], ...]:
+    if layout is None or not layout.segments:
+        return ()
+    return tuple((int(s.id), int(s.start), int(s.stop)) for s in layout.segments)
+
+
+@lru_cache(maxsize=16)
+def _build_pixel_tables(
+    led_count: int,
+    geometry: TreeGeometry,
+    geometry_enabled: bool,
+    layout_key: Tuple[Tuple[int, int, int], ...],
+) -> PixelTables:
+    n = max(0, int(led_count))
+    layout = None
+    if layout_key:
+        from segment_layout import SegmentRange
+
+        layout = SegmentLayout(
+            led_count=n,
+            segments=[SegmentRange(id=a, start=b, stop=c) for a, b, c in layout_key],
+            kind="unknown",
+        )
+    ctx = RenderContext(
+        led_count=n,
+        geometry=geometry,
+        geometry_enabled=geometry_enabled,
+        segment_layout=layout,
+    )
+
+    angle = array("d")
+    y = array("d")
+    if geometry_enabled:
+        for i in range(n):
+            a, yy, _ = geometry.coords(i)
+            angle.append(a)
+            y.append(yy)
+
+    seg_order = array("i")
+    seg_local = array("i")
+    seg_len = array("i")
+    seg_count = _seg_info(ctx, 0)[1]
+    for i in range(n):
+        o, _, lo, ln = _seg_info(ctx, i)
+        seg_order.append(o)
+        seg_local.append(lo)
+        seg_len.append(ln)
+
+    return PixelTables(
+        led_count=n,
+        seg_count=int(seg_count),
+        angle=_frozen_array("d", angle),
+        y=_frozen_array("d", y),
+        seg_order=_frozen_array("i", seg_order),
+        seg_local=_frozen_array("i", seg_local),
+        seg_len=_frozen_array("i", seg_len),
+    )
+
+
 @dataclass
 class RenderContext:
     led_count: int
@@ -73,6 +156,22 @@ class RenderContext:
     geometry_enabled: bool
     segment_layout: SegmentLayout | None = None
 
+    @property
+    def tables(self) -> PixelTables:
+        """
+        Per-pixel tables, built once per strip shape and process.
+
+        They are cached at module level rather than stored on the context so a
+        pattern pickled to the CPU pool stays small; each worker builds its
+        own copy on first use.
+        """
+        return _build_pixel_tables(
+            int(self.led_count),
+            self.geometry,
+            bool(self.geometry_enabled),
+            _layout_key(self.segment_layout),
+        )
+
 
 class Pattern:
     name: str = "pattern"
@@ -86,6 +185,36 @@ class Pattern:
     def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
         raise NotImplementedError
 
+    def frame_into(
+        self,
+        buf: Any,
+        offset: int = 0,
+        *,
+        t: float,
+        frame_idx: int,
+        brightness: int,
+    ) -> int:
+        """
+        Render one frame into `buf[offset : offset + led_count * 3]`.
+
+        `buf` is any writable buffer (bytearray, memoryview, mmap). Returns the
+        number of bytes written. The default copies `frame()` once; array
+        backends override it to write in place.
+        """
+        n = int(self.ctx.led_count) * 3
+        rgb = self.frame(t=t, frame_idx=frame_idx, brightness=brightness)
+        with memoryview(buf) as view:
+            dst = view[int(offset) : int(offset) + n]
+            if len(dst) != n:
+                raise ValueError("buffer too small for frame")
+            if len(rgb) == n:
+                dst[:] = rgb
+            else:
+                m = min(n, len(rgb))
+                dst[:m] = rgb[:m]
+                dst[m:] = bytes(n - m)
+        return n
+
 
 # -----------------------
 #  Basic patterns
@@ -299,8 +428,9 @@ class CandySpiral(Pattern):
                 out[j : j + 3] = bytes(c)
             return bytes(out)
 
+        tb = self.ctx.tables
         for i in range(n):
-            ang, y, _ = self.ctx.geometry.coords(i)
+            ang, y = tb.angle[i], tb.y[i]
             # helical coordinate
             phase = (
                 (ang / (2.0 * math.pi))
@@ -341,8 +471,9 @@ class VerticalWipe(Pattern):
 
         head_y = (t * speed) % 1.0
         feather = float(self.params.get("feather", 0.03))
+        ys = self.ctx.tables.y
         for i in range(n):
-            _, y, _ = self.ctx.geometry.coords(i)
+            y = ys[i]
             if y <= head_y:
                 c = color
             else:
@@ -384,9 +515,10 @@ class Plasma(Pattern):
         n = self.ctx.led_count
         out = bytearray(n * 3)
         speed = float(self.params.get("speed", 0.5))
+        tb = self.ctx.tables
         for i in range(n):
             if self.ctx.geometry_enabled:
-                ang, y, _ = self.ctx.geometry.coords(i)
+                ang, y = tb.angle[i], tb.y[i]
                 x = ang / (2.0 * math.pi)
             else:
                 x = i / max(1, n)
@@ -469,9 +601,10 @@ class Aurora(Pattern):
         n = self.ctx.led_count
         out = bytearray(n * 3)
         speed = float(self.params.get("speed", 0.18))
+        tb = self.ctx.tables
         for i in range(n):
             if self.ctx.geometry_enabled:
-                ang, y, _ = self.ctx.geometry.coords(i)
+                ang, y = tb.angle[i], tb.y[i]
                 x = ang / (2 * math.pi)
             else:
                 x = i / max(1, n)
@@ -630,8 +763,9 @@ class BarberPole(Pattern):
                 out[j : j + 3] = bytes(c)
             return bytes(out)
 
+        tb = self.ctx.tables
         for i in range(n):
-            ang, y, _ = self.ctx.geometry.coords(i)
+            ang, y = tb.angle[i], tb.y[i]
             phase = (ang / (2.0 * math.pi)) + y * twist + t * speed
             v = (phase * stripes) % 1.0
             c = c1 if v < 0.5 else c2
@@ -648,9 +782,10 @@ class SpiralRainbow(Pattern):
         twist = float(self.params.get("twist", 1.4))
         out = bytearray(self.ctx.led_count * 3)
         n = self.ctx.led_count
+        tb = self.ctx.tables
         for i in range(n):
             if self.ctx.geometry_enabled:
-                ang, y, _ = self.ctx.geometry.coords(i)
+                ang, y = tb.angle[i], tb.y[i]
                 base = (ang / (2.0 * math.pi)) + y * twist + t * speed
             else:
                 base = (i / max(1, n)) * twist + t * speed
@@ -677,9 +812,10 @@ class FireFlicker(Pattern):
         n = self.ctx.led_count
         out = bytearray(n * 3)
         speed = float(self.params.get("speed", 2.0))
+        ys = self.ctx.tables.y
         for i in range(n):
             if self.ctx.geometry_enabled:
-                _, y, _ = self.ctx.geometry.coords(i)
+                y = ys[i]
                 heat = max(0.0, 1.0 - y)  # hotter at bottom
             else:
                 heat = 1.0 - (i / max(1, n))
@@ -709,9 +845,10 @@ class PulseRings(Pattern):
         out = bytearray(self.ctx.led_count * 3)
         n = self.ctx.led_count
 
+        ys = self.ctx.tables.y
         for i in range(n):
             if self.ctx.geometry_enabled:
-                _, y, _ = self.ctx.geometry.coords(i)
+                y = ys[i]
             else:
                 y = i / max(1, n)
             v = 0.5 + 0.5 * math.sin(2.0 * math.pi * (y * rings - t * speed))
@@ -748,8 +885,9 @@ class LaserSweep(Pattern):
             return bytes(out)
 
         head = (t * speed) % 1.0
+        angles = self.ctx.tables.angle
         for i in range(n):
-            ang, _, _ = self.ctx.geometry.coords(i)
+            ang = angles[i]
             x = (ang / (2.0 * math.pi)) % 1.0
             d = abs(x - head)
             d = min(d, 1.0 - d)  # wrap
@@ -902,11 +1040,12 @@ class QuadChase(Pattern):
         # active segment is int(phase) but we do smooth spill based on distance
         # (this looks good even if you have >4 segments)
         # Determine seg_count from layout if present
-        _, seg_count, _, _ = _seg_info(self.ctx, 0)
+        tb = self.ctx.tables
+        seg_count = sc = tb.seg_count
         phase = (t * speed + phase_offset) % max(1.0, float(seg_count))
 
         for i in range(n):
-            seg_order, sc, _, _ = _seg_info(self.ctx, i, default_segments=seg_count)
+            seg_order = tb.seg_order[i]
 
             # distance on a ring (0 is active)
             d = abs((seg_order - phase) % sc)
@@ -931,13 +1070,11 @@ class OppositePulse(Pattern):
         n = self.ctx.led_count
         out = bytearray(n * 3)
 
-        _, seg_count, _, _ = _seg_info(self.ctx, 0)
-        seg_count = max(2, seg_count)
-
         p = 0.5 * (1.0 + math.sin(2.0 * math.pi * freq * t))  # 0..1
 
+        orders = self.ctx.tables.seg_order
         for i in range(n):
-            seg_order, sc, _, _ = _seg_info(self.ctx, i, default_segments=seg_count)
+            seg_order = orders[i]
             # even vs odd segments
             w = p if (seg_order % 2 == 0) else (1.0 - p)
             hue = 0.0 if (seg_order % 2 == 0) else 0.33
@@ -961,11 +1098,11 @@ class QuadTwinkle(Pattern):
         n = self.ctx.led_count
         out = bytearray(n * 3)
 
-        _, seg_count, _, _ = _seg_info(self.ctx, 0)
-        seg_count = max(1, seg_count)
+        tb = self.ctx.tables
+        sc = tb.seg_count
 
         for i in range(n):
-            seg_order, sc, _, _ = _seg_info(self.ctx, i, default_segments=seg_count)
+            seg_order = tb.seg_order[i]
             base_h = (seg_order / max(1.0, float(sc))) % 1.0
 
             r = _hash01(i, seed)
@@ -996,13 +1133,13 @@ class QuadComets(Pattern):
         n = self.ctx.led_count
         out = bytearray(n * 3)
 
-        _, seg_count, _, seg_len0 = _seg_info(self.ctx, 0)
-        seg_count = max(1, seg_count)
+        tb = self.ctx.tables
+        sc = tb.seg_count
 
         for i in range(n):
-            seg_order, sc, local, seg_len = _seg_info(
-                self.ctx, i, default_segments=seg_count
-            )
+            seg_order = tb.seg_order[i]
+            local = tb.seg_local[i]
+            seg_len = tb.seg_len[i]
             head = (t * speed * seg_len) % max(1.0, float(seg_len))
             d = local - head
             if d < 0:
@@ -1031,13 +1168,13 @@ class QuadSpiral(Pattern):
         n = self.ctx.led_count
         out = bytearray(n * 3)
 
-        _, seg_count, _, _ = _seg_info(self.ctx, 0)
-        seg_count = max(1, seg_count)
+        tb = self.ctx.tables
+        sc = tb.seg_count
 
         for i in range(n):
-            seg_order, sc, _, _ = _seg_info(self.ctx, i, default_segments=seg_count)
+            seg_order = tb.seg_order[i]
             if self.ctx.geometry_enabled:
-                angle, y, _ = self.ctx.geometry.coords(i)
+                angle, y = tb.angle[i], tb.y[i]
                 theta = (angle / (2.0 * math.pi)) % 1.0
             else:
                 theta = (i / max(1.0, float(n))) % 1.0
@@ -1101,26 +1238,66 @@ PATTERN_REGISTRY: Dict[str, type[Pattern]] = {
 }
 
 
+RENDER_BACKENDS = ("python", "numpy")
+
+
+def normalize_render_backend(val: str | None) -> str:
+    s = str(val or "").strip().lower()
+    return s if s in RENDER_BACKENDS else "python"
+
+
+def _vector_registry() -> Dict[str, type[Pattern]]:
+    # NumPy is optional; without it every pattern renders on the scalar path.
+    try:
+        from patterns_numpy import VECTOR_PATTERN_REGISTRY
+    except Exception:
+        return {}
+    return VECTOR_PATTERN_REGISTRY
+
+
+def numpy_backend_available() -> bool:
+    return bool(_vector_registry())
+
+
 class PatternFactory:
     def __init__(
         self,
         led_count: int,
         geometry: TreeGeometry,
         segment_layout: SegmentLayout | None = None,
+        backend: str = "python",
     ) -> None:
         self.led_count = led_count
         self.geometry = geometry
         self.segment_layout = segment_layout
+        self.backend = normalize_render_backend(backend)
 
     def available(self) -> List[str]:
         return sorted(PATTERN_REGISTRY.keys())
 
-    def create(self, name: str, params: Optional[Dict[str, Any]] = None) -> Pattern:
+    def create(
+        self,
+        name: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        backend: str | None = None,
+    ) -> Pattern:
+        """
+        Build a pattern instance.
+
+        backend="numpy" selects the array-backed implementation from
+        `patterns_numpy` when NumPy is installed (same output bytes); patterns
+        without a vector implementation, or hosts without NumPy, fall back to
+        the scalar class.
+        """
         cls = PATTERN_REGISTRY.get(name)
         if cls is None:
             raise ValueError(
                 f"Unknown pattern '{name}'. Available: {', '.join(self.available())}"
             )
+        use = normalize_render_backend(backend) if backend else self.backend
+        if use == "numpy":
+            cls = _vector_registry().get(name, cls)
         ctx = RenderContext(
             led_count=self.led_count,
             geometry=self.geometry,
@@ -0,0 +1,636 @@
+from __future__ import annotations
+
+import math
+import random
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+import patterns as P
+
+
+# NumPy render backend for `patterns` (PatternFactory backend="numpy").
+#
+# Each class subclasses its scalar counterpart, so names, params and defaults
+# live in one place, and overrides `frame()` to compute the whole strip with
+# array ops. Float expressions keep the scalar evaluation order so the output
+# bytes match. Patterns whose scalar `frame()` is already bulk (slice fills) or
+# only touches a few random pixels per frame (solid, strobe, twinkle, confetti,
+# ...) are not overridden and resolve to the scalar class. `frame_into()`
+# points `_emit()` at the caller's buffer so the channels land there directly.
+
+
+# -----------------------
+#  Array helpers
+# -----------------------
+
+
+def _clamp8(x: np.ndarray) -> np.ndarray:
+    return np.clip(np.trunc(x), 0.0, 255.0)
+
+
+def _hsv_to_rgb(h, s, v) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:  # type: ignore[no-untyped-def]
+    h, s, v = np.broadcast_arrays(
+        np.mod(np.asarray(h, dtype=np.float64), 1.0),
+        np.clip(np.asarray(s, dtype=np.float64), 0.0, 1.0),
+        np.clip(np.asarray(v, dtype=np.float64), 0.0, 1.0),
+    )
+    h6 = h * 6.0
+    i = np.trunc(h6)
+    f = h6 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - f * s)
+    t = v * (1.0 - (1.0 - f) * s)
+    sector = i.astype(np.int64) % 6
+    r = np.choose(sector, [v, q, p, p, t, v])
+    g = np.choose(sector, [t, v, v, q, p, p])
+    b = np.choose(sector, [p, p, t, v, v, q])
+    return _clamp8(r * 255.0), _clamp8(g * 255.0), _clamp8(b * 255.0)
+
+
+def _scale(rgb, bri):  # type: ignore[no-untyped-def]
+    """Vector `scale_rgb`; `bri` may be a scalar or a per-pixel array."""
+    bri = np.clip(np.trunc(np.asarray(bri, dtype=np.float64)), 0.0, 255.0)
+    s = bri / 255.0
+    return (_clamp8(rgb[0] * s), _clamp8(rgb[1] * s), _clamp8(rgb[2] * s))
+
+
+def _mix(a, b, t):  # type: ignore[no-untyped-def]
+    """Vector `mix_rgb` between two constant colors."""
+    t = np.clip(t, 0.0, 1.0)
+    return tuple(_clamp8(a[k] + (b[k] - a[k]) * t) for k in range(3))
+
+
+def _select(mask: np.ndarray, a, b):  # type: ignore[no-untyped-def]
+    return tuple(np.where(mask, a[k], b[k]) for k in range(3))
+
+
+def _write(out: np.ndarray, rgb) -> None:  # type: ignore[no-untyped-def]
+    out[:, 0] = rgb[0]
+    out[:, 1] = rgb[1]
+    out[:, 2] = rgb[2]
+
+
+def _pack(rgb, n: int) -> bytes:  # type: ignore[no-untyped-def]
+    out = np.empty((n, 3), dtype=np.uint8)
+    _write(out, rgb)
+    return out.tobytes()
+
+
+def _hash01(i: np.ndarray, seed: int) -> np.ndarray:
+    """Vector `patterns._hash01` (wrapping uint64 keeps the low 48 bits exact)."""
+    x = i.astype(np.uint64) * np.uint64(0x1F123BB5)
+    x ^= np.uint64((int(seed) * 0x9E3779B9) & 0xFFFFFFFFFFFFFFFF)
+    x = (x ^ (x >> np.uint64(16))) & np.uint64(0xFFFFFFFF)
+    x = (x * np.uint64(0x7FEB352D)) & np.uint64(0xFFFFFFFF)
+    x = (x ^ (x >> np.uint64(15))) & np.uint64(0xFFFFFFFF)
+    return (x & np.uint64(0xFFFF)).astype(np.float64) / 65535.0
+
+
+# -----------------------
+#  Per-pixel tables (shared with the scalar path via RenderContext.tables)
+# -----------------------
+
+
+@lru_cache(maxsize=32)
+def _index(n: int) -> np.ndarray:
+    idx = np.arange(n, dtype=np.float64)
+    idx.setflags(write=False)
+    return idx
+
+
+class _VectorMixin:
+    ctx: P.RenderContext
+    # (n, 3) uint8 view of the caller's buffer while `frame_into` is running.
+    _target: Optional[np.ndarray] = None
+
+    def frame_into(
+        self,
+        buf: Any,
+        offset: int = 0,
+        *,
+        t: float,
+        frame_idx: int,
+        brightness: int,
+    ) -> int:
+        n = self._n()
+        target = np.frombuffer(buf, dtype=np.uint8, count=n * 3, offset=int(offset))
+        self._target = target.reshape(n, 3)
+        try:
+            rgb = self.frame(t=t, frame_idx=frame_idx, brightness=brightness)  # type: ignore[attr-defined]
+            if self._target is not None:
+                # frame() did not go through _emit(); copy its result instead.
+                target[:] = np.frombuffer(rgb, dtype=np.uint8, count=n * 3)
+        finally:
+            self._target = None
+        return n * 3
+
+    def _emit(self, rgb) -> bytes:  # type: ignore[no-untyped-def]
+        """Write channels into the `frame_into` target, or pack them to bytes."""
+        out = self._target
+        if out is None:
+            return _pack(rgb, self._n())
+        self._target = None
+        _write(out, rgb)
+        return b""
+
+    def _n(self) -> int:
+        return int(self.ctx.led_count)
+
+    def _idx(self) -> np.ndarray:
+        return _index(self._n())
+
+    def _coords(self) -> Tuple[np.ndarray, np.ndarray]:
+        tb = self.ctx.tables
+        return (
+            np.frombuffer(tb.angle, dtype=np.float64),
+            np.frombuffer(tb.y, dtype=np.float64),
+        )
+
+    def _segs(self) -> Tuple[np.ndarray, int, np.ndarray, np.ndarray]:
+        tb = self.ctx.tables
+        return (
+            np.frombuffer(tb.seg_order, dtype=np.int32),
+            tb.seg_count,
+            np.frombuffer(tb.seg_local, dtype=np.int32),
+            np.frombuffer(tb.seg_len, dtype=np.int32),
+        )
+
+
+def _stripe_1d(idx: np.ndarray, offset: int, band: int) -> np.ndarray:
+    return ((idx.astype(np.int64) + offset) // band) % 2 == 0
+
+
+# -----------------------
+#  Basic patterns
+# -----------------------
+
+
+class RainbowCycle(_VectorMixin, P.RainbowCycle):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        speed = float(self.params.get("speed", 0.07))
+        spread = float(self.params.get("spread", 1.0))
+        n = self._n()
+        base = (t * speed) % 1.0
+        h = (base + (self._idx() / max(1, n)) * spread) % 1.0
+        return self._emit(_scale(_hsv_to_rgb(h, 1.0, 1.0), brightness))
+
+
+class GlitterRainbow(_VectorMixin, P.GlitterRainbow):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        density = float(self.params.get("density", 0.02))
+        rng = random.Random(int(self.params.get("seed", 1337)) + frame_idx)
+        base = RainbowCycle(
+            self.ctx,
+            params={
+                "speed": self.params.get("speed", 0.06),
+                "spread": self.params.get("spread", 1.3),
+            },
+        ).frame(t=t, frame_idx=frame_idx, brightness=brightness)
+        n = self._n()
+        out = np.frombuffer(base, dtype=np.uint8).reshape(n, 3).copy()
+        sparkles = int(n * density)
+        picks = [rng.randrange(0, n) for _ in range(max(1, sparkles))]
+        out[picks] = P.scale_rgb((255, 255, 255), brightness)
+        return self._emit((out[:, 0], out[:, 1], out[:, 2]))
+
+
+class Comet(_VectorMixin, P.Comet):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        speed = float(self.params.get("speed", 220.0))
+        tail = int(self.params.get("tail", 70))
+        color = tuple(self.params.get("color", [255, 255, 255]))
+        base = (int(color[0]), int(color[1]), int(color[2]))
+
+        n = self._n()
+        head = int((t * speed) % max(1, n))
+        d = (head - self._idx().astype(np.int64)) % n
+        lit = d <= tail
+        # amp depends only on the integer distance; build the brightness table
+        # with Python floats so `**` rounds exactly like the scalar path.
+        lut = np.array(
+            [
+                int(brightness * ((1.0 - (k / max(1, tail))) ** 2.0))
+                for k in range(max(0, tail) + 1)
+            ],
+            dtype=np.float64,
+        )
+        bri = np.zeros(n, dtype=np.float64)
+        bri[lit] = lut[d[lit]]
+        rgb = _scale(base, bri)
+        return self._emit(tuple(np.where(lit, c, 0.0) for c in rgb))
+
+
+class TheaterChase(_VectorMixin, P.TheaterChase):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        color = tuple(self.params.get("color", [255, 0, 0]))
+        bg = tuple(self.params.get("bg", [0, 0, 0]))
+        color = P.scale_rgb((int(color[0]), int(color[1]), int(color[2])), brightness)
+        bg = P.scale_rgb((int(bg[0]), int(bg[1]), int(bg[2])), brightness)
+        period = int(self.params.get("period", 3))
+        speed = float(self.params.get("speed", 6.0))
+        phase = int((t * speed) % period)
+        n = self._n()
+        on = (self._idx().astype(np.int64) + phase) % period == 0
+        return self._emit(_select(on, color, bg))
+
+
+# -----------------------
+#  Geometry-aware patterns
+# -----------------------
+
+
+class CandySpiral(_VectorMixin, P.CandySpiral):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        speed = float(self.params.get("speed", 0.5))
+        stripes = int(self.params.get("stripes", 8))
+        red = P.scale_rgb((255, 0, 0), brightness)
+        white = P.scale_rgb((255, 255, 255), brightness)
+        n = self._n()
+
+        if not self.ctx.geometry_enabled:
+            band = max(1, int(self.params.get("band", 12)))
+            offset = int(t * float(self.params.get("scroll", 30.0)))
+            return self._emit(
+                _select(_stripe_1d(self._idx(), offset, band), red, white)
+            )
+
+        ang, y = self._coords()
+        phase = (
+            (ang / (2.0 * math.pi))
+            + (y * float(self.params.get("twist", 1.2)))
+            + (t * speed)
+        )
+        v = (phase * stripes) % 1.0
+        rgb = _select(v < 0.5, red, white)
+        edge = np.abs(v - 0.5) * 2.0
+        rgb = _select(edge < 0.05, P.mix_rgb(red, white, 0.5), rgb)
+        return self._emit(rgb)
+
+
+class VerticalWipe(_VectorMixin, P.VerticalWipe):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        speed = float(self.params.get("speed", 0.25))
+        color = tuple(self.params.get("color", [0, 255, 0]))
+        bg = tuple(self.params.get("bg", [0, 0, 0]))
+        color = P.scale_rgb((int(color[0]), int(color[1]), int(color[2])), brightness)
+        bg = P.scale_rgb((int(bg[0]), int(bg[1]), int(bg[2])), brightness)
+        n = self._n()
+
+        if not self.ctx.geometry_enabled:
+            head = int(((t * speed) % 1.0) * n)
+            return self._emit(_select(self._idx() <= head, color, bg))
+
+        head_y = (t * speed) % 1.0
+        feather = float(self.params.get("feather", 0.03))
+        _, y = self._coords()
+        d = (y - head_y) / max(1e-6, feather)
+        rgb = _select(d < 1.0, _mix(color, bg, d), bg)
+        return self._emit(_select(y <= head_y, color, rgb))
+
+
+class ColorWaves(_VectorMixin, P.ColorWaves):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        speed = float(self.params.get("speed", 0.25))
+        n = self._n()
+        x = self._idx() / max(1, n)
+        w1 = 0.5 + 0.5 * np.sin(2 * math.pi * (x * 3.0 + t * speed))
+        w2 = 0.5 + 0.5 * np.sin(2 * math.pi * (x * 7.0 - t * speed * 0.7))
+        h = (w1 * 0.6 + w2 * 0.4 + t * 0.03) % 1.0
+        v = 0.6 + 0.4 * np.sin(2 * math.pi * (x * 2.0 + t * speed * 0.33))
+        rgb = _hsv_to_rgb(h, 1.0, np.clip(v, 0.0, 1.0))
+        return self._emit(_scale(rgb, brightness))
+
+
+class Plasma(_VectorMixin, P.Plasma):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        n = self._n()
+        speed = float(self.params.get("speed", 0.5))
+        if self.ctx.geometry_enabled:
+            ang, y = self._coords()
+            x = ang / (2.0 * math.pi)
+        else:
+            x = self._idx() / max(1, n)
+            y = x
+        v = (
+            np.sin((x * 10.0 + t * speed) * 2.0)
+            + np.sin((y * 6.0 - t * speed * 0.7) * 2.0)
+            + np.sin((x * 4.0 + y * 4.0 + t * speed * 0.3) * 2.0)
+        ) / 3.0
+        h = (0.6 + v * 0.25 + t * 0.02) % 1.0
+        return self._emit(_scale(_hsv_to_rgb(h, 1.0, 1.0), brightness))
+
+
+class Aurora(_VectorMixin, P.Aurora):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        n = self._n()
+        speed = float(self.params.get("speed", 0.18))
+        if self.ctx.geometry_enabled:
+            ang, y = self._coords()
+            x = ang / (2 * math.pi)
+        else:
+            x = self._idx() / max(1, n)
+            y = x
+        v = 0.5 + 0.5 * np.sin(2 * math.pi * (x * 1.7 + t * speed))
+        v2 = 0.5 + 0.5 * np.sin(2 * math.pi * (y * 2.3 - t * speed * 0.7))
+        h = (0.33 + 0.1 * np.sin(2 * math.pi * (x + y + t * 0.04))) % 1.0
+        sat = 0.7 + 0.3 * v2
+        val = 0.15 + 0.85 * (v * 0.6 + v2 * 0.4)
+        rgb = _hsv_to_rgb(h, sat, np.minimum(1.0, val))
+        return self._emit(_scale(rgb, brightness))
+
+
+class GradientScroll(_VectorMixin, P.GradientScroll):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        c1 = tuple(self.params.get("c1", [255, 0, 0]))
+        c2 = tuple(self.params.get("c2", [0, 255, 0]))
+        c1 = (int(c1[0]), int(c1[1]), int(c1[2]))
+        c2 = (int(c2[0]), int(c2[1]), int(c2[2]))
+        speed = float(self.params.get("speed", 0.12))
+        n = self._n()
+        x = (self._idx() / max(1, n)) + t * speed
+        x = x % 1.0
+        return self._emit(_scale(_mix(c1, c2, x), brightness))
+
+
+class BarberPole(_VectorMixin, P.BarberPole):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        c1 = P.scale_rgb(tuple(self.params.get("c1", [255, 0, 0])), brightness)
+        c2 = P.scale_rgb(tuple(self.params.get("c2", [255, 255, 255])), brightness)
+        stripes = int(self.params.get("stripes", 10))
+        twist = float(self.params.get("twist", 1.0))
+        speed = float(self.params.get("speed", 0.4))
+        n = self._n()
+
+        if not self.ctx.geometry_enabled:
+            band = max(1, int(self.params.get("band", 16)))
+            offset = int(t * float(self.params.get("scroll", 40.0)))
+            return self._emit(_select(_stripe_1d(self._idx(), offset, band), c1, c2))
+
+        ang, y = self._coords()
+        phase = (ang / (2.0 * math.pi)) + y * twist + t * speed
+        v = (phase * stripes) % 1.0
+        return self._emit(_select(v < 0.5, c1, c2))
+
+
+class SpiralRainbow(_VectorMixin, P.SpiralRainbow):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        speed = float(self.params.get("speed", 0.25))
+        twist = float(self.params.get("twist", 1.4))
+        n = self._n()
+        if self.ctx.geometry_enabled:
+            ang, y = self._coords()
+            base = (ang / (2.0 * math.pi)) + y * twist + t * speed
+        else:
+            base = (self._idx() / max(1, n)) * twist + t * speed
+        h = base % 1.0
+        return self._emit(_scale(_hsv_to_rgb(h, 1.0, 1.0), brightness))
+
+
+class FireFlicker(_VectorMixin, P.FireFlicker):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        seed = int(self.params.get("seed", 99))
+        n = self._n()
+        speed = float(self.params.get("speed", 2.0))
+        if self.ctx.geometry_enabled:
+            _, y = self._coords()
+            heat = np.maximum(0.0, 1.0 - y)
+        else:
+            heat = 1.0 - (self._idx() / max(1, n))
+        flick = 0.4 + 0.6 * np.sin((t * speed) + _hash01(self._idx(), seed) * 6.28)
+        flick = np.maximum(0.0, flick)
+        v = np.minimum(1.0, heat * 0.7 + flick * 0.6)
+        low = _mix((80, 0, 0), (255, 30, 0), v / 0.33)
+        mid = _mix((255, 30, 0), (255, 140, 0), (v - 0.33) / 0.33)
+        high = _mix((255, 140, 0), (255, 240, 200), (v - 0.66) / 0.34)
+        rgb = _select(v < 0.33, low, _select(v < 0.66, mid, high))
+        return self._emit(_scale(rgb, brightness))
+
+
+class PulseRings(_VectorMixin, P.PulseRings):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        base_h = float(self.params.get("hue", 0.0))
+        speed = float(self.params.get("speed", 0.3))
+        rings = int(self.params.get("rings", 6))
+        n = self._n()
+        if self.ctx.geometry_enabled:
+            _, y = self._coords()
+        else:
+            y = self._idx() / max(1, n)
+        v = 0.5 + 0.5 * np.sin(2.0 * math.pi * (y * rings - t * speed))
+        h = (base_h + 0.15 * np.sin(2.0 * math.pi * (t * 0.07 + y))) % 1.0
+        rgb = _hsv_to_rgb(h, 1.0, np.maximum(0.0, v))
+        return self._emit(_scale(rgb, brightness))
+
+
+class LaserSweep(_VectorMixin, P.LaserSweep):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        color = tuple(self.params.get("color", [0, 255, 80]))
+        color = P.scale_rgb((int(color[0]), int(color[1]), int(color[2])), brightness)
+        bg = P.scale_rgb((0, 0, 0), int(brightness * 0.05))
+        speed = float(self.params.get("speed", 0.25))
+        width = float(self.params.get("width", 0.08))
+        n = self._n()
+
+        if not self.ctx.geometry_enabled:
+            head = int(((t * speed) % 1.0) * n)
+            w = max(3, int(width * n))
+            d = np.abs(self._idx() - head)
+            amp = np.maximum(0.0, 1.0 - d / max(1, w))
+            return self._emit(_mix(bg, color, amp))
+
+        head = (t * speed) % 1.0
+        ang, _ = self._coords()
+        x = (ang / (2.0 * math.pi)) % 1.0
+        d = np.abs(x - head)
+        d = np.minimum(d, 1.0 - d)
+        amp = np.maximum(0.0, 1.0 - d / max(1e-6, width))
+        return self._emit(_mix(bg, color, amp))
+
+
+class StaticNoise(_VectorMixin, P.StaticNoise):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        seed = int(self.params.get("seed", 31415))
+        n = self._n()
+        bucket = int(t * float(self.params.get("rate", 10.0)))
+        idx = self._idx()
+        v = _hash01(idx + bucket * 131, seed)
+        h = _hash01(idx + bucket * 17, seed + 1)
+        return self._emit(_scale(_hsv_to_rgb(h, 1.0, v), brightness))
+
+
+class Cylon(_VectorMixin, P.Cylon):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        color = tuple(self.params.get("color", [255, 0, 0]))
+        color = (int(color[0]), int(color[1]), int(color[2]))
+        color = P.scale_rgb(color, brightness)
+        n = self._n()
+        speed = float(self.params.get("speed", 0.22))
+        width = int(self.params.get("width", 20))
+        ph = (t * speed) % 2.0
+        pos = ph if ph <= 1.0 else 2.0 - ph
+        head = int(pos * (n - 1))
+        d = np.abs(self._idx().astype(np.int64) - head)
+        lit = d <= width
+        lut = np.array(
+            [
+                int(brightness * ((1.0 - k / max(1, width)) ** 2.2))
+                for k in range(max(0, width) + 1)
+            ],
+            dtype=np.float64,
+        )
+        bri = np.zeros(n, dtype=np.float64)
+        bri[lit] = lut[d[lit]]
+        rgb = _scale(color, bri)
+        return self._emit(tuple(np.where(lit, c, 0.0) for c in rgb))
+
+
+class Checker(_VectorMixin, P.Checker):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        c1 = P.scale_rgb(tuple(self.params.get("c1", [255, 0, 0])), brightness)
+        c2 = P.scale_rgb(tuple(self.params.get("c2", [0, 255, 0])), brightness)
+        block = int(self.params.get("block", 10))
+        speed = float(self.params.get("speed", 0.6))
+        shift = int((t * speed) * block)
+        n = self._n()
+        v = ((self._idx().astype(np.int64) + shift) // max(1, block)) % 2
+        return self._emit(_select(v == 0, c1, c2))
+
+
+class WipeRandom(_VectorMixin, P.WipeRandom):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        speed = float(self.params.get("speed", 0.15))
+        n = self._n()
+        wipe = int(t * speed)
+        frac = (t * speed) - wipe
+        h = P._hash01(wipe, int(self.params.get("seed", 777))) % 1.0
+        rgb = P.scale_rgb(P.hsv_to_rgb(h, 1.0, 1.0), brightness)
+        head = int(frac * n)
+        return self._emit(_select(self._idx() <= head, rgb, (0, 0, 0)))
+
+
+# -----------------------
+# Segment-aware patterns
+# -----------------------
+
+
+class QuadChase(_VectorMixin, P.QuadChase):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        speed = float(self.params.get("speed", 0.6))
+        tail = float(self.params.get("tail", 1.6))
+        hue_speed = float(self.params.get("hue_speed", 0.06))
+        phase_offset = float(self.params.get("phase_offset", 0.0))
+        n = self._n()
+
+        order, sc, _, _ = self._segs()
+        phase = (t * speed + phase_offset) % max(1.0, float(sc))
+        d = np.abs((order - phase) % sc)
+        d = np.minimum(d, sc - d)
+        w = np.maximum(0.0, 1.0 - (d / max(1e-6, tail)))
+        hue = (order / max(1.0, float(sc)) + (t * hue_speed)) % 1.0
+        return self._emit(_scale(_hsv_to_rgb(hue, 1.0, w), brightness))
+
+
+class OppositePulse(_VectorMixin, P.OppositePulse):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        freq = float(self.params.get("speed", 0.4))
+        n = self._n()
+        p = 0.5 * (1.0 + math.sin(2.0 * math.pi * freq * t))
+        order, _, _, _ = self._segs()
+        even = order % 2 == 0
+        w = np.where(even, p, 1.0 - p)
+        hue = np.where(even, 0.0, 0.33)
+        return self._emit(_scale(_hsv_to_rgb(hue, 1.0, w), brightness))
+
+
+class QuadTwinkle(_VectorMixin, P.QuadTwinkle):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        density = float(self.params.get("density", 0.06))
+        speed = float(self.params.get("speed", 0.6))
+        seed = int(self.params.get("seed", 424242))
+        n = self._n()
+
+        order, sc, _, _ = self._segs()
+        base_h = (order / max(1.0, float(sc))) % 1.0
+        r = _hash01(self._idx(), seed)
+        lit = r <= density
+        ph = (t * speed + r * 7.0) % 1.0
+        tw = np.clip(1.0 - np.abs(ph - 0.5) * 2.0, 0.0, 1.0)
+        rgb = _scale(_hsv_to_rgb(base_h, 1.0, tw), brightness)
+        return self._emit(tuple(np.where(lit, c, 0.0) for c in rgb))
+
+
+class QuadComets(_VectorMixin, P.QuadComets):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        speed = float(self.params.get("speed", 0.22))
+        tail = int(self.params.get("tail", 90))
+        n = self._n()
+
+        order, sc, local, seg_len = self._segs()
+        head = (t * speed * seg_len) % np.maximum(1.0, seg_len)
+        d = local - head
+        d = np.where(d < 0, d + seg_len, d)
+        w = np.maximum(0.0, 1.0 - (d / max(1.0, float(tail))))
+        hue = (order / max(1.0, float(sc))) % 1.0
+        return self._emit(_scale(_hsv_to_rgb(hue, 1.0, w), brightness))
+
+
+class QuadSpiral(_VectorMixin, P.QuadSpiral):
+    def frame(self, *, t: float, frame_idx: int, brightness: int) -> bytes:
+        speed = float(self.params.get("speed", 0.18))
+        stripes = float(self.params.get("stripes", 10.0))
+        twist = float(self.params.get("twist", 2.2))
+        seg_phase = float(self.params.get("seg_phase", 0.25))
+        phase_offset = float(self.params.get("phase_offset", 0.0))
+        n = self._n()
+
+        order, sc, _, _ = self._segs()
+        if self.ctx.geometry_enabled:
+            angle, y = self._coords()
+            theta = (angle / (2.0 * math.pi)) % 1.0
+        else:
+            theta = (self._idx() / max(1.0, float(n))) % 1.0
+            y = theta
+
+        v = (
+            theta * stripes
+            + y * twist
+            + ((order + phase_offset) / max(1.0, float(sc))) * seg_phase
+            + t * speed
+        ) % 1.0
+        b = 0.5 + 0.5 * np.sin(2.0 * math.pi * v)
+        b = np.clip(b, 0.0, 1.0)
+        hue = (v + 0.15) % 1.0
+        return self._emit(_scale(_hsv_to_rgb(hue, 1.0, b), brightness))
+
+
+VECTOR_PATTERN_REGISTRY: Dict[str, type[P.Pattern]] = {
+    cls.name: cls
+    for cls in (
+        RainbowCycle,
+        GlitterRainbow,
+        Comet,
+        TheaterChase,
+        CandySpiral,
+        VerticalWipe,
+        ColorWaves,
+        Plasma,
+        Aurora,
+        GradientScroll,
+        BarberPole,
+        SpiralRainbow,
+        FireFlicker,
+        PulseRings,
+        LaserSweep,
+        StaticNoise,
+        Cylon,
+        Checker,
+        WipeRandom,
+        QuadChase,
+        OppositePulse,
+        QuadTwinkle,
+        QuadComets,
+        QuadSpiral,
+    )
+}
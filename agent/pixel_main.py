@@ -3,10 +3,11 @@ from __future__ import annotations
 import asyncio
 import os
 import time
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from auth import (
@@ -20,6 +21,7 @@ from config import Settings, load_settings
 from geometry import TreeGeometry
 from patterns import PatternFactory
 from pixel_streamer import PixelStreamConfig, PixelStreamer
+from preview_stream import preview_events
 from services.db_service import DatabaseService
 
 
@@ -127,9 +129,17 @@ STREAMER = PixelStreamer(
         channels_per_universe=SETTINGS.pixel_channels_per_universe,
         priority=SETTINGS.pixel_priority,
         source_name=SETTINGS.pixel_source_name,
+        sync_universe=SETTINGS.pixel_sync_universe,
+        artnet_sync=SETTINGS.pixel_artnet_sync,
+        artnet_sync_host=SETTINGS.pixel_artnet_sync_host,
+        delta=SETTINGS.pixel_delta_send,
+        delta_keepalive_s=SETTINGS.pixel_delta_keepalive_s,
     ),
     fps_default=SETTINGS.ddp_fps_default,
     fps_max=SETTINGS.ddp_fps_max,
+    render_backend=SETTINGS.pattern_render_backend,
+    pacer_spin_s=SETTINGS.ddp_pacer_spin_ms / 1000.0,
+    max_lag_s=SETTINGS.ddp_backpressure_max_lag_s,
 )
 
 STARTED_AT = time.time()
@@ -261,6 +271,12 @@ class DDPStartRequest(BaseModel):
     )
 
 
+class FSEQPlayRequest(BaseModel):
+    file: str = Field(..., description="FSEQ path relative to DATA_DIR")
+    channel_start: int = Field(1, ge=1)
+    loop: bool = False
+
+
 class A2AInvokeRequest(BaseModel):
     action: str
     params: Dict[str, Any] = Field(default_factory=dict)
@@ -403,7 +419,10 @@ def _action_stop(_: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def _action_status(_: Dict[str, Any]) -> Dict[str, Any]:
-    return {"ddp": STREAMER.status().__dict__}
+    return {
+        "ddp": STREAMER.status().__dict__,
+        "ddp_metrics": STREAMER.metrics().__dict__,
+    }
 
 
 _ACTIONS: Dict[str, Any] = {
@@ -461,7 +480,40 @@ def ddp_patterns() -> Dict[str, Any]:
 
 @app.get("/v1/ddp/status")
 def ddp_status() -> Dict[str, Any]:
-    return {"ok": True, "status": STREAMER.status().__dict__}
+    return {
+        "ok": True,
+        "status": STREAMER.status().__dict__,
+        "metrics": STREAMER.metrics().__dict__,
+    }
+
+
+@app.get("/v1/ddp/preview")
+def ddp_preview(
+    request: Request, fps: float = 10.0, width: int = 48, height: int = 32
+) -> StreamingResponse:
+    return StreamingResponse(
+        preview_events(
+            STREAMER.preview,
+            geometry=GEOM,
+            width=int(width),
+            height=int(height),
+            fps=max(1.0, min(float(STREAMER.fps_max), float(fps))),
+            is_disconnected=request.is_disconnected,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/v1/metrics")
+def metrics() -> Dict[str, Any]:
+    return {
+        "ok": True,
+        "version": app.version,
+        "uptime_s": max(0.0, time.time() - STARTED_AT),
+        "ddp": STREAMER.status().__dict__,
+        "ddp_metrics": STREAMER.metrics().__dict__,
+    }
 
 
 @app.post("/v1/ddp/start")
@@ -490,6 +542,23 @@ def ddp_stop() -> Dict[str, Any]:
     return {"ok": True, "status": st.__dict__}
 
 
+@app.post("/v1/fseq/play")
+def fseq_play(req: FSEQPlayRequest) -> Dict[str, Any]:
+    base = Path(SETTINGS.data_dir).resolve()
+    path = (base / req.file).resolve()
+    if base not in path.parents:
+        raise HTTPException(status_code=400, detail="file must be within DATA_DIR")
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="FSEQ file not found")
+    try:
+        st = STREAMER.play_fseq(
+            path=str(path), channel_start=req.channel_start, loop=req.loop
+        )
+        return {"ok": True, "status": st.__dict__}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.get("/v1/a2a/card")
 def a2a_card(_: None = Depends(_require_a2a_auth)) -> Dict[str, Any]:
     return {
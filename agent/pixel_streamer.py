@@ -3,12 +3,17 @@ from __future__ import annotations
 import threading
 import time
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, Dict, Optional
 
 from artnet_sender import ArtNetConfig, ArtNetSender
 from e131_sender import E131Config, E131Sender
+from frame_pacer import FramePacer, JitterHistogram
+from frame_pool import FramePool
+from fseq import FSEQReader
 from geometry import TreeGeometry
 from patterns import PatternFactory
+from preview_stream import FrameTap
 
 
 @dataclass(frozen=True)
@@ -20,6 +25,11 @@ class PixelStreamConfig:
     channels_per_universe: int
     priority: int = 100
     source_name: str = "wled-show-agent"
+    sync_universe: int = 0  # E1.31 universe sync address (0 = off)
+    artnet_sync: bool = False  # Art-Net: ArtSync after each frame
+    artnet_sync_host: str = ""  # ArtSync destination (blank = host)
+    delta: bool = False  # skip unchanged universes
+    delta_keepalive_s: float = 1.0  # resend unchanged universes this often
 
 
 @dataclass
@@ -31,6 +41,29 @@ class StreamStatus:
     frames_sent: int
 
 
+@dataclass
+class StreamMetrics:
+    frames_sent_total: int = 0
+    frame_overruns_total: int = 0
+    frame_compute_seconds_sum: float = 0.0
+    frame_compute_seconds_count: int = 0
+    frame_lag_seconds_sum: float = 0.0
+    frame_lag_seconds_count: int = 0
+    last_frame_compute_s: float | None = None
+    last_frame_lag_s: float | None = None
+    max_frame_lag_s: float = 0.0
+    # Delta sending (PIXEL_DELTA_SEND).
+    packets_skipped_total: int = 0
+    bytes_saved_total: int = 0
+    # Inter-frame send interval for the current/last stream (FramePacer).
+    frame_interval_p50_s: float | None = None
+    frame_interval_p99_s: float | None = None
+    frame_interval_count: int = 0
+    frame_interval_seconds_sum: float = 0.0
+    # Live preview clients tapping the output (GET /v1/ddp/preview).
+    preview_clients: int = 0
+
+
 class PixelStreamer:
     def __init__(
         self,
@@ -40,6 +73,9 @@ class PixelStreamer:
         cfg: PixelStreamConfig,
         fps_default: float = 20.0,
         fps_max: float = 45.0,
+        render_backend: str = "python",
+        pacer_spin_s: float = 0.002,
+        max_lag_s: float = 0.25,
     ) -> None:
         self.led_count = int(led_count)
         if self.led_count <= 0:
@@ -48,6 +84,9 @@ class PixelStreamer:
         self.cfg = cfg
         self.fps_default = fps_default
         self.fps_max = fps_max
+        self.render_backend = str(render_backend or "python")
+        self.pacer_spin_s = max(0.0, float(pacer_spin_s))
+        self.max_lag_s = max(0.0, float(max_lag_s))
 
         proto = str(cfg.protocol).strip().lower()
         if proto == "artnet":
@@ -57,6 +96,10 @@ class PixelStreamer:
                     port=int(cfg.port),
                     universe_start=int(cfg.universe_start),
                     channels_per_universe=int(cfg.channels_per_universe),
+                    sync=bool(cfg.artnet_sync),
+                    sync_host=str(cfg.artnet_sync_host or ""),
+                    delta=bool(cfg.delta),
+                    keepalive_s=float(cfg.delta_keepalive_s),
                 )
             )
         elif proto == "e131":
@@ -68,6 +111,9 @@ class PixelStreamer:
                     channels_per_universe=int(cfg.channels_per_universe),
                     priority=int(cfg.priority),
                     source_name=str(cfg.source_name or "wled-show-agent"),
+                    sync_universe=int(cfg.sync_universe),
+                    delta=bool(cfg.delta),
+                    keepalive_s=float(cfg.delta_keepalive_s),
                 )
             )
         else:
@@ -79,11 +125,27 @@ class PixelStreamer:
         self._status = StreamStatus(
             running=False, pattern=None, fps=None, started_at=None, frames_sent=0
         )
+        self._metrics = StreamMetrics()
+        self._jitter = JitterHistogram()
+        # Every sent frame is offered to live preview clients (never blocks).
+        self.preview = FrameTap()
 
     def status(self) -> StreamStatus:
         with self._lock:
             return StreamStatus(**self._status.__dict__)
 
+    def metrics(self) -> StreamMetrics:
+        with self._lock:
+            out = StreamMetrics(**self._metrics.__dict__)
+            out.frame_interval_p50_s = self._jitter.quantile(0.5)
+            out.frame_interval_p99_s = self._jitter.quantile(0.99)
+            out.frame_interval_count = int(self._jitter.count)
+            out.frame_interval_seconds_sum = float(self._jitter.sum_s)
+        out.packets_skipped_total = int(self._sender.packets_skipped)
+        out.bytes_saved_total = int(self._sender.bytes_saved)
+        out.preview_clients = int(self.preview.clients)
+        return out
+
     def stop(self) -> StreamStatus:
         with self._lock:
             if not self._status.running:
@@ -117,45 +179,162 @@ class PixelStreamer:
         self.stop()
 
         factory = PatternFactory(
-            led_count=self.led_count, geometry=self.geometry, segment_layout=None
+            led_count=self.led_count,
+            geometry=self.geometry,
+            segment_layout=None,
+            backend=self.render_backend,
         )
         pat = factory.create(pattern, params=params or {})
+        frames = FramePool(self.led_count * 3)
 
         self._stop.clear()
 
         def _run() -> None:
-            start_ts = time.monotonic()
-            next_frame = start_ts
+            frame_period = 1.0 / fps_val
+            pacer = FramePacer(
+                frame_period, spin_s=self.pacer_spin_s, jitter=self._jitter
+            )
+            start_ts = pacer.start()
             frame_idx = 0
             try:
                 while not self._stop.is_set():
-                    now = time.monotonic()
-                    if now >= (start_ts + duration_s):
+                    now = pacer.wait(self._stop)
+                    if self._stop.is_set() or now >= (start_ts + duration_s):
                         break
-                    if now < next_frame:
-                        time.sleep(min(0.01, next_frame - now))
-                        continue
+                    lag_s = pacer.lag(now)
                     t = now - start_ts
-                    rgb = pat.frame(t=t, frame_idx=frame_idx, brightness=brightness)
+                    frame_start = time.perf_counter()
+                    rgb = frames.acquire()
+                    pat.frame_into(
+                        rgb, 0, t=t, frame_idx=frame_idx, brightness=brightness
+                    )
                     self._sender.send_frame(rgb)
+                    sent_at = time.monotonic()
+                    self.preview.publish(rgb, now=sent_at)
+                    frame_compute_s = max(0.0, time.perf_counter() - frame_start)
                     frame_idx += 1
-                    with self._lock:
-                        self._status.frames_sent = frame_idx
-                    next_frame += 1.0 / fps_val
+                    self._record_frame(
+                        pacer,
+                        sent=frame_idx,
+                        sent_at=sent_at,
+                        compute_s=frame_compute_s,
+                        lag_s=lag_s,
+                    )
+            finally:
+                self._finish_run()
+
+        return self._launch(_run, pattern=pattern, fps=fps_val)
+
+    def play_fseq(
+        self, *, path: str, channel_start: int = 1, loop: bool = False
+    ) -> StreamStatus:
+        """
+        Play a pre-rendered .fseq at its step time (no pattern rendering).
+
+        Sends `led_count * 3` channels starting at 1-based `channel_start`.
+        """
+        self.stop()
+
+        reader = FSEQReader(path)
+        try:
+            length = self.led_count * 3
+            offset = reader.locate(int(channel_start) - 1, length)
+            if reader.step_ms <= 0 or reader.num_frames <= 0:
+                raise ValueError("FSEQ has no frames")
+        except Exception:
+            reader.close()
+            raise
+
+        self._stop.clear()
+
+        def _run() -> None:
+            pacer = FramePacer(
+                reader.step_ms / 1000.0, spin_s=self.pacer_spin_s, jitter=self._jitter
+            )
+            pacer.start()
+            sent = 0
+            try:
+                while not self._stop.is_set():
+                    now = pacer.wait(self._stop)
+                    if self._stop.is_set():
+                        break
+                    pacer.skip_late(now, self.max_lag_s)
+                    if pacer.frame >= reader.num_frames:
+                        if not loop:
+                            break
+                        pacer.start()
+                        continue
+                    lag_s = pacer.lag(now)
+                    send_start = time.perf_counter()
+                    view = reader.frame(pacer.frame)[offset : offset + length]
+                    try:
+                        self._sender.send_frame(view)
+                        self.preview.publish(view)
+                    finally:
+                        view.release()
+                    sent_at = time.monotonic()
+                    sent += 1
+                    self._record_frame(
+                        pacer,
+                        sent=sent,
+                        sent_at=sent_at,
+                        compute_s=max(0.0, time.perf_counter() - send_start),
+                        lag_s=lag_s,
+                    )
             finally:
-                with self._lock:
-                    self._status.running = False
-                    self._status.pattern = None
-                    self._status.fps = None
-                    self._thread = None
+                reader.close()
+                self._finish_run()
+
+        return self._launch(
+            _run,
+            pattern=f"fseq:{Path(reader.path).name}",
+            fps=1000.0 / reader.step_ms,
+        )
+
+    def _record_frame(
+        self,
+        pacer: FramePacer,
+        *,
+        sent: int,
+        sent_at: float,
+        compute_s: float,
+        lag_s: float,
+    ) -> None:
+        with self._lock:
+            m = self._metrics
+            self._status.frames_sent = sent
+            m.frames_sent_total += 1
+            if compute_s > pacer.period_s:
+                m.frame_overruns_total += 1
+            m.frame_compute_seconds_sum += float(compute_s)
+            m.frame_compute_seconds_count += 1
+            m.frame_lag_seconds_sum += float(lag_s)
+            m.frame_lag_seconds_count += 1
+            m.last_frame_compute_s = float(compute_s)
+            m.last_frame_lag_s = float(lag_s)
+            if lag_s > m.max_frame_lag_s:
+                m.max_frame_lag_s = float(lag_s)
+            pacer.tick(sent_at)
+
+    def _finish_run(self) -> None:
+        with self._lock:
+            self._status.running = False
+            self._status.pattern = None
+            self._status.fps = None
+            self._thread = None
 
-        th = threading.Thread(target=_run, name="pixel_streamer", daemon=True)
+    def _launch(self, run: Any, *, pattern: str, fps: float) -> StreamStatus:
+        th = threading.Thread(target=run, name="pixel_streamer", daemon=True)
         with self._lock:
             self._status.running = True
             self._status.pattern = pattern
-            self._status.fps = fps_val
+            self._status.fps = fps
             self._status.started_at = time.time()
             self._status.frames_sent = 0
+            self._metrics.last_frame_compute_s = None
+            self._metrics.last_frame_lag_s = None
+            self._metrics.max_frame_lag_s = 0.0
+            self._jitter.reset()
             self._thread = th
 
         th.start()
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import struct
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from geometry import TreeGeometry
+from utils.sequence_preview import PreviewRaster
+
+try:
+    import numpy as np
+except Exception:  # NumPy is optional; deltas fall back to a per-pixel loop.
+    np = None  # type: ignore[assignment]
+
+
+# Live preview of what a streamer is sending (SSE, see `preview_events`).
+#
+# Send loops call `FrameTap.publish()` after each frame goes out. With no
+# preview client connected that is one attribute check; otherwise the frame is
+# copied into a single "latest" buffer at most at the fastest client's rate.
+# Clients poll that buffer at their own (adaptive) fps and do the downsampling
+# and delta encoding themselves, so a slow client only misses frames and can
+# never hold up the send loop. That per-client work is vectorized with NumPy
+# (well under a millisecond for a full 128x128 image); without NumPy it runs in
+# a worker thread instead of on the event loop.
+
+_RUN_HEADER = struct.Struct("<HH")
+
+
+class PreviewClient:
+    """
+    Per-client pacing for the live preview.
+
+    The rate halves when pushing a frame to the client takes more than half of
+    the frame interval (a slow link or reader) and climbs back by 1 fps after
+    about a second of quick sends, between `fps_min` and `fps_max`.
+    """
+
+    def __init__(self, *, fps_max: float, fps_min: float = 1.0) -> None:
+        self.fps_max = max(0.5, float(fps_max))
+        self.fps_min = max(0.1, min(float(fps_min), self.fps_max))
+        self.fps = self.fps_max
+        self.seq = 0
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self._streak = 0
+
+    @property
+    def interval_s(self) -> float:
+        return 1.0 / self.fps
+
+    def record_send(self, send_s: float) -> None:
+        if float(send_s) > 0.5 * self.interval_s:
+            self.fps = max(self.fps_min, self.fps * 0.5)
+            self._streak = 0
+            return
+        self._streak += 1
+        if self._streak >= self.fps and self.fps < self.fps_max:
+            self.fps = min(self.fps_max, self.fps + 1.0)
+            self._streak = 0
+
+
+class FrameTap:
+    """Latest-frame mailbox between a send loop and live preview clients."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clients: List[PreviewClient] = []
+        self._max_fps = 0.0
+        self._next_copy = 0.0
+        self._buf = bytearray()
+        self._seq = 0
+        self.frames_published = 0
+
+    @property
+    def clients(self) -> int:
+        return len(self._clients)
+
+    def subscribe(self, client: PreviewClient) -> PreviewClient:
+        with self._lock:
+            self._clients.append(client)
+            self._update_rate()
+            client.seq = self._seq
+        return client
+
+    def unsubscribe(self, client: PreviewClient) -> None:
+        with self._lock:
+            try:
+                self._clients.remove(client)
+            except ValueError:
+                pass
+            self._update_rate()
+
+    def _update_rate(self) -> None:
+        self._max_fps = max((c.fps_max for c in self._clients), default=0.0)
+        self._next_copy = 0.0
+
+    def publish(self, frame: Any, *, now: float | None = None) -> None:
+        """Offer a just-sent frame (any bytes-like); never blocks on clients."""
+        if not self._clients:
+            return
+        now = time.monotonic() if now is None else float(now)
+        if now < self._next_copy:
+            return
+        with self._lock:
+            if not self._clients:
+                return
+            n = len(frame)
+            if len(self._buf) != n:
+                self._buf = bytearray(n)
+            self._buf[:] = frame
+            self._seq += 1
+            self.frames_published += 1
+            self._next_copy = now + 1.0 / self._max_fps
+
+    def latest(self, since: int) -> Tuple[Optional[bytes], int]:
+        """Copy of the newest frame if it is newer than `since`, and its sequence."""
+        with self._lock:
+            if self._seq == since or not self._buf:
+                return None, since
+            return bytes(self._buf), self._seq
+
+
+def encode_delta(prev: bytes, cur: bytes, *, backend: str = "numpy") -> bytes:
+    """
+    Changed pixels of `cur` against `prev` as runs: `<u16 start><u16 count>` then
+    `count` RGB triplets. Runs one unchanged pixel apart are merged (a header
+    costs more than resending the pixel).
+    """
+    npx = len(cur) // 3
+    if np is not None and backend == "numpy" and len(prev) == len(cur):
+        a = np.frombuffer(prev, dtype=np.uint8, count=npx * 3).reshape(-1, 3)
+        b = np.frombuffer(cur, dtype=np.uint8, count=npx * 3).reshape(-1, 3)
+        ne = a != b
+        changed = np.flatnonzero(ne[:, 0] | ne[:, 1] | ne[:, 2])
+        if not changed.size:
+            return b""
+        # A new run starts wherever two changed pixels are more than one apart.
+        breaks = np.flatnonzero(np.diff(changed) > 2)
+        starts = changed[np.r_[0, breaks + 1]]
+        counts = changed[np.r_[breaks, changed.size - 1]] + 1 - starts
+        nruns = int(starts.size)
+        hdr = np.empty((nruns, 2), dtype="<u2")
+        hdr[:, 0] = starts
+        hdr[:, 1] = counts
+        # The output alternates header / pixel byte ranges; gather them all
+        # from `cur` followed by the packed headers in one indexing op.
+        src = np.concatenate((b.reshape(-1), hdr.view(np.uint8).reshape(-1)))
+        seg_from = np.empty(2 * nruns, dtype=np.intp)
+        seg_from[0::2] = 3 * npx + 4 * np.arange(nruns)
+        seg_from[1::2] = 3 * starts
+        seg_len = np.empty(2 * nruns, dtype=np.intp)
+        seg_len[0::2] = _RUN_HEADER.size
+        seg_len[1::2] = 3 * counts
+        seg_at = np.cumsum(seg_len) - seg_len
+        idx = np.arange(int(seg_len.sum())) + np.repeat(seg_from - seg_at, seg_len)
+        return src[idx].tobytes()
+    runs: List[Tuple[int, int]] = []
+    start = -1
+    gap = 0
+    for px in range(npx):
+        i = px * 3
+        if cur[i : i + 3] != prev[i : i + 3]:
+            if start < 0:
+                start = px
+            elif gap > 1:
+                runs.append((start, px - gap - start))
+                start = px
+            gap = 0
+        elif start >= 0:
+            gap += 1
+    if start >= 0:
+        runs.append((start, npx - gap - start))
+    out = bytearray()
+    for start, count in runs:
+        out += _RUN_HEADER.pack(start, count)
+        out += cur[start * 3 : (start + count) * 3]
+    return bytes(out)
+
+
+def apply_delta(prev: bytes, delta: bytes) -> bytes:
+    """Inverse of `encode_delta` (what a client does with a delta frame)."""
+    img = bytearray(prev)
+    pos = 0
+    while pos + _RUN_HEADER.size <= len(delta):
+        start, count = _RUN_HEADER.unpack_from(delta, pos)
+        pos += _RUN_HEADER.size
+        img[start * 3 : (start + count) * 3] = delta[pos : pos + count * 3]
+        pos += count * 3
+    return bytes(img)
+
+
+def clamp_preview_size(width: int, height: int) -> Tuple[int, int]:
+    w = max(4, min(128, int(width)))
+    h = max(4, min(128, int(height)))
+    return w, h
+
+
+def _render_frame(
+    raster: PreviewRaster, frame: bytes, prev: bytes | None, want_delta: bool
+) -> Tuple[bytes, Optional[bytes]]:
+    """Preview image of `frame` and (when `want_delta`) its delta against `prev`."""
+    img = bytes(raster.render(frame))
+    if not want_delta or prev is None or img == prev:
+        return img, None
+    return img, encode_delta(prev, img)
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def preview_events(
+    tap: FrameTap,
+    *,
+    geometry: TreeGeometry,
+    width: int,
+    height: int,
+    fps: float,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    keyframe_s: float = 5.0,
+    heartbeat_s: float = 15.0,
+) -> AsyncIterator[str]:
+    """
+    SSE stream of the tapped output as tree-shaped `PreviewRaster` images.
+
+    `frame` events carry base64 RGB: `key: true` is the whole image, otherwise
+    `data` is an `encode_delta` against the previous image. A keyframe is sent
+    every `keyframe_s`, when the image size changes, or when the delta would
+    not be smaller. Unchanged images are not sent.
+    """
+    w, h = clamp_preview_size(width, height)
+    client = tap.subscribe(PreviewClient(fps_max=fps))
+    raster: PreviewRaster | None = None
+    prev: bytes | None = None
+    last_key = 0.0
+    last_out = time.monotonic()
+    try:
+        yield _sse("ready", {"width": w, "height": h, "fps": client.fps})
+        while not await is_disconnected():
+            await asyncio.sleep(client.interval_s)
+            seq_before = client.seq
+            frame, client.seq = tap.latest(client.seq)
+            now = time.monotonic()
+            img = delta = None
+            if frame is not None:
+                client.frames_skipped += max(0, client.seq - seq_before - 1)
+                if raster is None or raster.led_count != len(frame) // 3:
+                    raster = PreviewRaster(
+                        led_count=len(frame) // 3, geometry=geometry, width=w, height=h
+                    )
+                    prev = None
+                want_delta = prev is not None and now - last_key < keyframe_s
+                if np is not None:
+                    img, delta = _render_frame(raster, frame, prev, want_delta)
+                else:
+                    # The pure-Python path takes milliseconds at the maximum
+                    # size; keep it off the loop that drives the send loops.
+                    img, delta = await asyncio.to_thread(
+                        _render_frame, raster, frame, prev, want_delta
+                    )
+            if img is None or img == prev:
+                if now - last_out >= heartbeat_s:
+                    last_out = now
+                    yield _sse("tick", {"fps": client.fps})
+                continue
+            payload: Dict[str, Any] = {
+                "seq": client.seq,
+                "fps": round(client.fps, 2),
+                "skipped": client.frames_skipped,
+            }
+            if delta is not None and len(delta) >= len(img):
+                delta = None
+            if delta is None:
+                last_key = now
+                payload.update(key=True, data=base64.b64encode(img).decode("ascii"))
+            else:
+                payload.update(key=False, data=base64.b64encode(delta).decode("ascii"))
+            prev = img
+            send_start = time.monotonic()
+            yield _sse("frame", payload)
+            last_out = time.monotonic()
+            client.frames_sent += 1
+            client.record_send(last_out - send_start)
+    finally:
+        tap.unsubscribe(client)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import time
+from multiprocessing import shared_memory
+from typing import Any, Optional
+
+# Shared header (int64 slots) followed by `slots` frames of `frame_len` bytes.
+#
+#   [0] consumed   next frame index the sender needs (sender writes)
+#   [1] stop       non-zero asks the worker to exit (sender writes)
+#   [2] rendered   one past the newest frame the worker finished (worker writes)
+#   [3..3+slots)   frame index held by each slot, -1 while empty/being written
+_CONSUMED = 0
+_STOP = 1
+_RENDERED = 2
+_KEYS = 3
+_ALIGN = 64
+
+
+def _data_offset(slots: int) -> int:
+    raw = (_KEYS + int(slots)) * 8
+    return ((raw + _ALIGN - 1) // _ALIGN) * _ALIGN
+
+
+class FrameRing:
+    """
+    Fixed-size ring of rendered frames in `multiprocessing.shared_memory`.
+
+    Frame `k` lives in slot `k % slots`. The worker only renders frames in
+    `[consumed, consumed + slots)`, so a slot is never overwritten while the
+    sender may still be transmitting it.
+    """
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        *,
+        slots: int,
+        frame_len: int,
+        owner: bool,
+    ) -> None:
+        self._shm = shm
+        self.slots = int(slots)
+        self.frame_len = int(frame_len)
+        self._owner = bool(owner)
+        self._data_off = _data_offset(self.slots)
+        self._hdr = shm.buf[: (_KEYS + self.slots) * 8].cast("q")
+        self._buf = shm.buf
+
+    @classmethod
+    def create(cls, *, slots: int, frame_len: int) -> "FrameRing":
+        slots = max(1, int(slots))
+        frame_len = max(1, int(frame_len))
+        shm = shared_memory.SharedMemory(
+            create=True, size=_data_offset(slots) + slots * frame_len
+        )
+        ring = cls(shm, slots=slots, frame_len=frame_len, owner=True)
+        ring._hdr[_CONSUMED] = 0
+        ring._hdr[_STOP] = 0
+        ring._hdr[_RENDERED] = 0
+        for i in range(slots):
+            ring._hdr[_KEYS + i] = -1
+        return ring
+
+    @classmethod
+    def attach(cls, name: str, *, slots: int, frame_len: int) -> "FrameRing":
+        shm = shared_memory.SharedMemory(name=str(name))
+        return cls(shm, slots=slots, frame_len=frame_len, owner=False)
+
+    @property
+    def name(self) -> str:
+        return str(self._shm.name)
+
+    # Sender side
+
+    @property
+    def consumed(self) -> int:
+        return int(self._hdr[_CONSUMED])
+
+    def set_consumed(self, frame_idx: int) -> None:
+        self._hdr[_CONSUMED] = int(frame_idx)
+
+    def request_stop(self) -> None:
+        self._hdr[_STOP] = 1
+
+    @property
+    def rendered(self) -> int:
+        return int(self._hdr[_RENDERED])
+
+    def frame(self, frame_idx: int) -> Optional[memoryview]:
+        """Return a view of frame `frame_idx` if the worker has rendered it."""
+        slot = int(frame_idx) % self.slots
+        if int(self._hdr[_KEYS + slot]) != int(frame_idx):
+            return None
+        start = self._data_off + slot * self.frame_len
+        return self._buf[start : start + self.frame_len]
+
+    # Worker side
+
+    @property
+    def stopped(self) -> bool:
+        return bool(self._hdr[_STOP])
+
+    def render(self, pat: Any, frame_idx: int, **kwargs: Any) -> None:
+        slot = int(frame_idx) % self.slots
+        self._hdr[_KEYS + slot] = -1
+        pat.frame_into(
+            self._buf,
+            self._data_off + slot * self.frame_len,
+            frame_idx=frame_idx,
+            **kwargs,
+        )
+        self._hdr[_KEYS + slot] = int(frame_idx)
+        self._hdr[_RENDERED] = int(frame_idx) + 1
+
+    def close(self) -> None:
+        try:
+            self._hdr.release()
+        except Exception:
+            pass
+        self._buf = None  # type: ignore[assignment]
+        try:
+            self._shm.close()
+        except Exception:
+            pass
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except Exception:
+                pass
+
+
+def render_ahead_worker(
+    ring_name: str,
+    *,
+    pattern: Any,
+    slots: int,
+    frame_len: int,
+    frame_period_s: float,
+    brightness: int,
+    total_frames: int,
+) -> int:
+    """
+    Render frames into a `FrameRing` until `total_frames`, or until asked to stop.
+
+    Runs in a `ProcessService` worker, which owns `pattern` for the whole
+    stream. Frame `k` is rendered for `t = k * frame_period_s`. Returns the
+    number of frames rendered.
+    """
+    ring = FrameRing.attach(ring_name, slots=slots, frame_len=frame_len)
+    idle_s = min(0.005, max(0.0005, float(frame_period_s) / 4.0))
+    rendered = 0
+    k = 0
+    try:
+        while k < int(total_frames) and not ring.stopped:
+            consumed = ring.consumed
+            if k < consumed:
+                # The sender dropped frames; skip what it no longer needs.
+                k = consumed
+                continue
+            if k >= consumed + ring.slots:
+                time.sleep(idle_s)
+                continue
+            ring.render(
+                pattern, k, t=k * float(frame_period_s), brightness=int(brightness)
+            )
+            rendered += 1
+            k += 1
+    finally:
+        ring.close()
+    return rendered
@@ -9,6 +9,9 @@ router = APIRouter()
 
 router.add_api_route("/v1/audio/analyze", audio_service.audio_analyze, methods=["POST"])
 router.add_api_route("/v1/audio/waveform", audio_service.audio_waveform, methods=["GET"])
+router.add_api_route(
+    "/v1/audio/waveform/range", audio_service.audio_waveform_range, methods=["GET"]
+)
 router.add_api_route(
     "/v1/audio/waveform/cache", audio_service.audio_waveform_cache, methods=["GET"]
 )
@@ -8,3 +8,7 @@ from services import fseq_service
 router = APIRouter()
 
 router.add_api_route("/v1/fseq/export", fseq_service.fseq_export, methods=["POST"])
+router.add_api_route(
+    "/v1/fseq/export_show", fseq_service.fseq_export_show, methods=["POST"]
+)
+router.add_api_route("/v1/fseq/play", fseq_service.fseq_play, methods=["POST"])
@@ -32,6 +32,11 @@ router.add_api_route(
     jobs_service.jobs_audio_analyze,
     methods=["POST"],
 )
+router.add_api_route(
+    "/v1/jobs/audio/analyze_library",
+    jobs_service.jobs_audio_analyze_library,
+    methods=["POST"],
+)
 router.add_api_route(
     "/v1/jobs/xlights/import_project",
     jobs_service.jobs_xlights_import_project,
@@ -55,3 +60,8 @@ router.add_api_route(
 router.add_api_route(
     "/v1/jobs/fseq/export", jobs_service.jobs_fseq_export, methods=["POST"]
 )
+router.add_api_route(
+    "/v1/jobs/fseq/export_show",
+    jobs_service.jobs_fseq_export_show,
+    methods=["POST"],
+)
@@ -10,6 +10,15 @@ router = APIRouter()
 router.add_api_route(
     "/v1/show/config/load", show_service.show_config_load, methods=["POST"]
 )
+router.add_api_route(
+    "/v1/show/stream/start", show_service.show_stream_start, methods=["POST"]
+)
+router.add_api_route(
+    "/v1/show/stream/stop", show_service.show_stream_stop, methods=["POST"]
+)
+router.add_api_route(
+    "/v1/show/stream/status", show_service.show_stream_status, methods=["GET"]
+)
 router.add_api_route(
     "/v1/xlights/import_networks",
     show_service.xlights_import_networks,
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Dict, List, Optional, Sequence
 
 from wled_client import AsyncWLEDClient
@@ -31,28 +33,51 @@ class SegmentLayout:
         return [s.id for s in self.segments]
 
     def id_to_order(self) -> Dict[int, int]:
+        return dict(self._order_by_id)
+
+    @cached_property
+    def _order_by_id(self) -> Dict[int, int]:
         return {s.id: i for i, s in enumerate(self.segments)}
 
-    def segment_for_index(self, idx: int) -> Optional[int]:
-        """Return segment ID containing global LED index, if known."""
+    @cached_property
+    def _starts(self) -> Optional[List[int]]:
+        # Sorted, non-overlapping layouts (the normal case) can bisect; anything
+        # else keeps the first-match linear scan.
+        segs = self.segments
+        for a, b in zip(segs, segs[1:]):
+            if b.start < a.stop or b.start < a.start:
+                return None
+        return [int(s.start) for s in segs]
+
+    def _segment_at(self, idx: int) -> Optional[SegmentRange]:
         i = int(idx)
+        starts = self._starts
+        if starts is not None:
+            k = bisect_right(starts, i) - 1
+            if k >= 0:
+                s = self.segments[k]
+                if s.start <= i < s.stop:
+                    return s
+            return None
         for s in self.segments:
             if s.start <= i < s.stop:
-                return s.id
+                return s
         return None
 
+    def segment_for_index(self, idx: int) -> Optional[int]:
+        """Return segment ID containing global LED index, if known."""
+        s = self._segment_at(idx)
+        return s.id if s is not None else None
+
     def order_for_index(self, idx: int) -> Optional[int]:
         sid = self.segment_for_index(idx)
         if sid is None:
             return None
-        return self.id_to_order().get(sid)
+        return self._order_by_id.get(sid)
 
     def local_index(self, idx: int) -> Optional[int]:
-        i = int(idx)
-        for s in self.segments:
-            if s.start <= i < s.stop:
-                return i - s.start
-        return None
+        s = self._segment_at(idx)
+        return int(idx) - s.start if s is not None else None
 
 
 def _coerce_int(x: object, default: int) -> int:
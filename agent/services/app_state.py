@@ -19,6 +19,7 @@ from rate_limiter import AsyncCooldown
 from ddp_sender import DDPConfig
 from ddp_streamer import DDPStreamer
 from geometry import TreeGeometry
+from multi_output import MultiOutputStreamer
 from sequence_service import SequenceService
 from fleet_sequence_service import FleetSequenceService
 from services import a2a_service, fleet_service, metrics_service
@@ -207,6 +208,8 @@ async def startup(app: FastAPI | None = None) -> None:
             port=settings.ddp_port,
             destination_id=settings.ddp_destination_id,
             max_pixels_per_packet=settings.ddp_max_pixels_per_packet,
+            delta=settings.ddp_delta_send,
+            keepalive_s=settings.ddp_delta_keepalive_s,
         )
         ddp = DDPStreamer(
             wled=wled,
@@ -219,6 +222,22 @@ async def startup(app: FastAPI | None = None) -> None:
             segment_ids=segment_ids,
             blocking=ddp_blocking,
             cpu_pool=cpu_pool if settings.ddp_use_cpu_pool else None,
+            render_backend=settings.pattern_render_backend,
+            render_ahead_frames=settings.ddp_render_ahead_frames,
+            pacer_spin_s=settings.ddp_pacer_spin_ms / 1000.0,
+        )
+        show_stream = MultiOutputStreamer(
+            geometry=geom,
+            fps_default=settings.ddp_fps_default,
+            fps_max=settings.ddp_fps_max,
+            drop_late_frames=settings.ddp_drop_late_frames,
+            max_lag_s=settings.ddp_backpressure_max_lag_s,
+            blocking=ddp_blocking,
+            render_backend=settings.pattern_render_backend,
+            pacer_spin_s=settings.ddp_pacer_spin_ms / 1000.0,
+            ddp_max_pixels_per_packet=settings.ddp_max_pixels_per_packet,
+            delta=settings.ddp_delta_send,
+            delta_keepalive_s=settings.ddp_delta_keepalive_s,
         )
         sequences = SequenceService(
             wled=wled,
@@ -241,6 +260,7 @@ async def startup(app: FastAPI | None = None) -> None:
             looks=looks,
             importer=importer,
             ddp=ddp,
+            show_stream=show_stream,
             sequences=sequences,
             fleet_sequences=None,
             orchestrator=None,
@@ -1333,6 +1353,11 @@ async def shutdown(app: FastAPI | None = None) -> None:
                 await st.ddp.stop()
         except Exception:
             pass
+        try:
+            if getattr(st, "show_stream", None) is not None:
+                await st.show_stream.stop()
+        except Exception:
+            pass
         try:
             if getattr(st, "blocking", None) is not None:
                 await st.blocking.shutdown()
@@ -2,20 +2,27 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
+import os
 import uuid
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 from fastapi import Depends, HTTPException, Request
 
-from audio_analyzer import AudioAnalyzeError, analyze_beats, extract_waveform
+from audio_analyzer import AudioAnalyzeError, analyze_beats_timeline, extract_waveform
 from models.requests import AudioAnalyzeRequest
 from pack_io import read_json_async, write_json_async
 from services.audit_logger import log_event
 from services.auth_service import require_a2a_auth, require_admin
 from services.state import AppState, get_state
 from utils.blocking import run_blocking_state, run_cpu_blocking_state
-from utils.cache_utils import cache_stats, cleanup_cache
+from utils.cache_utils import cache_stats, cleanup_cache, file_digest, open_index
+from waveform_pyramid import (
+    MAX_RANGE_POINTS,
+    PYRAMID_VERSION,
+    build_waveform_pyramid,
+    read_waveform_range,
+)
 
 
 def _resolve_data_path(state: AppState, rel_path: str) -> Path:
@@ -60,7 +67,66 @@ async def _waveform_cache_stats(state: AppState) -> Dict[str, int]:
     try:
         return await run_blocking_state(state, cache_stats, cache_dir)
     except Exception:
-        return {"files": 0, "bytes": 0}
+        return {"files": 0, "bytes": 0, "hits": 0, "misses": 0}
+
+
+# Request fields that change an analysis result (part of its cache key).
+ANALYSIS_PARAMS = (
+    "min_bpm",
+    "max_bpm",
+    "hop_ms",
+    "window_ms",
+    "peak_threshold",
+    "min_interval_s",
+    "prefer_ffmpeg",
+)
+
+
+def _analysis_cache_dir(state: AppState) -> Path:
+    return Path(state.settings.data_dir) / "cache" / "analysis"
+
+
+def analysis_cache_key(audio_digest: str, params: Dict[str, Any]) -> str:
+    key_raw = "|".join([audio_digest, *(str(params[k]) for k in ANALYSIS_PARAMS)])
+    return hashlib.sha256(key_raw.encode("utf-8")).hexdigest()[:16]
+
+
+async def cached_analysis(state: AppState, key: str) -> Dict[str, Any] | None:
+    """Cached beats JSON for an `analysis_cache_key`, if any."""
+    cache_index = open_index(_analysis_cache_dir(state))
+    hit = await run_blocking_state(state, cache_index.lookup, f"{key}.json")
+    cached = await read_json_async(str(hit)) if hit is not None else None
+    return cached if isinstance(cached, dict) else None
+
+
+async def store_analysis(state: AppState, key: str, out: Dict[str, Any]) -> None:
+    cache_dir = _analysis_cache_dir(state)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    await write_json_async(str(cache_dir / f"{key}.json"), out)
+    await run_blocking_state(state, open_index(cache_dir).record, f"{key}.json")
+
+
+async def cached_beats_analysis(
+    state: AppState, audio_path: Path, params: Dict[str, Any]
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Beats JSON for `audio_path` (see `analyze_beats_timeline`), keyed by the
+    audio content hash and analysis parameters, so renamed or re-uploaded
+    files are not analyzed again. Returns (analysis, cached).
+    """
+    audio_digest = await run_blocking_state(state, file_digest, str(audio_path))
+    key = analysis_cache_key(audio_digest, params)
+    out = await cached_analysis(state, key)
+    if out is not None:
+        return out, True
+    out = await run_cpu_blocking_state(
+        state,
+        analyze_beats_timeline,
+        audio_path=str(audio_path),
+        **{k: params[k] for k in ANALYSIS_PARAMS},
+    )
+    await store_analysis(state, key, out)
+    return out, False
 
 
 async def audio_analyze(
@@ -77,31 +143,9 @@ async def audio_analyze(
         audio_path = _resolve_data_path(state, req.audio_file)
         out_path = _resolve_data_path(state, req.out_file)
 
-        analysis = await run_cpu_blocking_state(
-            state,
-            analyze_beats,
-            audio_path=str(audio_path),
-            min_bpm=int(req.min_bpm),
-            max_bpm=int(req.max_bpm),
-            hop_ms=int(req.hop_ms),
-            window_ms=int(req.window_ms),
-            peak_threshold=float(req.peak_threshold),
-            min_interval_s=float(req.min_interval_s),
-            prefer_ffmpeg=bool(req.prefer_ffmpeg),
+        out, cached = await cached_beats_analysis(
+            state, audio_path, req.model_dump()
         )
-
-        out = analysis.as_dict()
-        if analysis.bpm > 0:
-            out["bpm_timeline"] = [
-                {
-                    "start_s": 0.0,
-                    "end_s": float(analysis.duration_s),
-                    "bpm": float(analysis.bpm),
-                }
-            ]
-        else:
-            out["bpm_timeline"] = []
-
         await write_json_async(str(out_path), out)
 
         base = Path(state.settings.data_dir).resolve()
@@ -123,14 +167,14 @@ async def audio_analyze(
                     source_path=rel_audio,
                     beats_path=rel_out,
                     prefer_ffmpeg=bool(req.prefer_ffmpeg),
-                    bpm=float(analysis.bpm),
-                    beat_count=len(list(analysis.beats_s or [])),
+                    bpm=float(out["bpm"]),
+                    beat_count=len(list(out["beats_s"] or [])),
                     error=None,
                 )
             except Exception:
                 pass
 
-        return {"ok": True, "analysis": out, "out_file": rel_out}
+        return {"ok": True, "analysis": out, "out_file": rel_out, "cached": cached}
     except HTTPException:
         raise
     except AudioAnalyzeError as e:
@@ -162,28 +206,24 @@ async def audio_waveform(
             if base in audio_path.resolve().parents
             else str(audio_path)
         )
-        stat = audio_path.stat()
         default_points = int(getattr(state.settings, "waveform_points_default", 512))
         points_i = max(32, min(5000, int(points or default_points)))
+        audio_digest = await run_blocking_state(state, file_digest, str(audio_path))
         key_raw = "|".join(
             [
-                rel,
-                str(stat.st_mtime),
-                str(stat.st_size),
+                audio_digest,
                 str(points_i),
                 str(int(bool(prefer_ffmpeg))),
             ]
         )
         key = hashlib.sha256(key_raw.encode("utf-8")).hexdigest()[:16]
         cache_dir = _waveform_cache_dir(state)
-        try:
-            cache_dir.mkdir(parents=True, exist_ok=True)
-        except Exception:
-            pass
+        cache_index = open_index(cache_dir)
         cache_path = cache_dir / f"{key}.json"
 
-        if not refresh and cache_path.is_file():
-            cached = await read_json_async(str(cache_path))
+        if not refresh:
+            hit = await run_blocking_state(state, cache_index.lookup, cache_path.name)
+            cached = await read_json_async(str(hit)) if hit is not None else None
             if isinstance(cached, dict):
                 cached["cached"] = True
                 cached["file"] = rel
@@ -202,6 +242,7 @@ async def audio_waveform(
         waveform["file"] = rel
         waveform["cached"] = False
         await write_json_async(str(cache_path), waveform)
+        await run_blocking_state(state, cache_index.record, cache_path.name)
 
         max_mb = int(getattr(state.settings, "waveform_cache_max_mb", 0) or 0)
         max_days = float(getattr(state.settings, "waveform_cache_max_days", 0) or 0)
@@ -225,6 +266,99 @@ async def audio_waveform(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _waveform_pyramid(
+    state: AppState, audio_path: Path, *, prefer_ffmpeg: bool
+) -> Path:
+    """Pyramid file for `audio_path` (built on the first request, then reused)."""
+    audio_digest = await run_blocking_state(state, file_digest, str(audio_path))
+    key_raw = "|".join(
+        [
+            audio_digest,
+            "pyramid",
+            f"v{PYRAMID_VERSION}",
+            str(int(bool(prefer_ffmpeg))),
+        ]
+    )
+    key = hashlib.sha256(key_raw.encode("utf-8")).hexdigest()[:16]
+    cache_dir = _waveform_cache_dir(state)
+    cache_index = open_index(cache_dir)
+    cache_path = cache_dir / f"{key}.wfp"
+
+    hit = await run_blocking_state(state, cache_index.lookup, cache_path.name)
+    if hit is not None:
+        return hit
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_dir / f".{key}.{uuid.uuid4().hex}.tmp"
+    try:
+        await run_cpu_blocking_state(
+            state,
+            build_waveform_pyramid,
+            audio_path=str(audio_path),
+            out_path=str(tmp_path),
+            sample_rate_hz=44100,
+            prefer_ffmpeg=bool(prefer_ffmpeg),
+        )
+        os.replace(tmp_path, cache_path)
+    finally:
+        try:
+            tmp_path.unlink()
+        except FileNotFoundError:
+            pass
+    await run_blocking_state(state, cache_index.record, cache_path.name)
+    return cache_path
+
+
+async def audio_waveform_range(
+    file: str,
+    request: Request,
+    start_s: float = 0.0,
+    end_s: float | None = None,
+    points: int | None = None,
+    prefer_ffmpeg: bool = True,
+    _: None = Depends(require_a2a_auth),
+    state: AppState = Depends(get_state),
+) -> Dict[str, Any]:
+    """
+    Min/max/RMS buckets for [start_s, end_s) of an audio file at `points`
+    resolution, sliced from its cached waveform pyramid (no decoding once built).
+    """
+    try:
+        audio_path = _resolve_data_path(state, file)
+        if not audio_path.is_file():
+            raise HTTPException(status_code=404, detail="Audio file not found")
+        if end_s is not None and float(end_s) <= float(start_s):
+            raise HTTPException(status_code=400, detail="end_s must be > start_s")
+
+        base = Path(state.settings.data_dir).resolve()
+        rel = (
+            str(audio_path.resolve().relative_to(base))
+            if base in audio_path.resolve().parents
+            else str(audio_path)
+        )
+        default_points = int(getattr(state.settings, "waveform_points_default", 512))
+        points_i = max(1, min(MAX_RANGE_POINTS, int(points or default_points)))
+        pyramid_path = await _waveform_pyramid(
+            state, audio_path, prefer_ffmpeg=bool(prefer_ffmpeg)
+        )
+        out = await run_blocking_state(
+            state,
+            read_waveform_range,
+            str(pyramid_path),
+            start_s=max(0.0, float(start_s)),
+            end_s=end_s,
+            points=points_i,
+        )
+        out["file"] = rel
+        return out
+    except HTTPException:
+        raise
+    except AudioAnalyzeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 async def audio_waveform_cache(
     request: Request,
     _: None = Depends(require_a2a_auth),
@@ -235,6 +369,8 @@ async def audio_waveform_cache(
         "ok": True,
         "files": stats.get("files", 0),
         "bytes": stats.get("bytes", 0),
+        "hits": stats.get("hits", 0),
+        "misses": stats.get("misses", 0),
         "max_mb": int(getattr(state.settings, "waveform_cache_max_mb", 0) or 0),
         "max_days": float(getattr(state.settings, "waveform_cache_max_days", 0) or 0),
     }
@@ -3270,6 +3270,23 @@ class DatabaseService:
             rows = (await session.exec(stmt)).all()
             return [r.model_dump() for r in rows]
 
+    async def list_fseq_exports_for_sequence(
+        self, *, source_sequence: str, limit: int = 20
+    ) -> list[dict[str, Any]]:
+        lim = max(1, int(limit))
+        async with AsyncSession(self.engine) as session:
+            stmt = (
+                select(FseqExportRecord)
+                .where(
+                    FseqExportRecord.agent_id == self.agent_id,
+                    FseqExportRecord.source_sequence == str(source_sequence),
+                )
+                .order_by(FseqExportRecord.updated_at.desc())
+                .limit(lim)
+            )
+            rows = (await session.exec(stmt)).all()
+            return [r.model_dump() for r in rows]
+
     async def list_fpp_scripts(self, *, limit: int = 200) -> list[dict[str, Any]]:
         lim = max(1, int(limit))
         async with AsyncSession(self.engine) as session:
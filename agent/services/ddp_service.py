@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Any, Dict, Optional
 
 from fastapi import Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
+from audio_reactive import AudioReactive, open_pcm_source
 from ddp_control import prepare_ddp_params
-from models.requests import DDPStartRequest
+from models.requests import DDPAudioReactiveRequest, DDPStartRequest
 from orientation import infer_orientation, OrientationInfo
+from preview_stream import preview_events
 from services.audit_logger import log_event
 from services.auth_service import require_a2a_auth
 from services.state import AppState, get_state
@@ -19,6 +23,38 @@ def _require_ddp(state: AppState):
     return ddp
 
 
+async def _audio_reactive(
+    state: AppState, req: DDPAudioReactiveRequest
+) -> AudioReactive:
+    path = None
+    if req.path:
+        base = Path(state.settings.data_dir).resolve()
+        p = (base / req.path).resolve()
+        if base not in p.parents:
+            raise HTTPException(status_code=400, detail="Path must be within DATA_DIR.")
+        path = str(p)
+    source = open_pcm_source(
+        req.source,
+        path=path,
+        host=req.host,
+        port=int(req.port),
+        sample_rate_hz=int(req.sample_rate_hz),
+        max_backlog_s=float(req.max_backlog_s),
+    )
+    try:
+        return AudioReactive(
+            source,
+            hop=int(req.hop),
+            fft_size=int(req.fft_size),
+            bands_hz=tuple(req.bands_hz),
+            mapping=req.mapping,
+        )
+    except BaseException:
+        # Bad analyzer settings: don't leak the open file / ffmpeg process.
+        await source.close()
+        raise
+
+
 async def _get_orientation(
     state: AppState, *, refresh: bool
 ) -> Optional[OrientationInfo]:
@@ -109,8 +145,9 @@ async def ddp_status(
     ddp = _require_ddp(state)
     try:
         st = await ddp.status()
+        m = await ddp.metrics()
         await log_event(state, action="ddp.status", ok=True, request=request)
-        return {"ok": True, "status": st.__dict__}
+        return {"ok": True, "status": st.__dict__, "metrics": m.__dict__}
     except HTTPException as e:
         await log_event(
             state,
@@ -127,6 +164,36 @@ async def ddp_status(
         raise
 
 
+async def ddp_preview(
+    request: Request,
+    fps: float = 10.0,
+    width: int = 48,
+    height: int = 32,
+    _: None = Depends(require_a2a_auth),
+    state: AppState = Depends(get_state),
+) -> StreamingResponse:
+    """
+    Live SSE preview of the frames DDP is sending (downsampled, delta-encoded).
+
+    `fps` is the client's maximum; it is lowered automatically while the client
+    cannot keep up. Clients never slow down the DDP send loop.
+    """
+    ddp = _require_ddp(state)
+    fps_f = max(1.0, min(float(ddp.fps_max), float(fps)))
+    return StreamingResponse(
+        preview_events(
+            ddp.preview,
+            geometry=ddp.geometry,
+            width=int(width),
+            height=int(height),
+            fps=fps_f,
+            is_disconnected=request.is_disconnected,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 async def ddp_start(
     req: DDPStartRequest,
     request: Request,
@@ -150,13 +217,22 @@ async def ddp_start(
             default_start_pos=str(state.settings.quad_default_start_pos),
         )
 
-        st = await ddp.start(
-            pattern=req.pattern,
-            params=params,
-            duration_s=req.duration_s,
-            brightness=min(state.settings.wled_max_bri, req.brightness),
-            fps=req.fps,
+        audio = (
+            await _audio_reactive(state, req.audio) if req.audio is not None else None
         )
+        try:
+            st = await ddp.start(
+                pattern=req.pattern,
+                params=params,
+                duration_s=req.duration_s,
+                brightness=min(state.settings.wled_max_bri, req.brightness),
+                fps=req.fps,
+                audio=audio,
+            )
+        except BaseException:
+            if audio is not None:
+                await audio.stop()
+            raise
 
         # Best-effort runtime state + DB metadata.
         try:
@@ -197,7 +273,10 @@ async def ddp_start(
             action="ddp.start",
             ok=True,
             resource=str(req.pattern),
-            payload={"duration_s": req.duration_s},
+            payload={
+                "duration_s": req.duration_s,
+                "audio": req.audio.source if req.audio is not None else None,
+            },
             request=request,
         )
         return {"ok": True, "status": st.__dict__}
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 from fastapi import Depends, HTTPException
 
-from models.requests import FSEQExportRequest
+from geometry import TreeGeometry
+from jobs import JobCanceled
+from models.requests import FSEQExportRequest, FSEQPlayRequest, FSEQShowExportRequest
 from pack_io import read_json_async
 from services.auth_service import require_a2a_auth
 from services.state import AppState, get_state
-from utils.blocking import run_cpu_blocking_state
-from utils.fseq_render import render_fseq
+from utils.blocking import run_blocking_state
+from utils.cache_utils import cleanup_cache, file_digest
+from show_config import load_show_config_async
+from utils.fseq_render import (
+    render_fseq_parallel,
+    render_show_fseq_parallel,
+    show_props_for_fseq,
+)
 
 
 def _resolve_data_path(state: AppState, rel_path: str) -> Path:
@@ -23,13 +31,184 @@ def _resolve_data_path(state: AppState, rel_path: str) -> Path:
     return p
 
 
+def fseq_chunk_cache_dir(state: AppState, *, use_cache: bool = True) -> Optional[str]:
+    """Per-step rendered frame cache for incremental re-export, if enabled."""
+    if not use_cache or not bool(
+        getattr(state.settings, "fseq_chunk_cache_enabled", False)
+    ):
+        return None
+    return str(Path(state.settings.data_dir) / "cache" / "fseq_chunks")
+
+
+async def prune_fseq_chunk_cache(state: AppState) -> None:
+    """Apply the LRU size/age limits after an export (least recently used first)."""
+    cache_dir = fseq_chunk_cache_dir(state)
+    max_mb = int(getattr(state.settings, "fseq_chunk_cache_max_mb", 0) or 0)
+    max_days = float(getattr(state.settings, "fseq_chunk_cache_max_days", 0) or 0)
+    if cache_dir is None or (max_mb <= 0 and max_days <= 0):
+        return
+    try:
+        await run_blocking_state(
+            state,
+            cleanup_cache,
+            Path(cache_dir),
+            max_bytes=max_mb * 1024 * 1024 if max_mb > 0 else None,
+            max_days=max_days or None,
+        )
+    except Exception:
+        pass
+
+
+def _geometry_sig(geometry: TreeGeometry) -> str:
+    return (
+        f"{geometry.runs}:{geometry.pixels_per_run}:"
+        f"{geometry.segment_len}:{geometry.segments_per_run}"
+    )
+
+
+async def fseq_export_source(
+    state: AppState, seq_path: Path, geometry: TreeGeometry
+) -> Dict[str, Any]:
+    """What a single-sequence export was rendered from (see `find_preview_fseq`)."""
+    seq_root = _resolve_data_path(state, "sequences").resolve()
+    try:
+        sha = await run_blocking_state(state, file_digest, str(seq_path))
+    except Exception:
+        sha = None
+    return {
+        "sequence_file": str(seq_path.resolve().relative_to(seq_root)),
+        "sequence_sha256": sha,
+        "geometry": _geometry_sig(geometry),
+    }
+
+
+async def find_preview_fseq(
+    state: AppState, *, seq_path: Path, led_count: int, geometry: TreeGeometry
+) -> Optional[Dict[str, Any]]:
+    """
+    Most recent export of this sequence that a preview can read frames from.
+
+    Matches the recorded source (same sequence file and content hash, same
+    geometry and LED count) and requires the .fseq to still exist. Returns
+    `path`, `file` (relative to DATA_DIR), `channel_start` and `mtime`, or None
+    when the preview has to be rendered live.
+    """
+    db = getattr(state, "db", None)
+    lookup = getattr(db, "list_fseq_exports_for_sequence", None)
+    if lookup is None:
+        return None
+    try:
+        rows = await lookup(source_sequence=seq_path.name)
+    except Exception:
+        return None
+    base = Path(state.settings.data_dir).resolve()
+    seq_root = _resolve_data_path(state, "sequences").resolve()
+    try:
+        rel = str(seq_path.resolve().relative_to(seq_root))
+    except ValueError:
+        return None
+    geom_sig = _geometry_sig(geometry)
+    sha: str | None = None
+    for row in rows or []:
+        payload = row.get("payload") if isinstance(row, dict) else None
+        if not isinstance(payload, dict):
+            continue
+        source = payload.get("source") or {}
+        render = payload.get("render") or {}
+        out_file = str(payload.get("out_file") or "")
+        if source.get("sequence_file") != rel or source.get("geometry") != geom_sig:
+            continue
+        if int(render.get("led_count") or 0) != int(led_count) or not out_file:
+            continue
+        path = (base / out_file).resolve()
+        if base not in path.parents or not path.is_file():
+            continue
+        if sha is None:
+            try:
+                sha = await run_blocking_state(state, file_digest, str(seq_path))
+            except Exception:
+                return None
+        if source.get("sequence_sha256") != sha:
+            continue
+        return {
+            "path": str(path),
+            "file": out_file,
+            "channel_start": int(render.get("channel_start") or 1),
+            "mtime": float(path.stat().st_mtime),
+        }
+    return None
+
+
+async def record_fseq_export(state: AppState, res: Dict[str, Any]) -> None:
+    """Best-effort upsert of an export's metadata for the UI/meta endpoints."""
+    if state.db is not None:
+        try:
+            fseq = res.get("fseq") if isinstance(res, dict) else None
+            rel_path = (
+                str(res.get("out_file") or "").lstrip("/")
+                if isinstance(res, dict)
+                else ""
+            )
+            try:
+                rel_file = str(Path(rel_path).relative_to("fseq"))
+            except Exception:
+                rel_file = rel_path
+            frames = (
+                int(fseq.get("frames"))
+                if isinstance(fseq, dict) and fseq.get("frames") is not None
+                else None
+            )
+            step_ms = (
+                int(fseq.get("step_ms"))
+                if isinstance(fseq, dict) and fseq.get("step_ms") is not None
+                else None
+            )
+            duration_s = (
+                (float(frames) * float(step_ms) / 1000.0)
+                if frames is not None and step_ms is not None
+                else None
+            )
+            source_sequence = (
+                str(res.get("source_sequence") or "").strip() or None
+                if isinstance(res, dict)
+                else None
+            )
+            await state.db.upsert_fseq_export(
+                file=rel_file,
+                source_sequence=source_sequence,
+                bytes_written=(
+                    int(fseq.get("bytes_written") or 0)
+                    if isinstance(fseq, dict)
+                    else 0
+                ),
+                frames=frames,
+                channels=(
+                    int(fseq.get("channels"))
+                    if isinstance(fseq, dict) and fseq.get("channels") is not None
+                    else None
+                ),
+                step_ms=step_ms,
+                duration_s=duration_s,
+                payload={
+                    "render": res.get("render"),
+                    "source": res.get("source"),
+                    "out_file": res.get("out_file"),
+                }
+                if isinstance(res, dict)
+                else None,
+            )
+        except Exception:
+            pass
+
+
 async def fseq_export(
     req: FSEQExportRequest,
     _: None = Depends(require_a2a_auth),
     state: AppState = Depends(get_state),
 ) -> Dict[str, Any]:
     """
-    Export a renderable (procedural-pattern) sequence JSON file to an uncompressed .fseq (v1).
+    Export a renderable (procedural-pattern) sequence JSON file to .fseq
+    (uncompressed v1, or v2 with zstd/zlib blocks and optional sparse ranges).
 
     Note: steps of type "look" (WLED effect states) are not offline-renderable and are rejected.
     """
@@ -84,9 +263,8 @@ async def fseq_export(
 
     out_path = _resolve_data_path(state, req.out_file)
     try:
-        render = await run_cpu_blocking_state(
-            state,
-            render_fseq,
+        render = await render_fseq_parallel(
+            getattr(state, "cpu_pool", None),
             steps=steps,
             out_path=str(out_path),
             led_count=led_count,
@@ -97,13 +275,20 @@ async def fseq_export(
             geometry=ddp.geometry,
             segment_layout=layout_auto,
             max_bri=int(state.settings.wled_max_bri),
+            fseq_version=int(req.fseq_version),
+            compression=str(req.compression),
+            frames_per_block=int(req.frames_per_block),
+            sparse=bool(req.sparse),
+            cache_dir=fseq_chunk_cache_dir(state, use_cache=bool(req.use_cache)),
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    await prune_fseq_chunk_cache(state)
 
     res: Dict[str, Any] = {
         "ok": True,
         "source_sequence": seq_path.name,
+        "source": await fseq_export_source(state, seq_path, ddp.geometry),
         "render": render.get("render"),
         "fseq": render.get("fseq"),
         "out_file": str(
@@ -112,58 +297,137 @@ async def fseq_export(
             .relative_to(Path(state.settings.data_dir).resolve())
         ),
     }
-    if state.db is not None:
-        try:
-            fseq = res.get("fseq") if isinstance(res, dict) else None
-            rel_path = (
-                str(res.get("out_file") or "").lstrip("/")
-                if isinstance(res, dict)
-                else ""
-            )
-            try:
-                rel_file = str(Path(rel_path).relative_to("fseq"))
-            except Exception:
-                rel_file = rel_path
-            frames = (
-                int(fseq.get("frames"))
-                if isinstance(fseq, dict) and fseq.get("frames") is not None
-                else None
-            )
-            step_ms = (
-                int(fseq.get("step_ms"))
-                if isinstance(fseq, dict) and fseq.get("step_ms") is not None
-                else None
-            )
-            duration_s = (
-                (float(frames) * float(step_ms) / 1000.0)
-                if frames is not None and step_ms is not None
-                else None
-            )
-            source_sequence = (
-                str(res.get("source_sequence") or "").strip() or None
-                if isinstance(res, dict)
-                else None
-            )
-            await state.db.upsert_fseq_export(
-                file=rel_file,
-                source_sequence=source_sequence,
-                bytes_written=(
-                    int(fseq.get("bytes_written") or 0)
-                    if isinstance(fseq, dict)
-                    else 0
-                ),
-                frames=frames,
-                channels=(
-                    int(fseq.get("channels"))
-                    if isinstance(fseq, dict) and fseq.get("channels") is not None
-                    else None
-                ),
-                step_ms=step_ms,
-                duration_s=duration_s,
-                payload={"render": res.get("render")}
-                if isinstance(res, dict)
-                else None,
-            )
-        except Exception:
-            pass
+    await record_fseq_export(state, res)
     return res
+
+
+async def _load_sequence_steps(state: AppState, sequence_file: str) -> List[Dict[str, Any]]:
+    seq_root = _resolve_data_path(state, "sequences").resolve()
+    seq_path = (seq_root / (sequence_file or "")).resolve()
+    if seq_root not in seq_path.parents:
+        raise HTTPException(
+            status_code=400,
+            detail="sequence files must be within DATA_DIR/sequences",
+        )
+    seq = await read_json_async(str(seq_path))
+    return list((seq if isinstance(seq, dict) else {}).get("steps", []))
+
+
+async def export_show_fseq(
+    state: AppState,
+    req: FSEQShowExportRequest,
+    *,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    """Render every prop of a show config into one .fseq (shared by route and job)."""
+    try:
+        cfg = await load_show_config_async(
+            data_dir=state.settings.data_dir, rel_path=req.config_file
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    files: Dict[str, str] = {}
+    for prop in cfg.props:
+        f = req.prop_sequences.get(prop.id) or req.sequence_file
+        if f:
+            files[prop.id] = str(f)
+    loaded: Dict[str, List[Dict[str, Any]]] = {}
+    for name in sorted(set(files.values())):
+        loaded[name] = await _load_sequence_steps(state, name)
+    props = show_props_for_fseq(
+        cfg,
+        {pid: loaded[name] for pid, name in files.items()},
+        prop_ids=req.prop_ids,
+    )
+    if not props:
+        raise HTTPException(
+            status_code=400,
+            detail="No props with a channel range and a sequence to render",
+        )
+
+    out_path = _resolve_data_path(state, req.out_file)
+    try:
+        render = await render_show_fseq_parallel(
+            getattr(state, "cpu_pool", None),
+            props=props,
+            out_path=str(out_path),
+            step_ms=int(req.step_ms),
+            default_bri=min(
+                state.settings.wled_max_bri, max(1, int(req.default_brightness))
+            ),
+            max_bri=int(state.settings.wled_max_bri),
+            channels_total=req.channels_total,
+            fseq_version=int(req.fseq_version),
+            compression=str(req.compression),
+            frames_per_block=int(req.frames_per_block),
+            sparse=bool(req.sparse),
+            progress=progress,
+            cache_dir=fseq_chunk_cache_dir(state, use_cache=bool(req.use_cache)),
+        )
+    except JobCanceled:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await prune_fseq_chunk_cache(state)
+
+    res: Dict[str, Any] = {
+        "ok": True,
+        "source_sequence": Path(req.config_file).name,
+        "render": render.get("render"),
+        "fseq": render.get("fseq"),
+        "out_file": str(
+            Path(out_path)
+            .resolve()
+            .relative_to(Path(state.settings.data_dir).resolve())
+        ),
+    }
+    await record_fseq_export(state, res)
+    return res
+
+
+async def fseq_export_show(
+    req: FSEQShowExportRequest,
+    _: None = Depends(require_a2a_auth),
+    state: AppState = Depends(get_state),
+) -> Dict[str, Any]:
+    """
+    Export a whole show (every prop of a show config, each with its own
+    sequence, geometry and channel range) into one .fseq.
+    """
+    return await export_show_fseq(state, req)
+
+
+async def fseq_play(
+    req: FSEQPlayRequest,
+    _: None = Depends(require_a2a_auth),
+    state: AppState = Depends(get_state),
+) -> Dict[str, Any]:
+    """
+    Stream a pre-rendered .fseq to WLED over DDP at its own step time.
+
+    The file is memory-mapped and frames are sent straight from the mapping;
+    stop playback with /v1/ddp/stop.
+    """
+    ddp = getattr(state, "ddp", None)
+    if ddp is None:
+        raise HTTPException(status_code=503, detail="DDP streamer not initialized")
+    path = _resolve_data_path(state, req.file)
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="FSEQ file not found")
+    brightness = (
+        min(state.settings.wled_max_bri, int(req.brightness))
+        if req.brightness is not None
+        else None
+    )
+    try:
+        st = await ddp.play_fseq(
+            path=str(path),
+            channel_start=int(req.channel_start),
+            led_count=req.led_count,
+            loop=bool(req.loop),
+            brightness=brightness,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"ok": True, "status": st.__dict__}
@@ -1,22 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import time
+import uuid
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from aiofiles import os as aio_os
 from fastapi import Depends, HTTPException
 
-from audio_analyzer import analyze_beats
+from audio_analyzer import analyze_beats_timeline
 from jobs import (
     AsyncJobContext,
     AsyncJobManager,
     Job,
+    JobCanceled,
 )
 from models.requests import (
     AudioAnalyzeRequest,
+    AudioLibraryAnalyzeRequest,
     FSEQExportRequest,
+    FSEQShowExportRequest,
     GenerateLooksRequest,
     GenerateSequenceRequest,
     XlightsImportNetworksRequest,
@@ -24,10 +29,25 @@ from models.requests import (
     XlightsImportSequenceRequest,
 )
 from pack_io import read_json_async, read_jsonl_async, write_json_async
+from services.audio_service import (
+    ANALYSIS_PARAMS,
+    analysis_cache_key,
+    cached_analysis,
+    cached_beats_analysis,
+    store_analysis,
+)
 from services.auth_service import require_a2a_auth, require_admin
+from services.fseq_service import (
+    export_show_fseq,
+    fseq_chunk_cache_dir,
+    fseq_export_source,
+    prune_fseq_chunk_cache,
+    record_fseq_export,
+)
 from services.state import AppState, get_state
-from utils.blocking import run_cpu_blocking_state
-from utils.fseq_render import render_fseq
+from utils.blocking import run_blocking_state, run_cpu_blocking_state
+from utils.cache_utils import file_digest
+from utils.fseq_render import render_fseq_parallel
 from utils.sequence_generate import generate_sequence_file
 from show_config import ShowConfig, write_show_config_async
 from xlights_import import (
@@ -39,6 +59,9 @@ from xlights_import import (
 from xlights_sequence_import import import_xlights_xsq_timing_file
 
 
+_AUDIO_EXTS = {".wav", ".mp3", ".aac", ".m4a", ".flac", ".ogg"}
+
+
 def _require_jobs(state: AppState) -> AsyncJobManager:
     jobs = getattr(state, "jobs", None)
     if jobs is None:
@@ -303,6 +326,7 @@ async def jobs_looks_generate(
             seed=int(params["seed"]),
             write_files=bool(params.get("write_files", True)),
             include_multi_segment=bool(params.get("include_multi_segment", True)),
+            sharded=bool(params.get("sharded", False)),
             progress_cb=lambda cur, total, msg: (
                 ctx.check_cancelled(),
                 ctx.set_progress(current=cur, total=total, message=msg),
@@ -333,31 +357,7 @@ async def jobs_audio_analyze(
         out_path = _resolve_data_path(state, str(params["out_file"]))
 
         ctx.set_progress(message="Analyzing audio...")
-        analysis = await run_cpu_blocking_state(
-            state,
-            analyze_beats,
-            audio_path=str(audio_path),
-            min_bpm=int(params["min_bpm"]),
-            max_bpm=int(params["max_bpm"]),
-            hop_ms=int(params["hop_ms"]),
-            window_ms=int(params["window_ms"]),
-            peak_threshold=float(params["peak_threshold"]),
-            min_interval_s=float(params["min_interval_s"]),
-            prefer_ffmpeg=bool(params["prefer_ffmpeg"]),
-        )
-
-        out = analysis.as_dict()
-        if analysis.bpm > 0:
-            out["bpm_timeline"] = [
-                {
-                    "start_s": 0.0,
-                    "end_s": float(analysis.duration_s),
-                    "bpm": float(analysis.bpm),
-                }
-            ]
-        else:
-            out["bpm_timeline"] = []
-
+        out, cached = await cached_beats_analysis(state, audio_path, params)
         await write_json_async(str(out_path), out)
 
         base = Path(state.settings.data_dir).resolve()
@@ -373,7 +373,12 @@ async def jobs_audio_analyze(
         )
 
         ctx.set_progress(message="Done.")
-        res = {"analysis": out, "out_file": rel_out, "_rel_audio": rel_audio}
+        res = {
+            "analysis": out,
+            "out_file": rel_out,
+            "cached": cached,
+            "_rel_audio": rel_audio,
+        }
         # Best-effort DB metadata.
         if state.db is not None:
             try:
@@ -404,6 +409,171 @@ async def jobs_audio_analyze(
     return {"ok": True, "job": job.as_dict()}
 
 
+def _list_library_audio(music_dir: Path) -> List[Path]:
+    out: List[Path] = []
+    for dirpath, dirnames, filenames in os.walk(music_dir, followlinks=False):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.startswith(".") or Path(name).suffix.lower() not in _AUDIO_EXTS:
+                continue
+            out.append(Path(dirpath) / name)
+    return out
+
+
+async def jobs_audio_analyze_library(
+    req: AudioLibraryAnalyzeRequest,
+    _: None = Depends(require_a2a_auth),
+    state: AppState = Depends(get_state),
+) -> Dict[str, Any]:
+    """
+    Beats/BPM for every audio file under `music_dir`.
+
+    Files are hashed first; content that already has a cached analysis (same
+    bytes and analysis parameters, under any name) is reused, and the rest is
+    analyzed across the CPU pool, identical files only once.
+    """
+    jobs = _require_jobs(state)
+    params = req.model_dump()
+
+    async def _runner(ctx: AsyncJobContext) -> Any:
+        base = Path(state.settings.data_dir).resolve()
+        music_dir = _resolve_data_path(state, str(params["music_dir"]))
+        out_dir = _resolve_data_path(state, str(params["out_dir"]))
+        if not await aio_os.path.isdir(str(music_dir)):
+            raise HTTPException(
+                status_code=400,
+                detail="music_dir must be a directory under DATA_DIR",
+            )
+
+        ctx.set_progress(message="Scanning library...")
+        files = await run_blocking_state(state, _list_library_audio, music_dir)
+        summary = {
+            "files": len(files),
+            "analyzed": 0,
+            "cached": 0,
+            "duplicates": 0,
+            "errors": 0,
+        }
+        keys: Dict[Path, str] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[Path, str] = {}
+        todo: Dict[str, Path] = {}
+
+        for i, path in enumerate(files):
+            ctx.check_cancelled()
+            ctx.set_progress(
+                current=i, total=len(files), message=f"Hashed {i}/{len(files)} files"
+            )
+            try:
+                digest = await run_blocking_state(state, file_digest, str(path))
+            except Exception as e:
+                errors[path] = str(e)
+                continue
+            key = analysis_cache_key(digest, params)
+            keys[path] = key
+            if key in results or key in todo:
+                summary["duplicates"] += 1
+                continue
+            hit = None if params["force"] else await cached_analysis(state, key)
+            if hit is not None:
+                results[key] = hit
+                summary["cached"] += 1
+            else:
+                todo[key] = path
+
+        workers = int(params.get("workers") or 0)
+        if workers <= 0:
+            cpu_pool = getattr(state, "cpu_pool", None)
+            workers = (await cpu_pool.stats()).max_workers if cpu_pool else 1
+        slots = asyncio.Semaphore(max(1, workers))
+        failed: Dict[str, str] = {}
+
+        async def _analyze(key: str, path: Path) -> None:
+            async with slots:
+                ctx.check_cancelled()
+                try:
+                    out = await run_cpu_blocking_state(
+                        state,
+                        analyze_beats_timeline,
+                        audio_path=str(path),
+                        **{k: params[k] for k in ANALYSIS_PARAMS},
+                    )
+                    await store_analysis(state, key, out)
+                except Exception as e:
+                    failed[key] = str(e)
+                    return
+            results[key] = out
+            summary["analyzed"] += 1
+
+        tasks = [asyncio.ensure_future(_analyze(k, p)) for k, p in todo.items()]
+        try:
+            for done, fut in enumerate(asyncio.as_completed(tasks), start=1):
+                await fut
+                ctx.check_cancelled()
+                ctx.set_progress(
+                    current=done,
+                    total=len(tasks),
+                    message=(
+                        f"Analyzed {done}/{len(tasks)} files "
+                        f"({summary['cached']} cached)"
+                    ),
+                )
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        index: List[Dict[str, Any]] = []
+        for path in files:
+            rel = str(path.relative_to(base))
+            key = keys.get(path)
+            out = results.get(key) if key else None
+            if out is None:
+                summary["errors"] += 1
+                err = errors.get(path) or failed.get(str(key)) or "analysis failed"
+                index.append({"file": rel, "error": err})
+                continue
+            beats_path = out_dir / f"{path.relative_to(music_dir)}.json"
+            await write_json_async(str(beats_path), out)
+            index.append(
+                {
+                    "file": rel,
+                    "key": key,
+                    "beats_file": str(beats_path.relative_to(base)),
+                    "bpm": float(out.get("bpm") or 0.0),
+                    "beat_count": len(list(out.get("beats_s") or [])),
+                }
+            )
+        index_path = out_dir / "index.json"
+        await write_json_async(
+            str(index_path),
+            {"music_dir": str(music_dir.relative_to(base)), "files": index},
+        )
+
+        if state.db is not None:
+            for item in index:
+                if "error" in item or item["key"] not in todo:
+                    continue
+                try:
+                    await state.db.add_audio_analysis(
+                        analysis_id=uuid.uuid4().hex,
+                        source_path=str(item["file"]),
+                        beats_path=str(item["beats_file"]),
+                        prefer_ffmpeg=bool(params.get("prefer_ffmpeg")),
+                        bpm=float(item["bpm"]),
+                        beat_count=int(item["beat_count"]),
+                        error=None,
+                    )
+                except Exception:
+                    pass
+
+        ctx.set_progress(message="Done.")
+        return {"summary": summary, "index_file": str(index_path.relative_to(base))}
+
+    job = await _create_job(state, jobs, kind="audio_analyze_library", runner=_runner)
+    return {"ok": True, "job": job.as_dict()}
+
+
 async def jobs_xlights_import_project(
     req: XlightsImportProjectRequest,
     _: None = Depends(require_a2a_auth),
@@ -768,9 +938,8 @@ async def jobs_fseq_export(
         out_path = _resolve_data_path(state, str(params["out_file"]))
         ctx.set_progress(message="Rendering fseq...")
         try:
-            render = await run_cpu_blocking_state(
-                state,
-                render_fseq,
+            render = await render_fseq_parallel(
+                getattr(state, "cpu_pool", None),
                 steps=steps,
                 out_path=str(out_path),
                 led_count=led_count,
@@ -781,12 +950,31 @@ async def jobs_fseq_export(
                 geometry=ddp.geometry,
                 segment_layout=layout_auto,
                 max_bri=int(state.settings.wled_max_bri),
+                fseq_version=int(params.get("fseq_version") or 1),
+                compression=str(params.get("compression") or "zstd"),
+                frames_per_block=int(params.get("frames_per_block") or 0),
+                sparse=bool(params.get("sparse")),
+                cache_dir=fseq_chunk_cache_dir(
+                    state, use_cache=bool(params.get("use_cache", True))
+                ),
+                progress=lambda done, total: (
+                    ctx.check_cancelled(),
+                    ctx.set_progress(
+                        current=done,
+                        total=total,
+                        message=f"Rendered {done}/{total} frames",
+                    ),
+                ),
             )
+        except JobCanceled:
+            raise
         except Exception as e:
             raise HTTPException(status_code=400, detail=str(e))
+        await prune_fseq_chunk_cache(state)
 
         res = {
             "source_sequence": seq_path.name,
+            "source": await fseq_export_source(state, seq_path, ddp.geometry),
             "render": render.get("render"),
             "fseq": render.get("fseq"),
             "out_file": str(
@@ -796,61 +984,36 @@ async def jobs_fseq_export(
             ),
         }
         ctx.set_progress(message="Done.")
-        if state.db is not None:
-            try:
-                fseq = res.get("fseq") if isinstance(res, dict) else None
-                rel_path = (
-                    str(res.get("out_file") or "").lstrip("/")
-                    if isinstance(res, dict)
-                    else ""
-                )
-                try:
-                    rel_file = str(Path(rel_path).relative_to("fseq"))
-                except Exception:
-                    rel_file = rel_path
-                frames = (
-                    int(fseq.get("frames"))
-                    if isinstance(fseq, dict) and fseq.get("frames") is not None
-                    else None
-                )
-                step_ms = (
-                    int(fseq.get("step_ms"))
-                    if isinstance(fseq, dict) and fseq.get("step_ms") is not None
-                    else None
-                )
-                duration_s = (
-                    (float(frames) * float(step_ms) / 1000.0)
-                    if frames is not None and step_ms is not None
-                    else None
-                )
-                source_sequence = (
-                    str(res.get("source_sequence") or "").strip() or None
-                    if isinstance(res, dict)
-                    else None
-                )
-                await state.db.upsert_fseq_export(
-                    file=rel_file,
-                    source_sequence=source_sequence,
-                    bytes_written=(
-                        int(fseq.get("bytes_written") or 0)
-                        if isinstance(fseq, dict)
-                        else 0
-                    ),
-                    frames=frames,
-                    channels=(
-                        int(fseq.get("channels"))
-                        if isinstance(fseq, dict) and fseq.get("channels") is not None
-                        else None
-                    ),
-                    step_ms=step_ms,
-                    duration_s=duration_s,
-                    payload={"render": res.get("render")}
-                    if isinstance(res, dict)
-                    else None,
-                )
-            except Exception:
-                pass
+        await record_fseq_export(state, res)
         return res
 
     job = await _create_job(state, jobs, kind="fseq_export", runner=_runner)
     return {"ok": True, "job": job.as_dict()}
+
+
+async def jobs_fseq_export_show(
+    req: FSEQShowExportRequest,
+    _: None = Depends(require_a2a_auth),
+    state: AppState = Depends(get_state),
+) -> Dict[str, Any]:
+    jobs = _require_jobs(state)
+
+    async def _runner(ctx: AsyncJobContext) -> Any:
+        ctx.set_progress(message="Rendering show fseq...")
+        res = await export_show_fseq(
+            state,
+            req,
+            progress=lambda done, total: (
+                ctx.check_cancelled(),
+                ctx.set_progress(
+                    current=done,
+                    total=total,
+                    message=f"Rendered {done}/{total} frames",
+                ),
+            ),
+        )
+        ctx.set_progress(message="Done.")
+        return res
+
+    job = await _create_job(state, jobs, kind="fseq_export_show", runner=_runner)
+    return {"ok": True, "job": job.as_dict()}
@@ -32,6 +32,7 @@ async def looks_generate(
             seed=req.seed,
             write_files=req.write_files,
             include_multi_segment=req.include_multi_segment,
+            sharded=req.sharded,
         )
         await log_event(
             state,
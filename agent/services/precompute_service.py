@@ -3,15 +3,17 @@ from __future__ import annotations
 import hashlib
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Sequence
+from typing import Any, List, Sequence
 
 from audio_analyzer import AudioAnalyzeError, extract_waveform
 from geometry import TreeGeometry
 from jobs import AsyncJobContext, AsyncJobManager, Job
 from pack_io import write_json_async
+from services.fseq_service import find_preview_fseq
 from services.state import AppState
-from utils.blocking import run_cpu_blocking_state
-from utils.sequence_preview import render_sequence_preview
+from utils.blocking import run_blocking_state, run_cpu_blocking_state
+from utils.cache_utils import file_digest, open_index, sequence_digest
+from utils.sequence_preview import PREVIEW_LAYOUT_VERSION, render_sequence_preview
 
 
 _AUDIO_EXTS = {".wav", ".mp3", ".aac", ".m4a", ".flac", ".ogg"}
@@ -88,8 +90,7 @@ def _list_audio_files(state: AppState, *, limit: int) -> List[str]:
 def _preview_cache_path(
     *,
     state: AppState,
-    seq_rel: str,
-    st: os.stat_result,
+    seq_digest: str,
     width: int,
     height: int,
     fps: float,
@@ -98,6 +99,7 @@ def _preview_cache_path(
     fmt: str,
     led_count: int,
     geometry: TreeGeometry,
+    fseq_digest: str | None = None,
 ) -> Path:
     geom_sig = (
         f"{geometry.runs}:{geometry.pixels_per_run}:"
@@ -105,9 +107,7 @@ def _preview_cache_path(
     )
     key_raw = "|".join(
         [
-            seq_rel,
-            str(st.st_mtime),
-            str(st.st_size),
+            seq_digest,
             str(width),
             str(height),
             f"{fps:.3f}",
@@ -116,6 +116,8 @@ def _preview_cache_path(
             fmt,
             str(led_count),
             geom_sig,
+            str(PREVIEW_LAYOUT_VERSION),
+            f"fseq:{fseq_digest}" if fseq_digest else "render",
         ]
     )
     key = hashlib.sha256(key_raw.encode("utf-8")).hexdigest()[:16]
@@ -127,16 +129,13 @@ def _preview_cache_path(
 def _waveform_cache_path(
     *,
     state: AppState,
-    rel_path: str,
-    st: os.stat_result,
+    audio_digest: str,
     points: int,
     prefer_ffmpeg: bool,
 ) -> Path:
     key_raw = "|".join(
         [
-            rel_path,
-            str(st.st_mtime),
-            str(st.st_size),
+            audio_digest,
             str(points),
             str(int(bool(prefer_ffmpeg))),
         ]
@@ -175,7 +174,12 @@ async def schedule_precompute(
         current = 0
         summary = {
             "reason": str(reason),
-            "sequences": {"total": len(seq_list), "rendered": 0, "cached": 0},
+            "sequences": {
+                "total": len(seq_list),
+                "rendered": 0,
+                "cached": 0,
+                "from_fseq": 0,
+            },
             "audio": {"total": len(audio_list), "rendered": 0, "cached": 0},
             "errors": 0,
         }
@@ -211,7 +215,7 @@ async def schedule_precompute(
                 led_count = int(settings.tree_runs) * int(settings.tree_pixels_per_run)
             if led_count <= 0:
                 summary["errors"] += len(seq_list) * len(fmt_list)
-                seq_list = []
+                seq_list.clear()
 
             layout = None
             try:
@@ -239,11 +243,25 @@ async def schedule_precompute(
                     if not seq_path.is_file():
                         continue
                     try:
-                        st = seq_path.stat()
+                        seq_digest = await run_blocking_state(
+                            state, sequence_digest, str(seq_path)
+                        )
+                        fseq_src = await find_preview_fseq(
+                            state,
+                            seq_path=seq_path,
+                            led_count=led_count,
+                            geometry=geometry,
+                        )
+                        fseq_digest = (
+                            await run_blocking_state(
+                                state, file_digest, fseq_src["path"]
+                            )
+                            if fseq_src
+                            else None
+                        )
                         out_path = _preview_cache_path(
                             state=state,
-                            seq_rel=str(seq_rel),
-                            st=st,
+                            seq_digest=seq_digest,
                             width=width,
                             height=height,
                             fps=fps,
@@ -252,14 +270,15 @@ async def schedule_precompute(
                             fmt=fmt,
                             led_count=led_count,
                             geometry=geometry,
+                            fseq_digest=fseq_digest,
                         )
-                        if out_path.is_file():
-                            try:
-                                if out_path.stat().st_mtime >= st.st_mtime:
-                                    summary["sequences"]["cached"] += 1
-                                    continue
-                            except Exception:
-                                pass
+                        preview_index = open_index(out_path.parent)
+                        hit = await run_blocking_state(
+                            state, preview_index.lookup, out_path.name
+                        )
+                        if hit is not None:
+                            summary["sequences"]["cached"] += 1
+                            continue
                         tmp_path = out_path.with_name(
                             f".{out_path.name}.{os.urandom(4).hex()}.tmp"
                         )
@@ -280,6 +299,10 @@ async def schedule_precompute(
                                 max_bri=int(settings.wled_max_bri),
                                 strict=bool(strict),
                                 format=fmt,
+                                fseq_path=fseq_src["path"] if fseq_src else None,
+                                fseq_channel_start=(
+                                    fseq_src["channel_start"] if fseq_src else 1
+                                ),
                             )
                             try:
                                 tmp_path.replace(out_path)
@@ -288,7 +311,12 @@ async def schedule_precompute(
                                     os.replace(str(tmp_path), str(out_path))
                                 except Exception:
                                     pass
+                            await run_blocking_state(
+                                state, preview_index.record, out_path.name
+                            )
                             summary["sequences"]["rendered"] += 1
+                            if fseq_src:
+                                summary["sequences"]["from_fseq"] += 1
                         finally:
                             try:
                                 if tmp_path.is_file():
@@ -317,15 +345,20 @@ async def schedule_precompute(
                 if not abs_path.is_file():
                     continue
                 try:
-                    st = abs_path.stat()
+                    audio_digest = await run_blocking_state(
+                        state, file_digest, str(abs_path)
+                    )
                     out_path = _waveform_cache_path(
                         state=state,
-                        rel_path=str(rel_path),
-                        st=st,
+                        audio_digest=audio_digest,
                         points=points,
                         prefer_ffmpeg=prefer_ffmpeg,
                     )
-                    if out_path.is_file():
+                    waveform_index = open_index(out_path.parent)
+                    hit = await run_blocking_state(
+                        state, waveform_index.lookup, out_path.name
+                    )
+                    if hit is not None:
                         summary["audio"]["cached"] += 1
                         continue
                     waveform = await run_cpu_blocking_state(
@@ -342,6 +375,9 @@ async def schedule_precompute(
                     waveform["file"] = str(rel_path)
                     waveform["cached"] = False
                     await write_json_async(str(out_path), waveform)
+                    await run_blocking_state(
+                        state, waveform_index.record, out_path.name
+                    )
                     summary["audio"]["rendered"] += 1
                 except AudioAnalyzeError:
                     summary["errors"] += 1
@@ -4,6 +4,7 @@ import threading
 import time
 from dataclasses import dataclass
 import inspect
+from pathlib import Path
 from typing import Dict, Iterable, Tuple
 
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -13,6 +14,8 @@ from starlette.types import ASGIApp
 
 from config.constants import APP_VERSION, SERVICE_NAME
 from services.audit_logger import log_event
+from utils.blocking import run_blocking_state
+from utils.cache_utils import cache_namespace_stats
 from utils.outbound_metrics import REGISTRY as OUTBOUND_REGISTRY
 from utils.rate_limit_metrics import REGISTRY as RATE_LIMIT_REGISTRY
 
@@ -309,6 +312,33 @@ async def metrics_endpoint_with_state(request: Request) -> PlainTextResponse:
             except Exception:
                 pass
 
+        # Render caches (per-namespace index under DATA_DIR/cache).
+        data_dir = getattr(getattr(st, "settings", None), "data_dir", None)
+        if data_dir:
+            try:
+                caches = await run_blocking_state(
+                    st, cache_namespace_stats, Path(str(data_dir)) / "cache"
+                )
+                for name, help_text, kind, field in (
+                    ("wsa_cache_hits_total", "Render cache hits.", "counter", "hits"),
+                    (
+                        "wsa_cache_misses_total",
+                        "Render cache misses.",
+                        "counter",
+                        "misses",
+                    ),
+                    ("wsa_cache_files", "Render cache entries.", "gauge", "files"),
+                    ("wsa_cache_bytes", "Render cache size in bytes.", "gauge", "bytes"),
+                ):
+                    lines.append(f"# HELP {name} {help_text}")
+                    lines.append(f"# TYPE {name} {kind}")
+                    for ns, stats in caches.items():
+                        lines.append(
+                            f'{name}{{namespace="{ns}"}} {int(stats.get(field, 0))}'
+                        )
+            except Exception:
+                pass
+
         # MQTT bridge status.
         try:
             settings = getattr(st, "settings", None)
@@ -571,6 +601,111 @@ async def metrics_endpoint_with_state(request: Request) -> PlainTextResponse:
                     f"wsa_ddp_frame_lag_seconds_max {float(getattr(m, 'max_frame_lag_s', 0.0)):.6f}"
                 )
 
+                lines.append(
+                    "# HELP wsa_ddp_lookahead_frames Frames rendered ahead of the sender (render-ahead mode)."
+                )
+                lines.append("# TYPE wsa_ddp_lookahead_frames gauge")
+                lines.append(
+                    f"wsa_ddp_lookahead_frames {int(getattr(m, 'lookahead_frames', 0))}"
+                )
+
+                lines.append(
+                    "# HELP wsa_ddp_ring_underruns_total Frames the sender had to wait for (render-ahead ring empty)."
+                )
+                lines.append("# TYPE wsa_ddp_ring_underruns_total counter")
+                lines.append(
+                    f"wsa_ddp_ring_underruns_total {int(getattr(m, 'ring_underruns_total', 0))}"
+                )
+
+                lines.append(
+                    "# HELP wsa_ddp_packets_skipped_total Unchanged packets not sent (delta sending)."
+                )
+                lines.append("# TYPE wsa_ddp_packets_skipped_total counter")
+                lines.append(
+                    f"wsa_ddp_packets_skipped_total {int(getattr(m, 'packets_skipped_total', 0))}"
+                )
+
+                lines.append(
+                    "# HELP wsa_ddp_bytes_saved_total Bytes not sent because packets were unchanged (delta sending)."
+                )
+                lines.append("# TYPE wsa_ddp_bytes_saved_total counter")
+                lines.append(
+                    f"wsa_ddp_bytes_saved_total {int(getattr(m, 'bytes_saved_total', 0))}"
+                )
+
+                lines.append(
+                    "# HELP wsa_ddp_frame_interval_seconds Interval between sent frames (current stream)."
+                )
+                lines.append("# TYPE wsa_ddp_frame_interval_seconds summary")
+                for q, attr in (
+                    ("0.5", "frame_interval_p50_s"),
+                    ("0.99", "frame_interval_p99_s"),
+                ):
+                    val = getattr(m, attr, None)
+                    if val is not None:
+                        lines.append(
+                            f'wsa_ddp_frame_interval_seconds{{quantile="{q}"}} {float(val):.6f}'
+                        )
+                lines.append(
+                    f"wsa_ddp_frame_interval_seconds_count {int(getattr(m, 'frame_interval_count', 0))}"
+                )
+                lines.append(
+                    f"wsa_ddp_frame_interval_seconds_sum {float(getattr(m, 'frame_interval_seconds_sum', 0.0)):.6f}"
+                )
+
+                lines.append(
+                    "# HELP wsa_ddp_audio_hops_total Live audio hops analyzed (audio-reactive streams)."
+                )
+                lines.append("# TYPE wsa_ddp_audio_hops_total counter")
+                lines.append(
+                    f"wsa_ddp_audio_hops_total {int(getattr(m, 'audio_hops_total', 0))}"
+                )
+                lines.append(
+                    "# HELP wsa_ddp_audio_hop_overruns_total Audio hops that took longer to analyze than their duration."
+                )
+                lines.append("# TYPE wsa_ddp_audio_hop_overruns_total counter")
+                lines.append(
+                    f"wsa_ddp_audio_hop_overruns_total {int(getattr(m, 'audio_hop_overruns_total', 0))}"
+                )
+                lines.append(
+                    "# HELP wsa_ddp_audio_hop_compute_seconds_sum Total audio hop analysis time."
+                )
+                lines.append("# TYPE wsa_ddp_audio_hop_compute_seconds_sum counter")
+                lines.append(
+                    f"wsa_ddp_audio_hop_compute_seconds_sum {float(getattr(m, 'audio_hop_compute_seconds_sum', 0.0)):.6f}"
+                )
+                lines.append(
+                    "# HELP wsa_ddp_audio_hop_compute_seconds_max Slowest audio hop analysis."
+                )
+                lines.append("# TYPE wsa_ddp_audio_hop_compute_seconds_max gauge")
+                lines.append(
+                    f"wsa_ddp_audio_hop_compute_seconds_max {float(getattr(m, 'audio_hop_compute_max_s', 0.0)):.6f}"
+                )
+                lines.append(
+                    "# HELP wsa_ddp_audio_samples_dropped_total Live audio samples dropped to bound latency."
+                )
+                lines.append("# TYPE wsa_ddp_audio_samples_dropped_total counter")
+                lines.append(
+                    f"wsa_ddp_audio_samples_dropped_total {int(getattr(m, 'audio_samples_dropped_total', 0))}"
+                )
+                lines.append(
+                    "# HELP wsa_ddp_audio_latency_seconds Audio arrival to DDP frame send latency summary."
+                )
+                lines.append("# TYPE wsa_ddp_audio_latency_seconds summary")
+                lines.append(
+                    f"wsa_ddp_audio_latency_seconds_count {int(getattr(m, 'audio_latency_seconds_count', 0))}"
+                )
+                lines.append(
+                    f"wsa_ddp_audio_latency_seconds_sum {float(getattr(m, 'audio_latency_seconds_sum', 0.0)):.6f}"
+                )
+                lines.append(
+                    "# HELP wsa_ddp_audio_latency_seconds_max Max observed audio-to-light latency."
+                )
+                lines.append("# TYPE wsa_ddp_audio_latency_seconds_max gauge")
+                lines.append(
+                    f"wsa_ddp_audio_latency_seconds_max {float(getattr(m, 'audio_latency_max_s', 0.0)):.6f}"
+                )
+
                 last_compute = getattr(m, "last_frame_compute_s", None)
                 if last_compute is not None:
                     lines.append(
@@ -15,11 +15,18 @@ from models.requests import GenerateSequenceRequest, PlaySequenceRequest
 from pack_io import read_json_async, read_jsonl_async
 from services.audit_logger import log_event
 from services.auth_service import require_a2a_auth, require_admin
+from services.fseq_service import find_preview_fseq
 from services.state import AppState, get_state
 from utils.blocking import run_blocking_state, run_cpu_blocking_state
-from utils.cache_utils import cache_stats, cleanup_cache
+from utils.cache_utils import (
+    cache_stats,
+    cleanup_cache,
+    file_digest,
+    open_index,
+    sequence_digest,
+)
 from utils.sequence_generate import generate_sequence_file
-from utils.sequence_preview import render_sequence_preview
+from utils.sequence_preview import PREVIEW_LAYOUT_VERSION, render_sequence_preview
 
 
 def _require_sequences(state: AppState):
@@ -69,7 +76,7 @@ async def _preview_cache_stats(state: AppState) -> Dict[str, int]:
     try:
         return await run_blocking_state(state, cache_stats, cache_dir)
     except Exception:
-        return {"files": 0, "bytes": 0}
+        return {"files": 0, "bytes": 0, "hits": 0, "misses": 0}
 
 
 async def _preview_cache_cleanup(
@@ -375,18 +382,23 @@ async def sequences_preview(
         except Exception:
             layout = None
 
-        seq_root = _resolve_data_path(state, "sequences").resolve()
-        st = seq_path.stat()
-        rel = str(seq_path.relative_to(seq_root))
+        fseq_src = await find_preview_fseq(
+            state, seq_path=seq_path, led_count=led_count, geometry=geometry
+        )
+
+        seq_digest = await run_blocking_state(state, sequence_digest, str(seq_path))
+        fseq_digest = (
+            await run_blocking_state(state, file_digest, fseq_src["path"])
+            if fseq_src
+            else None
+        )
         geom_sig = (
             f"{geometry.runs}:{geometry.pixels_per_run}:"
             f"{geometry.segment_len}:{geometry.segments_per_run}"
         )
         key_raw = "|".join(
             [
-                rel,
-                str(st.st_mtime),
-                str(st.st_size),
+                seq_digest,
                 str(width_i),
                 str(height_i),
                 f"{fps_f:.3f}",
@@ -395,36 +407,37 @@ async def sequences_preview(
                 fmt,
                 str(led_count),
                 geom_sig,
+                str(PREVIEW_LAYOUT_VERSION),
+                f"fseq:{fseq_digest}" if fseq_digest else "render",
             ]
         )
         key = hashlib.sha256(key_raw.encode("utf-8")).hexdigest()[:16]
-        cache_dir = Path(settings.data_dir) / "cache" / "previews"
+        cache_dir = _preview_cache_dir(state)
+        cache_index = open_index(cache_dir)
+        out_path = cache_dir / f"{key}.{fmt}"
+
+        if not refresh:
+            cached = await run_blocking_state(state, cache_index.lookup, out_path.name)
+            if cached is not None:
+                await log_event(
+                    state,
+                    action="sequences.preview",
+                    ok=True,
+                    resource=str(file),
+                    payload={"cached": True, "format": fmt},
+                    request=request,
+                )
+                return FileResponse(
+                    path=str(cached),
+                    filename=f"{Path(file).stem}_preview.{fmt}",
+                    media_type="image/gif" if fmt == "gif" else "video/mp4",
+                    headers={"Cache-Control": "no-cache"},
+                )
+
         try:
             cache_dir.mkdir(parents=True, exist_ok=True)
         except Exception:
             pass
-        out_path = cache_dir / f"{key}.{fmt}"
-
-        if not refresh and out_path.is_file():
-            try:
-                if out_path.stat().st_mtime >= st.st_mtime:
-                    await log_event(
-                        state,
-                        action="sequences.preview",
-                        ok=True,
-                        resource=str(file),
-                        payload={"cached": True, "format": fmt},
-                        request=request,
-                    )
-                    return FileResponse(
-                        path=str(out_path),
-                        filename=f"{Path(file).stem}_preview.{fmt}",
-                        media_type="image/gif" if fmt == "gif" else "video/mp4",
-                        headers={"Cache-Control": "no-cache"},
-                    )
-            except Exception:
-                pass
-
         tmp_path = out_path.with_name(f".{out_path.name}.{uuid.uuid4().hex}.tmp")
         try:
             await run_cpu_blocking_state(
@@ -443,6 +456,8 @@ async def sequences_preview(
                 max_bri=int(settings.wled_max_bri),
                 strict=bool(strict),
                 format=fmt,
+                fseq_path=fseq_src["path"] if fseq_src else None,
+                fseq_channel_start=fseq_src["channel_start"] if fseq_src else 1,
             )
             try:
                 tmp_path.replace(out_path)
@@ -451,6 +466,7 @@ async def sequences_preview(
                     os.replace(str(tmp_path), str(out_path))
                 except Exception:
                     pass
+            await run_blocking_state(state, cache_index.record, out_path.name)
         finally:
             try:
                 if tmp_path.is_file():
@@ -476,7 +492,11 @@ async def sequences_preview(
             action="sequences.preview",
             ok=True,
             resource=str(file),
-            payload={"cached": False, "format": fmt},
+            payload={
+                "cached": False,
+                "format": fmt,
+                "fseq": fseq_src["file"] if fseq_src else None,
+            },
             request=request,
         )
         return FileResponse(
@@ -517,6 +537,8 @@ async def sequences_preview_cache(
         "ok": True,
         "files": stats.get("files", 0),
         "bytes": stats.get("bytes", 0),
+        "hits": stats.get("hits", 0),
+        "misses": stats.get("misses", 0),
         "max_mb": int(getattr(state.settings, "sequence_preview_cache_max_mb", 0) or 0),
         "max_days": float(
             getattr(state.settings, "sequence_preview_cache_max_days", 0) or 0
@@ -8,10 +8,12 @@ from fastapi import Depends, HTTPException, Request
 
 from models.requests import (
     ShowConfigLoadRequest,
+    ShowStreamStartRequest,
     XlightsImportNetworksRequest,
     XlightsImportProjectRequest,
     XlightsImportSequenceRequest,
 )
+from multi_output import outputs_from_show_config
 from pack_io import write_json_async
 from services.audit_logger import log_event
 from services.auth_service import require_a2a_auth
@@ -118,6 +120,79 @@ async def show_config_load(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _require_show_stream(state: AppState):
+    show_stream = getattr(state, "show_stream", None)
+    if show_stream is None:
+        raise HTTPException(status_code=503, detail="Show streamer not initialized")
+    return show_stream
+
+
+async def show_stream_start(
+    req: ShowStreamStartRequest,
+    request: Request,
+    _: None = Depends(require_a2a_auth),
+    state: AppState = Depends(get_state),
+) -> Dict[str, Any]:
+    show_stream = _require_show_stream(state)
+    try:
+        cfg = await load_show_config_async(
+            data_dir=state.settings.data_dir, rel_path=req.config_file
+        )
+        outputs = outputs_from_show_config(cfg, prop_ids=req.prop_ids)
+        st = await show_stream.start(
+            outputs=outputs,
+            pattern=req.pattern,
+            params=dict(req.params or {}),
+            duration_s=req.duration_s,
+            brightness=min(state.settings.wled_max_bri, req.brightness),
+            fps=req.fps,
+        )
+        await log_event(
+            state,
+            action="show.stream.start",
+            ok=True,
+            resource=str(req.config_file),
+            payload={"pattern": req.pattern, "outputs": len(outputs)},
+            request=request,
+        )
+        return {
+            "ok": True,
+            "status": st.__dict__,
+            "outputs": [o.__dict__ for o in outputs],
+        }
+    except Exception as e:
+        await log_event(
+            state,
+            action="show.stream.start",
+            ok=False,
+            resource=str(req.config_file),
+            error=str(e),
+            request=request,
+        )
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def show_stream_stop(
+    request: Request,
+    _: None = Depends(require_a2a_auth),
+    state: AppState = Depends(get_state),
+) -> Dict[str, Any]:
+    show_stream = _require_show_stream(state)
+    st = await show_stream.stop()
+    await log_event(state, action="show.stream.stop", ok=True, request=request)
+    return {"ok": True, "status": st.__dict__}
+
+
+async def show_stream_status(
+    _: None = Depends(require_a2a_auth),
+    state: AppState = Depends(get_state),
+) -> Dict[str, Any]:
+    show_stream = _require_show_stream(state)
+    st = await show_stream.status()
+    m = await show_stream.metrics()
+    return {"ok": True, "status": st.__dict__, "metrics": m.__dict__}
+
+
 async def xlights_import_networks(
     req: XlightsImportNetworksRequest,
     request: Request,
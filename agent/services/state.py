@@ -29,6 +29,7 @@ class AppState:
     looks: Any = None  # LookService
     importer: Any = None  # PresetImporter
     ddp: Any = None  # DDPStreamer
+    show_stream: Any = None  # MultiOutputStreamer
     sequences: Any = None  # SequenceService
     fleet_sequences: Any = None  # FleetSequenceService
     orchestrator: Any = None  # OrchestrationService
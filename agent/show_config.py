@@ -29,6 +29,13 @@ class PixelOutputConfig(BaseModel):
     channels_per_universe: int = Field(510, ge=1, le=512)
 
 
+class PropGeometryConfig(BaseModel):
+    runs: int = Field(..., ge=1, description="Vertical runs (e.g. tree strands).")
+    pixels_per_run: int = Field(..., ge=1)
+    segment_len: int = Field(..., ge=1)
+    segments_per_run: int = Field(1, ge=1)
+
+
 class PropConfig(BaseModel):
     id: str
     kind: str = Field("wled", description="wled, pixel, or model")
@@ -50,6 +57,10 @@ class PropConfig(BaseModel):
     pixel_count: Optional[int] = Field(
         default=None, ge=0, description="Pixel count for this prop (if known)."
     )
+    geometry: Optional[PropGeometryConfig] = Field(
+        default=None,
+        description="Optional pixel geometry for pattern rendering (whole-show FSEQ export); default is a straight strip.",
+    )
 
     # WLED
     wled_url: Optional[str] = None
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import random
 import wave
 from array import array
 
-from audio_analyzer import analyze_beats
+import pytest
+
+from audio_analyzer import analyze_beats, extract_waveform
 
 
 def _write_click_track_wav(
@@ -47,3 +50,87 @@ def test_analyze_beats_click_track(tmp_path) -> None:
     assert analysis.duration_s > 9.0
     assert len(analysis.beats_s) >= 15
     assert 110.0 <= analysis.bpm <= 130.0
+
+
+def test_numpy_backend_matches_scalar_analysis(tmp_path, monkeypatch) -> None:
+    pytest.importorskip("numpy")
+    # Small chunks so windows and buckets straddle chunk boundaries.
+    monkeypatch.setattr("audio_analyzer._PCM_CHUNK_FRAMES", 1000)
+    rng = random.Random(7)
+    sr, n = 8000, 8000 * 6
+    samples = array("h", (rng.randint(-4000, 4000) for _ in range(n * 2)))
+    for beat in range(0, n, sr // 2):
+        for i in range(beat, min(n, beat + 160)):
+            samples[2 * i] = rng.randint(20000, 32767)
+            samples[2 * i + 1] = rng.randint(-32768, -20001)
+    wav = tmp_path / "stereo.wav"
+    with wave.open(str(wav), "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes(samples.tobytes())
+
+    ref = analyze_beats(audio_path=str(wav), backend="python")
+    assert analyze_beats(audio_path=str(wav), backend="numpy") == ref
+    assert len(ref.beats_s) >= 10
+    for points in (32, 777, 5000):
+        assert extract_waveform(
+            audio_path=str(wav), points=points, backend="numpy"
+        ) == extract_waveform(audio_path=str(wav), points=points, backend="python")
+
+
+def _fake_ffmpeg(bin_dir, pcm_path, *, exit_code: int = 0) -> None:
+    """An `ffmpeg` on PATH that streams a raw s16le file to stdout."""
+    import stat
+    import sys
+
+    script = bin_dir / "ffmpeg"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        f"data = open({str(pcm_path)!r}, 'rb').read()\n"
+        "for i in range(0, len(data), 4093):\n"
+        "    sys.stdout.buffer.write(data[i : i + 4093])\n"
+        "sys.stderr.write('decoder said no')\n"
+        f"sys.exit({int(exit_code)})\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+
+
+def test_non_wav_is_streamed_from_ffmpeg_pipe(tmp_path, monkeypatch) -> None:
+    import os
+
+    from audio_analyzer import AudioAnalyzeError
+
+    wav = tmp_path / "click.wav"
+    _write_click_track_wav(path=str(wav), bpm=120.0, duration_s=6.0)
+    with wave.open(str(wav), "rb") as wf:
+        pcm = tmp_path / "click.s16le"
+        pcm.write_bytes(wf.readframes(wf.getnframes()))
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    _fake_ffmpeg(bin_dir, pcm)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setattr("audio_analyzer._PCM_CHUNK_FRAMES", 3000)
+    song = tmp_path / "song.mp3"
+    song.write_bytes(b"not really mp3")
+
+    ref = analyze_beats(audio_path=str(wav))
+    res = analyze_beats(audio_path=str(song))
+    assert res.method == "ffmpeg->pcm_energy_peaks"
+    assert (res.beats_s, res.bpm, res.duration_s) == (
+        ref.beats_s,
+        ref.bpm,
+        ref.duration_s,
+    )
+
+    # Length is unknown while piping, so buckets come from merged blocks.
+    wave_ref = extract_waveform(audio_path=str(wav), points=64)
+    wave_res = extract_waveform(audio_path=str(song), points=64)
+    assert wave_res["duration_s"] == wave_ref["duration_s"]
+    assert wave_res["points_total"] == 64
+    assert max(b["max"] for b in wave_res["points"]) == pytest.approx(28000 / 32768)
+
+    _fake_ffmpeg(bin_dir, pcm, exit_code=1)
+    with pytest.raises(AudioAnalyzeError, match="decoder said no"):
+        analyze_beats(audio_path=str(song))
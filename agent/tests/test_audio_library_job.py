@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import shutil
+import wave
+from array import array
+from types import SimpleNamespace
+
+import pytest
+
+from jobs import AsyncJobManager
+from models.requests import AudioLibraryAnalyzeRequest
+from services.db_service import DatabaseService
+from services.jobs_service import jobs_audio_analyze_library
+
+
+def _write_click_track_wav(path: str, *, bpm: float, duration_s: float) -> None:
+    sr = 8000
+    samples = array("h", [0] * int(duration_s * sr))
+    step = int(60.0 / bpm * sr)
+    for start in range(0, len(samples), step):
+        samples[start : start + 160] = array(
+            "h", [28000] * len(samples[start : start + 160])
+        )
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes(samples.tobytes())
+
+
+async def _run_library_job(state: SimpleNamespace, **req: object) -> dict:
+    res = await jobs_audio_analyze_library(
+        AudioLibraryAnalyzeRequest(**req), _=None, state=state
+    )
+    job_id = res["job"]["id"]
+    for _ in range(600):
+        job = await state.jobs.get(job_id)
+        if job is not None and job.status not in ("queued", "running"):
+            break
+        await asyncio.sleep(0.05)
+    assert job is not None and job.status == "succeeded", job and job.error
+    return job.result
+
+
+@pytest.mark.asyncio
+async def test_library_job_skips_content_already_analyzed(tmp_path) -> None:
+    music = tmp_path / "music"
+    (music / "sub").mkdir(parents=True)
+    _write_click_track_wav(str(music / "a.wav"), bpm=120.0, duration_s=4.0)
+    _write_click_track_wav(str(music / "c.wav"), bpm=100.0, duration_s=4.0)
+    shutil.copy(music / "a.wav", music / "sub" / "a_copy.wav")
+
+    jobs = AsyncJobManager(loop=asyncio.get_running_loop())
+    await jobs.init()
+    state = SimpleNamespace(
+        settings=SimpleNamespace(data_dir=str(tmp_path)),
+        jobs=jobs,
+        db=None,
+        cpu_pool=None,
+    )
+    try:
+        first = await _run_library_job(state)
+        assert first["summary"] == {
+            "files": 3,
+            "analyzed": 2,
+            "cached": 0,
+            "duplicates": 1,
+            "errors": 0,
+        }
+
+        # Renamed / re-uploaded content is served from the analysis cache.
+        (music / "c.wav").rename(music / "renamed.wav")
+        second = await _run_library_job(state)
+        assert second["summary"]["analyzed"] == 0
+        assert second["summary"]["cached"] == 2
+    finally:
+        await jobs.shutdown()
+
+    index = json.loads((tmp_path / second["index_file"]).read_text())
+    by_file = {item["file"]: item for item in index["files"]}
+    assert set(by_file) == {"music/a.wav", "music/renamed.wav", "music/sub/a_copy.wav"}
+    assert by_file["music/a.wav"]["key"] == by_file["music/sub/a_copy.wav"]["key"]
+    beats = json.loads(
+        (tmp_path / by_file["music/renamed.wav"]["beats_file"]).read_text()
+    )
+    assert beats["bpm_timeline"] and beats["beats_s"]
+
+
+@pytest.mark.asyncio
+async def test_library_job_records_every_run_in_db_history(tmp_path) -> None:
+    music = tmp_path / "music"
+    music.mkdir()
+    _write_click_track_wav(str(music / "a.wav"), bpm=120.0, duration_s=4.0)
+    shutil.copy(music / "a.wav", music / "a_copy.wav")
+
+    db = DatabaseService(
+        database_url=f"sqlite:///{tmp_path / 'test.db'}", agent_id="agent1"
+    )
+    await db.init()
+    jobs = AsyncJobManager(loop=asyncio.get_running_loop())
+    await jobs.init()
+    state = SimpleNamespace(
+        settings=SimpleNamespace(data_dir=str(tmp_path)),
+        jobs=jobs,
+        db=db,
+        cpu_pool=None,
+    )
+    try:
+        first = await _run_library_job(state)
+        assert first["summary"]["duplicates"] == 1
+        # Both files share one content key but get their own history rows.
+        rows = await db.list_audio_analyses()
+        assert sorted(r["source_path"] for r in rows) == [
+            "music/a.wav",
+            "music/a_copy.wav",
+        ]
+
+        await _run_library_job(state, force=True)
+        rows = await db.list_audio_analyses()
+        assert len(rows) == 4
+        assert len({r["id"] for r in rows}) == 4
+    finally:
+        await jobs.shutdown()
+        await db.close()
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import wave
+from array import array
+from types import SimpleNamespace
+
+import pytest
+
+import ddp_streamer as ddp_mod
+import services.ddp_service as ddp_service
+from audio_reactive import AudioReactive, BandAnalyzer, open_pcm_source
+from ddp_sender import DDPConfig
+from geometry import TreeGeometry
+from models.requests import DDPAudioReactiveRequest
+from segment_layout import SegmentLayout, SegmentRange
+
+
+def _tone_with_clicks(sr: int, seconds: float) -> array:
+    """Quiet 80 Hz hum with a loud 3 kHz burst every 0.25 s."""
+    out = array("h")
+    for i in range(int(sr * seconds)):
+        v = 2000.0 * math.sin(2 * math.pi * 80.0 * i / sr)
+        if i % (sr // 4) < sr // 50:
+            v += 20000.0 * math.sin(2 * math.pi * 3000.0 * i / sr)
+        out.append(int(v))
+    return out
+
+
+def test_band_analyzer_bands_and_onsets() -> None:
+    sr = 16000
+    pcm = _tone_with_clicks(sr, 2.0).tobytes()
+    results = {}
+    for backend in ("python", "numpy"):
+        if backend == "numpy":
+            pytest.importorskip("numpy")
+        an = BandAnalyzer(sample_rate_hz=sr, hop=256, fft_size=512, backend=backend)
+        feats = []
+        for i in range(0, len(pcm), 1000):  # arbitrary read sizes
+            feats.extend(an.feed(pcm[i : i + 1000], arrived_at=0.0))
+        assert an.hops == len(pcm) // 512
+        results[backend] = feats
+
+    feats = results["python"]
+    onsets = [f.t for f in feats if f.onset]
+    # One onset per burst after the first second of flux history.
+    assert len(onsets) >= 3
+    assert all(abs(t - round(t * 4) / 4) < 0.05 for t in onsets)
+    quiet = feats[len(feats) // 2 + 20]  # between bursts: only the hum
+    assert quiet.bands[0] == max(quiet.bands)
+
+    if "numpy" in results:
+        for a, b in zip(results["python"], results["numpy"]):
+            assert a.onset == b.onset
+            assert a.level == pytest.approx(b.level, abs=1e-9)
+            assert a.bands == pytest.approx(b.bands, abs=1e-9)
+
+
+class _DummyWLED:
+    async def enter_live_mode(self) -> None:
+        return None
+
+    async def set_brightness(self, _: int) -> None:
+        return None
+
+    async def exit_live_mode(self) -> None:
+        return None
+
+
+class _DummySender:
+    packets_skipped = 0
+    bytes_saved = 0
+
+    def __init__(self, _: DDPConfig) -> None:
+        pass
+
+    async def send_frame(self, rgb: bytes) -> None:
+        _SENT.append(bytes(rgb))
+
+    def close(self) -> None:
+        return None
+
+
+_SENT: list[bytes] = []
+
+
+@pytest.mark.asyncio
+async def test_ddp_stream_follows_live_audio(tmp_path, monkeypatch) -> None:
+    async def _fake_layout(*_, **__) -> SegmentLayout:
+        return SegmentLayout(
+            led_count=3,
+            segments=[SegmentRange(id=0, start=0, stop=3)],
+            kind="equal",
+        )
+
+    monkeypatch.setattr(ddp_mod, "DDPAsyncSender", _DummySender)
+    monkeypatch.setattr(ddp_mod, "fetch_segment_layout_async", _fake_layout)
+    _SENT.clear()
+
+    wav = tmp_path / "live.wav"
+    with wave.open(str(wav), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(_tone_with_clicks(16000, 2.0).tobytes())
+
+    audio = AudioReactive(
+        open_pcm_source("file", path=str(wav)),
+        hop=256,
+        fft_size=512,
+        mapping={"brightness": {"feature": "level", "min": 0.0, "max": 1.0}},
+    )
+    ddp = ddp_mod.DDPStreamer(
+        wled=_DummyWLED(),
+        geometry=TreeGeometry(
+            runs=1, pixels_per_run=3, segment_len=3, segments_per_run=1
+        ),
+        ddp_cfg=DDPConfig(host="127.0.0.1", port=4048),
+        fps_default=40.0,
+    )
+    await ddp.start(
+        pattern="solid",
+        params={"color": [255, 255, 255]},
+        duration_s=0.8,
+        brightness=255,
+        fps=40.0,
+        audio=audio,
+    )
+    await asyncio.sleep(0.4)
+    status = await ddp.status()
+    assert status.audio is not None and status.audio["hop"] == 256
+    await asyncio.sleep(0.6)
+    await ddp.stop()
+
+    m = await ddp.metrics()
+    assert m.audio_hops_total > 0
+    assert m.audio_latency_seconds_count > 0
+    assert 0.0 <= m.audio_latency_max_s < 0.5
+    # Brightness follows the audio level, so frames are not all identical.
+    assert len({f[0] for f in _SENT}) > 1
+    assert (await ddp.status()).audio is None
+
+
+@pytest.mark.asyncio
+async def test_invalid_analyzer_settings_close_the_source(
+    tmp_path, monkeypatch
+) -> None:
+    with wave.open(str(tmp_path / "live.wav"), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(_tone_with_clicks(16000, 0.5).tobytes())
+
+    opened = []
+
+    def _open(*args, **kwargs):  # type: ignore[no-untyped-def]
+        opened.append(open_pcm_source(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(ddp_service, "open_pcm_source", _open)
+    state = SimpleNamespace(settings=SimpleNamespace(data_dir=str(tmp_path)))
+    req = DDPAudioReactiveRequest(
+        source="file", path="live.wav", hop=4096, fft_size=1024
+    )
+    with pytest.raises(ValueError, match="hop"):
+        await ddp_service._audio_reactive(state, req)
+    assert len(opened) == 1
+    assert opened[0]._stream._wav is None  # closed, not leaked
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from utils.cache_utils import (
+    CacheIndex,
+    cache_namespace_stats,
+    cleanup_cache,
+    file_digest,
+    sequence_digest,
+)
+
+
+def _put(idx: CacheIndex, name: str, size: int) -> Path:
+    p = idx.path / name
+    p.write_bytes(b"x" * size)
+    idx.record(name)
+    return p
+
+
+def test_cache_index_tracks_hits_and_evicts_least_recently_used(
+    tmp_path: Path,
+) -> None:
+    idx = CacheIndex(tmp_path / "previews")
+    idx.path.mkdir()
+    a, b, c = (_put(idx, n, 100) for n in ("a.gif", "b.gif", "c.gif"))
+
+    assert idx.lookup("a.gif") == a
+    assert idx.lookup("b.gif", size=99) is None  # truncated write
+    assert idx.lookup("missing.gif") is None
+    stats = idx.stats()
+    assert stats == {"files": 2, "bytes": 200, "hits": 1, "misses": 2}
+
+    res = idx.evict(max_bytes=100)
+    assert res == {
+        "deleted_files": 1,
+        "deleted_bytes": 100,
+        "before_bytes": 200,
+        "after_bytes": 100,
+    }
+    assert a.exists() and not b.exists() and not c.exists()
+
+    assert idx.evict(purge=True)["after_bytes"] == 0
+    assert not a.exists()
+    assert idx.stats()["hits"] == 1
+    idx.close()
+
+
+def test_cache_index_adopts_existing_files(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache" / "waveforms"
+    cache_dir.mkdir(parents=True)
+    for i, name in enumerate(("old.json", "new.json")):
+        p = cache_dir / name
+        p.write_bytes(b"{}" * 10)
+        os.utime(p, (1000.0 + i, 1000.0 + i))
+    (cache_dir / ".partial.json.tmp").write_bytes(b"{")
+
+    res = cleanup_cache(cache_dir, max_bytes=20)
+    assert res["deleted_files"] == 1
+    assert not (cache_dir / "old.json").exists()
+    assert cache_namespace_stats(tmp_path / "cache") == {
+        "waveforms": {"files": 1, "bytes": 20, "hits": 0, "misses": 0}
+    }
+
+
+def test_content_digests_ignore_touch_and_metadata(tmp_path: Path) -> None:
+    seq = tmp_path / "seq.json"
+    steps = [{"pattern": "rainbow_cycle", "duration_s": 1.0}]
+    seq.write_text(json.dumps({"name": "a", "steps": steps}))
+    d1 = sequence_digest(str(seq))
+    f1 = file_digest(str(seq))
+
+    os.utime(seq, (5000.0, 5000.0))
+    assert file_digest(str(seq)) == f1
+    seq.write_text(json.dumps({"steps": steps, "name": "renamed"}, indent=2))
+    assert sequence_digest(str(seq)) == d1
+    assert file_digest(str(seq)) != f1
+
+    seq.write_text(json.dumps({"steps": steps + steps}))
+    assert sequence_digest(str(seq)) != d1
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import socket
+import struct
+
+import pytest
+
+from ddp_sender import DDPAsyncSender, DDPConfig, DDPSender
+
+
+def _receiver() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(2.0)
+    return sock
+
+
+def _read_frame(sock: socket.socket, packets: int) -> list[tuple[int, int, int, bytes]]:
+    out = []
+    for _ in range(packets):
+        pkt = sock.recv(4096)
+        flags, seq, _dtype, _dest, offset, length = struct.unpack("!BBBBLH", pkt[:10])
+        assert len(pkt) == 10 + length
+        out.append((flags, seq, offset, pkt[10:]))
+    return out
+
+
+def test_ddp_sender_packets_and_sequence() -> None:
+    rx = _receiver()
+    cfg = DDPConfig(host="127.0.0.1", port=rx.getsockname()[1], max_pixels_per_packet=4)
+    tx = DDPSender(cfg)
+    try:
+        frame = bytes(range(30))
+        for expected_seq in (1, 2):
+            tx.send_frame(bytearray(frame))
+            pkts = _read_frame(rx, 3)
+            assert [p[0] for p in pkts] == [0x40, 0x40, 0x41]
+            assert {p[1] for p in pkts} == {expected_seq}
+            assert [p[2] for p in pkts] == [0, 12, 24]
+            assert b"".join(p[3] for p in pkts) == frame
+    finally:
+        tx.close()
+        rx.close()
+
+
+@pytest.mark.asyncio
+async def test_ddp_async_sender_exact_multiple() -> None:
+    rx = _receiver()
+    cfg = DDPConfig(host="127.0.0.1", port=rx.getsockname()[1], max_pixels_per_packet=5)
+    tx = DDPAsyncSender(cfg)
+    try:
+        frame = bytes(range(30))
+        await tx.send_frame(memoryview(frame))
+        pkts = _read_frame(rx, 2)
+        assert [p[0] for p in pkts] == [0x40, 0x41]
+        assert [p[2] for p in pkts] == [0, 15]
+        assert b"".join(p[3] for p in pkts) == frame
+    finally:
+        tx.close()
+        rx.close()
+
+
+def test_ddp_delta_skips_unchanged_packets_but_keeps_push() -> None:
+    rx = _receiver()
+    rx.settimeout(0.2)
+    cfg = DDPConfig(
+        host="127.0.0.1",
+        port=rx.getsockname()[1],
+        max_pixels_per_packet=4,
+        delta=True,
+        keepalive_s=60.0,
+    )
+    tx = DDPSender(cfg)
+    try:
+        frame = bytearray(range(30))
+        tx.send_frame(frame)
+        assert len(_read_frame(rx, 3)) == 3
+
+        # Only the first packet changed: it goes out with the PUSH packet.
+        frame[0] = 0xFF
+        tx.send_frame(frame)
+        pkts = _read_frame(rx, 2)
+        assert [(p[0], p[2]) for p in pkts] == [(0x40, 0), (0x41, 24)]
+        assert pkts[0][3][0] == 0xFF
+
+        # Nothing changed: nothing is sent.
+        tx.send_frame(frame)
+        with pytest.raises(socket.timeout):
+            rx.recv(4096)
+        assert tx.packets_skipped == 1 + 3
+        assert tx.bytes_saved == (10 + 12) + (10 + 12) * 2 + (10 + 6)
+    finally:
+        tx.close()
+        rx.close()
@@ -7,6 +7,7 @@ import pytest
 import ddp_streamer as ddp_mod
 from ddp_sender import DDPConfig
 from geometry import TreeGeometry
+from patterns import PatternFactory
 from segment_layout import SegmentLayout, SegmentRange
 
 
@@ -26,7 +27,7 @@ class _DummySender:
         self.frames: list[bytes] = []
 
     async def send_frame(self, rgb: bytes) -> None:
-        self.frames.append(rgb)
+        self.frames.append(bytes(rgb))
 
     def close(self) -> None:
         return None
@@ -101,3 +102,57 @@ async def test_ddp_streamer_falls_back_when_pattern_not_picklable(
 
     assert blocking_pool.calls > 0
     assert cpu_pool.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_ddp_streamer_render_ahead_ring(monkeypatch) -> None:
+    from services.blocking_service import ProcessService
+
+    layout = SegmentLayout(
+        led_count=30, segments=[SegmentRange(id=0, start=0, stop=30)], kind="equal"
+    )
+
+    async def _fake_layout(*_, **__) -> SegmentLayout:
+        return layout
+
+    senders: list[_DummySender] = []
+
+    def _sender(cfg: DDPConfig) -> _DummySender:
+        senders.append(_DummySender(cfg))
+        return senders[-1]
+
+    monkeypatch.setattr(ddp_mod, "DDPAsyncSender", _sender)
+    monkeypatch.setattr(ddp_mod, "fetch_segment_layout_async", _fake_layout)
+
+    geom = TreeGeometry(runs=1, pixels_per_run=30, segment_len=30, segments_per_run=1)
+    pool = ProcessService(max_workers=1, max_queue=2)
+    try:
+        ddp = ddp_mod.DDPStreamer(
+            wled=_DummyWLED(),
+            geometry=geom,
+            ddp_cfg=DDPConfig(host="127.0.0.1", port=4048),
+            cpu_pool=pool,
+            render_ahead_frames=4,
+        )
+        await ddp.start(
+            pattern="rainbow_cycle", duration_s=0.4, brightness=200, fps=20.0
+        )
+        for _ in range(200):
+            await asyncio.sleep(0.05)
+            if not (await ddp.status()).running:
+                break
+        await ddp.stop()
+    finally:
+        await pool.shutdown()
+
+    metrics = await ddp.metrics()
+    assert metrics.frames_sent_total > 0
+    assert metrics.lookahead_frames == 0
+
+    pat = PatternFactory(led_count=30, geometry=geom, segment_layout=layout).create(
+        "rainbow_cycle"
+    )
+    expected = [pat.frame(t=k * 0.05, frame_idx=k, brightness=200) for k in range(9)]
+    sent = senders[0].frames
+    assert sent and all(f in expected for f in sent)
+    assert sent[0] == expected[0]
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import socket
+import struct
+
+import pytest
+
+from e131_sender import E131Config, E131Sender
+
+
+def _receiver() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(2.0)
+    return sock
+
+
+def test_e131_packets_patched_in_place_with_sync() -> None:
+    rx = _receiver()
+    tx = E131Sender(
+        E131Config(
+            host="127.0.0.1",
+            port=rx.getsockname()[1],
+            universe_start=5,
+            channels_per_universe=6,
+            sync_universe=99,
+        )
+    )
+    try:
+        for seq, frame in ((1, bytes(range(1, 11))), (2, bytes(range(21, 29)))):
+            tx.send_frame(frame)
+            p1, p2, sync = rx.recv(1024), rx.recv(1024), rx.recv(1024)
+
+            assert len(p1) == len(p2) == 126 + 6
+            # Root / framing / DMP PDU lengths (low 12 bits of flags+length).
+            assert struct.unpack(">H", p1[16:18])[0] & 0x0FFF == 110 + 6
+            assert struct.unpack(">H", p1[38:40])[0] & 0x0FFF == 88 + 6
+            assert struct.unpack(">H", p1[115:117])[0] & 0x0FFF == 11 + 6
+            assert struct.unpack(">H", p1[109:111])[0] == 99  # sync address
+            assert p1[111] == p2[111] == seq
+            assert struct.unpack(">H", p1[113:115])[0] == 5
+            assert struct.unpack(">H", p2[113:115])[0] == 6
+            assert p1[126:] == frame[:6]
+            # Short last universe is zero padded, even after a longer frame.
+            assert p2[126:] == frame[6:].ljust(6, b"\x00")
+
+            assert len(sync) == 49
+            assert struct.unpack(">I", sync[18:22])[0] == 0x00000008
+            assert struct.unpack(">I", sync[40:44])[0] == 0x00000001
+            assert sync[44] == seq
+            assert struct.unpack(">H", sync[45:47])[0] == 99
+    finally:
+        tx.close()
+        rx.close()
+
+
+def test_e131_without_sync_sends_only_data() -> None:
+    rx = _receiver()
+    tx = E131Sender(
+        E131Config(
+            host="127.0.0.1", port=rx.getsockname()[1], channels_per_universe=510
+        )
+    )
+    try:
+        tx.send_frame(bytes(30))
+        pkt = rx.recv(1024)
+        assert len(pkt) == 126 + 510
+        assert struct.unpack(">H", pkt[109:111])[0] == 0
+        rx.settimeout(0.05)
+        try:
+            rx.recv(1024)
+            raise AssertionError("unexpected extra packet")
+        except socket.timeout:
+            pass
+    finally:
+        tx.close()
+        rx.close()
+
+
+def test_e131_delta_skips_unchanged_universes_until_keepalive() -> None:
+    rx = _receiver()
+    rx.settimeout(0.2)
+    tx = E131Sender(
+        E131Config(
+            host="127.0.0.1",
+            port=rx.getsockname()[1],
+            universe_start=1,
+            channels_per_universe=6,
+            sync_universe=99,
+            delta=True,
+            keepalive_s=60.0,
+        )
+    )
+    try:
+        frame = bytearray(range(1, 13))
+        tx.send_frame(frame)
+        assert [len(rx.recv(1024)) for _ in range(3)] == [132, 132, 49]
+
+        frame[7] = 0
+        tx.send_frame(frame)
+        p2, sync = rx.recv(1024), rx.recv(1024)
+        assert struct.unpack(">H", p2[113:115])[0] == 2
+        assert p2[126:] == bytes(frame[6:])
+        assert len(sync) == 49
+
+        # Unchanged frame: no data and no sync.
+        tx.send_frame(frame)
+        with pytest.raises(socket.timeout):
+            rx.recv(1024)
+        assert tx.packets_skipped == 3
+        assert tx.bytes_saved == 3 * 132
+
+        # Keepalive elapsed: everything is resent.
+        tx._delta.keepalive_s = 1e-9
+        tx.send_frame(frame)
+        assert [len(rx.recv(1024)) for _ in range(3)] == [132, 132, 49]
+    finally:
+        tx.close()
+        rx.close()
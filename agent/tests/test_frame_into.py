@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import pytest
+
+from frame_pool import FramePool
+from geometry import TreeGeometry
+from patterns import PATTERN_REGISTRY, PatternFactory
+
+
+def test_frame_into_matches_frame_at_offset() -> None:
+    geom = TreeGeometry(runs=2, pixels_per_run=20, segment_len=20, segments_per_run=1)
+    factory = PatternFactory(led_count=40, geometry=geom)
+    for name in sorted(PATTERN_REGISTRY):
+        pat = factory.create(name)
+        ref = pat.frame(t=0.8, frame_idx=32, brightness=200)
+        buf = bytearray(b"\xaa" * (5 + 120 + 7))
+        wrote = pat.frame_into(buf, 5, t=0.8, frame_idx=32, brightness=200)
+        assert wrote == 120
+        assert bytes(buf[5:125]) == ref, name
+        assert buf[:5] == b"\xaa" * 5 and buf[125:] == b"\xaa" * 7
+
+
+def test_frame_into_rejects_short_buffer() -> None:
+    geom = TreeGeometry(runs=1, pixels_per_run=10, segment_len=10, segments_per_run=1)
+    pat = PatternFactory(led_count=10, geometry=geom).create("rainbow_cycle")
+    with pytest.raises(ValueError):
+        pat.frame_into(bytearray(29), 0, t=0.0, frame_idx=0, brightness=255)
+
+
+def test_frame_pool_round_robin() -> None:
+    pool = FramePool(6)
+    a, b = pool.acquire(), pool.acquire()
+    assert a is not b and len(a) == len(b) == pool.size == 6
+    assert pool.acquire() is a
+    with pytest.raises(ValueError):
+        FramePool(0)
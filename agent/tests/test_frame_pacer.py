@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from frame_pacer import FramePacer, JitterHistogram
+
+
+def test_jitter_histogram_quantiles() -> None:
+    h = JitterHistogram(bucket_s=0.001, buckets=100)
+    assert h.quantile(0.5) is None
+    for _ in range(98):
+        h.record(0.020)
+    h.record(0.050)
+    h.record(5.0)  # clamps into the last bucket
+    assert h.count == 100
+    assert h.quantile(0.5) == pytest.approx(0.0205)
+    assert h.quantile(0.99) == pytest.approx(0.0505)
+    assert h.quantile(1.0) == pytest.approx(0.0995)
+    h.reset()
+    assert h.count == 0 and h.quantile(0.5) is None
+
+
+def test_pacer_deadlines_are_absolute_and_skip_late_frames() -> None:
+    pacer = FramePacer(0.1)
+    pacer.start(now=100.0)
+    pacer.tick(now=100.03)  # a late send does not shift later deadlines
+    assert pacer.deadline == pytest.approx(100.1)
+    assert pacer.lag(100.12) == pytest.approx(0.02)
+    assert pacer.skip_late(100.12, 0.25) == 0
+    assert pacer.skip_late(100.45, 0.25) == 3
+    assert pacer.frame == 4
+    pacer.skip()
+    assert pacer.deadline == pytest.approx(100.5)
+
+
+def test_pacer_wait_hits_deadlines_and_records_intervals() -> None:
+    jitter = JitterHistogram()
+    pacer = FramePacer(0.01, spin_s=0.002, jitter=jitter)
+    pacer.start()
+    late = []
+    for _ in range(20):
+        now = pacer.wait()
+        late.append(now - pacer.deadline)
+        pacer.tick(now)
+    assert min(late) >= 0.0
+    assert max(late) < 0.005
+    assert jitter.count == 19
+    assert jitter.quantile(0.5) == pytest.approx(0.01, abs=0.002)
+
+
+def test_pacer_wait_returns_when_stopped() -> None:
+    stop = threading.Event()
+    pacer = FramePacer(10.0)
+    pacer.start()
+    pacer.tick()
+    threading.Timer(0.05, stop.set).start()
+    start = time.monotonic()
+    pacer.wait(stop)
+    assert time.monotonic() - start < 1.0
+
+
+@pytest.mark.asyncio
+async def test_pacer_wait_async() -> None:
+    pacer = FramePacer(0.01, spin_s=0.002)
+    start = pacer.start()
+    pacer.tick(start)
+    now = await pacer.wait_async()
+    assert now >= start + 0.01
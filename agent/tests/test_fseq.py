@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+import dataclasses
 from pathlib import Path
 
-from fseq import write_fseq_v1_file
+import pytest
+
+from fseq import (
+    FSEQError,
+    FSEQReader,
+    fseq_v2_compression_available,
+    write_fseq_v1_file,
+    write_fseq_v2_file,
+)
 
 
 def _u16le(b: bytes) -> int:
@@ -44,3 +53,416 @@ def test_write_fseq_v1_header_and_size(tmp_path: Path) -> None:
     assert _u32le(raw[14:18]) == frames
     assert raw[18] == step_ms
     assert len(raw) == 28 + (frames * channels)
+
+
+def _read_v2_frames(raw: bytes) -> tuple[dict, list[bytes]]:
+    import zlib
+
+    offset = _u16le(raw[4:6])
+    hdr = {
+        "offset": offset,
+        "major": raw[7],
+        "var_offset": _u16le(raw[8:10]),
+        "channels": _u32le(raw[10:14]),
+        "frames": _u32le(raw[14:18]),
+        "step_ms": raw[18],
+        "compression": raw[20] & 0x0F,
+        "blocks": raw[21],
+        "ranges": raw[22],
+    }
+    pos = 32
+    blocks = []
+    for _ in range(hdr["blocks"]):
+        blocks.append((_u32le(raw[pos : pos + 4]), _u32le(raw[pos + 4 : pos + 8])))
+        pos += 8
+    ranges = []
+    for _ in range(hdr["ranges"]):
+        ranges.append(
+            (
+                int.from_bytes(raw[pos : pos + 3], "little"),
+                int.from_bytes(raw[pos + 3 : pos + 6], "little"),
+            )
+        )
+        pos += 6
+    hdr["sparse_ranges"] = ranges
+    hdr["var_headers"] = raw[pos:offset]
+    frame_len = sum(n for _, n in ranges) if ranges else hdr["channels"]
+
+    data = b""
+    at = offset
+    if hdr["compression"] == 0:
+        data = raw[offset:]
+    for _first, length in blocks:
+        chunk = raw[at : at + length]
+        at += length
+        if hdr["compression"] == 2:
+            data += zlib.decompress(chunk)
+        else:
+            import zstandard
+
+            data += zstandard.ZstdDecompressor().decompress(chunk)
+    assert at == len(raw) or hdr["compression"] == 0
+    frames = [data[i : i + frame_len] for i in range(0, len(data), frame_len)]
+    return hdr, frames
+
+
+@pytest.mark.parametrize("compression", ["zlib", "zstd", "none"])
+def test_write_fseq_v2_blocks_and_sparse_ranges(
+    tmp_path: Path, compression: str
+) -> None:
+    if not fseq_v2_compression_available(compression):
+        pytest.skip(f"{compression} not available")
+    out = tmp_path / "test_v2.fseq"
+    frames = [bytes([i, 255 - i, i * 2 % 256]) * 4 for i in range(11)]
+
+    res = write_fseq_v2_file(
+        out_path=str(out),
+        channel_count=100,
+        num_frames=len(frames),
+        step_ms=25,
+        frame_generator=iter(frames),
+        compression=compression,
+        frames_per_block=4,
+        sparse_ranges=[(40, 12)],
+        variable_headers=[("sp", b"test\x00")],
+    )
+    raw = out.read_bytes()
+    assert res.version == 2 and res.compression == compression
+    assert res.bytes_written == len(raw)
+
+    hdr, got = _read_v2_frames(raw)
+    assert raw[0:4] == b"PSEQ" and hdr["major"] == 2
+    assert hdr["offset"] % 4 == 0
+    assert (hdr["channels"], hdr["frames"], hdr["step_ms"]) == (100, 11, 25)
+    assert hdr["compression"] == {"none": 0, "zstd": 1, "zlib": 2}[compression]
+    assert hdr["blocks"] == (0 if compression == "none" else 3)
+    assert hdr["sparse_ranges"] == [(40, 12)]
+    assert hdr["var_headers"].startswith(b"\x09\x00sptest\x00")
+    assert got == frames
+
+
+def test_fseq_reader_v1_frames_are_zero_copy_views(tmp_path: Path) -> None:
+    out = tmp_path / "v1.fseq"
+    frames = [bytes([i]) * 12 for i in range(5)]
+    write_fseq_v1_file(
+        out_path=str(out),
+        channel_count=12,
+        num_frames=5,
+        step_ms=40,
+        frame_generator=iter(frames),
+    )
+    with FSEQReader(str(out)) as reader:
+        assert (reader.version_major, reader.compression) == (1, "none")
+        assert (len(reader), reader.step_ms, reader.duration_s) == (5, 40, 0.2)
+        view = reader.frame(3)
+        assert isinstance(view, memoryview) and view.readonly
+        assert bytes(view) == frames[3]
+        view.release()
+        assert [bytes(f) for f in reader.frames()] == frames
+        assert reader.locate(6, 6) == 6
+        with pytest.raises(IndexError):
+            reader.frame(5)
+
+
+@pytest.mark.parametrize("compression", ["zlib", "zstd", "none"])
+def test_fseq_reader_v2_blocks_and_sparse_locate(
+    tmp_path: Path, compression: str
+) -> None:
+    if not fseq_v2_compression_available(compression):
+        pytest.skip(f"{compression} not available")
+    out = tmp_path / "v2.fseq"
+    frames = [bytes([i, 255 - i, i * 2 % 256]) * 4 for i in range(11)]
+    write_fseq_v2_file(
+        out_path=str(out),
+        channel_count=100,
+        num_frames=len(frames),
+        step_ms=25,
+        frame_generator=iter(frames),
+        compression=compression,
+        frames_per_block=4,
+        sparse_ranges=[(40, 12)],
+        variable_headers=[("sp", b"test\x00")],
+    )
+    with FSEQReader(str(out)) as reader:
+        assert (reader.version_major, reader.compression) == (2, compression)
+        assert list(reader.sparse_ranges) == [(40, 12)]
+        assert reader.variable_headers["sp"] == b"test\x00"
+        assert reader.frame_len == 12
+        # Out of order access crosses block boundaries in both directions.
+        for k in (10, 0, 5, 4, 3, 8):
+            assert bytes(reader.frame(k)) == frames[k]
+        assert reader.locate(43, 6) == 3
+        with pytest.raises(FSEQError):
+            reader.locate(0, 3)
+
+
+def test_render_fseq_v2_sparse_matches_v1_channels(tmp_path: Path) -> None:
+    from geometry import TreeGeometry
+    from utils.fseq_render import render_fseq
+
+    geom = TreeGeometry(runs=2, pixels_per_run=10, segment_len=10, segments_per_run=1)
+    steps = [{"type": "ddp", "pattern": "rainbow_cycle", "duration_s": 0.5}]
+    common = dict(
+        steps=steps,
+        led_count=20,
+        channel_start=31,
+        channels_total=120,
+        step_ms=50,
+        default_bri=128,
+        geometry=geom,
+        segment_layout=None,
+        max_bri=255,
+    )
+    v1 = tmp_path / "v1.fseq"
+    v2 = tmp_path / "v2.fseq"
+    render_fseq(out_path=str(v1), **common)
+    res = render_fseq(
+        out_path=str(v2), fseq_version=2, compression="zlib", sparse=True, **common
+    )
+    assert res["render"]["sparse"] is True
+
+    raw1 = v1.read_bytes()
+    v1_frames = [raw1[i : i + 120] for i in range(28, len(raw1), 120)]
+    hdr, v2_frames = _read_v2_frames(v2.read_bytes())
+    assert hdr["channels"] == 120
+    assert hdr["sparse_ranges"] == [(30, 60)]
+    assert v2_frames == [f[30:90] for f in v1_frames]
+
+
+def _render_args() -> dict:
+    from geometry import TreeGeometry
+
+    geom = TreeGeometry(runs=2, pixels_per_run=10, segment_len=10, segments_per_run=1)
+    return dict(
+        steps=[
+            {"type": "ddp", "pattern": "rainbow_cycle", "duration_s": 0.6},
+            {"type": "ddp", "pattern": "sparkle", "duration_s": 0.4, "brightness": 90},
+            {"type": "ddp", "pattern": "comet", "duration_s": 0.5},
+        ],
+        led_count=20,
+        channel_start=4,
+        channels_total=70,
+        step_ms=25,
+        default_bri=128,
+        geometry=geom,
+        segment_layout=None,
+        max_bri=255,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "version,compression,sparse",
+    [(1, "none", False), (2, "zlib", False), (2, "zlib", True), (2, "none", True)],
+)
+async def test_render_fseq_parallel_matches_serial(
+    tmp_path: Path, version: int, compression: str, sparse: bool
+) -> None:
+    from services.blocking_service import ProcessService
+    from utils.fseq_render import render_fseq, render_fseq_parallel
+
+    common = dict(
+        _render_args(),
+        fseq_version=version,
+        compression=compression,
+        frames_per_block=8,
+        sparse=sparse,
+    )
+    serial, parallel = tmp_path / "serial.fseq", tmp_path / "parallel.fseq"
+    render_fseq(out_path=str(serial), **common)
+
+    pool = ProcessService(max_workers=2)
+    progress = []
+    try:
+        res = await render_fseq_parallel(
+            pool,
+            out_path=str(parallel),
+            chunk_frames=10,
+            progress=lambda done, total: progress.append((done, total)),
+            **common,
+        )
+    finally:
+        await pool.shutdown()
+
+    assert res["render"]["workers"] == 2 and res["render"]["chunks"] > 2
+    assert res["fseq"]["bytes_written"] == parallel.stat().st_size
+    assert [d for d, _ in progress] == sorted(d for d, _ in progress)
+    assert progress[-1] == (60, 60)
+    if version == 1:
+        assert parallel.read_bytes() == serial.read_bytes()
+    with FSEQReader(str(serial)) as a, FSEQReader(str(parallel)) as b:
+        assert (len(b), b.compression, b.sparse_ranges) == (
+            len(a),
+            a.compression,
+            a.sparse_ranges,
+        )
+        assert [bytes(f) for f in b.frames()] == [bytes(f) for f in a.frames()]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("version,compression", [(1, "none"), (2, "zlib")])
+async def test_render_fseq_parallel_progress_can_abort(
+    tmp_path: Path, version: int, compression: str
+) -> None:
+    from jobs import JobCanceled
+    from utils.fseq_render import render_fseq_parallel
+
+    out = tmp_path / "out.fseq"
+    out.write_bytes(b"previous export")
+
+    def _cancel(done: int, total: int) -> None:
+        raise JobCanceled("canceled")
+
+    with pytest.raises(JobCanceled, match="canceled"):
+        await render_fseq_parallel(
+            None,
+            out_path=str(out),
+            fseq_version=version,
+            compression=compression,
+            progress=_cancel,
+            **_render_args(),
+        )
+    # The previous export survives and no partial/temp file is left behind.
+    assert [p.name for p in tmp_path.iterdir()] == ["out.fseq"]
+    assert out.read_bytes() == b"previous export"
+
+
+def test_render_fseq_chunk_cache_rerenders_only_edited_steps(tmp_path: Path) -> None:
+    from utils.cache_utils import cache_stats, cleanup_cache
+    from utils.fseq_render import render_fseq
+
+    cache_dir = tmp_path / "cache"
+    args = _render_args()
+    ref, out = tmp_path / "ref.fseq", tmp_path / "out.fseq"
+
+    res = render_fseq(out_path=str(out), cache_dir=str(cache_dir), **args)
+    assert res["render"]["cache"] == {"hits": 0, "misses": 3}
+    cached = sorted(cache_dir.glob("*.bin"))
+    assert len(cached) == 3
+
+    args["steps"][1] = dict(args["steps"][1], brightness=40)
+    render_fseq(out_path=str(ref), **args)
+    res = render_fseq(out_path=str(out), cache_dir=str(cache_dir), **args)
+    assert res["render"]["cache"] == {"hits": 2, "misses": 1}
+    assert out.read_bytes() == ref.read_bytes()
+    stats = cache_stats(cache_dir)
+    assert stats["files"] == 4 and stats["hits"] == 2
+    # Hits refresh last access, so size-based cleanup evicts the edited-away step.
+    one = cached[0].stat().st_size
+    res = cleanup_cache(cache_dir, max_bytes=3 * one)
+    assert res["deleted_files"] == 1
+    assert len([p for p in cached if p.exists()]) == 2
+
+
+@pytest.mark.asyncio
+async def test_render_fseq_parallel_uses_chunk_cache(tmp_path: Path) -> None:
+    from utils.fseq_render import render_fseq, render_fseq_parallel
+
+    cache_dir = tmp_path / "cache"
+    args = _render_args()
+    render_fseq(out_path=str(tmp_path / "warm.fseq"), cache_dir=str(cache_dir), **args)
+    args["steps"][2] = dict(args["steps"][2], duration_s=0.75)
+    ref = tmp_path / "ref.fseq"
+    render_fseq(out_path=str(ref), **args)
+
+    progress = []
+    out = tmp_path / "out.fseq"
+    res = await render_fseq_parallel(
+        None,
+        out_path=str(out),
+        cache_dir=str(cache_dir),
+        workers=2,
+        chunk_frames=7,
+        progress=lambda done, total: progress.append((done, total)),
+        **args,
+    )
+    assert res["render"]["cache"] == {"hits": 2, "misses": 1}
+    assert out.read_bytes() == ref.read_bytes()
+    # The re-rendered step (30 frames) counts on top of the assembled frames.
+    assert progress[-1] == (100, 100)
+
+
+@pytest.mark.asyncio
+async def test_render_show_fseq_writes_each_prop_into_its_range(
+    tmp_path: Path,
+) -> None:
+    from geometry import TreeGeometry
+    from show_config import PropConfig, PropGeometryConfig, ShowConfig
+    from utils.fseq_render import (
+        render_fseq,
+        render_show_fseq_parallel,
+        show_props_for_fseq,
+    )
+
+    cfg = ShowConfig(
+        props=[
+            PropConfig(
+                id="tree",
+                kind="model",
+                channel_start=1,
+                pixel_count=20,
+                geometry=PropGeometryConfig(runs=2, pixels_per_run=10, segment_len=10),
+            ),
+            PropConfig(id="arch", kind="model", pixel_count=10),  # packed at 61
+            PropConfig(id="star", kind="model", channel_start=201, channel_count=15),
+            PropConfig(id="unused", kind="model", channel_start=301, pixel_count=5),
+        ]
+    )
+    seqs = {
+        "tree": [{"type": "ddp", "pattern": "rainbow_cycle", "duration_s": 0.5}],
+        "arch": [{"type": "ddp", "pattern": "comet", "duration_s": 0.3}],
+        "star": [{"type": "ddp", "pattern": "sparkle", "duration_s": 0.4}],
+    }
+    props = show_props_for_fseq(cfg, seqs)
+    assert [(p.id, p.channel_start, p.led_count) for p in props] == [
+        ("tree", 1, 20),
+        ("arch", 61, 10),
+        ("star", 201, 5),
+    ]
+    assert props[0].geometry.enabled_for(20)
+
+    common = dict(props=props, step_ms=50, default_bri=128, max_bri=255)
+    full, sparse = tmp_path / "full.fseq", tmp_path / "sparse.fseq"
+    await render_show_fseq_parallel(None, out_path=str(full), fseq_version=1, **common)
+    res = await render_show_fseq_parallel(
+        None, out_path=str(sparse), compression="zlib", workers=2, **common
+    )
+    # tree and arch are adjacent, so they share one sparse range.
+    assert res["render"]["sparse_ranges"] == [[0, 90], [200, 15]]
+
+    with FSEQReader(str(full)) as a, FSEQReader(str(sparse)) as b:
+        assert (a.channel_count, len(a), len(b)) == (215, 10, 10)
+        for k in range(len(a)):
+            fa, fb = bytes(a.frame(k)), bytes(b.frame(k))
+            assert fb == fa[0:90] + fa[200:215]
+            assert fa[90:200] == bytes(110)
+
+    # Each prop matches a single-prop export of its own sequence; the arch
+    # sequence is shorter than the show and stays dark once it ends.
+    for p in props:
+        one = tmp_path / f"{p.id}.fseq"
+        render_fseq(
+            steps=seqs[p.id],
+            out_path=str(one),
+            led_count=p.led_count,
+            channel_start=1,
+            channels_total=p.led_count * 3,
+            step_ms=50,
+            default_bri=128,
+            geometry=p.geometry,
+            segment_layout=None,
+            max_bri=255,
+        )
+        lo, hi = p.channel_start - 1, p.channel_start - 1 + p.led_count * 3
+        with FSEQReader(str(one)) as ref, FSEQReader(str(full)) as a:
+            for k in range(len(a)):
+                want = bytes(ref.frame(k)) if k < len(ref) else bytes(hi - lo)
+                assert bytes(a.frame(k))[lo:hi] == want
+
+    overlapping = [props[0], dataclasses.replace(props[1], channel_start=31)]
+    with pytest.raises(ValueError, match="overlap"):
+        await render_show_fseq_parallel(
+            None,
+            out_path=str(tmp_path / "bad.fseq"),
+            **{**common, "props": overlapping},
+        )
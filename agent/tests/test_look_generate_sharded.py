@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from look_generator import LookLibraryGenerator, theme_targets
+from look_service import LookService
+from wled_mapper import WLEDMapper
+
+_EFFECTS = ["Solid", "Blink", "Merry Christmas", "Halloween Eyes"] + [
+    f"FX {i}" for i in range(30)
+]
+_PALETTES = ["Default", "Rainbow", "Party", "Red", "Ice", "Fire", "Halloween"]
+_THEMES = ["classic", "icy", "halloween", "rainbow"]
+
+
+class _DummyWLED:
+    async def get_effects(self, refresh: bool = True):  # type: ignore[override]
+        _ = refresh
+        return list(_EFFECTS)
+
+    async def get_palettes(self, refresh: bool = True):  # type: ignore[override]
+        _ = refresh
+        return list(_PALETTES)
+
+    async def get_segments(self, refresh: bool = True):  # type: ignore[override]
+        _ = refresh
+        return [{"id": i, "start": i * 50, "stop": i * 50 + 50} for i in range(4)]
+
+
+def _service(data_dir: str) -> LookService:
+    return LookService(
+        wled=_DummyWLED(),
+        mapper=WLEDMapper(),
+        data_dir=data_dir,
+        max_bri=255,
+        segment_ids=[0, 1, 2, 3],
+    )
+
+
+def test_iter_generate_streams_the_same_looks_as_generate() -> None:
+    def _gen() -> LookLibraryGenerator:
+        return LookLibraryGenerator(
+            mapper=WLEDMapper(), seed=7, effects=_EFFECTS, palettes=_PALETTES
+        )
+
+    kwargs = dict(total=600, themes=_THEMES, include_multi_segment=True)
+    kwargs["segment_ids"] = [0, 1, 2, 3]
+    looks = _gen().generate(**kwargs)
+    assert [l.id for l in _gen().iter_generate(**kwargs)] == [l.id for l in looks]
+    counts = {t: sum(1 for l in looks if l.theme == t) for t in _THEMES}
+    for theme, target in theme_targets(600, _THEMES):
+        assert counts[theme] >= target
+
+
+@pytest.mark.asyncio
+async def test_sharded_pack_is_reproducible_and_streamed_to_disk(tmp_path) -> None:
+    packs = []
+    for run in ("a", "b"):
+        svc = _service(str(tmp_path / run))
+        progress: list[tuple[int, int, str]] = []
+        summary = await svc.generate_pack(
+            total_looks=403,
+            themes=_THEMES + ["classic"],
+            brightness=120,
+            seed=42,
+            include_multi_segment=True,
+            sharded=True,
+            progress_cb=lambda cur, total, msg: progress.append((cur, total, msg)),
+        )
+        looks_dir = tmp_path / run / "looks"
+        assert sorted(p.name for p in looks_dir.iterdir()) == [summary.file]
+        assert summary.file not in svc._cache  # written, not held in memory
+        rows = await svc.load_pack(summary.file)
+        assert len(rows) == summary.total
+        assert progress[-1][0] == summary.total
+        packs.append((summary, (looks_dir / summary.file).read_bytes()))
+
+    (first, data_a), (second, data_b) = packs
+    assert data_a == data_b
+    # Repeated themes share one shard; every theme reaches its target.
+    assert list(first.themes) == _THEMES
+    assert first.themes["classic"] >= 2 * (403 // 5)
+    assert all(first.themes[t] >= 403 // 5 for t in _THEMES)
+    rows = [json.loads(line) for line in data_a.decode("utf-8").splitlines()]
+    assert [r["theme"] for r in rows] == sorted(
+        (r["theme"] for r in rows), key=_THEMES.index
+    )
+
+    in_memory = await _service(str(tmp_path / "c")).generate_pack(
+        total_looks=403,
+        themes=_THEMES + ["classic"],
+        brightness=120,
+        seed=42,
+        write_files=False,
+        include_multi_segment=True,
+        sharded=True,
+    )
+    assert in_memory.themes == first.themes
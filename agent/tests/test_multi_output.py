@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+
+import pytest
+
+from geometry import TreeGeometry
+from multi_output import MultiOutputStreamer, OutputSpec, outputs_from_show_config
+from show_config import PixelOutputConfig, PropConfig, ShowConfig
+
+
+def test_outputs_from_show_config_maps_props_to_channel_slices() -> None:
+    cfg = ShowConfig(
+        props=[
+            PropConfig(
+                id="tree", kind="wled", wled_url="http://10.0.0.5", pixel_count=100
+            ),
+            PropConfig(
+                id="arch",
+                kind="pixel",
+                channel_start=1001,
+                channel_count=150,
+                pixel=PixelOutputConfig(
+                    protocol="artnet", host="10.0.0.6", universe_start=3
+                ),
+            ),
+            PropConfig(
+                id="star",
+                kind="pixel",
+                pixel=PixelOutputConfig(host="10.0.0.7", pixel_count=20),
+            ),
+            PropConfig(id="planning_only", kind="model", channel_count=30),
+        ]
+    )
+    outs = {o.id: o for o in outputs_from_show_config(cfg)}
+    assert set(outs) == {"tree", "arch", "star"}
+    assert (outs["tree"].protocol, outs["tree"].host, outs["tree"].port) == (
+        "ddp",
+        "10.0.0.5",
+        4048,
+    )
+    assert (outs["tree"].channel_offset, outs["tree"].channel_count) == (0, 300)
+    assert (outs["arch"].channel_offset, outs["arch"].universe_start) == (1000, 3)
+    # No channel_start: packed after the highest channel used so far.
+    assert (outs["star"].channel_offset, outs["star"].channel_count) == (1150, 60)
+    assert outs["star"].protocol == "e131"
+
+    only = outputs_from_show_config(cfg, prop_ids=["star"])
+    assert [o.id for o in only] == ["star"]
+
+
+def _receiver() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(2.0)
+    return sock
+
+
+@pytest.mark.asyncio
+async def test_multi_output_renders_once_and_fans_out_slices() -> None:
+    ddp_rx, e131_rx = _receiver(), _receiver()
+    outputs = [
+        OutputSpec(
+            id="a",
+            protocol="ddp",
+            host="127.0.0.1",
+            port=ddp_rx.getsockname()[1],
+            channel_offset=0,
+            channel_count=30,
+        ),
+        OutputSpec(
+            id="b",
+            protocol="e131",
+            host="127.0.0.1",
+            port=e131_rx.getsockname()[1],
+            channel_offset=30,
+            channel_count=30,
+        ),
+    ]
+    geom = TreeGeometry(runs=1, pixels_per_run=20, segment_len=20, segments_per_run=1)
+    streamer = MultiOutputStreamer(geometry=geom, fps_max=60.0)
+    st = await streamer.start(
+        outputs=outputs,
+        pattern="solid",
+        params={"color": [10, 20, 30]},
+        duration_s=0.3,
+        brightness=255,
+        fps=30.0,
+    )
+    assert st.running and st.outputs == 2 and st.led_count == 20
+    try:
+        ddp_pkt = await asyncio.to_thread(ddp_rx.recv, 2048)
+        e131_pkt = await asyncio.to_thread(e131_rx.recv, 2048)
+        assert len(ddp_pkt) == 10 + 30
+        assert len(e131_pkt) == 126 + 510  # full universe, zero padded
+        assert ddp_pkt[10:13] == e131_pkt[126:129]
+        while (await streamer.status()).running:
+            await asyncio.sleep(0.05)
+        m = await streamer.metrics()
+        assert m.frames_rendered_total >= 3
+        assert [o["id"] for o in m.outputs] == ["a", "b"]
+        for out in m.outputs:
+            assert out["errors_total"] == 0
+            assert out["frames_sent_total"] >= 1
+            assert out["frames_sent_total"] + out["frames_dropped_total"] <= (
+                m.frames_rendered_total
+            )
+    finally:
+        await streamer.stop()
+        ddp_rx.close()
+        e131_rx.close()
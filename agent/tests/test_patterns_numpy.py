@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+
+from geometry import TreeGeometry
+from patterns import PATTERN_REGISTRY, PatternFactory
+from segment_layout import SegmentLayout, SegmentRange
+
+pytest.importorskip("numpy")
+
+
+def _quarters(led_count: int) -> SegmentLayout:
+    q = led_count // 4
+    return SegmentLayout(
+        led_count=led_count,
+        segments=[
+            SegmentRange(id=i, start=i * q, stop=(led_count if i == 3 else (i + 1) * q))
+            for i in range(4)
+        ],
+        kind="quarters",
+    )
+
+
+@pytest.mark.parametrize(
+    "led_count,layout",
+    [(200, "quarters"), (200, None), (157, None)],
+)
+def test_numpy_backend_matches_scalar_bytes(led_count: int, layout) -> None:
+    geom = TreeGeometry(runs=8, pixels_per_run=25, segment_len=25, segments_per_run=1)
+    factory = PatternFactory(
+        led_count=led_count,
+        geometry=geom,
+        segment_layout=_quarters(led_count) if layout else None,
+    )
+    for name in sorted(PATTERN_REGISTRY):
+        for t in (0.0, 0.37, 1.9, 12.25):
+            for bri in (255, 128, 7):
+                idx = int(t * 40)
+                ref = factory.create(name).frame(t=t, frame_idx=idx, brightness=bri)
+                vec = factory.create(name, backend="numpy").frame(
+                    t=t, frame_idx=idx, brightness=bri
+                )
+                assert vec == ref, f"{name} t={t} bri={bri}"
+
+
+def test_factory_backend_selection() -> None:
+    geom = TreeGeometry(runs=1, pixels_per_run=10, segment_len=10, segments_per_run=1)
+    scalar = PatternFactory(led_count=10, geometry=geom)
+    vector = PatternFactory(led_count=10, geometry=geom, backend="numpy")
+
+    assert type(scalar.create("plasma")) is PATTERN_REGISTRY["plasma"]
+    assert type(vector.create("plasma")) is not PATTERN_REGISTRY["plasma"]
+    assert isinstance(vector.create("plasma"), PATTERN_REGISTRY["plasma"])
+    # Patterns without an array implementation resolve to the scalar class.
+    assert type(vector.create("solid")) is PATTERN_REGISTRY["solid"]
+    # Unknown backends fall back to the scalar path.
+    assert type(scalar.create("plasma", backend="gpu")) is PATTERN_REGISTRY["plasma"]
+
+
+def test_numpy_frame_into_writes_in_place() -> None:
+    geom = TreeGeometry(runs=8, pixels_per_run=25, segment_len=25, segments_per_run=1)
+    factory = PatternFactory(
+        led_count=200, geometry=geom, segment_layout=_quarters(200)
+    )
+    for name in sorted(PATTERN_REGISTRY):
+        ref = factory.create(name).frame(t=2.5, frame_idx=100, brightness=180)
+        buf = bytearray(3 + 600)
+        factory.create(name, backend="numpy").frame_into(
+            buf, 3, t=2.5, frame_idx=100, brightness=180
+        )
+        assert buf[:3] == b"\x00\x00\x00"
+        assert bytes(buf[3:]) == ref, name
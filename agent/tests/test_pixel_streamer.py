@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import socket
+import struct
+import time
+from pathlib import Path
+
+from artnet_sender import ArtNetConfig, ArtNetSender
+from fseq import write_fseq_v1_file
+from geometry import TreeGeometry
+from pixel_streamer import PixelStreamConfig, PixelStreamer
+
+
+def _receiver() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(2.0)
+    return sock
+
+
+def test_artnet_dmx_reused_buffers_and_artsync() -> None:
+    rx = _receiver()
+    tx = ArtNetSender(
+        ArtNetConfig(
+            host="127.0.0.1",
+            port=rx.getsockname()[1],
+            universe_start=3,
+            channels_per_universe=6,
+            sync=True,
+        )
+    )
+    try:
+        for seq, frame in ((1, bytes(range(1, 11))), (2, bytes(range(21, 29)))):
+            tx.send_frame(frame)
+            p1, p2, sync = rx.recv(1024), rx.recv(1024), rx.recv(1024)
+            for pkt, universe in ((p1, 3), (p2, 4)):
+                assert pkt[:8] == b"Art-Net\x00"
+                assert struct.unpack("<H", pkt[8:10])[0] == 0x5000
+                assert pkt[12] == seq
+                assert struct.unpack("<H", pkt[14:16])[0] == universe
+                assert struct.unpack(">H", pkt[16:18])[0] == 6
+            assert p1[18:] == frame[:6]
+            assert p2[18:] == frame[6:].ljust(6, b"\x00")
+            assert (
+                sync == b"Art-Net\x00" + struct.pack("<H", 0x5200) + b"\x00\x0e\x00\x00"
+            )
+    finally:
+        tx.close()
+        rx.close()
+
+
+def test_pixel_streamer_metrics() -> None:
+    rx = _receiver()
+    streamer = PixelStreamer(
+        led_count=20,
+        geometry=TreeGeometry(
+            runs=1, pixels_per_run=20, segment_len=20, segments_per_run=1
+        ),
+        cfg=PixelStreamConfig(
+            protocol="artnet",
+            host="127.0.0.1",
+            port=rx.getsockname()[1],
+            universe_start=0,
+            channels_per_universe=510,
+            artnet_sync=True,
+        ),
+    )
+    try:
+        streamer.start(pattern="rainbow_cycle", duration_s=0.3, fps=20.0)
+        deadline = time.monotonic() + 3.0
+        while streamer.status().running and time.monotonic() < deadline:
+            time.sleep(0.05)
+        m = streamer.metrics()
+        assert m.frames_sent_total == streamer.status().frames_sent > 0
+        assert m.frame_lag_seconds_count == m.frames_sent_total
+        assert m.last_frame_compute_s is not None
+        assert m.max_frame_lag_s >= 0.0
+    finally:
+        streamer.stop()
+        rx.close()
+
+
+def test_pixel_streamer_plays_fseq_from_channel_offset(tmp_path: Path) -> None:
+    rx = _receiver()
+    out = tmp_path / "show.fseq"
+    frames = [bytes([i + 1]) * 6 + bytes([100 + i]) * 12 for i in range(4)]
+    write_fseq_v1_file(
+        out_path=str(out),
+        channel_count=18,
+        num_frames=4,
+        step_ms=20,
+        frame_generator=iter(frames),
+    )
+    streamer = PixelStreamer(
+        led_count=4,
+        geometry=TreeGeometry(
+            runs=1, pixels_per_run=4, segment_len=4, segments_per_run=1
+        ),
+        cfg=PixelStreamConfig(
+            protocol="artnet",
+            host="127.0.0.1",
+            port=rx.getsockname()[1],
+            universe_start=0,
+            channels_per_universe=510,
+        ),
+    )
+    try:
+        st = streamer.play_fseq(path=str(out), channel_start=7)
+        assert st.running and st.pattern == "fseq:show.fseq"
+        got = [rx.recv(1024)[18:30] for _ in range(4)]
+        assert got == [f[6:] for f in frames]
+        deadline = time.monotonic() + 3.0
+        while streamer.status().running and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert streamer.metrics().frames_sent_total == 4
+    finally:
+        streamer.stop()
+        rx.close()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from geometry import TreeGeometry
+from patterns import RenderContext, _seg_info
+from segment_layout import SegmentLayout, SegmentRange
+
+
+def test_tables_match_per_pixel_lookups() -> None:
+    geom = TreeGeometry(runs=4, pixels_per_run=30, segment_len=30, segments_per_run=1)
+    layout = SegmentLayout(
+        led_count=120,
+        segments=[
+            SegmentRange(id=7, start=0, stop=50),
+            SegmentRange(id=3, start=60, stop=120),
+        ],
+        kind="custom",
+    )
+    ctx = RenderContext(
+        led_count=120, geometry=geom, geometry_enabled=True, segment_layout=layout
+    )
+    tb = ctx.tables
+
+    assert tb is ctx.tables
+    assert tb.led_count == 120 and tb.seg_count == 2
+    for i in range(120):
+        ang, y, _ = geom.coords(i)
+        assert (tb.angle[i], tb.y[i]) == (ang, y)
+        order, _, local, seg_len = _seg_info(ctx, i)
+        assert (tb.seg_order[i], tb.seg_local[i], tb.seg_len[i]) == (
+            order,
+            local,
+            seg_len,
+        )
+
+
+def test_segment_layout_lookup_sorted_and_unsorted() -> None:
+    sorted_layout = SegmentLayout(
+        led_count=30,
+        segments=[SegmentRange(id=i, start=i * 10, stop=i * 10 + 8) for i in range(3)],
+        kind="custom",
+    )
+    assert sorted_layout.order_for_index(12) == 1
+    assert sorted_layout.local_index(12) == 2
+    assert sorted_layout.segment_for_index(9) is None
+
+    unsorted_layout = SegmentLayout(
+        led_count=30,
+        segments=[
+            SegmentRange(id=5, start=20, stop=30),
+            SegmentRange(id=2, start=0, stop=20),
+        ],
+        kind="custom",
+    )
+    assert unsorted_layout.order_for_index(3) == 1
+    assert unsorted_layout.segment_for_index(25) == 5
+    mapping = unsorted_layout.id_to_order()
+    mapping[5] = 99
+    assert unsorted_layout.id_to_order() == {5: 0, 2: 1}
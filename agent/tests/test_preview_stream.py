@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import base64
+import json
+import random
+import timeit
+
+import pytest
+
+from geometry import TreeGeometry
+from preview_stream import (
+    FrameTap,
+    PreviewClient,
+    apply_delta,
+    encode_delta,
+    preview_events,
+)
+from utils.sequence_preview import PreviewRaster
+
+
+def test_delta_roundtrip_merges_close_runs() -> None:
+    prev = bytes(30)
+    cur = bytearray(prev)
+    cur[0:3] = b"\x01\x02\x03"  # pixel 0
+    cur[6:9] = b"\x04\x05\x06"  # pixel 2 (one unchanged pixel between)
+    cur[27:30] = b"\x07\x08\x09"  # pixel 9
+    delta = encode_delta(prev, bytes(cur))
+    # Two runs: pixels 0..2 merged, then pixel 9.
+    assert len(delta) == (4 + 9) + (4 + 3)
+    assert apply_delta(prev, delta) == bytes(cur)
+    assert encode_delta(bytes(cur), bytes(cur)) == b""
+
+
+def test_numpy_delta_matches_scalar_and_bounds_frame_cost() -> None:
+    pytest.importorskip("numpy")
+    rng = random.Random(5)
+    for density in (0.0, 0.02, 0.3, 0.7, 1.0):
+        prev = bytes(rng.randrange(256) for _ in range(3 * 500))
+        cur = bytearray(prev)
+        for px in range(500):
+            if rng.random() < density:
+                cur[3 * px + rng.randrange(3)] ^= 0xFF
+        fast = encode_delta(prev, bytes(cur))
+        assert fast == encode_delta(prev, bytes(cur), backend="python")
+        assert apply_delta(prev, fast) == bytes(cur)
+
+    # A fully changed 128x128 image (the largest preview) must stay far below
+    # a DDP frame interval, since it is encoded on the send loop's event loop.
+    size = 128 * 128 * 3
+    blank = bytes(size)
+    full = bytes([7]) * size
+    sparse = bytearray(size)
+    sparse[::9] = bytes([1]) * len(sparse[::9])  # every third pixel: ~5k runs
+    for cur in (full, bytes(sparse)):
+        assert apply_delta(blank, encode_delta(blank, cur)) == cur
+        best = min(timeit.repeat(lambda: encode_delta(blank, cur), number=5, repeat=5))
+        assert best / 5 < 0.002
+
+
+def test_frame_tap_copies_only_for_clients_at_their_rate() -> None:
+    tap = FrameTap()
+    tap.publish(b"\x01" * 6, now=0.0)
+    assert tap.frames_published == 0
+
+    client = tap.subscribe(PreviewClient(fps_max=10.0))
+    tap.publish(b"\x02" * 6, now=1.0)
+    tap.publish(b"\x03" * 6, now=1.05)  # inside the 0.1 s client interval
+    tap.publish(b"\x04" * 6, now=1.1)
+    assert tap.frames_published == 2
+    frame, seq = tap.latest(client.seq)
+    assert frame == b"\x04" * 6 and seq == 2
+    assert tap.latest(seq) == (None, seq)
+
+    tap.unsubscribe(client)
+    assert tap.clients == 0
+    tap.publish(b"\x05" * 6, now=5.0)
+    assert tap.frames_published == 2
+
+
+def test_preview_client_backs_off_when_sends_are_slow() -> None:
+    client = PreviewClient(fps_max=20.0, fps_min=2.0)
+    client.record_send(0.2)
+    assert client.fps == 10.0
+    for _ in range(4):
+        client.record_send(0.5)
+    assert client.fps == 2.0
+    for _ in range(3):
+        client.record_send(0.0)
+    assert client.fps == 3.0
+
+
+@pytest.mark.asyncio
+async def test_preview_events_send_keyframe_then_delta() -> None:
+    geom = TreeGeometry(runs=4, pixels_per_run=10, segment_len=10, segments_per_run=1)
+    tap = FrameTap()
+
+    async def _connected() -> bool:
+        return False
+
+    gen = preview_events(
+        tap, geometry=geom, width=16, height=8, fps=50.0, is_disconnected=_connected
+    )
+    ready = await gen.__anext__()
+    assert ready.startswith("event: ready")
+
+    raster = PreviewRaster(led_count=40, geometry=geom, width=16, height=8)
+    red = bytes((255, 0, 0)) * 40
+    tap.publish(red)
+    first = json.loads((await gen.__anext__()).split("data: ", 1)[1])
+    assert first["key"] is True
+    img = base64.b64decode(first["data"])
+    assert img == bytes(raster.render(red))
+
+    changed = bytearray(red)
+    changed[0:3] = b"\x00\x00\xff"  # bottom LED of run 0
+    tap.publish(bytes(changed), now=1e9)
+    second = json.loads((await gen.__anext__()).split("data: ", 1)[1])
+    assert second["key"] is False
+    assert apply_delta(img, base64.b64decode(second["data"])) == bytes(
+        raster.render(bytes(changed))
+    )
+    await gen.aclose()
+    assert tap.clients == 0
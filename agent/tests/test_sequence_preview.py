@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from fseq import FSEQReader, write_fseq_v1_file
+from geometry import TreeGeometry
+from utils.sequence_preview import (
+    PreviewRaster,
+    _fseq_frame_stream,
+    _render_frame_stream,
+)
+
+
+def _geom(runs: int, ppr: int) -> TreeGeometry:
+    return TreeGeometry(
+        runs=runs, pixels_per_run=ppr, segment_len=ppr, segments_per_run=1
+    )
+
+
+def _pixel(img: memoryview, width: int, x: int, y: int) -> tuple:
+    i = (y * width + x) * 3
+    return tuple(img[i : i + 3])
+
+
+def test_tree_raster_maps_runs_to_columns_and_tapers() -> None:
+    runs, ppr = 4, 10
+    led_count = runs * ppr
+    rgb = bytearray(led_count * 3)
+    for run in range(runs):
+        for pos in range(ppr):
+            i = (run * ppr + pos) * 3
+            rgb[i : i + 3] = bytes((run * 60 + 10, pos * 20 + 5, 1))
+    raster = PreviewRaster(
+        led_count=led_count, geometry=_geom(runs, ppr), width=40, height=10
+    )
+    assert raster.tree
+    img = raster.render(bytes(rgb))
+    assert len(img) == 40 * 10 * 3
+
+    # Bottom row spans the full width: left edge is run 0, right edge the last run, LED pos 0.
+    assert _pixel(img, 40, 0, 9) == (10, 5, 1)
+    assert _pixel(img, 40, 39, 9) == ((runs - 1) * 60 + 10, 5, 1)
+    # Top row is the top LED of each run, and narrower than the base.
+    assert _pixel(img, 40, 20, 0)[1] == (ppr - 1) * 20 + 5
+    assert _pixel(img, 40, 0, 0) == (0, 0, 0)
+    assert _pixel(img, 40, 39, 0) == (0, 0, 0)
+
+
+def test_strip_raster_when_geometry_does_not_cover_strip() -> None:
+    led_count = 8
+    rgb = bytes(c for i in range(led_count) for c in (i * 10, 0, 255))
+    raster = PreviewRaster(led_count=led_count, geometry=_geom(3, 5), width=4, height=3)
+    assert not raster.tree
+    img = raster.render(rgb)
+    row = bytes(img[: 4 * 3])
+    assert row == bytes((10, 0, 255, 30, 0, 255, 50, 0, 255, 70, 0, 255))
+    assert bytes(img) == row * 3
+
+
+def test_render_frame_stream_reuses_one_image_buffer() -> None:
+    geom = _geom(4, 10)
+    steps = [
+        {
+            "type": "ddp",
+            "pattern": "solid",
+            "duration_s": 0.5,
+            "params": {"color": [255, 0, 0]},
+        },
+        {"type": "wled", "duration_s": 0.25},
+    ]
+    frames = []
+    for frame in _render_frame_stream(
+        steps=steps,
+        led_count=40,
+        geometry=geom,
+        segment_layout=None,
+        width=16,
+        height=8,
+        fps=4.0,
+        max_duration_s=0.0,
+        default_bri=255,
+        max_bri=255,
+        strict=False,
+    ):
+        frames.append((frame, bytes(frame)))
+    assert len(frames) == 3
+    assert all(f is frames[0][0] for f, _ in frames)
+    # Non-renderable steps hold the last rendered image.
+    assert frames[2][1] == frames[1][1]
+    assert any(frames[0][1][i] for i in range(0, len(frames[0][1]), 3))
+
+
+def _write_fseq(path: Path, *, frames: int, offset: int, led_count: int) -> None:
+    channels = offset + led_count * 3
+    write_fseq_v1_file(
+        out_path=str(path),
+        channel_count=channels,
+        num_frames=frames,
+        step_ms=50,
+        frame_generator=(
+            bytes(offset) + bytes([k * 10]) * (led_count * 3) for k in range(frames)
+        ),
+    )
+
+
+def test_fseq_frame_stream_strides_frames_at_preview_fps(tmp_path: Path) -> None:
+    path = tmp_path / "show.fseq"
+    _write_fseq(path, frames=20, offset=6, led_count=40)  # 1 s at 20 fps
+    with FSEQReader(str(path)) as reader:
+        levels = [
+            _pixel(frame, 16, 8, 7)[0]
+            for frame in _fseq_frame_stream(
+                reader=reader,
+                offset=6,
+                led_count=40,
+                geometry=_geom(4, 10),
+                width=16,
+                height=8,
+                fps=4.0,
+                max_duration_s=0.0,
+            )
+        ]
+    # Every 5th stored frame (0.25 s), read at the strip's channel offset.
+    assert levels == [0, 50, 100, 150]
+
+
+@pytest.mark.asyncio
+async def test_find_preview_fseq_matches_sequence_content(tmp_path: Path) -> None:
+    from services.fseq_service import find_preview_fseq, fseq_export_source
+
+    (tmp_path / "sequences").mkdir()
+    (tmp_path / "fseq").mkdir()
+    seq_path = tmp_path / "sequences" / "sequence_a.json"
+    seq_path.write_text(json.dumps({"steps": []}))
+    _write_fseq(tmp_path / "fseq" / "a.fseq", frames=2, offset=3, led_count=40)
+    geom = _geom(4, 10)
+
+    rows: list = []
+
+    async def _lookup(*, source_sequence: str) -> list:
+        return [r for r in rows if r["source_sequence"] == source_sequence]
+
+    state = SimpleNamespace(
+        settings=SimpleNamespace(data_dir=str(tmp_path)),
+        db=SimpleNamespace(list_fseq_exports_for_sequence=_lookup),
+    )
+    source = await fseq_export_source(state, seq_path, geom)
+    rows.append(
+        {
+            "source_sequence": "sequence_a.json",
+            "payload": {
+                "render": {"led_count": 40, "channel_start": 4},
+                "source": source,
+                "out_file": "fseq/a.fseq",
+            },
+        }
+    )
+
+    found = await find_preview_fseq(
+        state, seq_path=seq_path, led_count=40, geometry=geom
+    )
+    assert found is not None
+    assert found["file"] == "fseq/a.fseq" and found["channel_start"] == 4
+
+    assert (
+        await find_preview_fseq(state, seq_path=seq_path, led_count=50, geometry=geom)
+        is None
+    )
+    seq_path.write_text(json.dumps({"steps": [{"type": "ddp"}]}))
+    assert (
+        await find_preview_fseq(state, seq_path=seq_path, led_count=40, geometry=geom)
+        is None
+    )
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import wave
+from array import array
+
+import pytest
+
+from waveform_pyramid import (
+    WaveformPyramid,
+    build_waveform_pyramid,
+    read_waveform_range,
+)
+
+
+def _write_segments_wav(path: str, *, sr: int = 8000) -> array:
+    """Four 1 s segments: alternating +/-amp samples (RMS == amp), amp varies."""
+    samples = array("h")
+    for amp in (1000, 8000, 16000, 4000):
+        samples.extend(amp if i % 2 == 0 else -amp for i in range(sr))
+    samples.extend([0] * 123)  # ragged tail (partial bucket)
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sr)
+        wf.writeframes(samples.tobytes())
+    return samples
+
+
+def test_range_picks_level_and_slices_time_window(tmp_path) -> None:
+    wav = tmp_path / "segments.wav"
+    samples = _write_segments_wav(str(wav))
+    out = tmp_path / "segments.wfp"
+    info = build_waveform_pyramid(
+        audio_path=str(wav), out_path=str(out), base_block=64, backend="python"
+    )
+    assert info["levels"] > 3
+
+    full = read_waveform_range(str(out), points=40)
+    assert full["points_total"] == 40
+    assert full["level"] > 0
+    assert full["duration_s"] == pytest.approx(len(samples) / 8000.0)
+    assert max(p["max"] for p in full["points"]) == pytest.approx(16000 / 32768.0)
+    assert min(p["min"] for p in full["points"]) == pytest.approx(-16000 / 32768.0)
+
+    # Zoom into the middle of the 16000 segment: every point is that segment.
+    with WaveformPyramid(str(out)) as pyr:
+        zoom = pyr.range(start_s=2.25, end_s=2.75, points=20)
+        assert zoom["level"] < full["level"]
+        assert zoom["points_total"] == 20
+        for p in zoom["points"]:
+            assert p["max"] == pytest.approx(16000 / 32768.0)
+            assert p["min"] == pytest.approx(-16000 / 32768.0)
+            assert p["rms"] == pytest.approx(16000 / 32768.0, abs=1e-4)
+
+        # Deeper than level 0: one point per base bucket.
+        deep = pyr.range(start_s=1.0, end_s=1.05, points=1000)
+        assert deep["level"] == 0
+        assert deep["points_total"] == 7  # ceil(400 / 64)
+        assert pyr.range(start_s=10.0, end_s=11.0)["points"] == []
+
+
+def test_numpy_and_scalar_builds_are_identical(tmp_path) -> None:
+    pytest.importorskip("numpy")
+    wav = tmp_path / "segments.wav"
+    _write_segments_wav(str(wav))
+    paths = {b: tmp_path / f"{b}.wfp" for b in ("python", "numpy")}
+    for backend, path in paths.items():
+        build_waveform_pyramid(
+            audio_path=str(wav), out_path=str(path), base_block=64, backend=backend
+        )
+    assert paths["python"].read_bytes() == paths["numpy"].read_bytes()
@@ -1,10 +1,30 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import sqlite3
+import threading
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+# Render caches (previews, waveforms, fseq chunks) are directories of files
+# named by a content hash. Each directory carries a small SQLite index
+# (`INDEX_FILE`) with the size, last access and hit count of every entry plus
+# running totals, so stats are a single row read and LRU eviction walks the
+# `last_access` index for just the entries it removes instead of stat-ing the
+# whole directory. Writers call `CacheIndex.record()` after the file is in
+# place and readers go through `CacheIndex.lookup()`, which also keeps the
+# per-namespace hit/miss counters. Index failures never fail a render: the
+# cache just behaves like a miss.
+
+INDEX_FILE = ".index.sqlite3"
+_INDEX_VERSION = 1
+_EVICT_BATCH = 256
 
 
 @dataclass(frozen=True)
@@ -23,7 +43,8 @@ def _scan_cache(path: Path) -> List[CacheEntry]:
         return entries
     try:
         for entry in os.scandir(path):
-            if not entry.is_file():
+            # Dot files are the index itself and in-flight temp writes.
+            if entry.name.startswith(".") or not entry.is_file():
                 continue
             try:
                 st = entry.stat()
@@ -43,10 +64,273 @@ def _scan_cache(path: Path) -> List[CacheEntry]:
     return entries
 
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    files INTEGER NOT NULL DEFAULT 0,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO totals (id) VALUES (0);
+CREATE TRIGGER IF NOT EXISTS entries_ins AFTER INSERT ON entries BEGIN
+    UPDATE totals SET files = files + 1, bytes = bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_del AFTER DELETE ON entries BEGIN
+    UPDATE totals SET files = files - 1, bytes = bytes - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_size AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET bytes = bytes + NEW.size - OLD.size WHERE id = 0;
+END;
+"""
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+class CacheIndex:
+    """
+    On-disk index of one cache directory; `namespace` defaults to its name.
+
+    Use `open_index()` to share one instance (and SQLite connection) per
+    directory within a process. Safe across threads and processes.
+    """
+
+    def __init__(self, path: Path, *, namespace: str | None = None) -> None:
+        self.path = Path(path)
+        self.namespace = str(namespace or self.path.name)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections do not survive fork; worker processes open their own.
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        self.path.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            str(self.path / INDEX_FILE),
+            timeout=10.0,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            with _transaction(conn):
+                version = int(conn.execute("PRAGMA user_version").fetchone()[0])
+                if version < _INDEX_VERSION:
+                    self._adopt(conn)
+                    conn.execute(f"PRAGMA user_version = {_INDEX_VERSION}")
+        except BaseException:
+            conn.close()
+            raise
+        self._conn, self._pid = conn, os.getpid()
+        return conn
+
+    def _adopt(self, conn: sqlite3.Connection) -> None:
+        """One-time scan so files cached before the index existed are tracked."""
+        conn.executemany(
+            "INSERT OR IGNORE INTO entries (name, size, created_at, last_access)"
+            " VALUES (?, ?, ?, ?)",
+            [(e.path.name, e.size, e.mtime, e.mtime) for e in _scan_cache(self.path)],
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def lookup(
+        self, name: str, *, size: int | None = None, count: bool = True
+    ) -> Path | None:
+        """
+        Path of a cached entry, or None (a miss). A hit refreshes the entry's
+        last access; an entry whose file is gone or has the wrong `size` is
+        dropped (with the file). Files present but not yet indexed are adopted. With
+        `count=False` the index is left alone (re-reads of an entry that was
+        already looked up).
+        """
+        p = self.path / name
+        try:
+            st = p.stat()
+            ok = size is None or int(st.st_size) == int(size)
+        except OSError:
+            st, ok = None, False
+        if not count:
+            return p if ok else None
+        if st is not None and not ok:
+            try:
+                p.unlink()
+            except OSError:
+                pass
+        try:
+            with self._lock:
+                conn = self._connect()
+                now = time.time()
+                with _transaction(conn):
+                    if not ok:
+                        conn.execute("DELETE FROM entries WHERE name = ?", (name,))
+                        conn.execute(
+                            "UPDATE totals SET misses = misses + 1 WHERE id = 0"
+                        )
+                        return None
+                    conn.execute(
+                        "INSERT INTO entries (name, size, created_at, last_access, hits)"
+                        " VALUES (?, ?, ?, ?, 1) ON CONFLICT(name) DO UPDATE SET"
+                        " size = excluded.size, last_access = excluded.last_access,"
+                        " hits = hits + 1",
+                        (name, int(st.st_size), float(st.st_mtime), now),
+                    )
+                    conn.execute("UPDATE totals SET hits = hits + 1 WHERE id = 0")
+        except (OSError, sqlite3.Error):
+            pass
+        return p if ok else None
+
+    def record(self, name: str, size: int | None = None) -> None:
+        """Track a file just written under `name` (as most recently used)."""
+        try:
+            if size is None:
+                size = (self.path / name).stat().st_size
+            with self._lock:
+                conn = self._connect()
+                now = time.time()
+                with _transaction(conn):
+                    conn.execute(
+                        "INSERT INTO entries (name, size, created_at, last_access)"
+                        " VALUES (?, ?, ?, ?) ON CONFLICT(name) DO UPDATE SET"
+                        " size = excluded.size, created_at = excluded.created_at,"
+                        " last_access = excluded.last_access",
+                        (name, int(size), now, now),
+                    )
+        except (OSError, sqlite3.Error):
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        if not self.path.is_dir():
+            return {"files": 0, "bytes": 0, "hits": 0, "misses": 0}
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT files, bytes, hits, misses FROM totals WHERE id = 0")
+                .fetchone()
+            )
+        files, total, hits, misses = (int(v or 0) for v in row)
+        return {"files": files, "bytes": total, "hits": hits, "misses": misses}
+
+    def _evict(
+        self, where: str, args: Tuple[Any, ...], budget: int | None
+    ) -> Tuple[int, int]:
+        """
+        Remove the least recently used entries matching `where`, one batch at a
+        time, stopping once `budget` bytes are freed; returns (files, bytes).
+        """
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                f"SELECT name, size FROM entries WHERE {where}"
+                f" ORDER BY last_access LIMIT {_EVICT_BATCH}",
+                args,
+            ).fetchall()
+            if budget is not None:
+                freed = 0
+                for i, (_, size) in enumerate(rows):
+                    freed += int(size)
+                    if freed >= budget:
+                        rows = rows[: i + 1]
+                        break
+            if not rows:
+                return 0, 0
+            with _transaction(conn):
+                conn.executemany(
+                    "DELETE FROM entries WHERE name = ?", [(n,) for n, _ in rows]
+                )
+        for name, _ in rows:
+            try:
+                (self.path / name).unlink()
+            except OSError:
+                pass
+        return len(rows), sum(int(s) for _, s in rows)
+
+    def evict(
+        self,
+        *,
+        max_bytes: int | None = None,
+        max_days: float | None = None,
+        purge: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Drop entries older than `max_days` (by last access), then least recently
+        used ones until the cache fits `max_bytes`; `purge` drops everything.
+        """
+        before_bytes = self.stats()["bytes"]
+        deleted_files = deleted_bytes = 0
+
+        def _drain(where: str, *args: Any, budget: int | None = None) -> None:
+            nonlocal deleted_files, deleted_bytes
+            while budget is None or budget > 0:
+                n, b = self._evict(where, args, budget)
+                if n == 0:
+                    return
+                deleted_files += n
+                deleted_bytes += b
+                if budget is not None:
+                    budget -= b
+
+        if purge:
+            _drain("1")
+        else:
+            if max_days is not None and float(max_days) > 0:
+                _drain("last_access < ?", time.time() - float(max_days) * 86400.0)
+            if max_bytes is not None and int(max_bytes) > 0:
+                over = self.stats()["bytes"] - int(max_bytes)
+                if over > 0:
+                    _drain("1", budget=over)
+        return {
+            "deleted_files": int(deleted_files),
+            "deleted_bytes": int(deleted_bytes),
+            "before_bytes": int(before_bytes),
+            "after_bytes": int(self.stats()["bytes"]),
+        }
+
+
+_INDEXES: Dict[str, CacheIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def open_index(path: Path | str) -> CacheIndex:
+    key = os.path.abspath(str(path))
+    with _INDEXES_LOCK:
+        idx = _INDEXES.get(key)
+        if idx is None:
+            idx = _INDEXES[key] = CacheIndex(Path(key))
+        return idx
+
+
 def cache_stats(path: Path) -> Dict[str, int]:
-    entries = _scan_cache(path)
-    total_bytes = sum(int(e.size) for e in entries)
-    return {"files": len(entries), "bytes": int(total_bytes)}
+    """Entry count, total bytes and hit/miss counters of a cache directory."""
+    try:
+        return open_index(path).stats()
+    except (OSError, sqlite3.Error):
+        return {"files": 0, "bytes": 0, "hits": 0, "misses": 0}
 
 
 def cleanup_cache(
@@ -56,53 +340,71 @@ def cleanup_cache(
     max_days: float | None = None,
     purge: bool = False,
 ) -> Dict[str, int]:
-    entries = _scan_cache(path)
-    before_bytes = sum(int(e.size) for e in entries)
-    deleted_files = 0
-    deleted_bytes = 0
+    return open_index(path).evict(max_bytes=max_bytes, max_days=max_days, purge=purge)
+
+
+def cache_namespace_stats(root: Path) -> Dict[str, Dict[str, int]]:
+    """`cache_stats` of every indexed cache directory directly under `root`."""
+    out: Dict[str, Dict[str, int]] = {}
+    try:
+        dirs = sorted(p for p in Path(root).iterdir() if (p / INDEX_FILE).is_file())
+    except OSError:
+        return out
+    for d in dirs:
+        out[d.name] = cache_stats(d)
+    return out
+
+
+_DIGESTS: Dict[Tuple[str, str, int, int], str] = {}
+_DIGESTS_MAX = 4096
+_DIGESTS_LOCK = threading.Lock()
+
+
+def _memo_digest(kind: str, path: str, fn) -> str:
+    """Digest of a file, recomputed only when its size or mtime changes."""
+    st = os.stat(path)
+    key = (kind, os.path.abspath(path), int(st.st_size), int(st.st_mtime_ns))
+    with _DIGESTS_LOCK:
+        hit = _DIGESTS.get(key)
+    if hit is not None:
+        return hit
+    digest = fn(path)
+    with _DIGESTS_LOCK:
+        if len(_DIGESTS) >= _DIGESTS_MAX:
+            _DIGESTS.clear()
+        _DIGESTS[key] = digest
+    return digest
 
-    def _delete(entry: CacheEntry) -> None:
-        nonlocal deleted_files, deleted_bytes
-        try:
-            entry.path.unlink()
-            deleted_files += 1
-            deleted_bytes += int(entry.size)
-        except Exception:
-            return
-
-    if purge:
-        for entry in entries:
-            _delete(entry)
-        after = cache_stats(path)
-        return {
-            "deleted_files": int(deleted_files),
-            "deleted_bytes": int(deleted_bytes),
-            "before_bytes": int(before_bytes),
-            "after_bytes": int(after.get("bytes", 0)),
-        }
 
-    now = time.time()
-    if max_days is not None and float(max_days) > 0:
-        cutoff = now - (float(max_days) * 86400.0)
-        for entry in list(entries):
-            if entry.mtime and entry.mtime < cutoff:
-                _delete(entry)
-
-    entries = _scan_cache(path)
-    total_bytes = sum(int(e.size) for e in entries)
-    if max_bytes is not None and int(max_bytes) > 0 and total_bytes > int(max_bytes):
-        entries.sort(key=lambda e: (e.mtime, e.path.name))
-        target = int(max_bytes)
-        for entry in entries:
-            if total_bytes <= target:
-                break
-            _delete(entry)
-            total_bytes -= int(entry.size)
-
-    after = cache_stats(path)
-    return {
-        "deleted_files": int(deleted_files),
-        "deleted_bytes": int(deleted_bytes),
-        "before_bytes": int(before_bytes),
-        "after_bytes": int(after.get("bytes", 0)),
-    }
+def _sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's bytes (memoized by size and mtime)."""
+    return _memo_digest("file", str(path), _sha256_file)
+
+
+def _sha256_sequence_steps(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    steps = payload.get("steps") if isinstance(payload, dict) else None
+    if not isinstance(steps, list):
+        return _sha256_file(path)
+    blob = json.dumps(steps, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def sequence_digest(path: str) -> str:
+    """
+    SHA-256 of a sequence's canonicalized `steps`, so renaming, reformatting
+    or editing metadata keeps its renders cached.
+    """
+    try:
+        return _memo_digest("steps", str(path), _sha256_sequence_steps)
+    except ValueError:
+        return file_digest(path)
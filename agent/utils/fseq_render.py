@@ -1,98 +1,898 @@
 from __future__ import annotations
 
+import asyncio
+import bisect
+import hashlib
+import json
 import math
-from typing import Any, Dict, List
+import os
+import time
+import uuid
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from fseq import write_fseq_v1_file
+from frame_pool import FramePool
+from fseq import (
+    FSEQV1Header,
+    FSEQV1Writer,
+    FSEQV2Header,
+    FSEQV2Writer,
+    ExportedFSEQ,
+    fseq_v2_block_compressor,
+    write_fseq_v1_file,
+    write_fseq_v2_file,
+)
 from geometry import TreeGeometry
 from patterns import PatternFactory
 from segment_layout import SegmentLayout
+from show_config import ShowConfig
+from services.blocking_service import ProcessService
+from utils.blocking import run_cpu_blocking
+from utils.cache_utils import open_index
 
+# Upper bound on one worker's uncompressed chunk buffer.
+_MAX_CHUNK_BYTES = 8 * 1024 * 1024
+# Chunks per worker, so a slow range does not leave the other workers idle.
+_CHUNKS_PER_WORKER = 4
+# Bump when pattern output changes so stale cached steps are never reused.
+_CHUNK_CACHE_VERSION = 1
 
-def render_fseq(
-    *,
+
+@dataclass(frozen=True)
+class FSEQStepSpec:
+    """One renderable sequence step, placed at its first global frame."""
+
+    pattern: str
+    params: Dict[str, Any]
+    brightness: int
+    first_frame: int
+    frames: int
+    cache_key: str = ""
+
+
+@dataclass(frozen=True)
+class FSEQLayer:
+    """One prop's planned steps and where its pixels sit in each stored frame."""
+
+    specs: Tuple[FSEQStepSpec, ...]
+    led_count: int
+    offset: int
+    geometry: TreeGeometry
+    segment_layout: SegmentLayout | None = None
+    id: str = ""
+
+    @property
+    def frames(self) -> int:
+        if not self.specs:
+            return 0
+        return self.specs[-1].first_frame + self.specs[-1].frames
+
+
+def plan_fseq_steps(
     steps: List[Dict[str, Any]],
-    out_path: str,
-    led_count: int,
-    channel_start: int,
-    channels_total: int,
+    *,
     step_ms: int,
     default_bri: int,
+    max_bri: int,
+) -> List[FSEQStepSpec]:
+    """
+    Validate sequence steps and lay them out on the frame timeline.
+
+    Every frame's `t` and `frame_idx` follow from its step's `first_frame`,
+    so any frame range can be rendered independently of the others.
+    """
+    if not steps:
+        raise ValueError("Sequence has no steps")
+    specs: List[FSEQStepSpec] = []
+    first = 0
+    for step in steps:
+        typ = str(step.get("type") or "").strip().lower()
+        if typ != "ddp":
+            raise RuntimeError(
+                f"Non-renderable step type '{typ}' (only 'ddp' is supported for fseq export)."
+            )
+        pat_name = str(step.get("pattern") or "").strip()
+        if not pat_name:
+            raise RuntimeError("DDP step missing 'pattern'")
+        params = step.get("params") or {}
+        if not isinstance(params, dict):
+            params = {}
+        bri = step.get("brightness")
+        bri_i = (
+            int(default_bri)
+            if bri is None
+            else min(int(max_bri), max(1, int(bri)))
+        )
+        dur_s = float(step.get("duration_s", 0.0))
+        if dur_s <= 0:
+            dur_s = 0.1
+        n = max(1, int(math.ceil((dur_s * 1000.0) / max(1, step_ms))))
+        specs.append(
+            FSEQStepSpec(
+                pattern=pat_name,
+                params=dict(params),
+                brightness=bri_i,
+                first_frame=first,
+                frames=n,
+            )
+        )
+        first += n
+    return specs
+
+
+def fseq_chunk_cache_key(
+    spec: FSEQStepSpec,
+    *,
+    step_ms: int,
+    led_count: int,
     geometry: TreeGeometry,
     segment_layout: SegmentLayout | None,
-    max_bri: int,
-) -> Dict[str, Any]:
+) -> str:
+    """
+    Content address of one step's rendered frames.
+
+    Covers everything the frames depend on, including the step's first
+    `frame_idx` (seeded patterns use it), so an edit to an earlier step's
+    duration invalidates the steps after it.
+    """
+    layout = (
+        [[int(s.id), int(s.start), int(s.stop)] for s in segment_layout.segments]
+        if segment_layout is not None
+        else []
+    )
+    blob = json.dumps(
+        {
+            "v": _CHUNK_CACHE_VERSION,
+            "pattern": spec.pattern,
+            "params": spec.params,
+            "brightness": int(spec.brightness),
+            "first_frame": int(spec.first_frame),
+            "frames": int(spec.frames),
+            "step_ms": int(step_ms),
+            "led_count": int(led_count),
+            "geometry": [
+                int(geometry.runs),
+                int(geometry.pixels_per_run),
+                int(geometry.segment_len),
+                int(geometry.segments_per_run),
+            ],
+            "layout": layout,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _with_cache_keys(
+    specs: List[FSEQStepSpec],
+    cache_dir: str | None,
+    *,
+    step_ms: int,
+    led_count: int,
+    geometry: TreeGeometry,
+    segment_layout: SegmentLayout | None,
+) -> List[FSEQStepSpec]:
+    if not cache_dir:
+        return specs
+    return [
+        replace(
+            spec,
+            cache_key=fseq_chunk_cache_key(
+                spec,
+                step_ms=step_ms,
+                led_count=led_count,
+                geometry=geometry,
+                segment_layout=segment_layout,
+            ),
+        )
+        for spec in specs
+    ]
+
+
+def _chunk_path(cache_dir: str, key: str) -> Path:
+    return Path(cache_dir) / f"{key}.bin"
+
+
+def _cached_chunk(
+    cache_dir: str | None, spec: FSEQStepSpec, size: int, *, count: bool = True
+) -> Path | None:
+    """Return the cached step file if it is complete (a hit in the cache index)."""
+    if not cache_dir or not spec.cache_key:
+        return None
+    return open_index(cache_dir).lookup(
+        _chunk_path(cache_dir, spec.cache_key).name, size=int(size), count=count
+    )
+
+
+def _store_chunk(cache_dir: str, key: str, data: bytes | bytearray) -> None:
+    """Best-effort atomic write; a failed store only costs a re-render."""
+    p = _chunk_path(cache_dir, key)
+    tmp = p.with_name(f".{p.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(data)
+        os.replace(tmp, p)
+        open_index(cache_dir).record(p.name, len(data))
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def _render_range(
+    factory: PatternFactory,
+    specs: Sequence[FSEQStepSpec],
+    start: int,
+    end: int,
+    *,
+    step_ms: int,
+    buf: bytearray,
+    frame_len: int,
+    offset: int,
+    cache_dir: str | None = None,
+) -> None:
+    """
+    Render global frames [start, end) back to back into `buf`.
+
+    Steps found in `cache_dir` are copied from their cached frames instead.
+    Frames past the last step are left untouched.
+    """
+    if not specs:
+        return
+    end = min(int(end), specs[-1].first_frame + specs[-1].frames)
+    payload_len = int(factory.led_count) * 3
+    firsts = [s.first_frame for s in specs]
+    i = max(0, bisect.bisect_right(firsts, int(start)) - 1)
+    k = int(start)
+    while k < int(end):
+        spec = specs[i]
+        stop = min(int(end), spec.first_frame + spec.frames)
+        # Callers have already counted this step as a hit or filled it.
+        cached = _cached_chunk(
+            cache_dir, spec, spec.frames * payload_len, count=False
+        )
+        if cached is not None:
+            with cached.open("rb") as f:
+                f.seek((k - spec.first_frame) * payload_len)
+                data = memoryview(f.read((stop - k) * payload_len))
+            if len(data) == (stop - k) * payload_len:
+                for f_idx in range(k, stop):
+                    at = (f_idx - int(start)) * frame_len + offset
+                    src = (f_idx - k) * payload_len
+                    buf[at : at + payload_len] = data[src : src + payload_len]
+                k = stop
+                i += 1
+                continue
+        pat = factory.create(spec.pattern, params=spec.params)
+        for f in range(k, stop):
+            pat.frame_into(
+                buf,
+                (f - int(start)) * frame_len + offset,
+                t=((f - spec.first_frame) * int(step_ms)) / 1000.0,
+                frame_idx=f,
+                brightness=spec.brightness,
+            )
+        k = stop
+        i += 1
+
+
+def _pwrite_all(path: str, data: memoryview, pos: int) -> None:
+    if not hasattr(os, "pwrite"):
+        with open(path, "r+b") as f:
+            f.seek(pos)
+            f.write(data)
+        return
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        while len(data):
+            n = os.pwrite(fd, data, pos)
+            data = data[n:]
+            pos += n
+    finally:
+        os.close(fd)
+
+
+def fill_fseq_chunk_cache(
+    *,
+    spec: FSEQStepSpec,
+    led_count: int,
+    step_ms: int,
+    geometry: TreeGeometry,
+    segment_layout: SegmentLayout | None,
+    cache_dir: str,
+) -> int:
+    """Render one whole step into the chunk cache (`ProcessService` worker)."""
+    payload_len = int(led_count) * 3
+    buf = bytearray(spec.frames * payload_len)
+    factory = PatternFactory(
+        led_count=int(led_count),
+        geometry=geometry,
+        segment_layout=segment_layout,
+    )
+    _render_range(
+        factory,
+        [spec],
+        spec.first_frame,
+        spec.first_frame + spec.frames,
+        step_ms=int(step_ms),
+        buf=buf,
+        frame_len=payload_len,
+        offset=0,
+    )
+    _store_chunk(str(cache_dir), spec.cache_key, buf)
+    return spec.frames
+
+
+def render_fseq_chunk(
+    *,
+    layers: Sequence[FSEQLayer],
+    start_frame: int,
+    end_frame: int,
+    frame_len: int,
+    step_ms: int,
+    out_path: str | None = None,
+    data_offset: int = 0,
+    compression: str = "none",
+    compression_level: int = 0,
+    frames_per_block: int = 0,
+    cache_dir: str | None = None,
+) -> List[bytes]:
+    """
+    Render frames [start_frame, end_frame) in a `ProcessService` worker.
+
+    Every layer (prop) writes only its own channels into one shared chunk
+    buffer; channels no layer covers stay zero. With `out_path` the raw frames are written in place at
+    `data_offset + start_frame * frame_len` (the file must already be sized)
+    and nothing is returned. Otherwise the range is cut into blocks of
+    `frames_per_block` and the compressed blocks are returned in order.
+    """
+    nframes = int(end_frame) - int(start_frame)
+    if nframes <= 0:
+        return []
+    buf = bytearray(nframes * int(frame_len))
+    for layer in layers:
+        factory = PatternFactory(
+            led_count=int(layer.led_count),
+            geometry=layer.geometry,
+            segment_layout=layer.segment_layout,
+        )
+        _render_range(
+            factory,
+            layer.specs,
+            int(start_frame),
+            int(end_frame),
+            step_ms=int(step_ms),
+            buf=buf,
+            frame_len=int(frame_len),
+            offset=int(layer.offset),
+            cache_dir=cache_dir,
+        )
+    view = memoryview(buf)
+    if out_path is not None:
+        _pwrite_all(
+            str(out_path), view, int(data_offset) + int(start_frame) * int(frame_len)
+        )
+        return []
+    _, compress = fseq_v2_block_compressor(compression, compression_level)
+    if compress is None:
+        raise ValueError("Uncompressed chunks must be written in place")
+    step = max(1, int(frames_per_block)) * int(frame_len)
+    return [compress(view[i : i + step]) for i in range(0, len(buf), step)]
+
+
+def _check_render_args(
+    *,
+    steps: List[Dict[str, Any]],
+    led_count: int,
+    channel_start: int,
+    channels_total: int,
+    fseq_version: int,
+    sparse: bool,
+) -> Tuple[bool, int]:
+    """Validate export arguments; returns (effective sparse, payload length)."""
     if not steps:
         raise ValueError("Sequence has no steps")
     if led_count <= 0:
         raise ValueError("led_count must be > 0")
     if channel_start <= 0:
         raise ValueError("channel_start must be >= 1")
+    if int(fseq_version) not in (1, 2):
+        raise ValueError("fseq_version must be 1 or 2")
+    # Sparse v2 files store only this prop's channels.
+    sparse = bool(sparse) and int(fseq_version) == 2
 
     payload_len = int(led_count) * 3
     if channels_total < (channel_start - 1 + payload_len):
         raise ValueError(
             "channels_total is too small for channel_start + led_count*3"
         )
+    return sparse, payload_len
 
-    per_step_frames: List[int] = []
-    total_frames = 0
-    for step in steps:
-        dur_s = float(step.get("duration_s", 0.0))
-        if dur_s <= 0:
-            dur_s = 0.1
-        n = max(1, int(math.ceil((dur_s * 1000.0) / max(1, step_ms))))
-        per_step_frames.append(n)
-        total_frames += n
+
+def render_fseq(
+    *,
+    steps: List[Dict[str, Any]],
+    out_path: str,
+    led_count: int,
+    channel_start: int,
+    channels_total: int,
+    step_ms: int,
+    default_bri: int,
+    geometry: TreeGeometry,
+    segment_layout: SegmentLayout | None,
+    max_bri: int,
+    fseq_version: int = 1,
+    compression: str = "zstd",
+    frames_per_block: int = 0,
+    sparse: bool = False,
+    cache_dir: str | None = None,
+) -> Dict[str, Any]:
+    """
+    Render sequence steps to an .fseq file, one frame at a time.
+
+    With `cache_dir`, each step's frames are looked up in the content-addressed
+    chunk cache (see `fseq_chunk_cache_key`) and only missing steps are
+    rendered and stored, so re-exporting after editing one step renders just
+    that step.
+    """
+    sparse, payload_len = _check_render_args(
+        steps=steps,
+        led_count=led_count,
+        channel_start=channel_start,
+        channels_total=channels_total,
+        fseq_version=fseq_version,
+        sparse=sparse,
+    )
+
+    specs = plan_fseq_steps(
+        steps, step_ms=int(step_ms), default_bri=int(default_bri), max_bri=int(max_bri)
+    )
+    total_frames = sum(spec.frames for spec in specs)
+    specs = _with_cache_keys(
+        specs,
+        cache_dir,
+        step_ms=int(step_ms),
+        led_count=int(led_count),
+        geometry=geometry,
+        segment_layout=segment_layout,
+    )
 
     factory = PatternFactory(
         led_count=int(led_count),
         geometry=geometry,
         segment_layout=segment_layout,
     )
+    cache = {"hits": 0, "misses": 0}
 
-    frame_idx = 0
+    # The writer consumes each frame before the next is rendered, and channels
+    # outside the prop's range stay zero, so frames are patched in place.
+    frames = FramePool(payload_len if sparse else int(channels_total))
 
     def _frames():
-        nonlocal frame_idx
-        off = int(channel_start) - 1
-        for step, nframes in zip(steps, per_step_frames):
-            typ = str(step.get("type") or "").strip().lower()
-            if typ != "ddp":
-                raise RuntimeError(
-                    f"Non-renderable step type '{typ}' (only 'ddp' is supported for fseq export)."
+        off = 0 if sparse else int(channel_start) - 1
+        for spec in specs:
+            if cache_dir:
+                cached = _cached_chunk(cache_dir, spec, spec.frames * payload_len)
+                if cached is not None:
+                    data = cached.read_bytes()
+                    cache["hits"] += 1
+                else:
+                    data = bytearray(spec.frames * payload_len)
+                    _render_range(
+                        factory,
+                        [spec],
+                        spec.first_frame,
+                        spec.first_frame + spec.frames,
+                        step_ms=int(step_ms),
+                        buf=data,
+                        frame_len=payload_len,
+                        offset=0,
+                    )
+                    _store_chunk(cache_dir, spec.cache_key, data)
+                    cache["misses"] += 1
+                for i in range(spec.frames):
+                    frame = frames.acquire()
+                    frame[off : off + payload_len] = data[
+                        i * payload_len : (i + 1) * payload_len
+                    ]
+                    yield frame
+                continue
+            pat = factory.create(spec.pattern, params=spec.params)
+            for i in range(spec.frames):
+                t = (i * int(step_ms)) / 1000.0
+                frame = frames.acquire()
+                pat.frame_into(
+                    frame,
+                    off,
+                    t=t,
+                    frame_idx=spec.first_frame + i,
+                    brightness=spec.brightness,
                 )
-            pat_name = str(step.get("pattern") or "").strip()
-            if not pat_name:
-                raise RuntimeError("DDP step missing 'pattern'")
-            params = step.get("params") or {}
-            if not isinstance(params, dict):
-                params = {}
-            bri = step.get("brightness")
-            bri_i = (
-                int(default_bri)
-                if bri is None
-                else min(int(max_bri), max(1, int(bri)))
+                yield frame
+
+    if int(fseq_version) == 2:
+        res = write_fseq_v2_file(
+            out_path=str(out_path),
+            channel_count=int(channels_total),
+            num_frames=int(total_frames),
+            step_ms=int(step_ms),
+            frame_generator=_frames(),
+            compression=str(compression),
+            frames_per_block=int(frames_per_block),
+            sparse_ranges=[(int(channel_start) - 1, payload_len)] if sparse else (),
+            variable_headers=[("sp", b"wled-show-agent\x00")],
+        )
+    else:
+        res = write_fseq_v1_file(
+            out_path=str(out_path),
+            channel_count=int(channels_total),
+            num_frames=int(total_frames),
+            step_ms=int(step_ms),
+            frame_generator=_frames(),
+        )
+    return {
+        "render": {
+            "led_count": int(led_count),
+            "channel_start": int(channel_start),
+            "channels_total": int(channels_total),
+            "step_ms": int(step_ms),
+            "fseq_version": int(fseq_version),
+            "sparse": bool(sparse),
+            "cache": cache if cache_dir else None,
+        },
+        "fseq": res.__dict__,
+    }
+
+
+def _open_fseq_output(
+    *,
+    out_path: str,
+    channels_total: int,
+    total_frames: int,
+    step_ms: int,
+    fseq_version: int,
+    compression: str,
+    frames_per_block: int,
+    sparse_ranges: Sequence[Tuple[int, int]],
+) -> Tuple[Any, Any, int]:
+    """
+    Create the output file and write its header.
+
+    Returns `(file, writer, data_offset)`. Uncompressed files are extended to
+    their final size so workers can write frames in place; for compressed
+    files the caller appends blocks through `writer` and closes `file`.
+    """
+    p = Path(out_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    f = p.open("wb")
+    try:
+        if int(fseq_version) == 2:
+            writer: Any = FSEQV2Writer(
+                f,
+                FSEQV2Header(
+                    channel_count=int(channels_total),
+                    num_frames=int(total_frames),
+                    step_ms=int(step_ms),
+                    compression=str(compression or "none").strip().lower(),
+                    frames_per_block=int(frames_per_block),
+                    sparse_ranges=tuple(sparse_ranges),
+                    variable_headers=(("sp", b"wled-show-agent\x00"),),
+                    unique_id=time.time_ns() // 1000,
+                ),
+            )
+            data_offset = writer.header.channel_data_offset
+            frame_len = writer.header.frame_len
+            compressed = writer.header.compression != "none"
+        else:
+            writer = FSEQV1Writer(
+                f,
+                FSEQV1Header(
+                    channel_count=int(channels_total),
+                    num_frames=int(total_frames),
+                    step_ms=int(step_ms),
+                ),
             )
+            data_offset = writer.header.channel_data_offset
+            frame_len = int(channels_total)
+            compressed = False
+        writer.write_header()
+        if not compressed:
+            f.truncate(data_offset + int(total_frames) * frame_len)
+            f.close()
+        return f, writer, data_offset
+    except Exception:
+        f.close()
+        raise
 
-            pat = factory.create(pat_name, params=params)
-            for i in range(int(nframes)):
-                t = (i * int(step_ms)) / 1000.0
-                rgb = pat.frame(t=t, frame_idx=frame_idx, brightness=bri_i)
-                if len(rgb) != payload_len:
-                    rgb = (rgb[:payload_len]).ljust(payload_len, b"\x00")
-                frame = bytearray(int(channels_total))
-                end = min(int(channels_total), off + payload_len)
-                frame[off:end] = rgb[: (end - off)]
-                frame_idx += 1
-                yield bytes(frame)
-
-    res = write_fseq_v1_file(
+
+async def _render_layers_parallel(
+    cpu_pool: ProcessService | None,
+    *,
+    layers: List[FSEQLayer],
+    out_path: str,
+    channels_total: int,
+    frame_len: int,
+    step_ms: int,
+    fseq_version: int,
+    compression: str,
+    frames_per_block: int,
+    sparse_ranges: Sequence[Tuple[int, int]],
+    workers: int,
+    chunk_frames: int,
+    progress: Optional[Callable[[int, int], None]],
+    cache_dir: str | None,
+) -> Tuple[ExportedFSEQ, Dict[str, Any]]:
+    """Shared engine of `render_fseq_parallel` and `render_show_fseq_parallel`."""
+    total_frames = max(layer.frames for layer in layers)
+    if total_frames <= 0:
+        raise ValueError("Sequence has no frames")
+    layers = [
+        replace(
+            layer,
+            specs=tuple(
+                _with_cache_keys(
+                    list(layer.specs),
+                    cache_dir,
+                    step_ms=int(step_ms),
+                    led_count=int(layer.led_count),
+                    geometry=layer.geometry,
+                    segment_layout=layer.segment_layout,
+                )
+            ),
+        )
+        for layer in layers
+    ]
+
+    if int(workers) <= 0:
+        workers = (await cpu_pool.stats()).max_workers if cpu_pool is not None else 1
+    workers = max(1, int(workers))
+    slots = asyncio.Semaphore(workers)
+
+    # (layer, step) pairs missing from the cache; identical steps of identical
+    # props share a key and are rendered once.
+    missing: Dict[str, Tuple[FSEQLayer, FSEQStepSpec]] = {}
+    hits = 0
+    if cache_dir:
+
+        def _scan() -> int:
+            found = 0
+            for layer in layers:
+                for s in layer.specs:
+                    if s.cache_key in missing:
+                        continue
+                    size = s.frames * int(layer.led_count) * 3
+                    if _cached_chunk(cache_dir, s, size) is None:
+                        missing[s.cache_key] = (layer, s)
+                    else:
+                        found += 1
+            return found
+
+        hits = await asyncio.to_thread(_scan)
+    work_total = int(total_frames) + sum(s.frames for _, s in missing.values())
+    done_frames = 0
+
+    def _advance(nframes: int) -> None:
+        nonlocal done_frames
+        done_frames += nframes
+        if progress is not None:
+            progress(done_frames, work_total)
+
+    async def _fill(layer: FSEQLayer, spec: FSEQStepSpec) -> int:
+        async with slots:
+            return await run_cpu_blocking(
+                cpu_pool,
+                fill_fseq_chunk_cache,
+                spec=spec,
+                led_count=int(layer.led_count),
+                step_ms=int(step_ms),
+                geometry=layer.geometry,
+                segment_layout=layer.segment_layout,
+                cache_dir=str(cache_dir),
+            )
+
+    fills = [asyncio.create_task(_fill(la, s)) for la, s in missing.values()]
+    try:
+        for fut in asyncio.as_completed(fills):
+            _advance(await fut)
+    except BaseException:
+        for t in fills:
+            t.cancel()
+        await asyncio.gather(*fills, return_exceptions=True)
+        raise
+
+    # Render into a sibling temp file so a failed or canceled export never
+    # leaves a partial file at (or clobbers a previous export at) `out_path`.
+    p = Path(out_path)
+    tmp_path = str(p.with_name(f".{p.name}.{uuid.uuid4().hex}.tmp"))
+    f = None
+    tasks: List["asyncio.Task[Tuple[int, int, List[bytes]]]"] = []
+    try:
+        f, writer, data_offset = await asyncio.to_thread(
+            _open_fseq_output,
+            out_path=tmp_path,
+            channels_total=int(channels_total),
+            total_frames=int(total_frames),
+            step_ms=int(step_ms),
+            fseq_version=int(fseq_version),
+            compression=str(compression),
+            frames_per_block=int(frames_per_block),
+            sparse_ranges=sparse_ranges,
+        )
+        compressed = (
+            isinstance(writer, FSEQV2Writer) and writer.header.compression != "none"
+        )
+
+        if compressed:
+            # Ranges must be whole blocks so the block index stays regular.
+            fpb = writer.header.resolved_frames_per_block
+            blocks = writer.header.block_count
+            per_chunk = (
+                max(1, int(chunk_frames) // fpb)
+                if int(chunk_frames) > 0
+                else max(1, math.ceil(blocks / (workers * _CHUNKS_PER_WORKER)))
+            )
+            size = per_chunk * fpb
+        else:
+            fpb = 0
+            size = (
+                int(chunk_frames)
+                if int(chunk_frames) > 0
+                else math.ceil(total_frames / (workers * _CHUNKS_PER_WORKER))
+            )
+            size = max(1, min(size, _MAX_CHUNK_BYTES // max(1, frame_len)))
+        ranges = [
+            (a, min(int(total_frames), a + size))
+            for a in range(0, int(total_frames), size)
+        ]
+
+        async def _run(idx: int, start: int, end: int) -> Tuple[int, int, List[bytes]]:
+            async with slots:
+                blocks_out = await run_cpu_blocking(
+                    cpu_pool,
+                    render_fseq_chunk,
+                    layers=layers,
+                    start_frame=start,
+                    end_frame=end,
+                    frame_len=frame_len,
+                    step_ms=int(step_ms),
+                    out_path=None if compressed else tmp_path,
+                    data_offset=data_offset,
+                    compression=writer.header.compression if compressed else "none",
+                    frames_per_block=fpb,
+                    cache_dir=cache_dir,
+                )
+            return idx, end - start, blocks_out
+
+        tasks = [asyncio.create_task(_run(i, a, b)) for i, (a, b) in enumerate(ranges)]
+        pending: Dict[int, Tuple[int, List[bytes]]] = {}
+        next_idx = 0
+        for fut in asyncio.as_completed(tasks):
+            idx, nframes, blocks_out = await fut
+            if compressed:
+                # Blocks must land in frame order; hold early finishers.
+                pending[idx] = (nframes, blocks_out)
+                while next_idx in pending:
+                    n, blks = pending.pop(next_idx)
+                    for j, blk in enumerate(blks):
+                        await asyncio.to_thread(
+                            writer.add_compressed_block, blk, min(fpb, n - j * fpb)
+                        )
+                    next_idx += 1
+            _advance(nframes)
+        if compressed:
+            await asyncio.to_thread(writer.finalize)
+            f.close()
+        os.replace(tmp_path, p)
+    except BaseException:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if f is not None:
+            f.close()
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    res = ExportedFSEQ(
+        filename=p.name,
+        rel_path=str(p),
+        bytes_written=(
+            int(writer.bytes_written)
+            if compressed
+            else data_offset + int(total_frames) * frame_len
+        ),
+        frames=int(total_frames),
+        channels=int(channels_total),
+        step_ms=int(step_ms),
+        version=int(fseq_version),
+        compression=writer.header.compression if int(fseq_version) == 2 else "none",
+    )
+    meta = {
+        "workers": workers,
+        "chunks": len(ranges),
+        "cache": {"hits": hits, "misses": len(missing)} if cache_dir else None,
+    }
+    return res, meta
+
+
+async def render_fseq_parallel(
+    cpu_pool: ProcessService | None,
+    *,
+    steps: List[Dict[str, Any]],
+    out_path: str,
+    led_count: int,
+    channel_start: int,
+    channels_total: int,
+    step_ms: int,
+    default_bri: int,
+    geometry: TreeGeometry,
+    segment_layout: SegmentLayout | None,
+    max_bri: int,
+    fseq_version: int = 1,
+    compression: str = "zstd",
+    frames_per_block: int = 0,
+    sparse: bool = False,
+    workers: int = 0,
+    chunk_frames: int = 0,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cache_dir: str | None = None,
+) -> Dict[str, Any]:
+    """
+    `render_fseq` split into frame ranges rendered across `cpu_pool`.
+
+    Every frame keeps the `t` and `frame_idx` of the serial export, so the
+    frames are identical. Uncompressed output (v1, v2 "none") is sized up front
+    and each worker `pwrite`s its range at its precomputed offset; compressed v2
+    ranges are whole blocks that workers compress and this coroutine appends in
+    order. `progress(frames_done, total_frames)` runs after every finished
+    range and may raise (e.g. on job cancel) to abort the export.
+
+    `workers=0` uses the pool size; `chunk_frames=0` picks about four ranges
+    per worker.
+
+    With `cache_dir`, steps missing from the chunk cache are first rendered
+    into it (one pool task per step) and the ranges are then assembled from
+    cached frames; progress then also counts the frames of those steps.
+    """
+    sparse, payload_len = _check_render_args(
+        steps=steps,
+        led_count=led_count,
+        channel_start=channel_start,
+        channels_total=channels_total,
+        fseq_version=fseq_version,
+        sparse=sparse,
+    )
+    specs = plan_fseq_steps(
+        steps, step_ms=int(step_ms), default_bri=int(default_bri), max_bri=int(max_bri)
+    )
+    layer = FSEQLayer(
+        specs=tuple(specs),
+        led_count=int(led_count),
+        offset=0 if sparse else int(channel_start) - 1,
+        geometry=geometry,
+        segment_layout=segment_layout,
+    )
+    res, meta = await _render_layers_parallel(
+        cpu_pool,
+        layers=[layer],
         out_path=str(out_path),
-        channel_count=int(channels_total),
-        num_frames=int(total_frames),
+        channels_total=int(channels_total),
+        frame_len=payload_len if sparse else int(channels_total),
         step_ms=int(step_ms),
-        frame_generator=_frames(),
+        fseq_version=int(fseq_version),
+        compression=str(compression),
+        frames_per_block=int(frames_per_block),
+        sparse_ranges=[(int(channel_start) - 1, payload_len)] if sparse else [],
+        workers=int(workers),
+        chunk_frames=int(chunk_frames),
+        progress=progress,
+        cache_dir=cache_dir,
     )
     return {
         "render": {
@@ -100,6 +900,205 @@ def render_fseq(
             "channel_start": int(channel_start),
             "channels_total": int(channels_total),
             "step_ms": int(step_ms),
+            "fseq_version": int(fseq_version),
+            "sparse": bool(sparse),
+            **meta,
+        },
+        "fseq": res.__dict__,
+    }
+
+
+@dataclass(frozen=True)
+class ShowPropSteps:
+    """A show prop to render: its sequence steps and absolute channel range."""
+
+    id: str
+    steps: List[Dict[str, Any]]
+    channel_start: int  # 1-based
+    led_count: int
+    geometry: TreeGeometry
+    segment_layout: SegmentLayout | None = None
+
+
+def show_props_for_fseq(
+    cfg: ShowConfig,
+    sequences: Dict[str, List[Dict[str, Any]]],
+    *,
+    prop_ids: Optional[List[str]] = None,
+) -> List[ShowPropSteps]:
+    """
+    Map `ShowConfig.props` that have sequence steps to renderable props.
+
+    A prop spans `channel_count` (or `pixel_count * 3`) channels from its
+    1-based `channel_start`; props without `channel_start` are packed after
+    the highest channel used so far. `geometry` defaults to a straight strip.
+    Props with no steps in `sequences` or unknown size are skipped.
+    """
+    wanted = {str(x) for x in prop_ids} if prop_ids else None
+    out: List[ShowPropSteps] = []
+    cursor = 0
+    for prop in cfg.props:
+        count = int(prop.channel_count or 0)
+        if count <= 0:
+            pixel = prop.pixel
+            pixels = int(prop.pixel_count or (pixel.pixel_count if pixel else 0) or 0)
+            count = pixels * 3
+        if count <= 0:
+            continue
+        offset = (
+            int(prop.channel_start) - 1 if prop.channel_start is not None else cursor
+        )
+        cursor = max(cursor, offset + count)
+        steps = sequences.get(str(prop.id))
+        if not steps or (wanted is not None and prop.id not in wanted):
+            continue
+        led_count = count // 3
+        g = prop.geometry
+        geometry = (
+            TreeGeometry(
+                runs=int(g.runs),
+                pixels_per_run=int(g.pixels_per_run),
+                segment_len=int(g.segment_len),
+                segments_per_run=int(g.segments_per_run),
+            )
+            if g is not None
+            else TreeGeometry(
+                runs=1,
+                pixels_per_run=led_count,
+                segment_len=led_count,
+                segments_per_run=1,
+            )
+        )
+        out.append(
+            ShowPropSteps(
+                id=str(prop.id),
+                steps=list(steps),
+                channel_start=offset + 1,
+                led_count=led_count,
+                geometry=geometry,
+            )
+        )
+    return out
+
+
+async def render_show_fseq_parallel(
+    cpu_pool: ProcessService | None,
+    *,
+    props: Sequence[ShowPropSteps],
+    out_path: str,
+    step_ms: int,
+    default_bri: int,
+    max_bri: int,
+    channels_total: int | None = None,
+    fseq_version: int = 2,
+    compression: str = "zstd",
+    frames_per_block: int = 0,
+    sparse: bool = True,
+    workers: int = 0,
+    chunk_frames: int = 0,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cache_dir: str | None = None,
+) -> Dict[str, Any]:
+    """
+    Render every prop of a show into one .fseq in a single pass.
+
+    Each frame range is rendered once across `cpu_pool` (see
+    `render_fseq_parallel`), with every prop writing only its own channels
+    into the range's shared buffer. v2 `sparse` files store just the props'
+    channel ranges (adjacent props share one range), so a yard with gaps in
+    its channel map does not carry zeros. The sequence lasts as long as the
+    longest prop; shorter props stay dark afterwards.
+    """
+    if not props:
+        raise ValueError("No props to render")
+    if int(fseq_version) not in (1, 2):
+        raise ValueError("fseq_version must be 1 or 2")
+    sparse = bool(sparse) and int(fseq_version) == 2
+
+    ordered = sorted(props, key=lambda p: int(p.channel_start))
+    prev: ShowPropSteps | None = None
+    for p in ordered:
+        if p.led_count <= 0:
+            raise ValueError(f"Prop '{p.id}' has no pixels")
+        if p.channel_start <= 0:
+            raise ValueError(f"Prop '{p.id}' channel_start must be >= 1")
+        if (
+            prev is not None
+            and p.channel_start < prev.channel_start + prev.led_count * 3
+        ):
+            raise ValueError(f"Props '{prev.id}' and '{p.id}' overlap in channels")
+        prev = p
+    used = max(p.channel_start - 1 + p.led_count * 3 for p in ordered)
+    channels = int(channels_total) if channels_total is not None else used
+    if channels < used:
+        raise ValueError("channels_total is too small for the show's props")
+
+    sparse_ranges: List[Tuple[int, int]] = []
+    layers: List[FSEQLayer] = []
+    pos = 0
+    for p in ordered:
+        start, length = int(p.channel_start) - 1, int(p.led_count) * 3
+        if sparse:
+            if sparse_ranges and sum(sparse_ranges[-1]) == start:
+                sparse_ranges[-1] = (
+                    sparse_ranges[-1][0],
+                    sparse_ranges[-1][1] + length,
+                )
+            else:
+                sparse_ranges.append((start, length))
+        specs = plan_fseq_steps(
+            p.steps,
+            step_ms=int(step_ms),
+            default_bri=int(default_bri),
+            max_bri=int(max_bri),
+        )
+        layers.append(
+            FSEQLayer(
+                specs=tuple(specs),
+                led_count=int(p.led_count),
+                offset=pos if sparse else start,
+                geometry=p.geometry,
+                segment_layout=p.segment_layout,
+                id=p.id,
+            )
+        )
+        pos += length
+    if len(sparse_ranges) > 255:
+        raise ValueError("Too many separate channel ranges for sparse FSEQ (max 255)")
+
+    res, meta = await _render_layers_parallel(
+        cpu_pool,
+        layers=layers,
+        out_path=str(out_path),
+        channels_total=channels,
+        frame_len=pos if sparse else channels,
+        step_ms=int(step_ms),
+        fseq_version=int(fseq_version),
+        compression=str(compression),
+        frames_per_block=int(frames_per_block),
+        sparse_ranges=sparse_ranges,
+        workers=int(workers),
+        chunk_frames=int(chunk_frames),
+        progress=progress,
+        cache_dir=cache_dir,
+    )
+    return {
+        "render": {
+            "props": [
+                {
+                    "id": layer.id,
+                    "channel_start": p.channel_start,
+                    "led_count": layer.led_count,
+                    "frames": layer.frames,
+                }
+                for p, layer in zip(ordered, layers)
+            ],
+            "channels_total": channels,
+            "step_ms": int(step_ms),
+            "fseq_version": int(fseq_version),
+            "sparse": sparse,
+            "sparse_ranges": [list(r) for r in sparse_ranges],
+            **meta,
         },
         "fseq": res.__dict__,
     }
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import os
+import shutil
 from pathlib import Path
-from typing import Any, Dict, List, Sequence, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from look_generator import LookLibraryGenerator
+from look_generator import Look, LookLibraryGenerator, theme_seed
 from pack_io import nowstamp, write_jsonl
 from wled_mapper import WLEDMapper
 
@@ -14,6 +16,53 @@ def list_look_packs(*, data_dir: str) -> List[str]:
     return sorted([p.name for p in looks_dir.glob("looks_pack_*.jsonl")])
 
 
+def look_rows(
+    looks: Iterable[Look], theme_counts: Dict[str, int]
+) -> Iterator[Dict[str, Any]]:
+    """Pack rows for `looks`, tallying `theme_counts` as they stream past."""
+    for look in looks:
+        row = dict(look.spec)
+        row["id"] = look.id
+        row["name"] = look.name
+        row["theme"] = look.theme
+        row["tags"] = look.tags
+        theme_counts[look.theme] = theme_counts.get(look.theme, 0) + 1
+        yield row
+
+
+def write_pack_atomic(path: str, rows: Iterable[Dict[str, Any]]) -> str:
+    """Stream `rows` to `path` via a temp file so a canceled run never leaves a partial pack."""
+    tmp = f"{path}.tmp"
+    try:
+        write_jsonl(tmp, rows)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    return path
+
+
+def join_look_shards(part_paths: Sequence[str], out_path: str) -> str:
+    """Concatenate shard JSONL files (in the given order) into `out_path`."""
+    tmp = f"{out_path}.tmp"
+    try:
+        with open(tmp, "wb") as out:
+            for part in part_paths:
+                with open(part, "rb") as f:
+                    shutil.copyfileobj(f, out)
+        os.replace(tmp, out_path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    return out_path
+
+
+def _mapper_for(effects: Sequence[str], palettes: Sequence[str]) -> WLEDMapper:
+    mapper = WLEDMapper()
+    mapper.seed(effects=[str(x) for x in effects], palettes=[str(x) for x in palettes])
+    return mapper
+
+
 def generate_looks_pack(
     *,
     data_dir: str,
@@ -30,12 +79,15 @@ def generate_looks_pack(
     write_files: bool,
     progress_queue: Any | None = None,
     cancel_event: Any | None = None,
-) -> Tuple[str, List[Dict[str, Any]], Dict[str, int]]:
-    mapper = WLEDMapper()
-    mapper.seed(effects=[str(x) for x in effects], palettes=[str(x) for x in palettes])
+) -> Tuple[str, Optional[List[Dict[str, Any]]], Dict[str, int]]:
+    """
+    Generate a pack; returns (file, rows, theme_counts).
 
+    With `write_files` the rows stream straight into the JSONL file and `rows` is None
+    (the pack is not held in memory or pickled back across the process boundary).
+    """
     gen = LookLibraryGenerator(
-        mapper=mapper,
+        mapper=_mapper_for(effects, palettes),
         seed=seed,
         effects=[str(x) for x in effects],
         palettes=[str(x) for x in palettes],
@@ -58,37 +110,71 @@ def generate_looks_pack(
         except Exception:
             return False
 
+    looks = gen.iter_generate(
+        total=total_looks,
+        themes=themes,
+        brightness=min(max_bri, brightness),
+        include_multi_segment=include_multi_segment,
+        segment_ids=list(segment_ids) if segment_ids else [0],
+        progress_cb=_progress_cb if progress_queue is not None else None,
+        cancel_cb=_cancel_cb if cancel_event is not None else None,
+    )
+    theme_counts: Dict[str, int] = {}
+    fname = f"looks_pack_{nowstamp()}.jsonl"
+    rows: Optional[List[Dict[str, Any]]] = None
     try:
-        looks = gen.generate(
-            total=total_looks,
-            themes=themes,
-            brightness=min(max_bri, brightness),
-            include_multi_segment=include_multi_segment,
-            segment_ids=list(segment_ids) if segment_ids else [0],
-            progress_cb=_progress_cb if progress_queue is not None else None,
-            cancel_cb=_cancel_cb if cancel_event is not None else None,
-        )
+        if write_files:
+            looks_dir = Path(data_dir) / "looks"
+            looks_dir.mkdir(parents=True, exist_ok=True)
+            write_pack_atomic(str(looks_dir / fname), look_rows(looks, theme_counts))
+        else:
+            rows = list(look_rows(looks, theme_counts))
     finally:
         if progress_queue is not None:
             try:
                 progress_queue.put(None)
             except Exception:
                 pass
+    return fname, rows, theme_counts
 
-    rows: List[Dict[str, Any]] = []
-    theme_counts: Dict[str, int] = {}
-    for look in looks:
-        row = dict(look.spec)
-        row["id"] = look.id
-        row["name"] = look.name
-        row["theme"] = look.theme
-        row["tags"] = look.tags
-        rows.append(row)
-        theme_counts[look.theme] = theme_counts.get(look.theme, 0) + 1
 
-    fname = f"looks_pack_{nowstamp()}.jsonl"
-    if write_files:
-        looks_dir = Path(data_dir) / "looks"
-        looks_dir.mkdir(parents=True, exist_ok=True)
-        write_jsonl(str(looks_dir / fname), rows)
-    return fname, rows, theme_counts
+def generate_looks_shard(
+    *,
+    theme: str,
+    target: int,
+    seed: int,
+    brightness: int,
+    effects: Sequence[str],
+    palettes: Sequence[str],
+    segments: Sequence[Dict[str, Any]],
+    include_multi_segment: bool,
+    segment_ids: Sequence[int],
+    out_path: str | None = None,
+) -> Tuple[Optional[List[Dict[str, Any]]], int]:
+    """
+    Generate one theme's looks with a seed derived from (`seed`, `theme`).
+
+    Output depends only on the arguments, so shards can run in any order / process.
+    With `out_path` the rows stream into that JSONL file and `rows` is None.
+    Returns (rows, count).
+    """
+    gen = LookLibraryGenerator(
+        mapper=_mapper_for(effects, palettes),
+        seed=theme_seed(seed, theme),
+        effects=[str(x) for x in effects],
+        palettes=[str(x) for x in palettes],
+        segments=list(segments) if segments is not None else None,
+    )
+    looks = gen.iter_theme(
+        theme,
+        target=target,
+        brightness=brightness,
+        include_multi_segment=include_multi_segment,
+        segment_ids=list(segment_ids) if segment_ids else [0],
+    )
+    counts: Dict[str, int] = {}
+    if out_path is not None:
+        write_jsonl(out_path, look_rows(looks, counts))
+        return None, sum(counts.values())
+    rows = list(look_rows(looks, counts))
+    return rows, len(rows)
@@ -4,50 +4,117 @@ import json
 import math
 import shutil
 import subprocess
+from operator import itemgetter
 from pathlib import Path
 from typing import Any, Dict, Iterable, List
 
+from fseq import FSEQError, FSEQReader
 from geometry import TreeGeometry
 from patterns import PatternFactory
 from segment_layout import SegmentLayout
 
+try:
+    import numpy as np
+except Exception:  # NumPy is optional; the gather falls back to itemgetter.
+    np = None  # type: ignore[assignment]
 
-def _downsample_rgb(
-    rgb: bytes, *, led_count: int, width: int, height: int
-) -> bytes:
-    if led_count <= 0 or width <= 0 or height <= 0:
-        return b""
-    expected = int(led_count) * 3
-    if len(rgb) < expected:
-        rgb = rgb.ljust(expected, b"\x00")
-    elif len(rgb) > expected:
-        rgb = rgb[:expected]
-
-    row = bytearray(width * 3)
-    for x in range(width):
-        start = int(x * led_count / width)
-        end = int((x + 1) * led_count / width)
-        if end <= start:
-            end = min(led_count, start + 1)
-        start_b = start * 3
-        end_b = min(expected, end * 3)
-        if start_b >= end_b:
-            continue
-        count = max(1, (end_b - start_b) // 3)
-        r_sum = 0
-        g_sum = 0
-        b_sum = 0
-        for idx in range(start_b, end_b, 3):
-            r_sum += rgb[idx]
-            g_sum += rgb[idx + 1]
-            b_sum += rgb[idx + 2]
-        row[x * 3] = int(r_sum / count)
-        row[x * 3 + 1] = int(g_sum / count)
-        row[x * 3 + 2] = int(b_sum / count)
-
-    if height == 1:
-        return bytes(row)
-    return bytes(row) * int(height)
+
+# Bumped whenever the preview image layout changes, so cached previews keyed on
+# it are re-rendered instead of served stale.
+PREVIEW_LAYOUT_VERSION = 2
+
+# Width of the tree at its top relative to its base (0 = a single point).
+_TREE_TOP_WIDTH = 0.15
+
+
+class PreviewRaster:
+    """
+    Precomputed LED -> preview pixel map for one strip shape and image size.
+
+    When the geometry covers the strip, the image is the tree seen from the
+    front: each row is one height along the runs (bottom LED at the bottom
+    row), narrowing linearly towards the top, and each pixel inside the
+    outline takes the nearest LED of the run it falls in. Otherwise the strip
+    is laid out left to right and repeated down every row.
+
+    Patterns render into `source` (reused), `resample()` gathers it into the
+    reused `out` image in one array op and returns a view of it.
+    """
+
+    def __init__(
+        self, *, led_count: int, geometry: TreeGeometry, width: int, height: int
+    ) -> None:
+        self.led_count = max(0, int(led_count))
+        self.width = max(1, int(width))
+        self.height = max(1, int(height))
+        self.tree = bool(geometry.enabled_for(self.led_count))
+        if self.tree:
+            index = _tree_index(geometry, self.width, self.height)
+        else:
+            index = _strip_index(self.led_count, self.width, self.height)
+        # One extra black pixel at the end of the source is the background.
+        self._src = bytearray((self.led_count + 1) * 3)
+        self.out = bytearray(self.width * self.height * 3)
+        self.source = memoryview(self._src)[: self.led_count * 3]
+        self.view = memoryview(self.out)
+        if np is not None:
+            self._np_index = np.asarray(index, dtype=np.intp)
+            self._np_src = np.frombuffer(self._src, dtype=np.uint8).reshape(-1, 3)
+            self._np_out = np.frombuffer(self.out, dtype=np.uint8).reshape(-1, 3)
+            self._getter = None
+        else:
+            self._getter = itemgetter(
+                *[3 * i + c for i in index for c in range(3)]
+            )
+
+    def resample(self) -> memoryview:
+        """Gather the current `source` frame into `out`."""
+        if self._getter is None:
+            np.take(self._np_src, self._np_index, axis=0, out=self._np_out)
+        else:
+            self.out[:] = bytes(self._getter(self._src))
+        return self.view
+
+    def render(self, rgb: bytes) -> memoryview:
+        """Copy `rgb` (padded/truncated to the strip) into `source` and resample."""
+        n = len(self.source)
+        m = min(n, len(rgb))
+        self.source[:m] = rgb[:m]
+        if m < n:
+            self.source[m:] = bytes(n - m)
+        return self.resample()
+
+
+def _tree_index(geometry: TreeGeometry, width: int, height: int) -> List[int]:
+    runs = max(1, int(geometry.runs))
+    ppr = max(1, int(geometry.pixels_per_run))
+    background = runs * ppr
+    center = width / 2.0
+    index: List[int] = []
+    for row in range(height):
+        # y: 0 at the bottom row, 1 at the top row.
+        y = 1.0 - (row / float(height - 1)) if height > 1 else 0.0
+        pos = min(ppr - 1, int(round(y * (ppr - 1))))
+        half = 0.5 * width * (1.0 - (1.0 - _TREE_TOP_WIDTH) * y)
+        left = center - half
+        for col in range(width):
+            x = (col + 0.5 - left) / (2.0 * half) if half > 0 else -1.0
+            if x < 0.0 or x >= 1.0:
+                index.append(background)
+                continue
+            run = min(runs - 1, int(x * runs))
+            index.append(run * ppr + pos)
+    return index
+
+
+def _strip_index(led_count: int, width: int, height: int) -> List[int]:
+    if led_count <= 0:
+        return [0] * (width * height)
+    row = [
+        min(led_count - 1, int((col + 0.5) * led_count / width))
+        for col in range(width)
+    ]
+    return row * height
 
 
 def _render_frame_stream(
@@ -63,13 +130,25 @@ def _render_frame_stream(
     default_bri: int,
     max_bri: int,
     strict: bool,
-) -> Iterable[bytes]:
+    backend: str = "numpy",
+) -> Iterable[memoryview]:
+    """
+    Yield preview frames for `steps`.
+
+    Every frame is a view of the same reused image buffer, so each one must be
+    consumed (written out) before the next is requested. Patterns use the
+    NumPy backend when it is installed (same bytes as the scalar renderer).
+    """
     factory = PatternFactory(
         led_count=int(led_count),
         geometry=geometry,
         segment_layout=segment_layout,
+        backend=backend,
     )
-    last_frame = bytes(width * height * 3)
+    raster = PreviewRaster(
+        led_count=int(led_count), geometry=geometry, width=width, height=height
+    )
+    frame = raster.view
     elapsed = 0.0
     frame_idx = 0
     for step in steps:
@@ -106,17 +185,11 @@ def _render_frame_stream(
                 pat = factory.create(pat_name, params=params)
             for i in range(nframes):
                 t = (i / float(fps)) if fps > 0 else 0.0
-                if pat is None:
-                    frame = last_frame
-                else:
-                    rgb = pat.frame(t=t, frame_idx=frame_idx, brightness=bri_i)
-                    frame = _downsample_rgb(
-                        rgb,
-                        led_count=int(led_count),
-                        width=int(width),
-                        height=int(height),
+                if pat is not None:
+                    pat.frame_into(
+                        raster.source, 0, t=t, frame_idx=frame_idx, brightness=bri_i
                     )
-                    last_frame = frame
+                    frame = raster.resample()
                 frame_idx += 1
                 yield frame
         else:
@@ -124,11 +197,48 @@ def _render_frame_stream(
                 raise RuntimeError(f"Non-renderable step type '{typ}'")
             for _ in range(nframes):
                 frame_idx += 1
-                yield last_frame
+                yield frame
 
         elapsed += dur_s
 
 
+def _fseq_frame_stream(
+    *,
+    reader: FSEQReader,
+    offset: int,
+    led_count: int,
+    geometry: TreeGeometry,
+    width: int,
+    height: int,
+    fps: float,
+    max_duration_s: float,
+) -> Iterable[memoryview]:
+    """
+    Yield preview frames by striding through an exported .fseq at `fps`.
+
+    `offset` is where the strip's channels start within a stored frame. Frames
+    come straight from the reader's mapping, so no pattern runs; like
+    `_render_frame_stream`, every frame is a view of one reused image buffer.
+    """
+    raster = PreviewRaster(
+        led_count=int(led_count), geometry=geometry, width=width, height=height
+    )
+    n = int(led_count) * 3
+    step_ms = max(1, int(reader.step_ms))
+    duration_s = float(reader.duration_s)
+    if max_duration_s:
+        duration_s = min(duration_s, float(max_duration_s))
+    last = int(reader.num_frames) - 1
+    shown = -1
+    for i in range(int(math.ceil(duration_s * fps))):
+        k = min(last, int(i * 1000.0 / (fps * step_ms) + 1e-9))
+        if k != shown:
+            with reader.frame(k) as view, view[offset : offset + n] as rgb:
+                raster.render(rgb)
+            shown = k
+        yield raster.view
+
+
 def render_sequence_preview(
     *,
     seq_path: str,
@@ -144,7 +254,19 @@ def render_sequence_preview(
     max_bri: int,
     strict: bool,
     format: str,
+    backend: str = "numpy",
+    fseq_path: str | None = None,
+    fseq_channel_start: int = 1,
 ) -> Dict[str, Any]:
+    """
+    Render a sequence preview (GIF/MP4) through ffmpeg.
+
+    With `fseq_path` (an export of the same sequence, see
+    `services.fseq_service.find_preview_fseq`) the frames are read from the
+    file starting at `fseq_channel_start` instead of re-running the patterns;
+    if it cannot be read or does not cover the strip, the sequence is
+    rendered live.
+    """
     ffmpeg = shutil.which("ffmpeg")
     if not ffmpeg:
         raise RuntimeError("ffmpeg not available for preview rendering")
@@ -153,9 +275,22 @@ def render_sequence_preview(
     if fmt not in ("gif", "mp4"):
         raise RuntimeError("format must be gif or mp4")
 
-    with open(seq_path, "r", encoding="utf-8") as f:
-        payload = json.load(f)
-    steps = list(payload.get("steps", [])) if isinstance(payload, dict) else []
+    reader: FSEQReader | None = None
+    offset = 0
+    if fseq_path:
+        try:
+            reader = FSEQReader(fseq_path)
+            offset = reader.locate(int(fseq_channel_start) - 1, int(led_count) * 3)
+        except (OSError, FSEQError):
+            if reader is not None:
+                reader.close()
+            reader = None
+
+    steps: List[Dict[str, Any]] = []
+    if reader is None:
+        with open(seq_path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        steps = list(payload.get("steps", [])) if isinstance(payload, dict) else []
 
     width_i = max(16, int(width))
     height_i = max(1, int(height))
@@ -198,26 +333,45 @@ def render_sequence_preview(
             out_path,
         ]
 
-    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
-    assert proc.stdin is not None
+    if reader is not None:
+        stream = _fseq_frame_stream(
+            reader=reader,
+            offset=offset,
+            led_count=int(led_count),
+            geometry=geometry,
+            width=width_i,
+            height=height_i,
+            fps=fps_f,
+            max_duration_s=float(max_duration_s),
+        )
+    else:
+        stream = _render_frame_stream(
+            steps=steps,
+            led_count=int(led_count),
+            geometry=geometry,
+            segment_layout=segment_layout,
+            width=width_i,
+            height=height_i,
+            fps=fps_f,
+            max_duration_s=float(max_duration_s),
+            default_bri=int(default_bri),
+            max_bri=int(max_bri),
+            strict=bool(strict),
+            backend=backend,
+        )
+
     frames = 0
-    for frame in _render_frame_stream(
-        steps=steps,
-        led_count=int(led_count),
-        geometry=geometry,
-        segment_layout=segment_layout,
-        width=width_i,
-        height=height_i,
-        fps=fps_f,
-        max_duration_s=float(max_duration_s),
-        default_bri=int(default_bri),
-        max_bri=int(max_bri),
-        strict=bool(strict),
-    ):
-        if not frame:
-            continue
-        proc.stdin.write(frame)
-        frames += 1
+    try:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        assert proc.stdin is not None
+        for frame in stream:
+            if not frame:
+                continue
+            proc.stdin.write(frame)
+            frames += 1
+    finally:
+        if reader is not None:
+            reader.close()
     proc.stdin.close()
     rc = proc.wait()
     if rc != 0:
@@ -229,5 +383,6 @@ def render_sequence_preview(
         "height": int(height_i),
         "fps": float(fps_f),
         "format": fmt,
+        "source": "fseq" if reader is not None else "render",
         "out_path": str(out_path),
     }
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import math
+import mmap
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from audio_analyzer import AudioAnalyzeError, PcmStream, _use_numpy
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+
+# Multi-resolution waveform ("pyramid") file, built once per audio file.
+#
+# Level 0 holds min/max/RMS of every `base_block` samples; each level above
+# merges pairs of buckets from the one below, until a level has at most
+# `_TOP_BUCKETS` buckets. A zoom request picks the coarsest level that still
+# has at least the requested number of buckets inside the time range and
+# folds at most a few adjacent buckets into each output point, so serving a
+# range reads O(points) bytes and never decodes audio.
+#
+# Layout (little-endian):
+#   header  `_HEADER`: magic, version, sample rate, total samples, base block,
+#           level count
+#   levels  `_LEVEL` per level: bucket count, byte offset of its data
+#   data    per level: int16 min[count], int16 max[count], uint16 rms[count]
+
+PYRAMID_VERSION = 1
+_MAGIC = b"WSAWFPYR"
+_HEADER = struct.Struct("<8sIIQII")
+_LEVEL = struct.Struct("<QQ")
+_TOP_BUCKETS = 16
+DEFAULT_BASE_BLOCK = 256
+MAX_RANGE_POINTS = 5000
+
+
+class _Level0:
+    """Min/max/sum of squares per `block` samples, fed one PCM chunk at a time."""
+
+    def __init__(self, block: int, *, use_numpy: bool) -> None:
+        self.block = int(block)
+        self.use_numpy = bool(use_numpy)
+        self.samples = 0
+        self.mins: List[Any] = []
+        self.maxs: List[Any] = []
+        self.sumsq: List[Any] = []
+        self._pend: Any = np.empty(0, dtype=np.int16) if use_numpy else array("h")
+
+    def feed(self, chunk: Any) -> None:
+        self.samples += len(chunk)
+        if self.use_numpy:
+            buf = np.concatenate((self._pend, chunk))
+        else:
+            buf = self._pend + chunk
+        full = len(buf) // self.block
+        if full:
+            self._reduce(buf[: full * self.block], full)
+        self._pend = buf[full * self.block :]
+
+    def _reduce(self, buf: Any, count: int) -> None:
+        if self.use_numpy:
+            grid = buf.reshape(count, -1)
+            wide = grid.astype(np.int64)
+            self.mins.append(grid.min(axis=1))
+            self.maxs.append(grid.max(axis=1))
+            self.sumsq.append((wide * wide).sum(axis=1).astype(np.float64))
+            return
+        size = len(buf) // count
+        for i in range(count):
+            part = buf[i * size : (i + 1) * size]
+            self.mins.append(min(part))
+            self.maxs.append(max(part))
+            self.sumsq.append(float(sum(x * x for x in part)))
+
+    def finish(self) -> Tuple[Any, Any, Any]:
+        if len(self._pend):
+            self._reduce(self._pend, 1)
+            self._pend = self._pend[:0]
+        if self.use_numpy:
+            if not self.mins:
+                empty = np.empty(0, dtype=np.int16)
+                return empty, empty, np.empty(0, dtype=np.float64)
+            return (
+                np.concatenate(self.mins),
+                np.concatenate(self.maxs),
+                np.concatenate(self.sumsq),
+            )
+        return self.mins, self.maxs, self.sumsq
+
+
+def _merge_pairs(mins: Any, maxs: Any, sumsq: Any) -> Tuple[Any, Any, Any]:
+    """Next level up: adjacent buckets pairwise (an odd last one stays alone)."""
+    n = len(mins)
+    even = n // 2 * 2
+    if np is not None and isinstance(mins, np.ndarray):
+        lo = np.minimum(mins[0:even:2], mins[1:even:2])
+        hi = np.maximum(maxs[0:even:2], maxs[1:even:2])
+        sq = sumsq[0:even:2] + sumsq[1:even:2]
+        if even < n:
+            lo = np.append(lo, mins[-1])
+            hi = np.append(hi, maxs[-1])
+            sq = np.append(sq, sumsq[-1])
+        return lo, hi, sq
+    lo = [min(a, b) for a, b in zip(mins[0:even:2], mins[1:even:2])]
+    hi = [max(a, b) for a, b in zip(maxs[0:even:2], maxs[1:even:2])]
+    sq = [a + b for a, b in zip(sumsq[0:even:2], sumsq[1:even:2])]
+    if even < n:
+        lo.append(mins[-1])
+        hi.append(maxs[-1])
+        sq.append(sumsq[-1])
+    return lo, hi, sq
+
+
+def _rms_u16(sumsq: Any, *, total: int, size: int) -> Any:
+    """RMS per bucket in sample units (0..32768), rounded to uint16."""
+    n = len(sumsq)
+    if n == 0:
+        return []
+    last = total - (n - 1) * size
+    if np is not None and isinstance(sumsq, np.ndarray):
+        counts = np.full(n, float(size))
+        counts[-1] = float(last)
+        return np.minimum(np.rint(np.sqrt(sumsq / counts)), 65535).astype(np.uint16)
+    return [
+        min(65535, int(round(math.sqrt(sq / float(size if i < n - 1 else last)))))
+        for i, sq in enumerate(sumsq)
+    ]
+
+
+def _le_bytes(values: Any, typecode: str) -> bytes:
+    if np is not None and isinstance(values, np.ndarray):
+        return values.astype("<i2" if typecode == "h" else "<u2").tobytes()
+    arr = array(typecode, values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def build_waveform_pyramid(
+    *,
+    audio_path: str,
+    out_path: str,
+    sample_rate_hz: int = 44100,
+    prefer_ffmpeg: bool = True,
+    base_block: int = DEFAULT_BASE_BLOCK,
+    backend: str = "numpy",
+) -> Dict[str, Any]:
+    """
+    Decode `audio_path` once (streamed, see `PcmStream`) and write its
+    waveform pyramid to `out_path`. Runs in a `ProcessService` worker.
+    """
+    use_np = _use_numpy(backend)
+    base = max(1, int(base_block))
+    level0 = _Level0(base, use_numpy=use_np)
+    with PcmStream(
+        str(audio_path),
+        sample_rate_hz=int(sample_rate_hz),
+        prefer_ffmpeg=prefer_ffmpeg,
+        use_numpy=use_np,
+    ) as pcm:
+        for chunk in pcm.chunks():
+            level0.feed(chunk)
+        sr = int(pcm.sample_rate_hz)
+    total = level0.samples
+    if total <= 0:
+        raise AudioAnalyzeError("Audio file has no samples")
+
+    levels = [level0.finish()]
+    while len(levels[-1][0]) > _TOP_BUCKETS:
+        levels.append(_merge_pairs(*levels[-1]))
+
+    blobs: List[bytes] = []
+    table: List[Tuple[int, int]] = []
+    offset = _HEADER.size + _LEVEL.size * len(levels)
+    for i, (mins, maxs, sumsq) in enumerate(levels):
+        rms = _rms_u16(sumsq, total=total, size=base << i)
+        blob = _le_bytes(mins, "h") + _le_bytes(maxs, "h") + _le_bytes(rms, "H")
+        table.append((len(mins), offset))
+        blobs.append(blob)
+        offset += len(blob)
+
+    with open(out_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, PYRAMID_VERSION, sr, total, base, len(levels)))
+        for count, off in table:
+            f.write(_LEVEL.pack(count, off))
+        for blob in blobs:
+            f.write(blob)
+    return {
+        "sample_rate_hz": sr,
+        "duration_s": float(total) / float(sr) if sr > 0 else 0.0,
+        "levels": len(levels),
+        "base_block": base,
+        "bytes": offset,
+    }
+
+
+class WaveformPyramid:
+    """Read side of a pyramid file (memory-mapped; see `range`)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = str(path)
+        self._f = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._f.close()
+            raise AudioAnalyzeError("Waveform pyramid is empty")
+        try:
+            if len(self._mm) < _HEADER.size:
+                raise AudioAnalyzeError("Waveform pyramid is truncated")
+            magic, version, sr, total, base, nlevels = _HEADER.unpack_from(self._mm, 0)
+            if magic != _MAGIC or version != PYRAMID_VERSION:
+                raise AudioAnalyzeError("Not a waveform pyramid (or an old version)")
+            self.sample_rate_hz = int(sr)
+            self.total_samples = int(total)
+            self.base_block = int(base)
+            self.levels: List[Tuple[int, int]] = [
+                _LEVEL.unpack_from(self._mm, _HEADER.size + i * _LEVEL.size)
+                for i in range(int(nlevels))
+            ]
+            count, off = self.levels[-1]
+            if off + 6 * count > len(self._mm):
+                raise AudioAnalyzeError("Waveform pyramid is truncated")
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def duration_s(self) -> float:
+        if self.sample_rate_hz <= 0:
+            return 0.0
+        return float(self.total_samples) / float(self.sample_rate_hz)
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except Exception:
+            pass
+        self._f.close()
+
+    def __enter__(self) -> "WaveformPyramid":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _read(self, level: int, field: int, a: int, b: int) -> array:
+        """Buckets [a, b) of one field (0 = min, 1 = max, 2 = rms)."""
+        count, off = self.levels[level]
+        start = off + (field * count + a) * 2
+        arr = array("H" if field == 2 else "h")
+        arr.frombytes(self._mm[start : start + (b - a) * 2])
+        if sys.byteorder == "big":
+            arr.byteswap()
+        return arr
+
+    def _pick_level(self, s0: int, s1: int, points: int) -> int:
+        """Coarsest level with at least `points` buckets in [s0, s1)."""
+        for level in range(len(self.levels) - 1, -1, -1):
+            size = self.base_block << level
+            if -(-s1 // size) - s0 // size >= points:
+                return level
+        return 0
+
+    def range(
+        self,
+        *,
+        start_s: float = 0.0,
+        end_s: Optional[float] = None,
+        points: int = 512,
+    ) -> Dict[str, Any]:
+        """
+        Min/max/RMS of `points` equal slices of [start_s, end_s) (normalized to
+        -1..1). Deep zooms past level 0 return one point per level-0 bucket
+        instead (`points_total` is then smaller than requested).
+        """
+        sr, total = self.sample_rate_hz, self.total_samples
+        s0 = max(0, min(total, int(float(start_s) * sr)))
+        s1 = total if end_s is None else int(math.ceil(float(end_s) * sr))
+        s1 = max(s0, min(total, s1))
+        want = max(1, min(MAX_RANGE_POINTS, int(points)))
+        out: Dict[str, Any] = {
+            "duration_s": self.duration_s,
+            "sample_rate_hz": sr,
+            "start_s": float(s0) / sr if sr > 0 else 0.0,
+            "end_s": float(s1) / sr if sr > 0 else 0.0,
+            "level": 0,
+            "bucket_s": float(self.base_block) / sr if sr > 0 else 0.0,
+            "points": [],
+            "points_total": 0,
+        }
+        if s1 <= s0:
+            return out
+
+        level = self._pick_level(s0, s1, want)
+        size = self.base_block << level
+        count = self.levels[level][0]
+        a0, a1 = s0 // size, min(count, -(-s1 // size))
+        mins = self._read(level, 0, a0, a1)
+        maxs = self._read(level, 1, a0, a1)
+        rms = self._read(level, 2, a0, a1)
+        last_w = float(total - (count - 1) * size)
+
+        n = min(want, a1 - a0)
+        span = s1 - s0
+        buckets: List[Dict[str, float]] = []
+        for i in range(n):
+            x = s0 + span * i // n
+            y = s0 + span * (i + 1) // n
+            a = x // size - a0
+            b = max(a + 1, -(-y // size) - a0)
+            sq = w = 0.0
+            for j in range(a, b):
+                wj = last_w if a0 + j == count - 1 else float(size)
+                sq += float(rms[j]) * float(rms[j]) * wj
+                w += wj
+            buckets.append(
+                {
+                    "min": float(min(mins[a:b])) / 32768.0,
+                    "max": float(max(maxs[a:b])) / 32768.0,
+                    "rms": math.sqrt(sq / w) / 32768.0 if w > 0 else 0.0,
+                }
+            )
+        out.update(
+            level=level,
+            bucket_s=float(size) / sr,
+            points=buckets,
+            points_total=len(buckets),
+        )
+        return out
+
+
+def read_waveform_range(
+    path: str,
+    *,
+    start_s: float = 0.0,
+    end_s: Optional[float] = None,
+    points: int = 512,
+) -> Dict[str, Any]:
+    with WaveformPyramid(path) as pyr:
+        return pyr.range(start_s=start_s, end_s=end_s, points=points)